@@ -1,19 +1,17 @@
 import os
 import json
+import time
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
 
+from app.core.metrics import LLM_SECONDS
+
 load_dotenv()
 
 
 def generate_pdf_summary(analysis: dict) -> str:
     """PDF 분석 결과를 Gemini로 요약 - 개선된 프롬프트"""
-    client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
-    
-    script_output = analysis.get("script_output", "")
-    file_name = analysis.get("file_name", "unknown")
-    
     system_msg = types.Part.from_text(text=(
         "당신은 PDF 문서 보안 분석 전문가입니다.\n"
         "입력은 PDF 파일 정적 분석 도구의 실행 결과입니다.\n"
@@ -45,42 +43,11 @@ def generate_pdf_summary(analysis: dict) -> str:
         "반드시 JSON 형식으로만 응답하세요."
     ))
     
-    user_msg = types.Part.from_text(text=f"파일명: {file_name}\n\n분석 결과:\n{script_output}")
-    
-    config = types.GenerateContentConfig(
-        temperature=0.2,  # 더 일관성 있는 응답
-        max_output_tokens=2048,
-        system_instruction=[system_msg],
-    )
-    
-    try:
-        chunks = []
-        for chunk in client.models.generate_content_stream(
-            model="models/gemini-flash-latest",
-            contents=[types.Content(role="user", parts=[user_msg])],
-            config=config,
-        ):
-            if getattr(chunk, "text", None):
-                chunks.append(chunk.text)
-        
-        full_response = "".join(chunks).strip()
-        return _extract_json_from_response(full_response)
-        
-    except Exception as e:
-        error_msg = str(e)
-        if "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
-            return _fallback_quota_exceeded()
-        else:
-            return _fallback_error(error_msg)
+    return _generate_summary("pdf", system_msg, analysis)
 
 
 def generate_pe_summary(analysis: dict) -> str:
     """PE(실행파일) 분석 결과를 Gemini로 요약 - 개선된 프롬프트"""
-    client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
-    
-    script_output = analysis.get("script_output", "")
-    file_name = analysis.get("file_name", "unknown")
-    
     system_msg = types.Part.from_text(text=(
         "당신은 실행파일(PE) 악성코드 분석 전문가입니다.\n"
         "입력은 EXE/DLL 파일 정적 분석 도구의 실행 결과입니다.\n"
@@ -109,42 +76,11 @@ def generate_pe_summary(analysis: dict) -> str:
         "반드시 JSON 형식으로만 응답하세요."
     ))
     
-    user_msg = types.Part.from_text(text=f"파일명: {file_name}\n\n분석 결과:\n{script_output}")
-    
-    config = types.GenerateContentConfig(
-        temperature=0.2,
-        max_output_tokens=2048,
-        system_instruction=[system_msg],
-    )
-    
-    try:
-        chunks = []
-        for chunk in client.models.generate_content_stream(
-            model="models/gemini-flash-latest",
-            contents=[types.Content(role="user", parts=[user_msg])],
-            config=config,
-        ):
-            if getattr(chunk, "text", None):
-                chunks.append(chunk.text)
-        
-        full_response = "".join(chunks).strip()
-        return _extract_json_from_response(full_response)
-        
-    except Exception as e:
-        error_msg = str(e)
-        if "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
-            return _fallback_quota_exceeded()
-        else:
-            return _fallback_error(error_msg)
+    return _generate_summary("pe", system_msg, analysis)
 
 
 def generate_zip_summary(analysis: dict) -> str:
     """ZIP 파일 분석 결과를 Gemini로 요약 - 개선된 프롬프트"""
-    client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
-    
-    script_output = analysis.get("script_output", "")
-    file_name = analysis.get("file_name", "unknown")
-    
     system_msg = types.Part.from_text(text=(
         "당신은 압축 파일 보안 분석 전문가입니다.\n"
         "입력은 ZIP 파일 구조 분석 도구의 실행 결과입니다.\n"
@@ -173,42 +109,11 @@ def generate_zip_summary(analysis: dict) -> str:
         "반드시 JSON 형식으로만 응답하세요."
     ))
     
-    user_msg = types.Part.from_text(text=f"파일명: {file_name}\n\n분석 결과:\n{script_output}")
-    
-    config = types.GenerateContentConfig(
-        temperature=0.2,
-        max_output_tokens=2048,
-        system_instruction=[system_msg],
-    )
-    
-    try:
-        chunks = []
-        for chunk in client.models.generate_content_stream(
-            model="models/gemini-flash-latest",
-            contents=[types.Content(role="user", parts=[user_msg])],
-            config=config,
-        ):
-            if getattr(chunk, "text", None):
-                chunks.append(chunk.text)
-        
-        full_response = "".join(chunks).strip()
-        return _extract_json_from_response(full_response)
-        
-    except Exception as e:
-        error_msg = str(e)
-        if "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
-            return _fallback_quota_exceeded()
-        else:
-            return _fallback_error(error_msg)
+    return _generate_summary("zip", system_msg, analysis)
 
 
 def generate_office_summary(analysis: dict) -> str:
     """MS Office/HWP 분석 결과를 Gemini로 요약 - 개선된 프롬프트"""
-    client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
-    
-    script_output = analysis.get("script_output", "")
-    file_name = analysis.get("file_name", "unknown")
-    
     system_msg = types.Part.from_text(text=(
         "당신은 문서 악성코드 분석 전문가입니다.\n"
         "입력은 oletools 기반 MS Office/HWP 파일 분석 도구의 실행 결과입니다.\n"
@@ -237,33 +142,53 @@ def generate_office_summary(analysis: dict) -> str:
         "제한: 매크로 원문이나 민감 데이터는 절대 포함하지 마세요. 반드시 JSON 형식으로만 응답하세요."
     ))
     
-    user_msg = types.Part.from_text(text=f"파일명: {file_name}\n\n분석 결과:\n{script_output}")
-    
-    config = types.GenerateContentConfig(
-        temperature=0.2,
-        max_output_tokens=2048,
-        system_instruction=[system_msg],
-    )
-    
+    return _generate_summary("office", system_msg, analysis)
+
+
+def _generate_summary(kind: str, system_msg, analysis: dict) -> str:
+    """
+    공통 Gemini 호출: 분석 결과(script_output)를 system_msg 프롬프트로 요약합니다.
+    호출 시간과 결과(ok/429/error/fallback)를 메트릭으로 기록합니다.
+    """
+    started = time.perf_counter()
+    outcome = "error"
     try:
-        chunks = []
-        for chunk in client.models.generate_content_stream(
-            model="models/gemini-flash-latest",
-            contents=[types.Content(role="user", parts=[user_msg])],
-            config=config,
-        ):
-            if getattr(chunk, "text", None):
-                chunks.append(chunk.text)
-        
-        full_response = "".join(chunks).strip()
-        return _extract_json_from_response(full_response)
-        
-    except Exception as e:
-        error_msg = str(e)
-        if "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
-            return _fallback_quota_exceeded()
-        else:
-            return _fallback_error(error_msg)
+        client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
+
+        script_output = analysis.get("script_output", "")
+        file_name = analysis.get("file_name", "unknown")
+        user_msg = types.Part.from_text(text=f"파일명: {file_name}\n\n분석 결과:\n{script_output}")
+
+        config = types.GenerateContentConfig(
+            temperature=0.2,  # 더 일관성 있는 응답
+            max_output_tokens=2048,
+            system_instruction=[system_msg],
+        )
+
+        try:
+            chunks = []
+            for chunk in client.models.generate_content_stream(
+                model="models/gemini-flash-latest",
+                contents=[types.Content(role="user", parts=[user_msg])],
+                config=config,
+            ):
+                if getattr(chunk, "text", None):
+                    chunks.append(chunk.text)
+
+            full_response = "".join(chunks).strip()
+            result = _extract_json_from_response(full_response)
+            outcome = "fallback" if is_fallback_summary(result) else "ok"
+            return result
+
+        except Exception as e:
+            error_msg = str(e)
+            if "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
+                outcome = "429"
+                return _fallback_quota_exceeded()
+            else:
+                return _fallback_error(error_msg)
+    finally:
+        LLM_SECONDS.observe(time.perf_counter() - started, kind=kind, outcome=outcome)
 
 
 def _extract_json_from_response(response: str) -> str:
@@ -294,6 +219,24 @@ def _extract_json_from_response(response: str) -> str:
     return _fallback_response()
 
 
+# 폴백 응답의 summary 문구 (캐시에 저장하지 않아야 하는 응답 판별용)
+_FALLBACK_SUMMARY_PREFIXES = (
+    "분석 결과를 생성하지 못했습니다.",
+    "Gemini API 할당량이 초과되었습니다.",
+    "AI 분석 중 오류가 발생했습니다.",
+    "LLM 분석 실패:",
+)
+
+
+def is_fallback_summary(llm_summary: str) -> bool:
+    """LLM 요약이 실제 분석이 아닌 폴백(오류/할당량 초과) 응답인지 확인"""
+    try:
+        summary = json.loads(llm_summary).get("summary", "")
+    except Exception:
+        return True
+    return any(summary.startswith(prefix) for prefix in _FALLBACK_SUMMARY_PREFIXES)
+
+
 def _fallback_response() -> str:
     """분석 실패 시 기본 응답"""
     return json.dumps({
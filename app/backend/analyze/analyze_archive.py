@@ -0,0 +1,141 @@
+"""
+TAR / 단일 파일 압축(gz, bz2, xz) 분석
+archive_stream으로 파일을 앞에서부터 한 번만 읽으며 멤버를 스트림으로 꺼내고,
+ZIP과 같은 재귀 검사(archive_scan)와 한도(ScanBudget)를 적용합니다. (tar.gz 등은 압축을 풀며 바로 TAR로 읽음)
+"""
+import os
+import argparse
+
+try:
+    from app.backend.analyze import entropy as entropy_engine
+    from app.backend.analyze import archive_scan
+    from app.backend.analyze import archive_stream
+    from app.backend.analyze import zip_entries
+    from app.backend.analyze.file_type import sniff_bytes, SNIFF_BYTES, TYPE_DESCRIPTIONS
+except ImportError:  # analyze 디렉토리에서 CLI로 직접 실행한 경우
+    import entropy as entropy_engine
+    import archive_scan
+    import archive_stream
+    import zip_entries
+    from file_type import sniff_bytes, SNIFF_BYTES, TYPE_DESCRIPTIONS
+
+ARCHIVE_TYPES = archive_stream.STREAM_TYPES
+
+
+def _member_counter():
+    """
+    바깥 아카이브에서 검사한 멤버의 집계 (확장자 분류별 개수, 링크 수, 선언된 크기 합)
+    트리에는 탐지된 노드만 남으므로 검사 중에 셉니다. 반환: (집계, scan_archive의 visit 함수)
+    """
+    by_class = dict.fromkeys(zip_entries.CLASS_LABELS, 0)
+    summary = {"members": 0, "links": 0, "declared_size": 0, "by_class": by_class}
+
+    def visit(node):
+        summary["members"] += 1
+        ext = os.path.splitext(node["name"])[1].lower()
+        by_class[zip_entries.CLASS_BY_EXT.get(ext, "other")] += 1
+        summary["links"] += any(finding["id"] == "link" for finding in node["findings"])
+        summary["declared_size"] += node["size"] or 0
+
+    return summary, visit
+
+
+def inspect_archive(filepath, budget=None):
+    """
+    TAR/gz/bz2/xz 파일을 스트림으로 읽어 구조화된 결과(dict)를 반환합니다.
+    budget: archive_scan.ScanBudget (None이면 기본 한도)
+    """
+    result = {
+        "file_name": os.path.basename(filepath),
+        "format": None,
+        "container": None,
+        "compression": None,
+        "summary": None,
+        "entropy": None,
+        "tree": None,
+        "error": None,
+    }
+
+    if not os.path.exists(filepath):
+        result["error"] = f"파일을 찾을 수 없습니다: {filepath}"
+        return result
+
+    with open(filepath, "rb") as f:
+        kind = sniff_bytes(f.read(SNIFF_BYTES))
+    if kind not in ARCHIVE_TYPES:
+        result["error"] = "TAR/gzip/bzip2/xz 형식이 아닙니다."
+        return result
+    result["format"] = kind
+
+    budget = budget or archive_scan.ScanBudget()
+    try:
+        with entropy_engine.open_mapped(filepath) as buf:
+            result["entropy"] = entropy_engine.profile_buffer(buf)
+        with open(filepath, "rb") as f:
+            archive = archive_stream.open_archive(f, kind, result["file_name"], budget.charge,
+                                                  bomb_ratio=budget.bomb_ratio, bomb_min_bytes=budget.bomb_min_bytes)
+            result["container"] = archive.format
+            result["compression"] = archive.compression
+            summary, visit = _member_counter()
+            result["tree"] = archive_scan.scan_archive(archive, result["file_name"], budget, visit)
+            archive.close()
+        result["summary"] = summary
+    except archive_stream.StreamLimit as e:
+        result["error"] = f"압축 스트림 검사 중단: {e}"
+    except archive_scan.READ_ERRORS as e:
+        result["error"] = f"손상된 압축 파일입니다: {e}"
+    except Exception as e:
+        result["error"] = f"분석 중 예외 발생: {e}"
+
+    return result
+
+
+def format_archive_report(result):
+    """inspect_archive 결과를 텍스트 보고서로 변환합니다."""
+    lines = []
+    lines.append("=" * 60)
+    lines.append(f"압축 파일 구조 분석: {result['file_name']}")
+    lines.append("=" * 60)
+
+    if result["format"]:
+        layout = "TAR 묶음" if result["container"] == "tar" else "단일 파일"
+        compression = TYPE_DESCRIPTIONS[result["compression"]] if result["compression"] else "무압축"
+        lines.append(f"  - 형식: {layout} ({compression})")
+
+    summary = result.get("summary")
+    if summary:
+        by_class = ", ".join(f"{zip_entries.CLASS_LABELS[name]} {count}"
+                             for name, count in summary["by_class"].items() if count)
+        lines.append(f"  - 검사한 멤버: {summary['members']}개 (선언된 크기 합 {summary['declared_size']:,}바이트)")
+        lines.append(f"  - 확장자 분류: {by_class or '없음'}")
+        if summary["links"]:
+            lines.append(f"  - 링크 멤버: {summary['links']}개")
+
+    tree = result.get("tree")
+    if tree:
+        archive_scan.format_tree(lines, tree)
+
+    entropy = result.get("entropy")
+    if entropy:
+        lines.append(f"\n  - 파일 엔트로피: {entropy['entropy']:.4f} "
+                     f"({entropy['window']}바이트 창 {entropy['windows']}개 중 {entropy['high_entropy_windows']}개가 고엔트로피)")
+
+    if result["error"]:
+        lines.append(f"[오류] {result['error']}")
+
+    return "\n".join(lines)
+
+
+def analyze_archive(filepath):
+    if not os.path.exists(filepath):
+        print(f"[오류] 파일을 찾을 수 없습니다: {filepath}")
+        return
+
+    print(format_archive_report(inspect_archive(filepath)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TAR/gzip/bzip2/xz 압축 파일 보안 분석 도구")
+    parser.add_argument("filepath", help="분석할 압축 파일 경로")
+    args = parser.parse_args()
+    analyze_archive(args.filepath)
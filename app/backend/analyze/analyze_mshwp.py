@@ -1,184 +1,596 @@
-import sys
 import os
 import argparse
-import subprocess # 명령줄 도구 실행용
 import olefile    # olemeta 대체 및 olefile 라이브러리 직접 사용
 from oletools import oleid
 from oletools import olevba
+from oletools import mraptor
+from oletools import crypto
+from oletools.oleobj import OleNativeStream
+from oletools.common.clsid import KNOWN_CLSIDS
 
-# --- [1] 명령줄 도구 실행 헬퍼 ---
-def run_command_tool(command_name, filepath):
+# 임베디드 파일 중 실행 가능한 확장자
+DANGEROUS_EXTS = ('.exe', '.dll', '.scr', '.com', '.pif', '.bat', '.cmd', '.vbs', '.vbe',
+                  '.js', '.jse', '.wsf', '.wsh', '.ps1', '.hta', '.lnk', '.jar')
+
+# 루트 CLSID를 모를 때 스트림 이름으로 문서 형식 추정
+STREAM_FILE_TYPES = [
+    ("WordDocument", "MS Word 97-2003 Document"),
+    ("Workbook", "MS Excel 97-2003 Workbook"),
+    ("Book", "MS Excel 5.0/95 Workbook"),
+    ("PowerPoint Document", "MS PowerPoint 97-2003 Presentation"),
+    ("FileHeader", "Hangul Word Processor (HWP) Document"),
+]
+
+ENTRY_TYPE_NAMES = {
+    olefile.STGTY_EMPTY: "Empty",
+    olefile.STGTY_STORAGE: "Storage",
+    olefile.STGTY_STREAM: "Stream",
+    olefile.STGTY_LOCKBYTES: "LockBytes",
+    olefile.STGTY_PROPERTY: "Property",
+    olefile.STGTY_ROOT: "Root",
+}
+
+
+# --- [1] OLE 파일 열기 (한 번만 파싱하여 모든 분석 단계에서 공유) ---
+def open_ole(filepath, data=None):
     """
-    oletools의 명령줄 도구(oledir, olemap 등)를 실행하고 원본 출력을 반환합니다.
+    OLE(Compound File)이면 파싱된 OleFileIO를, 아니면 None을 반환합니다.
+    data: 파일 대신 메모리의 내용 (압축 파일 내부 엔트리 등)
+    반환: (OleFileIO 또는 None, 오류 메시지 또는 None)
     """
-    # 시스템에 설치된 파이썬을 이용해 모듈로 실행 (경로 문제 방지)
-    command = [sys.executable, "-m", f"oletools.{command_name}", filepath]
-    
+    if not (olefile.isOleFile(data=data) if data is not None else olefile.isOleFile(filepath)):
+        return None, None
     try:
-        # Popen을 사용하여 stdout/stderr을 모두 캡처
-        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8', errors='ignore')
-        stdout, stderr = process.communicate()
-        
-        if process.returncode != 0:
-            return f"  [오류] {command_name} 실행 실패:\n{stderr}"
-        
-        if not stdout.strip():
-            return "  -> (출력 정보 없음)"
-            
-        return stdout.strip()
-
-    except FileNotFoundError:
-        return f"  [오류] {command_name}을(를) 찾을 수 없습니다. oletools가 올바르게 설치되었는지 확인하세요."
+        # olevba와 같은 방식으로 스트림 이름을 유니코드로 다룸
+        return olefile.OleFileIO(data if data is not None else filepath, path_encoding=None), None
     except Exception as e:
-        return f"  [오류] {command_name} 실행 중 예외 발생: {e}"
+        return None, f"OLE 파일 파싱 오류: {e}"
+
+
+def _entry_name(name):
+    """출력용 스트림 이름 (제어 문자는 \\x05 형태로 표시)"""
+    return repr(name)[1:-1]
+
+
+def _stream_path(parts):
+    return "/".join(_entry_name(part) for part in parts)
+
+
+def _clsid_name(clsid):
+    if not clsid:
+        return None
+    return KNOWN_CLSIDS.get(clsid.upper())
+
+
+# --- [2] 파일 식별 및 위험 지표 (oleid) ---
+def _indicator(indicator_id, name, value, description):
+    return {"id": indicator_id, "name": name, "value": str(value), "description": description}
+
+
+def _guess_file_type(ole):
+    clsid_name = _clsid_name(ole.root.clsid)
+    if clsid_name:
+        return clsid_name, ""
+    for stream_name, file_type in STREAM_FILE_TYPES:
+        if ole.exists(stream_name):
+            return file_type, ""
+    return ("Generic OLE file / Compound File (unknown format)",
+            f"Unrecognized OLE file. Root CLSID: {ole.root.clsid} - None")
+
+
+def inspect_oleid(filepath, ole=None, metadata=None, vba=None, data=None):
+    """
+    oleid와 같은 위험 지표를 만듭니다.
+    ole이 주어지면 이미 파싱된 핸들과 메타데이터/olevba 결과로 지표를 계산하고,
+    OLE가 아닌 파일(OOXML 등)은 oleid로 직접 검사합니다.
+    """
+    result = {"indicators": [], "error": None}
+    if ole is None:
+        try:
+            for i in oleid.OleID(filepath, data=data).check() or []:
+                result["indicators"].append(_indicator(i.id, i.name, i.value, i.description))
+        except Exception as e:
+            result["error"] = f"oleid 분석 오류: {e}"
+        return result
 
-# --- [2] 라이브러리 도구 실행 (oleid) ---
-def analyze_oleid(filepath):
-    print("\n--- 1. oleid (파일 식별 및 위험 지표) ---")
     try:
-        oid = oleid.OleID(filepath)
-        indicators = oid.check()
-        
-        if not indicators:
-            print("  -> OLE/Compound File 인디케이터 없음.")
-            return
-
-        for i in indicators:
-            print(f"  - ID: {i.id}")
-            print(f"    Name: {i.name}")
-            print(f"    Value: {i.value}")
-            print(f"    Description: {i.description}\n")
+        indicators = result["indicators"]
+        file_type, type_description = _guess_file_type(ole)
+        indicators.append(_indicator("ftype", "File format", file_type, type_description))
+        indicators.append(_indicator("container", "Container format", "OLE", "Container type"))
+
+        meta = (metadata or {}).get("summary") or {}
+        codepage = meta.get("codepage")
+        indicators.append(_indicator("appname", "Application name", meta.get("creating_application"),
+                                     "Application name declared in properties"))
+        indicators.append(_indicator("codepage", "Properties code page", codepage,
+                                     "Code page used for properties"))
+        indicators.append(_indicator("author", "Author", meta.get("author"),
+                                     "Author declared in properties"))
 
+        try:
+            encrypted = crypto.is_encrypted(ole)
+            indicators.append(_indicator(
+                "encrypted", "Encrypted", encrypted,
+                "The file is encrypted. It may be decrypted with msoffcrypto-tool" if encrypted
+                else "The file is not encrypted"))
+        except Exception as e:
+            indicators.append(_indicator("encrypted", "Encrypted", "Error",
+                                         f"Error while checking encryption: {e}"))
+
+        vba = vba or {}
+        if vba.get("error"):
+            indicators.append(_indicator("vba", "VBA Macros", "Error",
+                                         f"Error while checking VBA macros: {vba['error']}"))
+        elif vba.get("has_macros") and vba.get("suspicious"):
+            indicators.append(_indicator("vba", "VBA Macros", "Yes, suspicious",
+                                         "This file contains VBA macros. Suspicious keywords were found."))
+        elif vba.get("has_macros"):
+            indicators.append(_indicator("vba", "VBA Macros", "Yes",
+                                         "This file contains VBA macros. No suspicious keyword was found."))
+        else:
+            indicators.append(_indicator("vba", "VBA Macros", "No",
+                                         "This file does not contain VBA macros."))
+        indicators.append(_indicator(
+            "xlm", "XLM Macros", "Yes" if vba.get("has_xlm") else "No",
+            "This file contains XLM macros." if vba.get("has_xlm")
+            else "This file does not contain Excel 4/XLM macros."))
+
+        indicators.append(_indicator("ext_rels", "External Relationships", 0,
+                                     "External relationships such as remote templates, remote OLE objects, etc"))
+        indicators.append(_indicator(
+            "ObjectPool", "ObjectPool", ole.exists("ObjectPool"),
+            "Contains an ObjectPool stream, very likely to contain embedded OLE objects or files."))
+
+        flash = 0
+        for parts in ole.listdir():
+            with ole.openstream(parts) as stream:
+                flash += len(oleid.detect_flash(stream.read()))
+        indicators.append(_indicator(
+            "flash", "Flash objects", flash,
+            "Number of embedded Flash objects (SWF files) detected in OLE streams. "
+            "Not 100% accurate, there may be false positives."))
     except Exception as e:
-        print(f"  [오류] oleid 분석 오류: {e}")
+        result["error"] = f"oleid 분석 오류: {e}"
+    return result
+
+
+# --- [3] 메타데이터 (olemeta/olefile) ---
+SUMMARY_FIELDS = ("title", "subject", "author", "keywords", "comments", "last_saved_by",
+                  "revision_number", "create_time", "last_saved_time", "creating_application",
+                  "codepage", "security")
 
-# --- [3] 라이브러리 도구 실행 (olemeta/olefile) ---
-def analyze_metadata(filepath):
-    print("\n--- 2. olemeta (메타데이터 요약) ---")
-    print("   (olefile 라이브러리를 사용하여 SummaryInformation을 직접 파싱합니다)")
+
+def inspect_metadata(filepath, ole=None):
+    result = {"is_ole": False, "summary": None,
+              "SummaryInformation": None, "DocumentSummaryInformation": None, "error": None}
+    if ole is None:
+        return result
+
+    result["is_ole"] = True
     try:
-        if not olefile.isOleFile(filepath):
-            print("  -> OLE 파일이 아니므로 메타데이터를 읽을 수 없습니다.")
-            return
-
-        ole = olefile.OleFileIO(filepath)
-        
-        # 'SummaryInformation' 스트림에서 속성 읽기
-        if ole.exists('SummaryInformation'):
-            props = ole.getproperties('SummaryInformation')
-            print("\n  [SummaryInformation]")
-            if not props:
-                print("    -> 속성 정보 없음")
-            for name, value in props.items():
-                print(f"    - {name}: {value}")
-        else:
-            print("\n  [SummaryInformation] -> 스트림을 찾을 수 없음")
+        meta = ole.get_metadata()
+        summary = {}
+        for field in SUMMARY_FIELDS:
+            value = getattr(meta, field, None)
+            if isinstance(value, bytes):
+                value = value.decode("utf-8", errors="replace")
+            summary[field] = None if value is None else str(value)
+        result["summary"] = summary
 
-        # 'DocumentSummaryInformation' 스트림에서 속성 읽기
-        if ole.exists('DocumentSummaryInformation'):
-            props = ole.getproperties('DocumentSummaryInformation')
-            print("\n  [DocumentSummaryInformation]")
-            if not props:
-                print("    -> 속성 정보 없음")
-            for name, value in props.items():
-                print(f"    - {name}: {value}")
-        else:
-            print("\n  [DocumentSummaryInformation] -> 스트림을 찾을 수 없음")
-            
-        ole.close()
+        # 'SummaryInformation' / 'DocumentSummaryInformation' 스트림에서 속성 읽기
+        for stream_name in ('SummaryInformation', 'DocumentSummaryInformation'):
+            path = "\x05" + stream_name
+            if ole.exists(path):
+                props = ole.getproperties(path, convert_time=True)
+                result[stream_name] = {str(name): str(value) for name, value in props.items()}
     except Exception as e:
-        print(f"  [오류] 메타데이터 분석 오류: {e}")
+        result["error"] = f"메타데이터 분석 오류: {e}"
+    return result
+
+
+# --- [4] VBA 매크로 분석 (olevba) ---
+class SharedOleVBAParser(olevba.VBA_Parser):
+    """이미 파싱된 OleFileIO를 다시 열지 않고 그대로 사용하는 VBA_Parser"""
+
+    def __init__(self, filepath, ole, data=None):
+        self._shared_ole = ole
+        super().__init__(filepath, data=data)
+
+    def open_ole(self, _file):
+        self.ole_file = self._shared_ole
+        self.type = olevba.TYPE_OLE
+
+    def close(self):
+        # 공유 핸들은 inspect_mshwp에서 닫습니다.
+        self.ole_file = None
+        for ole_subfile in self.ole_subfiles or []:
+            ole_subfile.close()
+
+
+def inspect_olevba(filepath, ole=None, data=None):
+    result = {"skipped": False, "has_macros": False, "has_xlm": False, "suspicious": False,
+              "macros": [], "analysis": [], "error": None}
 
-# --- [4] 라이브러리 도구 실행 (olevba) ---
-def analyze_olevba(filepath):
-    print("\n--- 3. olevba (VBA 매크로 분석) ---")
-    
     # HWP 파일은 VBA를 사용하지 않으므로 건너뛰기
-    if filepath.lower().endswith('.hwp'):
-        print("  -> HWP 파일입니다. VBA 매크로 분석을 건너뜁니다.")
-        return
-        
+    if filepath.lower().endswith('.hwp') or (ole is not None and ole.exists("FileHeader")):
+        result["skipped"] = True
+        return result
+
     vba_parser = None
     try:
-        vba_parser = olevba.VBA_Parser(filepath)
-        
+        vba_parser = (SharedOleVBAParser(filepath, ole, data) if ole is not None
+                      else olevba.VBA_Parser(filepath, data=data))
+
         if vba_parser.detect_vba_macros():
-            print("  🚨 **매크로 탐지: VBA 코드가 파일에 존재합니다.**\n")
-            
-            # 모든 매크로 스트림 정보 출력
-            print("  [매크로 스트림 정보]")
+            result["has_macros"] = True
+
+            # 모든 매크로 스트림 정보
+            code = []
             for (filename, stream_path, vba_filename, vba_code) in vba_parser.extract_macros():
-                print(f"  - OLE 파일명: {filename}")
-                print(f"    스트림 경로: {stream_path}")
-                print(f"    VBA 모듈명: {vba_filename}")
-                print(f"    코드 크기: {len(vba_code)} bytes\n")
-
-            # 분석 결과 (의심 키워드, 자동 실행 등)
-            print("  [매크로 코드 분석 결과]")
-            analysis_results = vba_parser.analyze_macros()
-            
-            if not analysis_results:
-                print("  -> 분석 결과 없음")
-                
-            for keyword, description, count in analysis_results:
-                if count > 0: # 0이 아닌 결과만 출력
-                    print(f"  - 키워드: {keyword}")
-                    print(f"    설명: {description}")
-                    print(f"    횟수: {count}\n")
-        else:
-            print("  -> VBA 매크로가 탐지되지 않았습니다.")
-            
+                result["macros"].append({
+                    "ole_file": os.path.basename(filename),
+                    "stream_path": stream_path,
+                    "vba_filename": vba_filename,
+                    "code_size": len(vba_code),
+                })
+                code.append(vba_code)
+
+            # 분석 결과 (자동 실행, 의심 키워드, IOC 등)
+            for kw_type, keyword, description in vba_parser.analyze_macros() or []:
+                result["analysis"].append({"type": kw_type, "keyword": keyword, "description": description})
+
+            # mraptor: 자동 실행 + 쓰기/실행 조합이면 의심
+            raptor = mraptor.MacroRaptor("\n".join(code))
+            raptor.scan()
+            result["suspicious"] = bool(raptor.suspicious)
+
+        if ole is not None and (ole.exists("Workbook") or ole.exists("Book")):
+            result["has_xlm"] = bool(vba_parser.detect_xlm_macros())
+
     except Exception as e:
-        print(f"  [에러] olevba 분석 오류: {e}")
+        result["error"] = f"olevba 분석 오류: {e}"
     finally:
         if vba_parser:
             vba_parser.close()
+    return result
 
-# --- [5] 메인 함수 (모든 분석기 실행) ---
-def main_analysis(filepath):
-    if not os.path.exists(filepath):
-        print(f"[오류] 파일을 찾을 수 없습니다: {filepath}")
-        return
 
-    filename = os.path.basename(filepath)
-    print("=" * 70)
-    print(f"파일 전체 분석 시작: {filename}")
-    print("=" * 70)
+# --- [5] 디렉토리 구조 (oledir) ---
+def inspect_oledir(ole):
+    entries = []
+    for sid in range(len(ole.direntries)):
+        entry = ole.direntries[sid]
+        if entry is None:
+            # 트리에 연결되지 않은 항목: 빈 항목이거나 고아(orphan) 항목
+            entry = ole._load_direntry(sid)
+            status = "unused" if entry.entry_type == olefile.STGTY_EMPTY else "orphan"
+        else:
+            status = "used"
+        if entry.entry_type == olefile.STGTY_EMPTY:
+            continue
+        entries.append({
+            "sid": sid,
+            "status": status,
+            "type": ENTRY_TYPE_NAMES.get(entry.entry_type, "Unknown"),
+            "name": "" if entry.name.startswith("\x00") else _entry_name(entry.name),
+            "left": None if entry.sid_left == olefile.NOSTREAM else entry.sid_left,
+            "right": None if entry.sid_right == olefile.NOSTREAM else entry.sid_right,
+            "child": None if entry.sid_child == olefile.NOSTREAM else entry.sid_child,
+            "start_sector": entry.isectStart,
+            "size": entry.size,
+            "clsid": entry.clsid or None,
+            "clsid_name": _clsid_name(entry.clsid),
+        })
+    return {"entries": entries, "orphans": sum(1 for e in entries if e["status"] == "orphan")}
+
+
+# --- [6] 섹터 맵 (olemap) ---
+def inspect_olemap(ole):
+    sector_size = ole.sector_size
+    counts = {"used": 0, "free": 0, "fat": 0, "difat": 0, "end_of_chain": 0}
+    fat = ole.fat[:ole.nb_sect]
+    for value in fat:
+        if value == olefile.FREESECT:
+            counts["free"] += 1
+        elif value == olefile.FATSECT:
+            counts["fat"] += 1
+        elif value == olefile.DIFSECT:
+            counts["difat"] += 1
+        elif value == olefile.ENDOFCHAIN:
+            counts["end_of_chain"] += 1
+        else:
+            counts["used"] += 1
+
+    # FAT 끝의 빈 섹터부터 파일 끝까지는 OLE 구조 밖의 데이터 (덧붙인 페이로드 등)
+    last_used = len(fat)
+    while last_used > 0 and fat[last_used - 1] == olefile.FREESECT:
+        last_used -= 1
+    extra_offset = (last_used + 1) * sector_size
+    extra_size = max(0, ole._filesize - extra_offset)
+
+    return {
+        "header": {
+            "major_version": ole.dll_version,
+            "minor_version": ole.minor_version,
+            "sector_size": sector_size,
+            "mini_sector_size": ole.mini_sector_size,
+            "mini_stream_cutoff": ole.mini_stream_cutoff_size,
+            "num_fat_sectors": ole.num_fat_sectors,
+            "first_dir_sector": ole.first_dir_sector,
+            "first_mini_fat_sector": ole.first_mini_fat_sector,
+            "num_mini_fat_sectors": ole.num_mini_fat_sectors,
+            "first_difat_sector": ole.first_difat_sector,
+            "num_difat_sectors": ole.num_difat_sectors,
+        },
+        "file_size": ole._filesize,
+        "num_sectors": ole.nb_sect,
+        "sectors": counts,
+        "extra_data_offset": extra_offset,
+        "extra_data_size": extra_size,
+    }
+
+
+# --- [7] 타임스탬프 (oletimes) ---
+def _timestamp(value):
+    return value.isoformat(sep=" ") if value else None
+
 
-    # 1. oleid (라이브러리)
-    analyze_oleid(filepath)
-    
-    # 2. olemeta / olefile (라이브러리)
-    analyze_metadata(filepath)
+def inspect_oletimes(ole):
+    items = [{"name": "Root", "modified": _timestamp(ole.root.getmtime()),
+              "created": _timestamp(ole.root.getctime())}]
+    for parts in ole.listdir(streams=True, storages=True):
+        items.append({
+            "name": _stream_path(parts),
+            "modified": _timestamp(ole.getmtime(parts)),
+            "created": _timestamp(ole.getctime(parts)),
+        })
+    return {"entries": items}
+
+
+# --- [8] 임베디드 객체 (oleobj) ---
+def inspect_oleobj(ole):
+    """
+    OLE 1.0 Package(\\x01Ole10Native) 스트림의 임베디드 파일 정보를 읽습니다.
+    (oleobj와 달리 파일을 디스크에 추출하지 않습니다)
+    """
+    result = {"objects": [], "errors": []}
+    for parts in ole.listdir():
+        if parts[-1].lower() != "\x01ole10native":
+            continue
+        stream_path = _stream_path(parts)
+        try:
+            with ole.openstream(parts) as stream:
+                package = OleNativeStream(stream)
+        except Exception:
+            result["errors"].append({"stream_path": stream_path, "error": "OLE 1.0 객체가 아닙니다"})
+            continue
+        if package.is_link:
+            continue
+        name = package.filename or package.src_path or package.temp_path or ""
+        result["objects"].append({
+            "stream_path": stream_path,
+            "filename": package.filename,
+            "src_path": package.src_path,
+            "temp_path": package.temp_path,
+            "size": package.actual_size,
+            "executable": os.path.splitext(name)[1].lower() in DANGEROUS_EXTS,
+        })
+    return result
+
+
+# --- [9] 구조화된 전체 분석 ---
+OLE_TOOLS = [
+    ("oledir", "4. oledir (OLE 디렉토리 구조)", inspect_oledir),
+    ("olemap", "5. olemap (OLE 섹터 맵)", inspect_olemap),
+    ("oletimes", "6. oletimes (스트림 타임스탬프)", inspect_oletimes),
+    ("oleobj", "7. oleobj (임베디드 OLE 객체)", inspect_oleobj),
+]
+
+
+def inspect_mshwp(filepath, data=None):
+    """
+    파일을 한 번만 파싱하여 모든 분석 단계에 같은 OleFileIO 핸들을 전달하고,
+    구조화된 결과(dict)를 반환합니다.
+    data: 파일 대신 메모리의 내용 (filepath는 이름/확장자 판단에만 사용)
+    """
+    ole, open_error = open_ole(filepath, data)
+    try:
+        metadata = inspect_metadata(filepath, ole)
+        vba = inspect_olevba(filepath, ole, data)
+        result = {
+            "file_name": os.path.basename(filepath),
+            "is_ole": ole is not None,
+            "ole_error": open_error,
+            "oleid": inspect_oleid(filepath, ole, metadata, vba, data),
+            "metadata": metadata,
+            "olevba": vba,
+            "tools": {},
+        }
+        for tool_name, _, inspect in OLE_TOOLS:
+            if ole is None:
+                result["tools"][tool_name] = None
+                continue
+            try:
+                result["tools"][tool_name] = inspect(ole)
+            except Exception as e:
+                result["tools"][tool_name] = {"error": f"{tool_name} 분석 오류: {e}"}
+        return result
+    finally:
+        if ole is not None:
+            ole.close()
 
-    # 3. olevba (라이브러리)
-    analyze_olevba(filepath)
 
-    # 4. oledir (명령줄)
-    print("\n--- 4. oledir (OLE 디렉토리 구조) ---")
-    print(run_command_tool("oledir", filepath))
+def _format_oledir(info):
+    lines = [f"  {'id':<4} {'Status':<7} {'Type':<8} {'Name':<28} {'Left':<5} {'Right':<5} "
+             f"{'Child':<5} {'1st Sect':<9} Size"]
+    for e in info["entries"]:
+        left, right, child = (("-" if v is None else v) for v in (e["left"], e["right"], e["child"]))
+        lines.append(f"  {e['sid']:<4} {e['status']:<7} {e['type']:<8} {e['name']:<28} {left!s:<5} "
+                     f"{right!s:<5} {child!s:<5} {e['start_sector']:<9X} {e['size']}")
+    with_clsid = [e for e in info["entries"] if e["clsid"]]
+    if with_clsid:
+        lines.append("\n  [CLSID]")
+        for e in with_clsid:
+            lines.append(f"  - {e['name']}: {e['clsid']}" + (f" ({e['clsid_name']})" if e["clsid_name"] else ""))
+    if info["orphans"]:
+        lines.append(f"\n  🚨 트리에 연결되지 않은(orphan) 항목 {info['orphans']}개 - 숨겨진 데이터일 수 있습니다.")
+    return lines
 
-    # 5. olemap (명령줄)
-    print("\n--- 5. olemap (OLE 섹터 맵) ---")
-    print(run_command_tool("olemap", filepath))
-    
-    # 6. oletimes (명령줄)
-    print("\n--- 6. oletimes (스트림 타임스탬프) ---")
-    print(run_command_tool("oletimes", filepath))
 
-    # 7. oleobj (명령줄)
-    print("\n--- 7. oleobj (임베디드 OLE 객체) ---")
-    print(run_command_tool("oleobj", filepath))
+def _format_olemap(info):
+    header = info["header"]
+    sectors = info["sectors"]
+    lines = [
+        f"  - 버전: {header['major_version']} (minor {header['minor_version']:#06x}), "
+        f"섹터 크기: {header['sector_size']} bytes (미니 섹터 {header['mini_sector_size']} bytes)",
+        f"  - FAT 섹터: {header['num_fat_sectors']}개, 첫 디렉토리 섹터: {header['first_dir_sector']:08X}",
+        f"  - MiniFAT 섹터: {header['num_mini_fat_sectors']}개 (시작 {header['first_mini_fat_sector']:08X}), "
+        f"DIFAT 섹터: {header['num_difat_sectors']}개",
+        f"  - 파일 크기: {info['file_size']} bytes, 전체 섹터: {info['num_sectors']}개",
+        f"  - 섹터 사용: 데이터 {sectors['used'] + sectors['end_of_chain']}, 빈 섹터 {sectors['free']}, "
+        f"FAT {sectors['fat']}, DIFAT {sectors['difat']}",
+    ]
+    if info["extra_data_size"]:
+        lines.append(f"  🚨 OLE 구조 밖의 추가 데이터: {info['extra_data_size']} bytes "
+                     f"(오프셋 {info['extra_data_offset']:08X})")
+    else:
+        lines.append("  - OLE 구조 밖의 추가 데이터 없음")
+    return lines
 
-    print("\n" + "=" * 70)
-    print(f"파일 분석 완료: {filename}")
-    print("=" * 70)
+
+def _format_oletimes(info):
+    lines = [f"  {'Stream/Storage name':<40} {'Modification Time':<26} Creation Time"]
+    for e in info["entries"]:
+        lines.append(f"  {e['name']:<40} {e['modified'] or 'None':<26} {e['created'] or 'None'}")
+    return lines
+
+
+def _format_oleobj(info):
+    lines = []
+    if not info["objects"]:
+        lines.append("  -> 임베디드 OLE 객체 없음")
+    for obj in info["objects"]:
+        flag = " 🚨 실행 가능한 파일" if obj["executable"] else ""
+        lines.append(f"  - 스트림: {obj['stream_path']}{flag}")
+        lines.append(f"    파일명: {obj['filename']}")
+        lines.append(f"    원본 경로: {obj['src_path']}")
+        lines.append(f"    임시 경로: {obj['temp_path']}")
+        lines.append(f"    크기: {obj['size']} bytes\n")
+    for err in info["errors"]:
+        lines.append(f"  [오류] {err['stream_path']}: {err['error']}")
+    return lines
+
+
+TOOL_FORMATTERS = {
+    "oledir": _format_oledir,
+    "olemap": _format_olemap,
+    "oletimes": _format_oletimes,
+    "oleobj": _format_oleobj,
+}
+
+
+def format_mshwp_report(result):
+    """inspect_mshwp 결과를 텍스트 보고서로 변환합니다."""
+    lines = []
+    lines.append("=" * 70)
+    lines.append(f"파일 전체 분석 시작: {result['file_name']}")
+    lines.append("=" * 70)
+    if result.get("ole_error"):
+        lines.append(f"  [오류] {result['ole_error']}")
+
+    # 1. oleid
+    lines.append("\n--- 1. oleid (파일 식별 및 위험 지표) ---")
+    oid = result["oleid"]
+    if oid["error"]:
+        lines.append(f"  [오류] {oid['error']}")
+    elif not oid["indicators"]:
+        lines.append("  -> OLE/Compound File 인디케이터 없음.")
+    for i in oid["indicators"]:
+        lines.append(f"  - ID: {i['id']}")
+        lines.append(f"    Name: {i['name']}")
+        lines.append(f"    Value: {i['value']}")
+        lines.append(f"    Description: {i['description']}\n")
+
+    # 2. olemeta / olefile
+    lines.append("\n--- 2. olemeta (메타데이터 요약) ---")
+    lines.append("   (olefile 라이브러리를 사용하여 SummaryInformation을 직접 파싱합니다)")
+    meta = result["metadata"]
+    if meta["error"]:
+        lines.append(f"  [오류] {meta['error']}")
+    elif not meta["is_ole"]:
+        lines.append("  -> OLE 파일이 아니므로 메타데이터를 읽을 수 없습니다.")
+    else:
+        for stream_name in ('SummaryInformation', 'DocumentSummaryInformation'):
+            props = meta[stream_name]
+            if props is None:
+                lines.append(f"\n  [{stream_name}] -> 스트림을 찾을 수 없음")
+                continue
+            lines.append(f"\n  [{stream_name}]")
+            if not props:
+                lines.append("    -> 속성 정보 없음")
+            for name, value in props.items():
+                lines.append(f"    - {name}: {value}")
+
+    # 3. olevba
+    lines.append("\n--- 3. olevba (VBA 매크로 분석) ---")
+    vba = result["olevba"]
+    if vba["skipped"]:
+        lines.append("  -> HWP 파일입니다. VBA 매크로 분석을 건너뜁니다.")
+    elif vba["has_macros"]:
+        lines.append("  🚨 **매크로 탐지: VBA 코드가 파일에 존재합니다.**\n")
+        lines.append("  [매크로 스트림 정보]")
+        for m in vba["macros"]:
+            lines.append(f"  - OLE 파일명: {m['ole_file']}")
+            lines.append(f"    스트림 경로: {m['stream_path']}")
+            lines.append(f"    VBA 모듈명: {m['vba_filename']}")
+            lines.append(f"    코드 크기: {m['code_size']} bytes\n")
+        lines.append("  [매크로 코드 분석 결과]")
+        if not vba["analysis"]:
+            lines.append("  -> 분석 결과 없음")
+        for a in vba["analysis"]:
+            lines.append(f"  - 유형: {a['type']}")
+            lines.append(f"    키워드: {a['keyword']}")
+            lines.append(f"    설명: {a['description']}\n")
+        if vba["suspicious"]:
+            lines.append("  🚨 mraptor: 자동 실행 + 쓰기/실행 코드가 함께 있어 의심스러운 매크로입니다.")
+    elif not vba["error"]:
+        lines.append("  -> VBA 매크로가 탐지되지 않았습니다.")
+    if vba.get("has_xlm"):
+        lines.append("  🚨 Excel 4/XLM 매크로가 존재합니다.")
+    if vba["error"]:
+        lines.append(f"  [에러] {vba['error']}")
+
+    # 4~7. OLE 구조 (같은 핸들에서 분석)
+    for tool_name, title, _ in OLE_TOOLS:
+        lines.append(f"\n--- {title} ---")
+        info = result["tools"][tool_name]
+        if info is None:
+            lines.append("  -> OLE 파일이 아니므로 건너뜁니다.")
+        elif "error" in info and len(info) == 1:
+            lines.append(f"  [오류] {info['error']}")
+        else:
+            lines.extend(TOOL_FORMATTERS[tool_name](info))
+
+    lines.append("\n" + "=" * 70)
+    lines.append(f"파일 분석 완료: {result['file_name']}")
+    lines.append("=" * 70)
+    return "\n".join(lines)
+
+
+# --- [10] 메인 함수 (모든 분석기 실행) ---
+def main_analysis(filepath):
+    if not os.path.exists(filepath):
+        print(f"[오류] 파일을 찾을 수 없습니다: {filepath}")
+        return
+
+    print(format_mshwp_report(inspect_mshwp(filepath)))
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="oletools를 이용한 MS/HWP 파일 상세 정보 분석")
     parser.add_argument("filepath", help="분석할 파일의 경로")
-    
+
     args = parser.parse_args()
-    
-    main_analysis(args.filepath)
\ No newline at end of file
+
+    main_analysis(args.filepath)
@@ -0,0 +1,564 @@
+"""
+OOXML(docx/xlsx/pptx 등) 문서 분석
+OOXML은 ZIP 묶음이므로 OLE 도구로 파일 전체를 다루지 않고, 중앙 디렉토리(zip_directory)만 읽어 파트 목록을 만든 뒤
+검사에 필요한 파트만 크기 상한까지 해제합니다. (본문/이미지 등 나머지 파트는 풀지 않음)
+- [Content_Types].xml, _rels/.rels: 문서 종류(Word/Excel/PowerPoint)와 매크로 사용 형식 여부
+- 모든 *.rels: TargetMode="External" 관계 (원격 템플릿 인젝션, 외부 OLE 객체/프레임, 위험 URI 스킴 등)
+- vbaProject.bin: 있을 때만 꺼내 olevba/mraptor로 검사 (analyze_mshwp.inspect_olevba)
+- macrosheets: Excel 4(XLM) 매크로 시트
+- activeX: ActiveX 컨트롤과 CLSID
+- embeddings: 임베디드 객체 (OLE이면 루트 CLSID, OLE 1.0 Package 파일명, 매크로 여부 / 그 밖에는 시그니처로 형식만)
+- 나머지 모든 파트: 앞부분(SNIFF_BYTES)만 해제해 실행파일/OLE/스크립트가 숨어 있는지 (word/media/payload.exe 등)
+- 패키지 전체: ZIP과 같은 압축 폭탄 검사 (zip_directory.inspect_bomb)
+"""
+import os
+import zlib
+import struct
+import argparse
+import posixpath
+import xml.etree.ElementTree as ET
+
+from oletools.common.clsid import KNOWN_CLSIDS
+
+try:
+    from app.backend.analyze import entropy as entropy_engine
+    from app.backend.analyze import archive_scan
+    from app.backend.analyze import zip_directory
+    from app.backend.analyze.analyze_mshwp import open_ole, inspect_olevba, inspect_oleobj, DANGEROUS_EXTS
+    from app.backend.analyze.file_type import sniff_bytes, SNIFF_BYTES, TYPE_DESCRIPTIONS
+except ImportError:  # analyze 디렉토리에서 CLI로 직접 실행한 경우
+    import entropy as entropy_engine
+    import archive_scan
+    import zip_directory
+    from analyze_mshwp import open_ole, inspect_olevba, inspect_oleobj, DANGEROUS_EXTS
+    from file_type import sniff_bytes, SNIFF_BYTES, TYPE_DESCRIPTIONS
+
+# 파트를 해제해 읽는 최대 크기 (app.config의 OOXML_* 값으로 덮어씀)
+DEFAULT_MAX_XML_BYTES = 2 * 1024 * 1024          # .rels, [Content_Types].xml, ActiveX XML
+DEFAULT_MAX_BINARY_BYTES = 32 * 1024 * 1024      # vbaProject.bin, 임베디드 OLE 객체
+# 읽을 최대 XML 파트 수 (슬라이드가 많은 문서 등에서 .rels 파싱 시간 제한)
+MAX_XML_PARTS = 2000
+# 앞부분을 해제해 형식을 보는 나머지 파트의 최대 수
+MAX_SNIFFED_PARTS = 10000
+# 결과에 담는 외부 관계/컨트롤/임베디드 객체/의심 파트 목록의 최대 길이
+MAX_LISTED = 50
+
+# 나머지 파트에서 스크립트로 보는 내용 (XML 파트는 <script만 봄, 본문 글자와 구분하기 위해)
+SCRIPT_MARKERS = (b"<script", b"#!/", b"@echo off", b"powershell", b"wscript.", b"createobject(", b"<hta:")
+XML_SCRIPT_MARKERS = (b"<script",)
+ARCHIVE_KINDS = ("zip", "hwpx", "ooxml", "tar", "gzip", "bz2", "xz")
+
+CONTENT_TYPES_PART = "[content_types].xml"
+VBA_PROJECT_TYPE = "application/vnd.ms-office.vbaProject"
+MACROSHEET_TYPES = ("application/vnd.ms-excel.macrosheet+xml", "application/vnd.ms-excel.intlmacrosheet+xml")
+
+# 주 문서 파트의 콘텐츠 형식 -> 프로그램
+APPLICATIONS = (
+    ("wordprocessingml", "Word"), ("ms-word", "Word"),
+    ("spreadsheetml", "Excel"), ("ms-excel", "Excel"),
+    ("presentationml", "PowerPoint"), ("ms-powerpoint", "PowerPoint"),
+)
+
+# 외부 관계 종류(Type URI의 마지막 부분) -> (탐지 id, 심각도, 설명)
+EXTERNAL_RELATIONSHIPS = {
+    "attachedTemplate": ("remote_template", "high", "원격 템플릿 (템플릿 인젝션)"),
+    "oleObject": ("external_ole_object", "high", "외부 OLE 객체 링크"),
+    "frame": ("external_frame", "high", "외부 프레임"),
+    "subDocument": ("external_subdocument", "medium", "외부 하위 문서"),
+    "externalLinkPath": ("external_workbook", "medium", "외부 통합 문서 링크"),
+    "image": ("external_image", "low", "외부 이미지 (문서를 열면 요청 전송)"),
+}
+OTHER_EXTERNAL = ("external_target", "low", "외부 대상")
+# 문서를 여는 것만으로 다른 처리기를 부를 수 있는 URI 스킴 (하이퍼링크 포함 모든 외부 관계에 적용)
+DANGEROUS_SCHEMES = ("mhtml:", "ms-msdt:", "search-ms:", "ms-officecmd:", "ms-word:", "ms-excel:",
+                     "ms-powerpoint:", "file:", "\\\\")
+
+# 파트를 읽다 날 수 있는 오류 (상한 초과/손상/XML 파싱)
+PART_ERRORS = (ValueError, ET.ParseError, zlib.error, OSError, EOFError, struct.error)
+
+
+def _finding(finding_id, severity, description):
+    return {"id": finding_id, "severity": severity, "description": description}
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _clsid_name(clsid):
+    if not clsid:
+        return None
+    return KNOWN_CLSIDS.get(clsid.strip("{}").upper())
+
+
+def _source_part(rels_name):
+    """'word/_rels/document.xml.rels' -> 'word/document.xml' ('_rels/.rels'는 패키지 자체이므로 '')"""
+    folder, base = posixpath.split(rels_name)
+    if base == ".rels":
+        return ""
+    return posixpath.join(posixpath.dirname(folder), base[:-len(".rels")])
+
+
+def _resolve(source, target):
+    """관계 대상(Target)을 패키지 안의 파트 이름(소문자)으로"""
+    if target.startswith("/"):
+        return target.lstrip("/").lower()
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source), target)).lower()
+
+
+def _read_part(buf, entry, max_bytes):
+    data, complete = zip_directory.read_entry(buf, entry, max_bytes)
+    if not complete:
+        raise ValueError(f"크기 상한({max_bytes:,}바이트) 초과")
+    return data
+
+
+def _read_xml(buf, entry, max_bytes):
+    # 크기 상한까지만 해제한 뒤 파싱 (외부 엔티티는 ElementTree가 불러오지 않음)
+    return ET.fromstring(_read_part(buf, entry, max_bytes))
+
+
+def _content_types(buf, parts, max_xml_bytes, errors):
+    """[Content_Types].xml -> (확장자별 기본 형식, 파트별 형식) (키는 모두 소문자, 파트 이름은 앞 '/' 없이)"""
+    defaults, overrides = {}, {}
+    entry = parts.get(CONTENT_TYPES_PART)
+    if entry is None:
+        errors.append({"part": "[Content_Types].xml", "error": "파트가 없습니다"})
+        return defaults, overrides
+    try:
+        root = _read_xml(buf, entry, max_xml_bytes)
+    except PART_ERRORS as e:
+        errors.append({"part": entry.name, "error": str(e)})
+        return defaults, overrides
+    for element in root:
+        name = _local_name(element.tag)
+        content_type = element.get("ContentType", "")
+        if name == "Default":
+            defaults[element.get("Extension", "").lower()] = content_type
+        elif name == "Override":
+            overrides[element.get("PartName", "").lstrip("/").lower()] = content_type
+    return defaults, overrides
+
+
+def _content_type(part, defaults, overrides):
+    if part in overrides:
+        return overrides[part]
+    return defaults.get(posixpath.splitext(part)[1].lstrip("."))
+
+
+def _scan_relationships(buf, parts, result, max_xml_bytes, state):
+    """
+    모든 .rels 파트를 읽어 외부 관계를 모으고, 주 문서 파트와 vbaProject 관계 대상을 찾습니다.
+    state: {"main_part", "vba_parts", "xml_parts"} (다른 단계와 공유)
+    """
+    relationships = result["relationships"]
+    external = {}  # 탐지 id -> [심각도, 설명, 개수, 첫 대상]
+    for name, entry in parts.items():
+        if not name.endswith(".rels"):
+            continue
+        if state["xml_parts"] >= MAX_XML_PARTS:
+            relationships["truncated"] = True
+            break
+        state["xml_parts"] += 1
+        try:
+            root = _read_xml(buf, entry, max_xml_bytes)
+        except PART_ERRORS as e:
+            result["errors"].append({"part": entry.name, "error": str(e)})
+            continue
+        relationships["parts"] += 1
+        source = _source_part(name)
+        for element in root:
+            if _local_name(element.tag) != "Relationship":
+                continue
+            relationships["count"] += 1
+            rel_type = element.get("Type", "").rsplit("/", 1)[-1]
+            target = element.get("Target", "")
+            if element.get("TargetMode", "").lower() != "external":
+                if rel_type == "officeDocument" and not source:
+                    state["main_part"] = _resolve(source, target)
+                elif rel_type == "vbaProject":
+                    state["vba_parts"].add(_resolve(source, target))
+                continue
+
+            finding_id, severity, label = EXTERNAL_RELATIONSHIPS.get(rel_type, OTHER_EXTERNAL)
+            if target.strip().lower().startswith(DANGEROUS_SCHEMES):
+                finding_id, severity, label = "dangerous_uri", "high", f"위험 URI 스킴 ({rel_type})"
+            elif rel_type == "hyperlink":
+                # 일반 하이퍼링크는 목록에만 남김 (클릭해야 열림)
+                finding_id = None
+            relationships["external_count"] += 1
+            if len(relationships["external"]) < MAX_LISTED:
+                relationships["external"].append({"source": entry.name, "id": element.get("Id"), "type": rel_type,
+                                                  "target": target, "severity": severity if finding_id else None})
+            if finding_id:
+                found = external.setdefault(finding_id, [severity, label, 0, target])
+                found[2] += 1
+
+    for finding_id, (severity, label, count, target) in external.items():
+        more = f" 외 {count - 1}개" if count > 1 else ""
+        result["findings"].append(_finding(finding_id, severity, f"{label}: {target}{more}"))
+
+
+def _inspect_vba(buf, entry, max_binary_bytes):
+    """vbaProject.bin만 꺼내 olevba/mraptor로 검사합니다."""
+    info = {"part": entry.name, "size": entry.file_size, "olevba": None, "error": None}
+    try:
+        data = _read_part(buf, entry, max_binary_bytes)
+    except PART_ERRORS as e:
+        info["error"] = f"vbaProject.bin 읽기 실패: {e}"
+        return info
+    info["olevba"] = inspect_olevba(entry.name, data=data)
+    return info
+
+
+def _inspect_activex(buf, entry, max_xml_bytes):
+    """ActiveX 컨트롤 XML (ax:ocx의 classid/persistence)"""
+    root = _read_xml(buf, entry, max_xml_bytes)
+    attributes = {_local_name(key): value for key, value in root.attrib.items()}
+    clsid = attributes.get("classid")
+    return {"part": entry.name, "classid": clsid, "clsid_name": _clsid_name(clsid),
+            "persistence": attributes.get("persistence")}
+
+
+def _inspect_embedding(buf, entry, max_binary_bytes):
+    """임베디드 객체: 앞부분으로 형식을 판별하고, OLE이면 전체를 꺼내 CLSID/Package/매크로 여부를 봅니다."""
+    info = {"part": entry.name, "size": entry.file_size, "type": None, "clsid": None, "clsid_name": None,
+            "has_vba": False, "packages": [], "error": None}
+    try:
+        head, _ = zip_directory.read_entry(buf, entry, SNIFF_BYTES)
+        info["type"] = sniff_bytes(head)
+        if info["type"] != "ole":
+            return info
+        data = _read_part(buf, entry, max_binary_bytes)
+    except PART_ERRORS as e:
+        info["error"] = f"읽기 실패: {e}"
+        return info
+
+    ole, error = open_ole(entry.name, data)
+    if ole is None:
+        info["error"] = error
+        return info
+    try:
+        info["clsid"] = ole.root.clsid or None
+        info["clsid_name"] = _clsid_name(info["clsid"])
+        info["has_vba"] = ole.exists("Macros/VBA") or ole.exists("_VBA_PROJECT_CUR/VBA")
+        info["packages"] = inspect_oleobj(ole)["objects"]
+    except Exception as e:
+        info["error"] = f"OLE 객체 분석 오류: {e}"
+    finally:
+        ole.close()
+    return info
+
+
+def _sniff_part(buf, entry):
+    """
+    다른 검사 대상이 아닌 파트: 앞부분만 해제해 실행파일/OLE/스크립트/압축 파일이 숨어 있는지 봅니다.
+    반환: 의심 파트 정보 또는 None
+    """
+    head, _ = zip_directory.read_entry(buf, entry, SNIFF_BYTES)
+    kind = sniff_bytes(head)
+    ext = posixpath.splitext(entry.name)[1].lower()
+    lowered = head[:1024].lower()
+    markers = XML_SCRIPT_MARKERS if lowered.lstrip().startswith(b"<") else SCRIPT_MARKERS
+    marker = next((marker for marker in markers if marker in lowered), None)
+    if kind in ("pe", "mz"):
+        severity, reason = "high", f"실행파일 파트 ({TYPE_DESCRIPTIONS[kind]})"
+    elif kind == "ole":
+        severity, reason = "medium", "OLE 파트 (embeddings 밖)"
+    elif ext in DANGEROUS_EXTS:
+        severity, reason = "medium", f"위험 확장자({ext})"
+    elif marker:
+        severity, reason = "medium", f"스크립트 내용 ({marker.decode()})"
+    elif kind in ARCHIVE_KINDS:
+        severity, reason = "low", f"압축 파일 파트 ({TYPE_DESCRIPTIONS[kind]})"
+    else:
+        return None
+    return {"part": entry.name, "type": kind, "severity": severity, "reason": reason}
+
+
+def _document_findings(result):
+    """매크로/ActiveX/임베디드 객체 검사 결과 -> 탐지 항목"""
+    findings = result["findings"]
+    for vba in result["vba"]:
+        olevba = vba["olevba"] or {}
+        if olevba.get("suspicious"):
+            findings.append(_finding("suspicious_macros", "high", "자동 실행 + 쓰기/실행 매크로 (mraptor)"))
+        elif olevba.get("has_macros"):
+            findings.append(_finding("macros", "medium", f"VBA 매크로 포함 ({vba['part']})"))
+    if result["xlm_sheets"]:
+        findings.append(_finding("xlm_macros", "medium", f"Excel 4(XLM) 매크로 시트 {len(result['xlm_sheets'])}개"))
+
+    activex = result["activex"]
+    if activex["count"]:
+        known = sorted({control["clsid_name"] for control in activex["controls"] if control["clsid_name"]})
+        severity = "high" if any("CVE" in name for name in known) else "medium"
+        detail = f" ({', '.join(known)})" if known else ""
+        findings.append(_finding("activex", severity, f"ActiveX 컨트롤 {activex['count']}개{detail}"))
+
+    for embedding in result["embeddings"]:
+        name = posixpath.basename(embedding["part"])
+        if embedding["type"] in ("pe", "mz"):
+            findings.append(_finding("embedded_executable", "high", f"임베디드 실행파일: {name}"))
+        elif posixpath.splitext(name)[1].lower() in DANGEROUS_EXTS:
+            findings.append(_finding("dangerous_extension", "medium", f"위험 확장자의 임베디드 객체: {name}"))
+        if embedding["clsid_name"] and "CVE" in embedding["clsid_name"]:
+            findings.append(_finding("exploit_clsid", "high", f"{name}: {embedding['clsid_name']}"))
+        if embedding["has_vba"]:
+            findings.append(_finding("embedded_macros", "medium", f"매크로가 있는 임베디드 문서: {name}"))
+        for package in embedding["packages"]:
+            if package["executable"]:
+                findings.append(_finding("embedded_package", "high",
+                                         f"임베디드 실행 가능한 파일: {package['filename'] or package['src_path']}"))
+    for part in result["hidden_parts"]["flagged"]:
+        findings.append(_finding("suspicious_part", part["severity"], f"{part['reason']}: {part['part']}"))
+    if result["hidden_parts"]["truncated"]:
+        findings.append(_finding("parts_truncated", "low", f"파트가 많아 앞 {MAX_SNIFFED_PARTS}개만 형식을 확인함"))
+    if result["macro_enabled"] and not result["vba"]:
+        findings.append(_finding("macro_enabled_format", "low", "매크로 사용 형식이지만 vbaProject.bin이 없음"))
+
+
+def _check_part(buf, entry, hidden, errors):
+    if entry.encrypted:
+        return
+    if hidden["sniffed"] >= MAX_SNIFFED_PARTS:
+        hidden["truncated"] = True
+        return
+    hidden["sniffed"] += 1
+    try:
+        flagged = _sniff_part(buf, entry)
+    except PART_ERRORS as e:
+        errors.append({"part": entry.name, "error": str(e)})
+        return
+    if flagged and len(hidden["flagged"]) < MAX_LISTED:
+        hidden["flagged"].append(flagged)
+
+
+def _inspect_buffer(result, buf, max_xml_bytes, max_binary_bytes, inflate_bytes, inflate_cpu_seconds, bomb_ratio):
+    result["entropy"] = entropy_engine.profile_buffer(buf)
+    directory = zip_directory.read_directory(buf)
+    # 압축 폭탄: ZIP과 같은 중앙 디렉토리 구조 검사 + 예산 안의 실제 해제 (엔트리별 결과는 남기지 않음)
+    bomb = zip_directory.inspect_bomb(buf, inflate_bytes, inflate_cpu_seconds, bomb_ratio, directory=directory)
+    (bomb["inflate"] or {}).pop("entries", None)
+    result["bomb"] = bomb
+    if bomb["is_bomb"]:
+        result["findings"].append(_finding("zip_bomb", "high", f"압축 폭탄 의심: {', '.join(bomb['reasons'])}"))
+    # OPC 파트 이름은 대소문자를 구분하지 않음
+    parts = {entry.name.lower(): entry for entry in directory.entries if not entry.is_dir}
+    result["parts"] = len(parts)
+    result["truncated"] = directory.truncated
+
+    defaults, overrides = _content_types(buf, parts, max_xml_bytes, result["errors"])
+    state = {"main_part": None, "vba_parts": set(), "xml_parts": 0}
+    _scan_relationships(buf, parts, result, max_xml_bytes, state)
+
+    if state["main_part"]:
+        content_type = _content_type(state["main_part"], defaults, overrides) or ""
+        result["content_type"] = content_type
+        result["application"] = next((app for key, app in APPLICATIONS if key in content_type), None)
+        result["macro_enabled"] = "macroenabled" in content_type.lower()
+
+    for name, entry in parts.items():
+        # 확장자 기본 형식(Default)은 보지 않음 (.bin을 vbaProject로 선언하면 임베디드 객체까지 매크로로 보게 됨)
+        if name.endswith("vbaproject.bin") or overrides.get(name) == VBA_PROJECT_TYPE:
+            state["vba_parts"].add(name)
+        elif overrides.get(name) in MACROSHEET_TYPES or "/macrosheets/" in name:
+            if not name.endswith(".rels"):
+                result["xlm_sheets"].append(entry.name)
+        elif "/activex/" in name and not name.endswith(".rels"):
+            activex = result["activex"]
+            if name.endswith(".bin"):
+                activex["binaries"] += 1
+                continue
+            activex["count"] += 1
+            if len(activex["controls"]) >= MAX_LISTED or state["xml_parts"] >= MAX_XML_PARTS:
+                continue
+            state["xml_parts"] += 1
+            try:
+                activex["controls"].append(_inspect_activex(buf, entry, max_xml_bytes))
+            except PART_ERRORS as e:
+                result["errors"].append({"part": entry.name, "error": str(e)})
+        elif "/embeddings/" in name and len(result["embeddings"]) < MAX_LISTED:
+            result["embeddings"].append(_inspect_embedding(buf, entry, max_binary_bytes))
+        elif name != CONTENT_TYPES_PART and not name.endswith(".rels"):
+            _check_part(buf, entry, result["hidden_parts"], result["errors"])
+
+    for name in sorted(state["vba_parts"])[:MAX_LISTED]:
+        if name in parts:
+            result["vba"].append(_inspect_vba(buf, parts[name], max_binary_bytes))
+    _document_findings(result)
+
+
+def inspect_ooxml(filepath, data=None, max_xml_bytes=DEFAULT_MAX_XML_BYTES, max_binary_bytes=DEFAULT_MAX_BINARY_BYTES,
+                  inflate_bytes=zip_directory.DEFAULT_MAX_INFLATE_BYTES,
+                  inflate_cpu_seconds=zip_directory.DEFAULT_MAX_CPU_SECONDS, bomb_ratio=zip_directory.BOMB_RATIO):
+    """
+    OOXML 문서를 분석하여 구조화된 결과(dict)를 반환합니다.
+    data: 파일 대신 메모리의 내용 (압축 파일 내부 엔트리 등, filepath는 이름으로만 사용)
+    max_xml_bytes/max_binary_bytes: 파트 하나를 해제해 읽는 최대 크기 (넘는 파트는 검사하지 않고 errors에 남김)
+    inflate_bytes/inflate_cpu_seconds: 압축 폭탄 검사에서 실제로 해제해 볼 최대 바이트/CPU 시간
+    bomb_ratio: 압축 폭탄으로 볼 압축률
+    """
+    result = {
+        "file_name": os.path.basename(filepath),
+        "application": None,
+        "content_type": None,
+        "macro_enabled": False,
+        "parts": 0,
+        "truncated": False,
+        "relationships": {"parts": 0, "count": 0, "external_count": 0, "external": [], "truncated": False},
+        "vba": [],
+        "xlm_sheets": [],
+        "activex": {"count": 0, "binaries": 0, "controls": []},
+        "embeddings": [],
+        "hidden_parts": {"sniffed": 0, "truncated": False, "flagged": []},
+        "bomb": None,
+        "findings": [],
+        "errors": [],
+        "entropy": None,
+        "error": None,
+    }
+
+    if data is None and not os.path.exists(filepath):
+        result["error"] = f"파일을 찾을 수 없습니다: {filepath}"
+        return result
+
+    try:
+        if data is not None:
+            _inspect_buffer(result, data, max_xml_bytes, max_binary_bytes, inflate_bytes, inflate_cpu_seconds,
+                            bomb_ratio)
+        else:
+            with entropy_engine.open_mapped(filepath) as buf:
+                _inspect_buffer(result, buf, max_xml_bytes, max_binary_bytes, inflate_bytes, inflate_cpu_seconds,
+                                bomb_ratio)
+    except (ValueError, struct.error) as e:
+        result["error"] = f"OOXML(ZIP) 구조를 읽을 수 없습니다: {e}"
+    except Exception as e:
+        result["error"] = f"분석 중 예외 발생: {e}"
+
+    return result
+
+
+def _format_vba(lines, vba):
+    lines.append(f"  - 파트: {vba['part']} ({vba['size']:,}바이트)")
+    if vba["error"]:
+        lines.append(f"    [오류] {vba['error']}")
+        return
+    olevba = vba["olevba"]
+    if olevba["error"]:
+        lines.append(f"    [에러] {olevba['error']}")
+    if not olevba["has_macros"]:
+        lines.append("    -> VBA 매크로가 탐지되지 않았습니다.")
+        return
+    lines.append("    🚨 **매크로 탐지: VBA 코드가 파일에 존재합니다.**")
+    for macro in olevba["macros"]:
+        lines.append(f"    - 모듈: {macro['vba_filename']} ({macro['stream_path']}, {macro['code_size']} bytes)")
+    for item in olevba["analysis"]:
+        lines.append(f"    - [{item['type']}] {item['keyword']}: {item['description']}")
+    if olevba["suspicious"]:
+        lines.append("    🚨 mraptor: 자동 실행 + 쓰기/실행 코드가 함께 있어 의심스러운 매크로입니다.")
+
+
+def format_ooxml_report(result):
+    """inspect_ooxml 결과를 텍스트 보고서로 변환합니다."""
+    lines = []
+    lines.append("=" * 60)
+    lines.append(f"OOXML 문서 분석: {result['file_name']}")
+    lines.append("=" * 60)
+
+    application = result["application"] or "알 수 없음"
+    macro = " (매크로 사용 형식)" if result["macro_enabled"] else ""
+    lines.append(f"  - 문서 종류: {application}{macro}")
+    if result["content_type"]:
+        lines.append(f"  - 주 문서 형식: {result['content_type']}")
+    truncated = " (중앙 디렉토리를 끝까지 읽지 못함)" if result["truncated"] else ""
+    lines.append(f"  - 파트: {result['parts']}개{truncated}")
+
+    findings = result["findings"]
+    lines.append(f"\n[탐지 항목] {len(findings)}개")
+    if not findings:
+        lines.append("  -> 외부 관계/매크로/ActiveX/위험한 임베디드 객체나 파트가 없습니다.")
+    for finding in findings:
+        lines.append(f"  {archive_scan.SEVERITY_LABELS[finding['severity']]} {finding['description']}")
+
+    lines.append("\n[VBA 매크로 (vbaProject.bin)]")
+    if not result["vba"]:
+        lines.append("  -> vbaProject.bin 없음")
+    for vba in result["vba"]:
+        _format_vba(lines, vba)
+    if result["xlm_sheets"]:
+        lines.append(f"  🚨 Excel 4/XLM 매크로 시트: {', '.join(result['xlm_sheets'][:10])}")
+
+    relationships = result["relationships"]
+    lines.append(f"\n[외부 관계 (_rels)] .rels {relationships['parts']}개, 관계 {relationships['count']}개 중 "
+                 f"외부 {relationships['external_count']}개")
+    for rel in relationships["external"]:
+        label = archive_scan.SEVERITY_LABELS.get(rel["severity"], "-")
+        lines.append(f"  {label} [{rel['type']}] {rel['target']} ({rel['source']})")
+    if relationships["external_count"] > len(relationships["external"]):
+        lines.append(f"  ... 외 {relationships['external_count'] - len(relationships['external'])}개")
+    if relationships["truncated"]:
+        lines.append(f"  [!] XML 파트 {MAX_XML_PARTS}개 한도에 도달해 나머지 .rels는 읽지 않았습니다.")
+
+    activex = result["activex"]
+    if activex["count"] or activex["binaries"]:
+        lines.append(f"\n[ActiveX] 컨트롤 {activex['count']}개, 바이너리 {activex['binaries']}개")
+        for control in activex["controls"]:
+            name = f" ({control['clsid_name']})" if control["clsid_name"] else ""
+            lines.append(f"  - {control['part']}: {control['classid']}{name}")
+
+    if result["embeddings"]:
+        lines.append(f"\n[임베디드 객체] {len(result['embeddings'])}개")
+    for embedding in result["embeddings"]:
+        kind = TYPE_DESCRIPTIONS.get(embedding["type"], embedding["type"])
+        lines.append(f"  - {embedding['part']} ({embedding['size']:,}바이트, {kind})")
+        if embedding["clsid"]:
+            name = f" ({embedding['clsid_name']})" if embedding["clsid_name"] else ""
+            lines.append(f"    CLSID: {embedding['clsid']}{name}")
+        for package in embedding["packages"]:
+            flag = " 🚨 실행 가능한 파일" if package["executable"] else ""
+            lines.append(f"    Package: {package['filename']} (원본 경로 {package['src_path']}){flag}")
+        if embedding["error"]:
+            lines.append(f"    [오류] {embedding['error']}")
+
+    hidden = result["hidden_parts"]
+    lines.append(f"\n[나머지 파트 형식 확인] {hidden['sniffed']}개 중 의심 {len(hidden['flagged'])}개")
+    for part in hidden["flagged"]:
+        lines.append(f"  {archive_scan.SEVERITY_LABELS[part['severity']]} {part['part']}: {part['reason']}")
+
+    bomb = result.get("bomb")
+    if bomb and bomb["inflate"]:
+        inflate = bomb["inflate"]
+        lines.append(f"\n[압축 폭탄 검사] 실제 해제 {inflate['inflated']:,}바이트 (파일의 {bomb['ratio']}배), "
+                     f"파트 {inflate['measured']}개 측정, CPU {inflate['cpu_seconds']}초")
+        if bomb["is_bomb"]:
+            lines.append(f"  💣 압축 폭탄 의심: {', '.join(bomb['reasons'])}")
+        else:
+            lines.append("  -> 이상 없음")
+
+    for error in result["errors"][:10]:
+        lines.append(f"  [오류] {error['part']}: {error['error']}")
+
+    entropy = result.get("entropy")
+    if entropy:
+        lines.append(f"\n  - 파일 엔트로피: {entropy['entropy']:.4f} "
+                     f"({entropy['window']}바이트 창 {entropy['windows']}개 중 {entropy['high_entropy_windows']}개가 고엔트로피)")
+
+    if result["error"]:
+        lines.append(f"[오류] {result['error']}")
+
+    return "\n".join(lines)
+
+
+def analyze_ooxml(filepath):
+    if not os.path.exists(filepath):
+        print(f"[오류] 파일을 찾을 수 없습니다: {filepath}")
+        return
+
+    print(format_ooxml_report(inspect_ooxml(filepath)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OOXML(docx/xlsx/pptx) 문서 보안 분석 도구")
+    parser.add_argument("filepath", help="분석할 문서 경로")
+    args = parser.parse_args()
+    analyze_ooxml(args.filepath)
@@ -2,70 +2,455 @@ import sys
 import os
 import argparse
 import re
+from contextlib import nullcontext
 
-if sys.platform == 'win32':
+try:
+    from app.backend.analyze import entropy as entropy_engine
+    from app.backend.analyze.keyword_scan import KeywordScanner
+    from app.backend.analyze import pdf_objects
+    from app.backend.analyze import pdf_structure
+    from app.backend.analyze import js_static
+except ImportError:  # analyze 디렉토리에서 CLI로 직접 실행한 경우
+    import entropy as entropy_engine
+    from keyword_scan import KeywordScanner
+    import pdf_objects
+    import pdf_structure
+    import js_static
+
+if sys.platform == 'win32' and __name__ == "__main__":
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
-def analyze_pdf(filepath):
-    if not os.path.exists(filepath):
-        print(f"[오류] 파일을 찾을 수 없습니다: {filepath}")
-        return
+SUSPICIOUS_KEYWORDS = {
+    b'/JS': 'JavaScript 코드 실행 가능성',
+    b'/JavaScript': 'JavaScript 코드 내장',
+    b'/AA': 'Automatic Action (페이지 열람 시 자동 실행)',
+    b'/OpenAction': '문서 열람 시 자동 실행',
+    b'/Launch': '외부 프로그램 실행 시도',
+    b'/URI': '외부 웹사이트 연결 시도',
+    b'/SubmitForm': '폼 데이터 전송 (피싱 가능성)',
+    b'/RichMedia': '플래시 등 외부 미디어 포함',
+    b'/ObjStm': 'Object Stream (내용을 숨기기 위해 사용될 수 있음)'
+}
+
+# 발견 시 가중치 2배를 주는 고위험 키워드
+HIGH_RISK_KEYWORDS = [b'/JS', b'/JavaScript', b'/OpenAction', b'/Launch']
+
+# 키워드 전체를 한 번에 찾는 스캐너 (파일을 한 번만 훑음)
+KEYWORD_SCANNER = KeywordScanner(SUSPICIOUS_KEYWORDS)
+# 결과에 담는 키워드별 최대 오프셋/객체 번호 수 (개수는 항상 전부 셈)
+MAX_KEYWORD_OFFSETS = 100
+# 결과에 담는 키워드가 발견된 객체의 최대 수
+MAX_OBJECT_HITS = 200
+# 파일 하나에서 꺼내 분석할 최대 스크립트 수
+MAX_SCRIPTS = 32
+# 보고서/결과에 담는 스크립트 앞부분 길이
+SCRIPT_PREVIEW_CHARS = 200
+
+# 구조 이상 징후별 위험 점수 (객체 재정의는 정상 편집에서도 흔하므로 표시만)
+STRUCTURE_WEIGHTS = {
+    "update_adds_keywords": 3,
+    "data_after_eof": 2,
+    "unlinked_sections": 2,
+    "broken_xref": 1,
+    "xref_mismatch": 1,
+    "orphan_objects": 1,
+    "redefined_objects": 0,
+}
+
+# /JS 값의 시작: 리터럴 문자열 '(', 16진수 문자열 '<', 간접 참조 'N G R'
+JS_VALUE_RE = re.compile(rb"/JS[ \t\r\n\f\x00]*(?=[(<0-9])")
+
+
+class ScriptCollector:
+    """
+    객체 탐색 중 /JS 값을 모읍니다. 문자열 값은 바로 꺼내고, 간접 참조는 탐색이 끝난 뒤 대상 객체에서 꺼냅니다.
+    (참조 대상이 뒤에 나올 수 있으므로 스트림/문자열 객체의 위치만 기록해 둠)
+    """
+
+    def __init__(self):
+        self.scripts = []
+        self.pending = []        # (참조하는 객체, 대상 객체 번호)
+        self.locations = {}      # 파일에 직접 있는 스트림/문자열 객체 번호 -> 파일 오프셋
+        self.inner_strings = {}  # 객체 스트림 안의 문자열 객체 번호 -> 본문
+
+    def _add(self, obj, value, encoding, source_object=None):
+        if len(self.scripts) < MAX_SCRIPTS:
+            self.scripts.append({"object": obj.number, "container": obj.container, "source_object": source_object,
+                                 "encoding": encoding, "text": pdf_objects.text_from_string(value)})
+
+    def visit(self, obj):
+        body = obj.dictionary.lstrip()
+        is_string = body[:1] == b"(" or (body[:1] == b"<" and body[:2] != b"<<")
+        if obj.container is None and (obj.has_stream or is_string):
+            self.locations[obj.number] = obj.offset
+        elif obj.container is not None and is_string:
+            self.inner_strings[obj.number] = body
+
+        if b"/JS" not in obj.normalized:
+            return
+        data = obj.normalized
+        for match in JS_VALUE_RE.finditer(data):
+            start = match.end()
+            if data[start:start + 1] == b"(":
+                value, _ = pdf_objects.read_literal_string(data, start, js_static.MAX_SCRIPT_BYTES)
+                self._add(obj, value, "literal")
+            elif data[start:start + 1] == b"<":
+                value, _ = pdf_objects.read_hex_string(data, start, js_static.MAX_SCRIPT_BYTES)
+                self._add(obj, value, "hex")
+            else:
+                reference = pdf_objects.REFERENCE_RE.match(data, start)
+                if reference:
+                    self.pending.append((obj, int(reference.group(1))))
+
+    def _string_value(self, body):
+        body = body.lstrip()
+        if body[:1] == b"(":
+            return pdf_objects.read_literal_string(body, 0, js_static.MAX_SCRIPT_BYTES)[0]
+        return pdf_objects.read_hex_string(body, 0, js_static.MAX_SCRIPT_BYTES)[0]
 
-    print("=" * 60)
-    print(f"PDF 악성 의심 키워드 스캔: {os.path.basename(filepath)}")
-    print("=" * 60)
-
-    suspicious_keywords = {
-        b'/JS': 'JavaScript 코드 실행 가능성',
-        b'/JavaScript': 'JavaScript 코드 내장',
-        b'/AA': 'Automatic Action (페이지 열람 시 자동 실행)',
-        b'/OpenAction': '문서 열람 시 자동 실행',
-        b'/Launch': '외부 프로그램 실행 시도',
-        b'/URI': '외부 웹사이트 연결 시도',
-        b'/SubmitForm': '폼 데이터 전송 (피싱 가능성)',
-        b'/RichMedia': '플래시 등 외부 미디어 포함',
-        b'/ObjStm': 'Object Stream (내용을 숨기기 위해 사용될 수 있음)'
+    def resolve(self, buf, budget):
+        """간접 참조된 스크립트를 대상 객체(스트림은 예산 안에서 해제)에서 꺼냅니다."""
+        for obj, number in self.pending:
+            if len(self.scripts) >= MAX_SCRIPTS:
+                break
+            if number in self.inner_strings:
+                self._add(obj, self._string_value(self.inner_strings[number]), "string_object", number)
+                continue
+            if number not in self.locations:
+                continue
+            target = pdf_objects.read_object(buf, self.locations[number])
+            if target is None:
+                continue
+            if target.has_stream:
+                data = pdf_objects.decode_stream(buf, target, budget)
+                if data is not None:
+                    self._add(obj, data[:js_static.MAX_SCRIPT_BYTES], "stream", number)
+            else:
+                self._add(obj, self._string_value(target.dictionary), "string_object", number)
+        return self.scripts
+
+
+def analyze_scripts(scripts):
+    """꺼낸 스크립트를 js_static으로 분석합니다. (같은 내용은 스크립트 해시 캐시 사용)"""
+    analyzed = []
+    for script in scripts:
+        text = script.pop("text")
+        analysis = js_static.analyze_script(text)
+        script.update({
+            "sha256": analysis["sha256"],
+            "size": analysis["size"],
+            "score": analysis["score"],
+            "findings": analysis["findings"],
+            "cached": analysis["cached"],
+            "preview": text[:SCRIPT_PREVIEW_CHARS],
+        })
+        analyzed.append(script)
+    return analyzed
+
+
+def scan_objects(buf, budget, revision_of=None):
+    """
+    객체 단위 키워드 검사 (이름 #xx 이스케이프를 풀고, 압축된 객체 스트림은 예산 안에서 풀어 검사)
+    /JS 스크립트 본문도 함께 꺼내 분석합니다. (압축된 스트림/객체 스트림 안의 것 포함)
+    budget: pdf_objects.DecodeBudget, revision_of: 파일 오프셋 -> 리비전 번호 (구조 분석을 한 경우)
+    반환: {"hidden": {keyword: 원본 바이트 검색으로는 보이지 않던 개수},
+           "hidden_by_revision": {리비전: {keyword: 개수}}, "objects_by_keyword": {keyword: [객체 번호]},
+           "object_hits": [...], "scripts": [...], "file_objects": [(번호, 세대, 오프셋)], "stats": {...}}
+    """
+    collector = ScriptCollector()
+    hidden = dict.fromkeys(SUSPICIOUS_KEYWORDS, 0)
+    hidden_by_revision = {}
+    objects_by_keyword = {keyword: [] for keyword in SUSPICIOUS_KEYWORDS}
+    object_hits = []
+    file_objects = []
+    stats = {"objects": 0, "object_streams": 0, "escaped_names": 0}
+    compressed = set()
+
+    for obj in pdf_objects.walk_objects(buf, budget):
+        stats["objects"] += 1
+        if obj.container is None:
+            file_objects.append((obj.number, obj.generation, obj.offset))
+        if obj.has_stream and obj.is_object_stream:
+            stats["object_streams"] += 1
+            if obj.filters():
+                compressed.add(obj.number)
+        if obj.normalized != obj.dictionary:
+            stats["escaped_names"] += 1
+        collector.visit(obj)
+
+        if not KEYWORD_SCANNER.pattern.search(obj.normalized):
+            continue
+        found = {keyword: hit["count"] for keyword, hit in KEYWORD_SCANNER.scan(obj.normalized, 0).items()
+                 if hit["count"]}
+        # 원본 바이트에 그대로 있는 일치는 파일 전체 검색에서 이미 셈
+        if obj.container in compressed:
+            literal = {}
+        else:
+            literal = {keyword: hit["count"] for keyword, hit in KEYWORD_SCANNER.scan(obj.dictionary, 0).items()}
+        revision = revision_of(obj.offset) if revision_of else None
+        hidden_here = 0
+        for keyword, count in found.items():
+            extra = max(0, count - literal.get(keyword, 0))
+            hidden[keyword] += extra
+            hidden_here += extra
+            if extra and revision is not None:
+                by_keyword = hidden_by_revision.setdefault(revision, {})
+                by_keyword[keyword] = by_keyword.get(keyword, 0) + extra
+            if len(objects_by_keyword[keyword]) < MAX_KEYWORD_OFFSETS:
+                objects_by_keyword[keyword].append(obj.number)
+        if len(object_hits) < MAX_OBJECT_HITS:
+            object_hits.append({
+                "object": obj.number,
+                "generation": obj.generation,
+                "container": obj.container,
+                "revision": revision,
+                "keywords": {keyword.decode(): count for keyword, count in found.items()},
+                "hidden": hidden_here,
+            })
+
+    scripts = analyze_scripts(collector.resolve(buf, budget))
+
+    stats.update({
+        "decoded_bytes": budget.used,
+        "decode_budget": budget.limit,
+        "budget_exhausted": budget.exhausted,
+        "decode_errors": budget.errors,
+    })
+    return {"hidden": hidden, "hidden_by_revision": hidden_by_revision, "objects_by_keyword": objects_by_keyword,
+            "object_hits": object_hits, "scripts": scripts, "file_objects": file_objects, "stats": stats}
+
+
+def analyze_structure(buf, budget):
+    """
+    xref/trailer를 파일 끝에서부터 거꾸로 읽어 리비전 구조를 만듭니다. (키워드 귀속과 이상 징후는 객체 탐색 뒤에 채움)
+    반환: (결과 dict, 리비전 목록)
+    """
+    revisions, errors = pdf_structure.read_revisions(buf, budget)
+    linearized = pdf_structure.is_linearized(buf)
+    structure = {
+        "startxref": pdf_structure.find_startxref(buf),
+        "linearized": linearized,
+        "revisions": pdf_structure.summarize_revisions(revisions, linearized),
+        "updates": 0,
+        "anomalies": [],
+        "errors": errors,
     }
+    structure["updates"] = sum(1 for revision in structure["revisions"] if revision["incremental_update"])
+    return structure, revisions
 
-    try:
-        with open(filepath, 'rb') as f:
-            content = f.read()
-
-        print("\n[스캔 결과]")
-        print(f"  {'키워드':<15} | {'발견 횟수':<10} | {'설명'}")
-        print("-" * 70)
-
-        risk_score = 0
-        found_keywords = []
-        
-        for keyword, desc in suspicious_keywords.items():
-            count = content.count(keyword)
-            if count > 0:
-                print(f"  {keyword.decode():<15} | {count:<10} | {desc}")
-                found_keywords.append((keyword.decode(), count, desc))
-                if keyword in [b'/JS', b'/JavaScript', b'/OpenAction', b'/Launch']:
-                    risk_score += (count * 2)
-                else:
-                    risk_score += count
-
-        if not found_keywords:
-            print("  -> 의심스러운 키워드가 발견되지 않았습니다.")
-
-        print("\n[종합 판정]")
-        if risk_score == 0:
-            print("  [클린] 의심스러운 키워드가 발견되지 않았습니다.")
-        elif risk_score < 3:
-            print("  [주의] 일부 스크립트나 액션이 포함되어 있습니다. (정상 문서일 수도 있음)")
+
+def attribute_keywords(buf, structure, hits, hidden_by_revision):
+    """
+    키워드를 리비전별로 셉니다. (원본 바이트 일치 + 객체 스트림/이스케이프로 숨은 일치)
+    리비전이 하나면 파일 전체 검색 결과를 그대로 쓰고, 여럿이면 리비전 범위마다 다시 훑습니다.
+    """
+    summaries = structure["revisions"]
+    for index, summary in enumerate(summaries):
+        if len(summaries) == 1:
+            raw = {keyword: hit["count"] for keyword, hit in hits.items()}
         else:
-            print("  [위험] 다수의 자동 실행 및 스크립트 요소가 발견되었습니다. 악성 가능성이 있습니다.")
+            end = summaries[index + 1]["start"] if index + 1 < len(summaries) else None
+            raw = {keyword: hit["count"] for keyword, hit in
+                   KEYWORD_SCANNER.scan(buf, 0, summary["start"], end).items()}
+        hidden = hidden_by_revision.get(index, {})
+        summary["keywords"] = {keyword.decode(): raw[keyword] + hidden.get(keyword, 0)
+                               for keyword in SUSPICIOUS_KEYWORDS if raw[keyword] + hidden.get(keyword, 0)}
+
+    # 증분 업데이트에서 새로 나타난 고위험 키워드 (정상 문서 뒤에 악성 액션을 덧붙이는 수법)
+    high_risk = {keyword.decode() for keyword in HIGH_RISK_KEYWORDS}
+    added = [summary for summary in summaries if summary["incremental_update"]
+             and high_risk & set(summary["keywords"])]
+    if added:
+        structure["anomalies"].insert(0, {
+            "type": "update_adds_keywords",
+            "description": "증분 업데이트에 고위험 키워드가 추가됨",
+            "count": len(added),
+            "revisions": [summary["index"] for summary in added],
+            "keywords": sorted({keyword for summary in added for keyword in summary["keywords"]
+                                if keyword in high_risk}),
+        })
 
+
+def inspect_pdf(filepath, decode_budget=pdf_objects.DEFAULT_DECODE_BUDGET, structure=True, data=None):
+    """
+    PDF 파일의 의심 키워드를 세어 구조화된 결과(dict)를 반환합니다.
+    파일 전체의 원본 바이트 검색에, 객체 스트림 내부/이름 이스케이프로 숨은 키워드(hidden)를 더해 셉니다.
+    decode_budget: 파일 하나에서 스트림을 풀어 만들 수 있는 최대 바이트 수
+    structure: xref/trailer로 리비전(증분 업데이트)을 나누고 키워드를 리비전별로 귀속, 구조 이상 징후 검사
+    data: 파일 대신 메모리의 내용 (압축 파일 내부 엔트리 등, filepath는 이름으로만 사용)
+    """
+    result = {
+        "file_name": os.path.basename(filepath),
+        "keywords": [],
+        "risk_score": 0,
+        "verdict": None,
+        "entropy": None,
+        "object_hits": [],
+        "scripts": [],
+        "pdf_objects": None,
+        "structure": None,
+        "error": None,
+    }
+
+    if data is None and not os.path.exists(filepath):
+        result["error"] = f"파일을 찾을 수 없습니다: {filepath}"
+        return result
+
+    try:
+        with nullcontext(data) if data is not None else entropy_engine.open_mapped(filepath) as buf:
+            result["entropy"] = entropy_engine.profile_buffer(buf)
+            hits = KEYWORD_SCANNER.scan(buf, max_offsets=MAX_KEYWORD_OFFSETS)
+            budget = pdf_objects.DecodeBudget(decode_budget)
+            revision_of = None
+            if structure:
+                result["structure"], revisions = analyze_structure(buf, budget)
+                revision_of = pdf_structure.revision_finder(revisions) if revisions else None
+            objects = scan_objects(buf, budget, revision_of)
+            if structure:
+                attribute_keywords(buf, result["structure"], hits, objects["hidden_by_revision"])
+                result["structure"]["anomalies"] += pdf_structure.find_anomalies(
+                    buf, revisions, result["structure"]["errors"], objects["file_objects"])
     except Exception as e:
-        print(f"[오류] 파일 읽기 실패: {e}")
+        result["error"] = f"파일 읽기 실패: {e}"
+        return result
+
+    result["object_hits"] = objects["object_hits"]
+    result["scripts"] = objects["scripts"]
+    result["pdf_objects"] = objects["stats"]
+
+    risk_score = 0
+    for keyword, desc in SUSPICIOUS_KEYWORDS.items():
+        hidden = objects["hidden"][keyword]
+        count = hits[keyword]["count"] + hidden
+        if count > 0:
+            found_in = [revision["index"] for revision in (result["structure"] or {}).get("revisions", [])
+                         if keyword.decode() in revision["keywords"]]
+            result["keywords"].append({"keyword": keyword.decode(), "count": count, "description": desc,
+                                       "offsets": hits[keyword]["offsets"], "hidden": hidden,
+                                       "objects": objects["objects_by_keyword"][keyword],
+                                       "revisions": found_in})
+            if keyword in HIGH_RISK_KEYWORDS:
+                risk_score += (count * 2)
+            else:
+                risk_score += count
+
+    # 스크립트 정적 분석 점수 (eval/셸코드 문자열/힙 스프레이/취약 API)
+    risk_score += sum(script["score"] for script in result["scripts"])
+
+    # 구조 이상 징후 (증분 업데이트로 덧붙인 액션, %%EOF 뒤 데이터, 숨은 객체 등)
+    for anomaly in (result["structure"] or {}).get("anomalies", []):
+        anomaly["weight"] = STRUCTURE_WEIGHTS.get(anomaly["type"], 0)
+        risk_score += anomaly["weight"]
+
+    result["risk_score"] = risk_score
+    if risk_score == 0:
+        result["verdict"] = "clean"
+    elif risk_score < 3:
+        result["verdict"] = "caution"
+    else:
+        result["verdict"] = "danger"
+
+    return result
+
+
+def format_pdf_report(result):
+    """inspect_pdf 결과를 기존 CLI와 동일한 텍스트 보고서로 변환합니다."""
+    lines = []
+    lines.append("=" * 60)
+    lines.append(f"PDF 악성 의심 키워드 스캔: {result['file_name']}")
+    lines.append("=" * 60)
+
+    if result["error"]:
+        lines.append(f"[오류] {result['error']}")
+        return "\n".join(lines)
+
+    lines.append("\n[스캔 결과]")
+    lines.append(f"  {'키워드':<15} | {'발견 횟수':<10} | {'첫 위치':<12} | {'설명'}")
+    lines.append("-" * 85)
+
+    for item in result["keywords"]:
+        first = f"0x{item['offsets'][0]:X}" if item.get("offsets") else "-"
+        hidden = f" (숨김 {item['hidden']}개)" if item.get("hidden") else ""
+        lines.append(f"  {item['keyword']:<15} | {item['count']:<10} | {first:<12} | {item['description']}{hidden}")
+
+    if not result["keywords"]:
+        lines.append("  -> 의심스러운 키워드가 발견되지 않았습니다.")
+
+    objects = result.get("pdf_objects")
+    if objects:
+        lines.append(f"\n  - 객체 {objects['objects']}개 검사 (객체 스트림 {objects['object_streams']}개, "
+                     f"이름 이스케이프 사용 객체 {objects['escaped_names']}개, 스트림 해제 {objects['decoded_bytes']:,}바이트)")
+        if objects["budget_exhausted"]:
+            lines.append("  [!] 스트림 해제 예산을 초과하여 일부 스트림은 검사하지 못했습니다. (압축 폭탄 의심)")
+    for hit in result.get("object_hits", [])[:20]:
+        where = f"객체 스트림 {hit['container']} 내부" if hit["container"] is not None else "파일"
+        hidden = f", 숨김 {hit['hidden']}개" if hit["hidden"] else ""
+        lines.append(f"    obj {hit['object']} ({where}{hidden}): {', '.join(hit['keywords'])}")
+
+    structure = result.get("structure")
+    if structure:
+        linearized = ", 선형화" if structure["linearized"] else ""
+        lines.append(f"\n[리비전 구조] 리비전 {len(structure['revisions'])}개 "
+                     f"(증분 업데이트 {structure['updates']}개{linearized})")
+        for revision in structure["revisions"]:
+            kind = "업데이트" if revision["incremental_update"] else "원본"
+            keywords = ", ".join(f"{keyword} {count}" for keyword, count in revision["keywords"].items()) or "-"
+            redefined = f", 재정의 {len(revision['redefined'])}개" if revision["redefined"] else ""
+            lines.append(f"  - #{revision['index']} {kind}: 0x{revision['start']:X}~0x{revision['end']:X} "
+                         f"(xref {revision['xref_type']} @0x{revision['xref_offset']:X}, 객체 {revision['objects']}개"
+                         f"{redefined}) 키워드: {keywords}")
+        for anomaly in structure["anomalies"]:
+            detail = ""
+            if anomaly.get("objects"):
+                detail = " obj " + ", ".join(str(number) for number in anomaly["objects"][:10])
+            elif anomaly.get("revisions"):
+                detail = " 리비전 " + ", ".join(f"#{index}" for index in anomaly["revisions"])
+            elif anomaly["type"] == "data_after_eof":
+                detail = f" 0x{anomaly['offset']:X}부터 {anomaly['size']:,}바이트"
+            lines.append(f"  [!] {anomaly['description']} ({anomaly['count']}){detail}")
+
+    scripts = result.get("scripts") or []
+    if scripts:
+        lines.append(f"\n[내장 JavaScript] {len(scripts)}개")
+        for script in scripts:
+            source = f"obj {script['source_object']} 스트림" if script["encoding"] == "stream" else script["encoding"]
+            lines.append(f"  - obj {script['object']} ({source}, {script['size']:,}바이트, "
+                         f"sha256 {script['sha256'][:16]}..., 점수 {script['score']})")
+            for finding in script["findings"]:
+                count = f" x{finding['count']}" if finding["count"] > 1 else ""
+                lines.append(f"      * {finding['description']}{count}")
+            preview = " ".join(script["preview"].split())[:120]
+            if preview:
+                lines.append(f"      > {preview}")
+
+    entropy = result.get("entropy")
+    if entropy:
+        lines.append(f"\n  - 파일 엔트로피: {entropy['entropy']:.4f} "
+                     f"({entropy['window']}바이트 창 {entropy['windows']}개 중 {entropy['high_entropy_windows']}개가 고엔트로피)")
+
+    lines.append("\n[종합 판정]")
+    if result["verdict"] == "clean":
+        lines.append("  [클린] 의심스러운 키워드가 발견되지 않았습니다.")
+    elif result["verdict"] == "caution":
+        lines.append("  [주의] 일부 스크립트나 액션이 포함되어 있습니다. (정상 문서일 수도 있음)")
+    else:
+        lines.append("  [위험] 다수의 자동 실행 및 스크립트 요소가 발견되었습니다. 악성 가능성이 있습니다.")
+
+    return "\n".join(lines)
+
+
+def analyze_pdf(filepath, structure=True):
+    if not os.path.exists(filepath):
+        print(f"[오류] 파일을 찾을 수 없습니다: {filepath}")
+        return
+
+    print(format_pdf_report(inspect_pdf(filepath, structure=structure)))
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="PDF 악성 키워드 스캐너")
     parser.add_argument("filepath", help="분석할 PDF 파일 경로")
+    parser.add_argument("--no-structure", action="store_true", help="xref/리비전 구조 분석을 하지 않음")
     args = parser.parse_args()
-    analyze_pdf(args.filepath)
\ No newline at end of file
+    analyze_pdf(args.filepath, structure=not args.no_structure)
@@ -1,84 +1,345 @@
 import sys
 import os
+import json
+import hashlib
 import argparse
+import functools
+from contextlib import nullcontext
 
 try:
     import pefile
 except ImportError:
-    print("[오류] 'pefile' 라이브러리가 필요합니다. 설치: pip install pefile")
-    sys.exit(1)
+    pefile = None
 
-def analyze_pe(filepath):
-    if not os.path.exists(filepath):
-        print(f"[오류] 파일을 찾을 수 없습니다: {filepath}")
-        return
+try:
+    from app.backend.analyze import entropy as entropy_engine
+    from app.backend.analyze import pe_carve
+except ImportError:  # analyze 디렉토리에서 CLI로 직접 실행한 경우
+    import entropy as entropy_engine
+    import pe_carve
+
+# 의심 API 지표 파일 (분류별 가중치와 API 목록)
+DEFAULT_IMPORT_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules", "pe_imports.json")
+# imphash 계산 시 DLL 이름에서 떼는 확장자 (pefile.get_imphash와 동일)
+_IMPHASH_EXTS = ("ocx", "sys", "dll")
+
+# 기본으로 파싱할 데이터 디렉토리 (현재 검사는 임포트 테이블만 사용)
+# 리소스/재배치/디버그 등은 큰 파일에서 전체 로드 시간의 대부분을 차지하므로 필요한 것만 파싱합니다.
+DEFAULT_DATA_DIRECTORIES = ("IMPORT",)
+
+
+def resolve_data_directories(directories):
+    """
+    'IMPORT', 'resource', 'IMAGE_DIRECTORY_ENTRY_TLS' 같은 이름 목록(또는 콤마 문자열)을
+    pefile 데이터 디렉토리 인덱스 목록으로 바꿉니다. 'ALL'이면 None(전체 로드)을 반환합니다.
+    """
+    if directories is None:
+        directories = DEFAULT_DATA_DIRECTORIES
+    if isinstance(directories, str):
+        directories = directories.split(",")
+
+    names = [name.strip().upper() for name in directories if name.strip()]
+    if "ALL" in names:
+        return None
+
+    indexes = []
+    for name in names:
+        if not name.startswith("IMAGE_DIRECTORY_ENTRY_"):
+            name = "IMAGE_DIRECTORY_ENTRY_" + name
+        if name not in pefile.DIRECTORY_ENTRY:
+            raise ValueError(f"알 수 없는 데이터 디렉토리입니다: {name}")
+        index = pefile.DIRECTORY_ENTRY[name]
+        if index not in indexes:
+            indexes.append(index)
+    return indexes
+
+
+def load_pe(filepath, directories=None, data=None):
+    """
+    fast_load로 헤더/섹션만 읽은 뒤 지정한 데이터 디렉토리만 파싱합니다.
+    data가 주어지면 파일 대신 메모리의 내용을 파싱합니다.
+    반환: (pe, 파싱한 디렉토리 이름 목록)
+    """
+    indexes = resolve_data_directories(directories)
+    pe = pefile.PE(data=data, fast_load=True) if data is not None else pefile.PE(filepath, fast_load=True)
+    if indexes is None:
+        pe.full_load()
+        return pe, ["ALL"]
+
+    if indexes:
+        pe.parse_data_directories(directories=indexes)
+    return pe, [pefile.DIRECTORY_ENTRY[index].replace("IMAGE_DIRECTORY_ENTRY_", "") for index in indexes]
+
+
+def _api_base(name):
+    """API 이름에서 A/W(문자셋) 접미사와 Ex 접미사를 뗀 기본형 (CreateProcessExW -> CreateProcess)"""
+    if len(name) > 2 and name[-1] in "AW" and name[-2].islower():
+        name = name[:-1]
+    if len(name) > 3 and name.endswith("Ex"):
+        name = name[:-2]
+    return name
+
+
+@functools.lru_cache(maxsize=8)
+def _compile_import_rules(path, mtime):
+    """
+    규칙 파일을 {임포트 이름(bytes): ((분류, 가중치, 규칙 이름), ...)} 해시 테이블로 컴파일합니다.
+    규칙마다 A/W/Ex 변형 이름을 미리 펼쳐 두어, 매칭은 pefile이 준 이름(bytes)을 그대로 찾기만 합니다.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    table = {}
+    for category, spec in data.get("categories", {}).items():
+        default_weight = spec.get("weight", 1)
+        for api in spec.get("apis", []):
+            if isinstance(api, dict):
+                name, weight = api["name"], api.get("weight", default_weight)
+            else:
+                name, weight = api, default_weight
+            base = _api_base(name)
+            for suffix in ("", "A", "W", "Ex", "ExA", "ExW"):
+                matches = table.setdefault((base + suffix).encode(), [])
+                if (category, weight, name) not in matches:
+                    matches.append((category, weight, name))
+    return {key: tuple(matches) for key, matches in table.items()}
+
+
+def load_import_rules(path=None):
+    """
+    규칙 파일을 읽어 컴파일한 테이블을 반환합니다.
+    프로세스(워커)마다 한 번만 컴파일하고, 파일이 수정되면(mtime 변경) 다시 읽습니다.
+    """
+    path = path or DEFAULT_IMPORT_RULES
+    return _compile_import_rules(path, os.path.getmtime(path))
+
+
+def match_imports(import_entries, rules):
+    """
+    임포트 디렉토리를 한 번 훑으며 규칙 일치 항목과 imphash를 함께 계산합니다.
+    이름 없이 서수(ordinal)로만 가져온 함수는 pefile의 서수 표로 이름을 찾아 비교합니다.
+    DLL마다 이름(bytes) 목록을 만든 뒤 집합 교집합/bytes.join으로 처리해 임포트가 수천 개여도 1ms 안쪽입니다.
+    반환: (일치 목록, imphash, 임포트 함수 개수)
+    """
+    matches = []
+    impstrs = []
+    count = 0
+    for entry in import_entries:
+        dll_lower = entry.dll.lower()
+        libname = dll_lower
+        parts = libname.rsplit(b".", 1)
+        if len(parts) > 1 and parts[1].decode('utf-8', 'ignore') in _IMPHASH_EXTS:
+            libname = parts[0]
+
+        names = [imp.name for imp in entry.imports]
+        if not all(names):
+            names = [imp.name or pefile.ordlookup.ordLookup(dll_lower, imp.ordinal, make_name=True)
+                     for imp in entry.imports]
+            names = [name for name in names if name]
+        if not names:
+            continue
+        count += len(names)
+        # imphash 문자열: "dll.func,dll.func,..." (소문자)
+        impstrs.append(libname + b"." + (b"," + libname + b".").join(names).lower())
+
+        hits = rules.keys() & names
+        if hits:
+            dll_name = entry.dll.decode('utf-8', 'ignore')
+            for name in sorted(hits):
+                for category, weight, rule in rules[name]:
+                    matches.append({"function": name.decode('utf-8', 'ignore'), "dll": dll_name,
+                                    "category": category, "weight": weight, "rule": rule})
+
+    imphash = hashlib.md5(b",".join(impstrs)).hexdigest() if impstrs else ""
+    return matches, imphash, count
 
-    print("=" * 60)
-    print(f"PE (EXE/DLL) 정적 분석 시작: {os.path.basename(filepath)}")
-    print("=" * 60)
 
+def inspect_pe(filepath, directories=None, rules_path=None, data=None):
+    """
+    PE 파일을 분석하여 구조화된 결과(dict)를 반환합니다.
+    출력 없이 결과만 만들어 서버 프로세스 안에서 바로 호출할 수 있습니다.
+    directories: 파싱할 데이터 디렉토리 이름 목록 (기본: DEFAULT_DATA_DIRECTORIES, 'ALL'이면 전체 로드)
+    rules_path: 의심 API 규칙 파일 (기본: DEFAULT_IMPORT_RULES)
+    data: 파일 대신 메모리의 내용 (압축 파일 내부 엔트리 등, filepath는 이름으로만 사용)
+    임포트 디렉토리를 파싱하지 않으면 has_import_table은 None(검사 안 함)입니다.
+    """
+    result = {
+        "file_name": os.path.basename(filepath),
+        "header": None,
+        "sections": [],
+        "has_import_table": False,
+        "suspicious_imports": [],
+        "import_count": 0,
+        "import_score": 0,
+        "imphash": None,
+        "overlay": None,
+        "entropy": None,
+        "carved": [],
+        "parsed_directories": [],
+        "error": None,
+    }
+
+    if pefile is None:
+        result["error"] = "'pefile' 라이브러리가 필요합니다. 설치: pip install pefile"
+        return result
+
+    if data is None and not os.path.exists(filepath):
+        result["error"] = f"파일을 찾을 수 없습니다: {filepath}"
+        return result
+
+    pe = None
     try:
-        pe = pefile.PE(filepath)
+        pe, result["parsed_directories"] = load_pe(filepath, directories, data)
 
         # 1. 기본 헤더 정보
-        print("\n[1] 기본 정보 (Header Info)")
-        print(f"  - Entry Point: {hex(pe.OPTIONAL_HEADER.AddressOfEntryPoint)}")
-        print(f"  - Image Base:  {hex(pe.OPTIONAL_HEADER.ImageBase)}")
-        print(f"  - 섹션 개수:   {pe.FILE_HEADER.NumberOfSections}")
-        print(f"  - 컴파일 시간: {pe.FILE_HEADER.TimeDateStamp}")
+        result["header"] = {
+            "entry_point": pe.OPTIONAL_HEADER.AddressOfEntryPoint,
+            "image_base": pe.OPTIONAL_HEADER.ImageBase,
+            "number_of_sections": pe.FILE_HEADER.NumberOfSections,
+            "timestamp": pe.FILE_HEADER.TimeDateStamp,
+        }
 
         # 2. 섹션 정보 및 엔트로피 (패킹 탐지)
-        print("\n[2] 섹션 정보 & 패킹 탐지 (Entropy)")
-        print("  * 엔트로피가 7.0 이상이면 패킹(Packing) 또는 암호화 가능성이 높습니다.")
-        print(f"  {'이름':<10} | {'크기(Raw)':<10} | {'엔트로피':<10} | {'상태'}")
-        print("-" * 60)
-        
-        for section in pe.sections:
-            entropy = section.get_entropy()
-            name = section.Name.decode('utf-8', 'ignore').strip().replace('\x00', '')
-            raw_size = section.SizeOfRawData
-            
-            status = ""
-            if entropy > 7.0:
-                status = "🚨 의심 (패킹?)"
-            elif raw_size == 0 and entropy < 1:
-                status = "비어있음"
-            
-            print(f"  {name:<10} | {raw_size:<10} | {entropy:.4f}     | {status}")
+        # 파일을 mmap으로 열어 파일 전체/섹션/오버레이 엔트로피를 창(4KB) 단위 프로파일과 함께 계산합니다.
+        with nullcontext(data) if data is not None else entropy_engine.open_mapped(filepath) as buf:
+            profile = entropy_engine.EntropyProfile(buf)
+            result["entropy"] = profile.summary()
+
+            for section in pe.sections:
+                raw_size = section.SizeOfRawData
+                start = section.get_PointerToRawData_adj()
+                # 파일 끝을 넘는 SizeOfRawData는 파일 길이에서 자름
+                end = min(start + raw_size, len(buf))
+                section_profile = profile.range_profile(start, end)
+                entropy = section_profile["entropy"]
+                # 섹션 전체로는 평범해도 일부 구간만 높은 엔트로피인 경우 (정상 섹션에 숨긴 암호화 데이터)
+                hidden = section_profile["high_entropy_regions"]
+
+                status = ""
+                if entropy > 7.0:
+                    status = "🚨 의심 (패킹?)"
+                elif hidden:
+                    status = "🚨 의심 (고엔트로피 구간 포함)"
+                elif raw_size == 0 and entropy < 1:
+                    status = "비어있음"
+
+                result["sections"].append({
+                    "name": section.Name.decode('utf-8', 'ignore').strip().replace('\x00', ''),
+                    "raw_size": raw_size,
+                    "offset": start,
+                    "entropy": entropy,
+                    "high_entropy_regions": hidden if entropy <= 7.0 else [],
+                    "status": status,
+                })
+
+            overlay_start = pe.get_overlay_data_start_offset()
+            if overlay_start is not None:
+                result["overlay"] = profile.range_profile(overlay_start)
+
+            # 오버레이/리소스/파일 중간에 숨은 실행파일·압축파일 (위치만 기록, 재분석은 디스패처가 담당)
+            result["carved"] = pe_carve.carve_pe(pe, buf)
 
         # 3. 의심스러운 API 호출 (Import Table)
-        print("\n[3] 주요 의심 API 호출 (Import Table)")
-        suspicious_apis = [
-            'VirtualAlloc', 'WriteProcessMemory', 'CreateRemoteThread', # 메모리 조작/인젝션
-            'ShellExecute', 'WinExec', 'CreateProcess',                 # 프로세스 실행
-            'URLDownloadToFile', 'InternetOpen',                        # 네트워크 연결
-            'RegOpenKey', 'RegSetValue'                                 # 레지스트리 조작
-        ]
-        
-        found_apis = False
-        if hasattr(pe, 'DIRECTORY_ENTRY_IMPORT'):
-            for entry in pe.DIRECTORY_ENTRY_IMPORT:
-                dll_name = entry.dll.decode('utf-8', 'ignore')
-                for imp in entry.imports:
-                    if imp.name:
-                        func_name = imp.name.decode('utf-8', 'ignore')
-                        # 의심 리스트에 포함되거나, 비슷하면 출력
-                        if any(api in func_name for api in suspicious_apis):
-                            print(f"  🚨 탐지됨: {func_name:<25} (라이브러리: {dll_name})")
-                            found_apis = True
-        else:
-            print("  -> 임포트 테이블이 없습니다. (패킹되어 있을 확률이 매우 높음)")
-
-        if not found_apis:
-            print("  -> 특이한 악성 API가 명시적으로 발견되지 않았습니다.")
+        import_parsed = result["parsed_directories"] == ["ALL"] or "IMPORT" in result["parsed_directories"]
+        if not import_parsed:
+            result["has_import_table"] = None
+        elif hasattr(pe, 'DIRECTORY_ENTRY_IMPORT'):
+            result["has_import_table"] = True
+            matches, imphash, count = match_imports(pe.DIRECTORY_ENTRY_IMPORT, load_import_rules(rules_path))
+            result["suspicious_imports"] = matches
+            result["imphash"] = imphash
+            result["import_count"] = count
+            result["import_score"] = sum(match["weight"] for match in matches)
 
     except pefile.PEFormatError:
-        print("[오류] 유효한 PE 파일이 아닙니다.")
+        result["error"] = "유효한 PE 파일이 아닙니다."
     except Exception as e:
-        print(f"[오류] 분석 중 예외 발생: {e}")
+        result["error"] = f"분석 중 예외 발생: {e}"
+    finally:
+        # 분석 중 예외가 나도 pefile의 mmap/파일 핸들을 닫음 (워커/재귀 검사는 프로세스가 오래 살아 있음)
+        if pe is not None:
+            pe.close()
+
+    return result
+
+
+def format_pe_report(result):
+    """inspect_pe 결과를 기존 CLI와 동일한 텍스트 보고서로 변환합니다."""
+    lines = []
+    lines.append("=" * 60)
+    lines.append(f"PE (EXE/DLL) 정적 분석 시작: {result['file_name']}")
+    lines.append("=" * 60)
+
+    header = result["header"]
+    if header is not None:
+        lines.append("\n[1] 기본 정보 (Header Info)")
+        lines.append(f"  - Entry Point: {hex(header['entry_point'])}")
+        lines.append(f"  - Image Base:  {hex(header['image_base'])}")
+        lines.append(f"  - 섹션 개수:   {header['number_of_sections']}")
+        lines.append(f"  - 컴파일 시간: {header['timestamp']}")
+
+        lines.append("\n[2] 섹션 정보 & 패킹 탐지 (Entropy)")
+        lines.append("  * 엔트로피가 7.0 이상이면 패킹(Packing) 또는 암호화 가능성이 높습니다.")
+        lines.append(f"  {'이름':<10} | {'크기(Raw)':<10} | {'엔트로피':<10} | {'상태'}")
+        lines.append("-" * 60)
+        for section in result["sections"]:
+            lines.append(f"  {section['name']:<10} | {section['raw_size']:<10} | {section['entropy']:.4f}     | {section['status']}")
+        for section in result["sections"]:
+            for region in section.get("high_entropy_regions", []):
+                lines.append(f"  🚨 {section['name']} 내부 고엔트로피 구간: 오프셋 {hex(region['offset'])}, "
+                             f"{region['size']} bytes (평균 {region['entropy']:.4f})")
+
+        overlay = result.get("overlay")
+        if overlay:
+            lines.append(f"  - 오버레이: 오프셋 {hex(overlay['offset'])}, {overlay['size']} bytes, 엔트로피 {overlay['entropy']:.4f}"
+                         + (" 🚨 의심 (암호화/압축 데이터?)" if overlay['entropy'] > 7.0 else ""))
+
+        lines.append("\n[3] 주요 의심 API 호출 (Import Table)")
+        if result.get("imphash"):
+            lines.append(f"  - 임포트 함수 {result['import_count']}개, imphash: {result['imphash']}")
+        for imp in result["suspicious_imports"]:
+            lines.append(f"  🚨 탐지됨: {imp['function']:<25} (라이브러리: {imp['dll']}, 분류: {imp['category']}, 가중치: {imp['weight']})")
+        if result["suspicious_imports"]:
+            lines.append(f"  - 의심 API 점수 합계: {result['import_score']}")
+        if result["has_import_table"] is None:
+            lines.append("  -> 임포트 디렉토리를 파싱하지 않아 검사를 건너뛰었습니다.")
+        elif not result["has_import_table"]:
+            lines.append("  -> 임포트 테이블이 없습니다. (패킹되어 있을 확률이 매우 높음)")
+        if not result["suspicious_imports"] and result["has_import_table"] is not None and result["error"] is None:
+            lines.append("  -> 특이한 악성 API가 명시적으로 발견되지 않았습니다.")
+
+        carved = result.get("carved") or []
+        lines.append("\n[4] 숨은 페이로드 후보 (오버레이/리소스/내장 파일)")
+        for item in carved:
+            where = f"리소스 {item['resource']}" if item["resource"] else {"overlay": "오버레이", "embedded": "파일 내부"}[item["source"]]
+            mark = "🚨" if item["kind"] != "data" or item["entropy"] >= 7.0 else "-"
+            lines.append(f"  {mark} {where}: {item['kind']} 형식, 오프셋 {hex(item['offset'])}, "
+                         f"{item['size']} bytes (엔트로피 {item['entropy']:.4f})")
+        if not carved:
+            lines.append("  -> 내장된 실행파일/압축파일이 발견되지 않았습니다.")
+
+    if result["error"]:
+        lines.append(f"[오류] {result['error']}")
+
+    return "\n".join(lines)
+
+
+def analyze_pe(filepath, directories=None, rules_path=None):
+    if not os.path.exists(filepath):
+        print(f"[오류] 파일을 찾을 수 없습니다: {filepath}")
+        return
+
+    print(format_pe_report(inspect_pe(filepath, directories, rules_path)))
 
 if __name__ == "__main__":
+    if pefile is None:
+        print("[오류] 'pefile' 라이브러리가 필요합니다. 설치: pip install pefile")
+        sys.exit(1)
+
     parser = argparse.ArgumentParser(description="PE(EXE) 파일 정적 분석 도구")
     parser.add_argument("filepath", help="분석할 EXE/DLL 파일 경로")
+    parser.add_argument("--directories", default=",".join(DEFAULT_DATA_DIRECTORIES),
+                        help="파싱할 데이터 디렉토리 (콤마 구분, 예: IMPORT,RESOURCE / ALL이면 전체 로드)")
+    parser.add_argument("--rules", default=None, help="의심 API 규칙 파일 (기본: rules/pe_imports.json)")
     args = parser.parse_args()
-    analyze_pe(args.filepath)
\ No newline at end of file
+    analyze_pe(args.filepath, args.directories, args.rules)
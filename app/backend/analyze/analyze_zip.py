@@ -1,74 +1,226 @@
 import sys
 import os
+import struct
 import argparse
 import zipfile
 
-def analyze_zip(filepath):
+try:
+    from app.backend.analyze import entropy as entropy_engine
+    from app.backend.analyze import archive_scan
+    from app.backend.analyze import archive_stream
+    from app.backend.analyze import zip_directory
+    from app.backend.analyze import zip_entries
+except ImportError:  # analyze 디렉토리에서 CLI로 직접 실행한 경우
+    import entropy as entropy_engine
+    import archive_scan
+    import archive_stream
+    import zip_directory
+    import zip_entries
+
+DANGEROUS_EXTS = archive_scan.DANGEROUS_EXTS
+
+SEVERITY_LABELS = archive_scan.SEVERITY_LABELS
+
+
+def _layout_flags(layout):
+    """중앙 디렉토리 구조 검사(find_overlaps)에서 중복/겹침에 걸린 엔트리 이름 -> 표시"""
+    flags = {}
+    layout = layout or {}
+    for group in layout.get("duplicate_offsets", []):
+        for name in group["entries"]:
+            flags[name] = "💣중복 오프셋"
+    for overlap in layout.get("overlaps", []):
+        flags.setdefault(overlap["overlaps"], "💣엔트리 겹침")
+    return flags
+
+
+def inspect_zip(filepath, budget=None, recursive=True,
+                inflate_bytes=zip_directory.DEFAULT_MAX_INFLATE_BYTES,
+                inflate_cpu_seconds=zip_directory.DEFAULT_MAX_CPU_SECONDS,
+                top_n=zip_entries.DEFAULT_TOP_ENTRIES, bomb_ratio=zip_directory.BOMB_RATIO):
+    """
+    ZIP 파일의 내부 목록을 분석하여 구조화된 결과(dict)를 반환합니다.
+    recursive: 엔트리를 메모리에서 읽어 형식별 분석기로 검사하고 안의 압축 파일까지 들어감 (archive_scan)
+    budget: archive_scan.ScanBudget (None이면 기본 한도)
+    inflate_bytes/inflate_cpu_seconds: 압축 폭탄 검사에서 실제로 해제해 볼 최대 바이트/CPU 시간
+    bomb_ratio: 압축 폭탄으로 볼 압축률 (파일 전체 판정과 엔트리 표시에 같이 사용, 안의 압축 파일은 budget 값)
+    압축률은 헤더에 적힌 크기가 아니라 실제로 해제한 크기로 계산합니다. (예산 안에서 잰 만큼, 못 잰 엔트리는 헤더 값)
+    엔트리가 많아도 결과 크기가 일정하도록 엔트리별 정보는 집계(summary)와 의심 점수 상위 top_n개(entries)만 남깁니다.
+    (전체 목록은 list_entries로 구간을 나눠 조회)
+    """
+    result = {
+        "file_name": os.path.basename(filepath),
+        "total_entries": 0,
+        "summary": None,
+        "entries": [],
+        "entropy": None,
+        "bomb": None,
+        "tree": None,
+        "error": None,
+    }
+
     if not os.path.exists(filepath):
-        print(f"[오류] 파일을 찾을 수 없습니다: {filepath}")
-        return
+        result["error"] = f"파일을 찾을 수 없습니다: {filepath}"
+        return result
 
     if not zipfile.is_zipfile(filepath):
-        print("[오류] 유효한 ZIP 파일이 아닙니다.")
-        return
-
-    print("=" * 60)
-    print(f"ZIP 압축 파일 구조 분석: {os.path.basename(filepath)}")
-    print("=" * 60)
+        result["error"] = "유효한 ZIP 파일이 아닙니다."
+        return result
 
     try:
-        with zipfile.ZipFile(filepath, 'r') as zf:
-            file_list = zf.infolist()
-            print(f"  - 총 파일 개수: {len(file_list)}개")
-            
-            print("\n[내부 파일 상세 분석]")
-            print(f"  {'파일명':<30} | {'압축률':<8} | {'상태'}")
-            print("-" * 70)
-
-            dangerous_exts = ['.exe', '.bat', '.cmd', '.scr', '.vbs', '.js', '.wsf', '.ps1']
-            
-            for info in file_list:
-                # 1. 압축률 계산 (Zip Bomb 탐지)
-                # compress_size가 0인 경우(빈 파일 등) 예외 처리
-                ratio = 0
-                if info.compress_size > 0:
-                    ratio = info.file_size / info.compress_size
-                
-                # 2. 파일명 디코딩 (한글 깨짐 방지 시도)
-                try:
-                    filename = info.filename.encode('cp437').decode('euc-kr')
-                except:
-                    filename = info.filename
-
-                # 3. 위험 요소 탐지
-                flags = []
-                
-                # Zip Bomb 체크: 압축률이 100배 이상이면 매우 의심
-                if ratio > 100:
-                    flags.append("💣ZipBomb의심")
-                
-                # 위험 확장자 체크
-                ext = os.path.splitext(filename)[1].lower()
-                if ext in dangerous_exts:
-                    flags.append(f"🚨실행파일({ext})")
-                
-                # 암호화 여부 (Flag bit 0)
-                if info.flag_bits & 0x1:
-                    flags.append("🔒암호화됨")
-
-                status_str = ", ".join(flags) if flags else "정상"
-                
-                # 출력 (파일명이 너무 길면 자르기)
-                display_name = (filename[:27] + '..') if len(filename) > 27 else filename
-                print(f"  {display_name:<30} | {ratio:.1f}x     | {status_str}")
+        with entropy_engine.open_mapped(filepath) as buf:
+            result["entropy"] = entropy_engine.profile_buffer(buf)
+            result["bomb"], result["summary"], result["entries"] = _scan_directory(
+                buf, inflate_bytes, inflate_cpu_seconds, top_n, bomb_ratio)
+        if result["summary"]:
+            # 끝까지 읽지 못한 중앙 디렉토리는 EOCD에 적힌 엔트리 수가 더 정확함
+            claimed = result["bomb"]["directory"]["claimed_entries"] if result["summary"]["truncated"] else 0
+            result["total_entries"] = max(result["summary"]["entries"], claimed)
+
+        # 재귀 검사 (내부 실행파일/문서/중첩 압축 파일)
+        # 중앙 디렉토리 집계가 끝나 엔트리 목록을 놓은 뒤에 zipfile로 다시 열어 최대 메모리를 줄임
+        if recursive:
+            with zipfile.ZipFile(filepath, 'r') as zf:
+                result["tree"] = archive_scan.scan_archive(archive_stream.ZipArchive(zf), result["file_name"], budget)
 
     except zipfile.BadZipFile:
-        print("[오류] 손상된 ZIP 파일입니다.")
+        result["error"] = "손상된 ZIP 파일입니다."
     except Exception as e:
-        print(f"[오류] 분석 중 예외 발생: {e}")
+        result["error"] = f"분석 중 예외 발생: {e}"
+
+    return result
+
+
+def _scan_directory(buf, inflate_bytes, inflate_cpu_seconds, top_n, bomb_ratio):
+    """
+    중앙 디렉토리를 한 번 읽어 압축 폭탄 검사와 엔트리 집계를 합니다.
+    반환: (inspect_bomb 결과, 엔트리 집계 또는 None, 의심 상위 엔트리 목록)
+    """
+    try:
+        directory = zip_directory.read_directory(buf)
+    except (ValueError, struct.error):
+        # 읽지 못한 이유는 inspect_bomb 결과의 error에 남음
+        return zip_directory.inspect_bomb(buf, inflate_bytes, inflate_cpu_seconds, bomb_ratio), None, []
+
+    # 압축 폭탄: 중앙 디렉토리 구조(중복/겹침) + 예산 안에서 실제 스트리밍 해제
+    bomb = zip_directory.inspect_bomb(buf, inflate_bytes, inflate_cpu_seconds, bomb_ratio, directory=directory)
+    # 엔트리별 해제 결과는 집계에만 쓰고 결과에는 남기지 않음 (엔트리 수만큼 커짐)
+    measured = (bomb["inflate"] or {}).pop("entries", {})
+    summary, top = zip_entries.summarize_entries(directory, measured, _layout_flags(bomb["layout"]), top_n,
+                                                 bomb_ratio)
+    return bomb, summary, top
+
+
+def list_entries(filepath, offset=0, limit=100,
+                 inflate_bytes=zip_directory.DEFAULT_MAX_INFLATE_BYTES,
+                 inflate_cpu_seconds=zip_directory.DEFAULT_MAX_CPU_SECONDS, bomb_ratio=zip_directory.BOMB_RATIO):
+    """
+    엔트리 상세 목록을 중앙 디렉토리 순서로 offset부터 limit개 반환합니다. (페이지 조회용)
+    중복/겹침 표시는 전체 디렉토리 기준이고, 실제 해제 크기는 이 페이지의 엔트리만 예산 안에서 잽니다.
+    반환: {"file_name", "total_entries", "truncated", "offset", "limit", "entries", "error"}
+    """
+    result = {"file_name": os.path.basename(filepath), "total_entries": 0, "truncated": False,
+              "offset": offset, "limit": limit, "entries": [], "error": None}
+    try:
+        with entropy_engine.open_mapped(filepath) as buf:
+            directory = zip_directory.read_directory(buf)
+            page = directory.entries[offset:offset + limit]
+            inflate = zip_directory.measure(buf, directory,
+                                            zip_directory.InflateBudget(inflate_bytes, inflate_cpu_seconds), page)
+        layout_flags = _layout_flags(zip_directory.find_overlaps(directory))
+        result["total_entries"] = len(directory.entries)
+        result["truncated"] = directory.truncated
+        result["entries"] = zip_entries.entries_page(directory, inflate["entries"], layout_flags, offset, limit,
+                                                     bomb_ratio)
+    except (ValueError, struct.error) as e:
+        result["error"] = f"중앙 디렉토리를 읽지 못했습니다: {e}"
+    except OSError as e:
+        result["error"] = f"파일을 열 수 없습니다: {e}"
+    return result
+
+
+def format_zip_report(result):
+    """inspect_zip 결과를 기존 CLI와 동일한 텍스트 보고서로 변환합니다."""
+    if result["error"] == "유효한 ZIP 파일이 아닙니다.":
+        return f"[오류] {result['error']}"
+
+    lines = []
+    lines.append("=" * 60)
+    lines.append(f"ZIP 압축 파일 구조 분석: {result['file_name']}")
+    lines.append("=" * 60)
+
+    if result["entries"] or result["error"] is None:
+        lines.append(f"  - 총 파일 개수: {result['total_entries']}개")
+        summary = result.get("summary")
+        if summary:
+            _format_summary(lines, summary)
+
+        entries = result["entries"]
+        if summary and len(entries) < summary["entries"] - summary["directories"]:
+            lines.append(f"\n[의심 엔트리 상위 {len(entries)}개] (전체 목록은 엔트리 목록 조회로 확인)")
+        else:
+            # 모두 들어가면 기존처럼 압축 파일 안의 순서대로
+            entries = sorted(entries, key=lambda entry: entry["index"])
+            lines.append("\n[내부 파일 상세 분석]")
+        lines.append(f"  {'파일명':<30} | {'압축률':<8} | {'상태'}")
+        lines.append("-" * 70)
+
+        for entry in entries:
+            filename = entry["filename"]
+            status_str = ", ".join(entry["flags"]) if entry["flags"] else "정상"
+            # 출력 (파일명이 너무 길면 자르기)
+            display_name = (filename[:27] + '..') if len(filename) > 27 else filename
+            lines.append(f"  {display_name:<30} | {entry['ratio']:.1f}x     | {status_str}")
+
+        bomb = result.get("bomb")
+        if bomb and bomb["inflate"]:
+            inflate = bomb["inflate"]
+            lines.append(f"\n[압축 폭탄 검사] 실제 해제 {inflate['inflated']:,}바이트 (파일의 {bomb['ratio']}배), "
+                         f"엔트리 {inflate['measured']}개 측정, CPU {inflate['cpu_seconds']}초")
+            if bomb["is_bomb"]:
+                lines.append(f"  💣 압축 폭탄 의심: {', '.join(bomb['reasons'])}")
+            else:
+                lines.append("  -> 이상 없음")
+        elif bomb and bomb["error"]:
+            lines.append(f"\n[압축 폭탄 검사] 중앙 디렉토리를 읽지 못했습니다: {bomb['error']}")
+
+        tree = result.get("tree")
+        if tree:
+            archive_scan.format_tree(lines, tree)
+
+        entropy = result.get("entropy")
+        if entropy:
+            lines.append(f"\n  - 파일 엔트로피: {entropy['entropy']:.4f} "
+                         f"({entropy['window']}바이트 창 {entropy['windows']}개 중 {entropy['high_entropy_windows']}개가 고엔트로피)")
+
+    if result["error"]:
+        lines.append(f"[오류] {result['error']}")
+
+    return "\n".join(lines)
+
+
+def _format_summary(lines, summary):
+    """엔트리 집계 (확장자 분류/압축률 분포/암호화·위험 표시 수)"""
+    by_class = ", ".join(f"{zip_entries.CLASS_LABELS[name]} {count}" for name, count in summary["by_class"].items() if count)
+    histogram = ", ".join(f"{label} {count}" for label, count in summary["ratio_histogram"].items() if count)
+    lines.append(f"  - 확장자 분류: {by_class or '없음'}")
+    lines.append(f"  - 압축률 분포: {histogram or '없음'} (최대 {summary['max_ratio']:.1f}x)")
+    lines.append(f"  - 암호화 {summary['encrypted']}개, 위험 표시 {summary['flagged']}개")
+    if summary["truncated"]:
+        lines.append(f"  [!] 중앙 디렉토리를 끝까지 읽지 못해 앞의 {summary['entries']}개 엔트리만 집계했습니다.")
+
+
+def analyze_zip(filepath, top_n=zip_entries.DEFAULT_TOP_ENTRIES):
+    if not os.path.exists(filepath):
+        print(f"[오류] 파일을 찾을 수 없습니다: {filepath}")
+        return
+
+    print(format_zip_report(inspect_zip(filepath, top_n=top_n)))
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="ZIP 파일 보안 분석 도구")
     parser.add_argument("filepath", help="분석할 ZIP 파일 경로")
+    parser.add_argument("--top", type=int, default=zip_entries.DEFAULT_TOP_ENTRIES,
+                        help="보고서에 표시할 의심 엔트리 수")
     args = parser.parse_args()
-    analyze_zip(args.filepath)
\ No newline at end of file
+    analyze_zip(args.filepath, args.top)
@@ -0,0 +1,527 @@
+"""
+압축 파일 재귀 검사
+압축 파일(ZIP/TAR/gz/bz2/xz, archive_stream) 안의 멤버를 디스크에 풀지 않고 스트림으로 읽어
+시그니처(매직 바이트)로 형식을 판별하고, 형식에 맞는 분석기(PE/PDF/OLE·OOXML)를 바로 실행합니다.
+안에 든 압축 파일은 같은 방식으로 다시 들어갑니다. (TAR/gz/bz2/xz는 멤버 스트림 위에 그대로 겹쳐 열고,
+임의 접근이 필요한 ZIP/HWPX와 분석기에 넘길 내용만 Spool(일정 크기까지 메모리, 넘으면 임시 파일)에 받음)
+- 모든 형식/단계에 걸친 전역 한도: 중첩 깊이, 해제한 총 바이트, 엔트리 수, 경과 시간 (ScanBudget)
+- 형식별 압축 폭탄 검사: ZIP은 중앙 디렉토리 + 예산 안의 실제 해제(zip_directory),
+  gz/bz2/xz는 푸는 동안 압축률을 재어 지나치면 중단(archive_stream)
+- 결과는 '바깥.zip/안.tar.gz/안.tar/파일.exe' 형식의 경로를 가진 노드 트리이며,
+  노드마다 탐지 항목(findings)과 자식까지 포함한 최고 심각도(severity)를 담습니다.
+  탐지 항목도 오류도 없는 엔트리는 노드를 남기지 않고 상위 노드의 omitted(생략한 엔트리 수)로만 셉니다.
+  탐지된 노드도 한 단계에 MAX_NODES_PER_LEVEL개까지만 (심각도 높은 순) 남겨 결과 크기에 상한을 둡니다.
+분석할 형식이 아닌 멤버는 판별에 필요한 앞부분만 읽습니다.
+"""
+import os
+import lzma
+import time
+import zlib
+import zipfile
+import tarfile
+
+try:
+    from app.backend.analyze.file_type import (sniff_bytes, zip_container_type, SNIFF_BYTES, TYPE_DESCRIPTIONS,
+                                               EXPECTED_TYPES_BY_EXT)
+    from app.backend.analyze import zip_directory
+    from app.backend.analyze import archive_stream
+    from app.backend.analyze.archive_stream import decode_name
+except ImportError:  # analyze 디렉토리에서 CLI로 직접 실행한 경우
+    from file_type import sniff_bytes, zip_container_type, SNIFF_BYTES, TYPE_DESCRIPTIONS, EXPECTED_TYPES_BY_EXT
+    import zip_directory
+    import archive_stream
+    from archive_stream import decode_name
+
+DANGEROUS_EXTS = ['.exe', '.bat', '.cmd', '.scr', '.vbs', '.js', '.wsf', '.ps1']
+
+# 기본 한도 (app.config의 ARCHIVE_* 값으로 덮어씀)
+DEFAULT_MAX_DEPTH = 3
+DEFAULT_MAX_TOTAL_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_SECONDS = 30
+# 엔트리 하나를 읽는 최대 크기 (넘으면 분석하지 않음)
+DEFAULT_MAX_MEMBER_BYTES = 64 * 1024 * 1024
+
+READ_CHUNK = 1024 * 1024
+# 안으로 다시 들어가는 형식 / 엔트리 내용을 분석기로 검사하는 형식
+CONTAINER_TYPES = archive_stream.RANDOM_ACCESS_TYPES + archive_stream.STREAM_TYPES
+ANALYZED_TYPES = ("pe", "mz", "pdf", "ole", "ooxml")
+
+# 멤버 스트림을 읽다 날 수 있는 형식별 오류
+READ_ERRORS = (zipfile.BadZipFile, tarfile.TarError, zlib.error, lzma.LZMAError,
+               NotImplementedError, EOFError, OSError, RuntimeError, ValueError)
+
+SEVERITY_ORDER = {None: 0, "low": 1, "medium": 2, "high": 3}
+SEVERITY_LABELS = {"high": "🚨", "medium": "⚠️", "low": "ℹ️"}
+# 보고서에 출력하는 재귀 검사 트리의 최대 줄 수 (엔트리가 많아도 보고서 크기를 일정하게)
+MAX_TREE_LINES = 200
+# 한 아카이브 단계에 남기는 최대 노드 수 (넘으면 심각도가 낮은 노드부터 뺌, 뺀 수는 stats의 dropped_nodes)
+MAX_NODES_PER_LEVEL = 200
+
+
+class ScanBudget:
+    """재귀 검사 전체에 걸친 남은 한도 (모든 압축 형식에 같이 적용)"""
+
+    def __init__(self, max_depth=DEFAULT_MAX_DEPTH, max_total_bytes=DEFAULT_MAX_TOTAL_BYTES,
+                 max_entries=DEFAULT_MAX_ENTRIES, max_seconds=DEFAULT_MAX_SECONDS,
+                 max_member_bytes=DEFAULT_MAX_MEMBER_BYTES,
+                 spool_memory_bytes=archive_stream.DEFAULT_SPOOL_MEMORY_BYTES,
+                 bomb_ratio=archive_stream.DEFAULT_BOMB_RATIO,
+                 bomb_min_bytes=archive_stream.DEFAULT_BOMB_MIN_BYTES):
+        self.max_depth = max_depth
+        self.max_total_bytes = max_total_bytes
+        self.max_entries = max_entries
+        self.max_seconds = max_seconds
+        self.max_member_bytes = max_member_bytes
+        self.spool_memory_bytes = spool_memory_bytes
+        self.bomb_ratio = bomb_ratio
+        self.bomb_min_bytes = bomb_min_bytes
+        self.started = time.monotonic()
+        self.bytes_read = 0
+        self.entries = 0
+        self.archives = 0
+        self.max_depth_seen = 0
+        self.dropped_nodes = 0
+        self.exhausted = []  # 도달한 한도 이름 (중복 없이 순서대로)
+
+    def hit(self, limit):
+        if limit not in self.exhausted:
+            self.exhausted.append(limit)
+
+    def out_of_time(self):
+        if time.monotonic() - self.started > self.max_seconds:
+            self.hit("time")
+            return True
+        return False
+
+    def remaining_seconds(self):
+        return max(0.0, self.max_seconds - (time.monotonic() - self.started))
+
+    def charge(self, size):
+        """스트림에서 풀어 읽은 바이트를 더합니다. 전체 바이트/시간 한도를 넘으면 StreamLimit"""
+        self.bytes_read += size
+        if self.bytes_read > self.max_total_bytes:
+            self.hit("total_bytes")
+            raise archive_stream.StreamLimit("total_bytes", "해제 바이트 한도 초과")
+        if self.out_of_time():
+            raise archive_stream.StreamLimit("time", "검사 시간 한도 초과")
+
+    def stats(self):
+        return {
+            "entries": self.entries,
+            "archives": self.archives,
+            "bytes_read": self.bytes_read,
+            "max_depth": self.max_depth_seen,
+            "dropped_nodes": self.dropped_nodes,
+            "seconds": round(time.monotonic() - self.started, 3),
+            "limits": {"depth": self.max_depth, "total_bytes": self.max_total_bytes, "entries": self.max_entries,
+                       "seconds": self.max_seconds, "member_bytes": self.max_member_bytes},
+            "exhausted": list(self.exhausted),
+        }
+
+
+def _finding(finding_id, severity, description):
+    return {"id": finding_id, "severity": severity, "description": description}
+
+
+def _unsafe_path(name):
+    """압축을 풀 때 대상 폴더 밖을 가리키는 경로 (절대 경로, 드라이브 문자, '..')"""
+    normalized = name.replace("\\", "/")
+    return (normalized.startswith("/") or (len(normalized) > 1 and normalized[1] == ":")
+            or ".." in normalized.split("/"))
+
+
+def _spool_member(stream, head, member, budget):
+    """
+    멤버 나머지를 Spool에 받습니다. (max_member_bytes/전체 바이트 한도까지)
+    반환: (Spool 또는 None, 한도로 잘렸는지)
+    """
+    spool = archive_stream.Spool(budget.spool_memory_bytes)
+    try:
+        return _fill_spool(spool, stream, head, member, budget)
+    except BaseException:
+        spool.close()
+        raise
+
+
+def _fill_spool(spool, stream, head, member, budget):
+    spool.write(head)
+    while True:
+        limit = budget.max_member_bytes - spool.size
+        if not member.metered:
+            limit = min(limit, budget.max_total_bytes - budget.bytes_read)
+        if limit <= 0:
+            # 남은 데이터가 있는지 1바이트만 확인
+            if stream.read(1):
+                budget.hit("member_bytes" if spool.size >= budget.max_member_bytes else "total_bytes")
+                spool.close()
+                return None, True
+            return spool, False
+        chunk = stream.read(min(READ_CHUNK, limit))
+        if not chunk:
+            return spool, False
+        if not member.metered:
+            budget.bytes_read += len(chunk)
+        spool.write(chunk)
+
+
+def _drain(stream):
+    """스트림을 끝까지 읽고 버립니다. (압축 해제 스트림이 바이트 수/압축률 한도를 검사) 반환: 읽은 바이트 수"""
+    total = 0
+    while True:
+        chunk = stream.read(READ_CHUNK)
+        if not chunk:
+            return total
+        total += len(chunk)
+
+
+def _analyze_member(name, kind, data, budget):
+    """형식에 맞는 분석기를 멤버 내용(버퍼)으로 실행해 요약과 탐지 항목을 만듭니다. 반환: (요약, [finding])"""
+    findings = []
+    if kind in ("pe", "mz"):
+        try:
+            from app.backend.analyze.analyze_pe import inspect_pe
+        except ImportError:
+            from analyze_pe import inspect_pe
+        result = inspect_pe(name, data=data)
+        packed = [section["name"] for section in result["sections"] if section["entropy"] > 7.0]
+        summary = {"import_score": result["import_score"], "imphash": result["imphash"],
+                   "suspicious_imports": sorted({match["function"] for match in result["suspicious_imports"]})[:10],
+                   "packed_sections": packed, "carved": len(result["carved"]), "error": result["error"]}
+        findings.append(_finding("nested_executable", "high", f"압축 파일 안의 실행파일 ({TYPE_DESCRIPTIONS[kind]})"))
+        if packed:
+            findings.append(_finding("packed_sections", "medium", f"패킹 의심 섹션: {', '.join(packed)}"))
+        return summary, findings
+
+    if kind == "pdf":
+        try:
+            from app.backend.analyze.analyze_pdf import inspect_pdf
+        except ImportError:
+            from analyze_pdf import inspect_pdf
+        result = inspect_pdf(name, data=data)
+        summary = {"risk_score": result["risk_score"], "verdict": result["verdict"],
+                   "keywords": {item["keyword"]: item["count"] for item in result["keywords"]},
+                   "scripts": len(result["scripts"]), "error": result["error"]}
+        if result["verdict"] == "danger":
+            findings.append(_finding("pdf_danger", "high", f"위험 PDF (점수 {result['risk_score']})"))
+        elif result["verdict"] == "caution":
+            findings.append(_finding("pdf_caution", "medium", f"주의 PDF (점수 {result['risk_score']})"))
+        return summary, findings
+
+    if kind == "ooxml":
+        try:
+            from app.backend.analyze.analyze_ooxml import inspect_ooxml
+        except ImportError:
+            from analyze_ooxml import inspect_ooxml
+        # 중앙 디렉토리만 읽고 필요한 파트(vbaProject.bin, .rels 등)만 해제, 압축 폭탄 검사는 남은 예산 안에서
+        result = inspect_ooxml(name, data=data,
+                               inflate_bytes=max(0, budget.max_total_bytes - budget.bytes_read),
+                               inflate_cpu_seconds=budget.remaining_seconds(), bomb_ratio=budget.bomb_ratio)
+        budget.bytes_read += ((result["bomb"] or {}).get("inflate") or {}).get("decompressed", 0)
+        vba = [item["olevba"] for item in result["vba"] if item["olevba"]]
+        summary = {"application": result["application"], "macro_enabled": result["macro_enabled"],
+                   "has_macros": any(item["has_macros"] for item in vba), "xlm_sheets": len(result["xlm_sheets"]),
+                   "external": result["relationships"]["external_count"], "activex": result["activex"]["count"],
+                   "embeddings": len(result["embeddings"]), "suspicious_parts": len(result["hidden_parts"]["flagged"]),
+                   "error": result["error"]}
+        findings.extend(result["findings"])
+        return summary, findings
+
+    if kind == "ole":
+        try:
+            from app.backend.analyze.analyze_mshwp import inspect_mshwp
+        except ImportError:
+            from analyze_mshwp import inspect_mshwp
+        # olefile/oletools는 bytes만 받음
+        result = inspect_mshwp(name, data=bytes(data))
+        vba = result["olevba"]
+        autoexec = [item["keyword"] for item in vba["analysis"] if item["type"] == "AutoExec"]
+        summary = {"has_macros": vba["has_macros"], "has_xlm": vba["has_xlm"], "suspicious": vba["suspicious"],
+                   "macros": len(vba["macros"]), "autoexec": autoexec[:10], "error": vba["error"]}
+        if vba["suspicious"]:
+            findings.append(_finding("suspicious_macros", "high", "자동 실행 + 쓰기/실행 매크로 (mraptor)"))
+        elif vba["has_macros"] or vba["has_xlm"]:
+            findings.append(_finding("macros", "medium", "VBA/XLM 매크로 포함 문서"))
+        return summary, findings
+
+    return None, findings
+
+
+def _rollup(node):
+    """자식까지 포함한 최고 심각도"""
+    severities = [finding["severity"] for finding in node["findings"]]
+    severities += [child["severity"] for child in node.get("children") or []]
+    node["severity"] = max(severities, key=SEVERITY_ORDER.get, default=None)
+    return node
+
+
+def _new_node(member, path, depth):
+    return {
+        "path": path,
+        "name": member.name,
+        "depth": depth,
+        "type": None,
+        "size": member.size,
+        "compressed_size": member.compressed_size,
+        "findings": [],
+        "analysis": None,
+        "children": None,
+        "omitted": 0,
+        "error": None,
+    }
+
+
+def _scan_entry(node, member, depth, budget):
+    name = member.name
+    ext = os.path.splitext(name)[1].lower()
+    findings = node["findings"]
+    if _unsafe_path(name):
+        findings.append(_finding("path_traversal", "medium", "압축 해제 폴더 밖을 가리키는 경로"))
+    if member.link is not None:
+        severity = "medium" if _unsafe_path(member.link) else "low"
+        findings.append(_finding("link", severity, f"링크 -> {member.link}"))
+        return node
+    if ext in DANGEROUS_EXTS:
+        findings.append(_finding("dangerous_extension", "medium", f"위험 확장자({ext})"))
+    if member.encrypted:
+        findings.append(_finding("encrypted", "low", "암호화된 엔트리 (내용 검사 불가)"))
+        return node
+
+    try:
+        with member.open() as stream:
+            head = stream.read(SNIFF_BYTES)
+            if not member.metered:
+                budget.bytes_read += len(head)
+            kind = sniff_bytes(head)
+            node["type"] = kind
+            if kind != "zip":
+                # ZIP은 내용을 받은 뒤 중앙 디렉토리로 OOXML인지 가려서 확인
+                _check_extension(findings, ext, kind)
+            if kind not in CONTAINER_TYPES + ANALYZED_TYPES:
+                if member.size is None:
+                    # 단일 파일 압축: 크기를 알 수 없으므로 끝까지 풀어 재며 압축 폭탄인지 봄 (내용은 버림)
+                    node["size"] = len(head) + _drain(stream)
+                return node
+            if kind in CONTAINER_TYPES and depth + 1 > budget.max_depth:
+                budget.hit("depth")
+                node["error"] = f"중첩 깊이 한도({budget.max_depth}) 초과"
+                return node
+            if kind in archive_stream.STREAM_TYPES:
+                # TAR/gz/bz2/xz: 멤버 스트림 위에 그대로 겹쳐 열어 버퍼 없이 읽음
+                _scan_stream(node, member, stream, head, kind, depth, budget)
+                return node
+            spool, truncated = _spool_member(stream, head, member, budget)
+    except READ_ERRORS as e:
+        node["error"] = f"엔트리 읽기 실패: {e}"
+        return node
+    if truncated:
+        node["error"] = "검사 한도를 넘어 내용을 검사하지 않았습니다"
+        return node
+
+    with spool:
+        if kind == "zip":
+            with spool.mapped() as data:
+                kind = zip_container_type(data)
+            node["type"] = kind
+            _check_extension(findings, ext, kind)
+        if kind in CONTAINER_TYPES:
+            _scan_zip(node, spool, depth, budget)
+        else:
+            try:
+                with spool.mapped() as data:
+                    node["analysis"], found = _analyze_member(name, kind, data, budget)
+                findings.extend(found)
+            except Exception as e:
+                node["error"] = f"분석 중 예외 발생: {e}"
+    return node
+
+
+def _check_extension(findings, ext, kind):
+    expected = EXPECTED_TYPES_BY_EXT.get(ext)
+    if expected and kind not in expected and kind != "unknown":
+        severity = "high" if kind in ("pe", "mz") else "medium"
+        findings.append(_finding("extension_mismatch", severity,
+                                 f"확장자({ext})와 실제 형식({TYPE_DESCRIPTIONS[kind]})이 다름"))
+
+
+def _scan_stream(node, member, stream, head, kind, depth, budget):
+    """멤버 스트림을 TAR/압축 스트림으로 열어 안의 멤버를 검사합니다."""
+    reader = archive_stream.PrependReader(head, stream)
+    if not member.metered:
+        # 앞부분은 이미 셈. 이후 tarfile/압축 해제기가 읽는 바이트(건너뛰는 부분 포함)도 한도에 넣음
+        reader = archive_stream.CountingReader(reader, budget.charge)
+        reader.count = len(head)
+    archive = archive_stream.open_archive(reader, kind, member.name, budget.charge, metered=True,
+                                          bomb_ratio=budget.bomb_ratio, bomb_min_bytes=budget.bomb_min_bytes)
+    node["children"], node["omitted"] = scan_members(archive, node["path"], depth + 1, budget)
+    _archive_outcome(node, archive)
+
+
+def _scan_zip(node, spool, depth, budget):
+    """Spool에 받은 ZIP/HWPX: 남은 예산 안에서 압축 폭탄 검사 후 안의 엔트리를 검사합니다."""
+    findings = node["findings"]
+    # 안의 압축 파일도 헤더 값이 아니라 남은 예산 안에서 실제로 해제해 압축 폭탄인지 봅니다.
+    with spool.mapped() as data:
+        bomb = zip_directory.inspect_bomb(data, max(0, budget.max_total_bytes - budget.bytes_read),
+                                          budget.remaining_seconds(), budget.bomb_ratio)
+    inflate = bomb["inflate"] or {}
+    budget.bytes_read += inflate.get("decompressed", 0)
+    layout = bomb["layout"] or {}
+    if (layout.get("duplicate_count") or layout.get("overlap_count")
+            or (bomb["ratio"] or 0) > budget.bomb_ratio):
+        findings.append(_finding("zip_bomb", "high", f"압축 폭탄 의심: {', '.join(bomb['reasons'])}"))
+        return
+    if inflate.get("budget_exceeded"):
+        # 남은 전체 예산이 모자라 다 재지 못함 (폭탄 판정이 아니라 한도 도달)
+        budget.hit("total_bytes" if inflate["budget_exceeded"] == "bytes" else "time")
+        node["error"] = "검사 한도를 넘어 내용을 검사하지 않았습니다"
+        return
+    try:
+        archive = archive_stream.open_archive(spool.fileobj(), "zip", node["name"])
+    except zipfile.BadZipFile as e:
+        node["error"] = f"손상된 내부 압축 파일: {e}"
+        return
+    with archive.zf:
+        node["children"], node["omitted"] = scan_members(archive, node["path"], depth + 1, budget)
+    _archive_outcome(node, archive)
+
+
+def _archive_outcome(node, archive):
+    """아카이브 검사가 도중에 멈춘 이유를 노드에 남깁니다. (압축 폭탄이면 탐지 항목)"""
+    stopped = archive.stopped
+    if stopped is not None and stopped.reason == "bomb":
+        node["findings"].append(_finding("compression_bomb", "high", f"압축 폭탄 의심: {stopped}"))
+    elif stopped is not None:
+        node["error"] = f"검사 한도 도달: {stopped}"
+    elif archive.error:
+        node["error"] = archive.error
+
+
+def _prunable(node):
+    """탐지 항목/오류가 없고 남은 자식도 없는 노드 (트리에 남기지 않음)"""
+    return not node["severity"] and not node["error"] and not node["children"]
+
+
+def _cap_nodes(nodes, budget):
+    """심각도가 높은 노드부터 MAX_NODES_PER_LEVEL개만 원래 순서대로 남깁니다."""
+    keep = sorted(range(len(nodes)), key=lambda i: -SEVERITY_ORDER[nodes[i]["severity"]])[:MAX_NODES_PER_LEVEL]
+    budget.dropped_nodes += len(nodes) - len(keep)
+    return [nodes[i] for i in sorted(keep)]
+
+
+def scan_members(archive, prefix, depth, budget, visit=None):
+    """
+    아카이브(archive_stream)의 멤버를 차례로 검사합니다. (depth: 이 아카이브 멤버들의 깊이, 바깥 파일의 멤버가 1)
+    visit: 검사를 마친 노드마다 (트리에서 빼기 전에) 호출할 함수 (멤버 집계용)
+    반환: (남긴 노드 목록, 생략한 깨끗한 엔트리 수(하위 포함)) (한도에 도달하면 그때까지 검사한 것만)
+    압축 폭탄/한도로 스트림을 멈추면 archive.stopped, 형식 오류로 멈추면 archive.error에 남깁니다.
+    """
+    budget.archives += 1
+    budget.max_depth_seen = max(budget.max_depth_seen, depth)
+    nodes = []
+    omitted = 0
+    node = None
+    try:
+        for member in archive.members():
+            if member.is_dir:
+                continue
+            if budget.entries >= budget.max_entries:
+                budget.hit("entries")
+                break
+            if budget.bytes_read >= budget.max_total_bytes:
+                budget.hit("total_bytes")
+                break
+            if budget.out_of_time():
+                break
+            budget.entries += 1
+            node = _new_node(member, f"{prefix}/{member.name}", depth)
+            _rollup(_scan_entry(node, member, depth, budget))
+            if visit is not None:
+                visit(node)
+            if _prunable(node):
+                omitted += 1 + node["omitted"]
+            else:
+                nodes.append(node)
+                if len(nodes) >= 2 * MAX_NODES_PER_LEVEL:
+                    nodes = _cap_nodes(nodes, budget)
+            node = None
+    except archive_stream.StreamLimit as e:
+        archive.stopped = e
+        if node is not None:
+            node["error"] = f"검사 중단: {e}"
+            _rollup(node)
+            if visit is not None:
+                visit(node)
+            nodes.append(node)
+    except READ_ERRORS as e:
+        archive.error = f"압축 파일 읽기 실패: {e}"
+    if len(nodes) > MAX_NODES_PER_LEVEL:
+        nodes = _cap_nodes(nodes, budget)
+    return nodes, omitted
+
+
+def scan_archive(archive, name, budget=None, visit=None):
+    """
+    아카이브(archive_stream.open_archive) 전체를 재귀 검사합니다.
+    visit: 바깥 아카이브의 멤버 노드마다 호출할 함수 (scan_members 참고)
+    반환: {"path", "format", "children": [노드], "omitted", "severity", "findings": [경로가 붙은 탐지 항목], "error",
+           "stats": {...}}
+    """
+    budget = budget or ScanBudget()
+    tree = {"path": name, "name": name, "format": archive.format, "findings": [], "error": None}
+    tree["children"], tree["omitted"] = scan_members(archive, name, 1, budget, visit)
+    # 바깥 아카이브 자체가 멈춘 이유 (압축 폭탄은 탐지 항목)
+    _archive_outcome(tree, archive)
+    own = [{**finding, "path": name} for finding in tree["findings"]]
+    _rollup(tree)
+    tree["findings"] = own + flatten_findings(tree["children"])
+    tree["stats"] = budget.stats()
+    return tree
+
+
+def flatten_findings(nodes):
+    """트리의 탐지 항목을 경로와 함께 한 목록으로 (보고서/요약용)"""
+    flat = []
+    for node in nodes:
+        for finding in node["findings"]:
+            flat.append({**finding, "path": node["path"]})
+        flat.extend(flatten_findings(node.get("children") or []))
+    return flat
+
+
+def format_tree(lines, tree, max_lines=MAX_TREE_LINES):
+    """scan_archive 결과를 보고서의 [내부 파일 재귀 검사] 절로 lines에 덧붙입니다."""
+    stats = tree["stats"]
+    lines.append(f"\n[내부 파일 재귀 검사] 엔트리 {stats['entries']}개, 압축 파일 {stats['archives']}개, "
+                 f"최대 깊이 {stats['max_depth']}, 해제 {stats['bytes_read']:,}바이트, {stats['seconds']}초")
+    if stats["exhausted"]:
+        lines.append(f"  [!] 검사 한도 도달: {', '.join(stats['exhausted'])} (일부 엔트리는 검사하지 못함)")
+    if stats["dropped_nodes"]:
+        lines.append(f"  [!] 탐지된 엔트리가 많아 심각도가 낮은 {stats['dropped_nodes']}개는 결과 트리에서 뺐습니다.")
+    tree_lines = []
+    for finding in tree["findings"]:
+        if finding["path"] == tree["path"]:
+            tree_lines.append(f"  {SEVERITY_LABELS[finding['severity']]} {finding['description']}")
+    if tree["error"]:
+        tree_lines.append(f"  [오류] {tree['error']}")
+    _format_nodes(tree_lines, tree["children"])
+    lines.extend(tree_lines[:max_lines])
+    if len(tree_lines) > max_lines:
+        lines.append(f"  ... 외 {len(tree_lines) - max_lines}줄 생략 (탐지 항목 {len(tree['findings'])}개)")
+    if not tree["findings"]:
+        lines.append("  -> 내부 파일에서 탐지 항목이 없습니다.")
+
+
+def _format_nodes(lines, nodes, indent=1):
+    """탐지 항목이 있는 노드(와 그 상위 압축 파일)만 들여쓰기로 출력합니다."""
+    for node in nodes:
+        if not node["severity"] and not node["error"]:
+            continue
+        pad = "  " * indent
+        kind = f" [{node['type']}]" if node["type"] else ""
+        lines.append(f"{pad}- {node['name']}{kind}")
+        for finding in node["findings"]:
+            lines.append(f"{pad}    {SEVERITY_LABELS[finding['severity']]} {finding['description']}")
+        if node["error"]:
+            lines.append(f"{pad}    [오류] {node['error']}")
+        _format_nodes(lines, node["children"] or [], indent + 1)
@@ -0,0 +1,317 @@
+"""
+스트리밍 압축 파일 계층
+ZIP, TAR(무압축/gz/bz2/xz), 단일 파일 압축(gz/bz2/xz)을 같은 방식으로 다룹니다.
+- open_archive(fileobj, kind, name): 형식에 맞는 아카이브 객체를 만들고, members()가 멤버를 차례로 돌려줍니다.
+- 멤버는 open()으로 파일처럼 읽는 스트림을 열며, 내용을 한꺼번에 메모리에 올리지 않습니다.
+- TAR와 단일 파일 압축은 앞에서부터 한 번만 읽는 스트림으로 처리하므로 안에 든 스트림에도 그대로 겹쳐 쓸 수 있습니다.
+  (멤버는 members()가 다음 멤버로 넘어가기 전에 읽어야 함)
+- ZIP은 중앙 디렉토리를 읽어야 하므로 임의 접근이 되는 파일이 필요합니다. 압축 파일 안의 ZIP은 Spool에 받아 엽니다.
+- 압축을 푸는 스트림은 읽은 바이트를 세어 on_read로 알리고, 압축률이 지나치면(압축 폭탄) StreamLimit을 냅니다.
+"""
+import io
+import os
+import bz2
+import gzip
+import lzma
+import mmap
+import tarfile
+import zipfile
+import tempfile
+import contextlib
+
+# TAR 헤더 블록 크기 / ustar 매직 위치
+TAR_BLOCK = 512
+TAR_MAGIC_OFFSET = 257
+
+# 단일 스트림 압축 폭탄 판정: 이만큼 이상 풀렸는데 압축률이 BOMB_RATIO를 넘으면 중단
+DEFAULT_BOMB_RATIO = 100
+DEFAULT_BOMB_MIN_BYTES = 16 * 1024 * 1024
+
+# Spool이 메모리에 두는 최대 크기 (넘으면 임시 파일로 옮김)
+DEFAULT_SPOOL_MEMORY_BYTES = 8 * 1024 * 1024
+
+# 스트림으로 여는 형식 / 임의 접근이 필요한 형식
+STREAM_CODECS = {
+    "gzip": lambda fileobj: gzip.GzipFile(fileobj=fileobj, mode="rb"),
+    "bz2": bz2.BZ2File,
+    "xz": lzma.LZMAFile,
+}
+STREAM_TYPES = ("tar",) + tuple(STREAM_CODECS)
+RANDOM_ACCESS_TYPES = ("zip", "hwpx")
+
+# 단일 파일 압축의 바깥 확장자 -> 안쪽 파일 확장자
+_INNER_SUFFIXES = {".gz": "", ".bz2": "", ".xz": "", ".tgz": ".tar", ".tbz2": ".tar", ".tbz": ".tar", ".txz": ".tar"}
+
+
+class StreamLimit(Exception):
+    """스트림을 더 읽지 않고 멈춰야 함 (reason: "bomb", "total_bytes", "time" 등 한도 이름)"""
+
+    def __init__(self, reason, message=""):
+        super().__init__(message or reason)
+        self.reason = reason
+
+
+class CountingReader(io.RawIOBase):
+    """읽은 바이트 수를 세는 읽기 전용 래퍼 (on_read(크기)가 StreamLimit을 내면 읽기 중단)"""
+
+    def __init__(self, fileobj, on_read=None):
+        self.fileobj = fileobj
+        self.on_read = on_read
+        self.count = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        if data:
+            self.count += len(data)
+            if self.on_read is not None:
+                self.on_read(len(data))
+        return data
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+class PrependReader(io.RawIOBase):
+    """형식 판별에 먼저 읽은 앞부분(head)을 돌려준 뒤 원래 스트림을 이어서 읽는 래퍼"""
+
+    def __init__(self, head, fileobj):
+        self.head = head
+        self.fileobj = fileobj
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        if not self.head:
+            return self.fileobj.read(size)
+        if size is None or size < 0:
+            data, self.head = self.head + self.fileobj.read(), b""
+            return data
+        data, self.head = self.head[:size], self.head[size:]
+        if len(data) < size:
+            data += self.fileobj.read(size - len(data))
+        return data
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+class Member:
+    """압축 파일 안의 멤버 하나 (size/compressed_size는 알 수 없으면 None)"""
+    __slots__ = ("name", "size", "compressed_size", "encrypted", "is_dir", "link", "metered", "_opener")
+
+    def __init__(self, name, size, compressed_size, opener, encrypted=False, is_dir=False, link=None, metered=False):
+        self.name = name
+        self.size = size
+        self.compressed_size = compressed_size
+        self.encrypted = encrypted
+        self.is_dir = is_dir
+        self.link = link            # 심볼릭/하드 링크 대상 (TAR)
+        self.metered = metered      # 푼 바이트를 바깥 압축 스트림에서 이미 세고 있음
+        self._opener = opener
+
+    def open(self):
+        """내용을 읽는 스트림 (with 문으로 사용)"""
+        return self._opener()
+
+
+class ZipArchive:
+    """zipfile.ZipFile을 감싼 아카이브 (멤버는 엔트리마다 압축을 풀며 읽는 스트림)"""
+    format = "zip"
+
+    def __init__(self, zf):
+        self.zf = zf
+        self.stopped = None
+        self.error = None
+
+    def members(self):
+        for info in self.zf.infolist():
+            yield Member(decode_name(info.filename), info.file_size, info.compress_size,
+                         lambda info=info: self.zf.open(info), encrypted=bool(info.flag_bits & 0x1),
+                         is_dir=info.is_dir())
+
+    def close(self):
+        self.zf.close()
+
+
+class TarArchive:
+    """TAR 스트림 (tarfile 스트림 모드 "r|": 앞에서부터 한 번만 읽으며, 읽지 않은 멤버 내용은 건너뜀)"""
+    format = "tar"
+
+    def __init__(self, fileobj, compression=None, metered=False):
+        # metered: 멤버 내용을 바깥 스트림(압축 해제/상위 멤버)에서 이미 세고 있음
+        self.tar = tarfile.open(fileobj=fileobj, mode="r|")
+        self.compression = compression
+        self.metered = metered
+        self.stopped = None
+        self.error = None
+
+    def members(self):
+        for info in self.tar:
+            link = info.linkname if info.issym() or info.islnk() else None
+            if not (info.isfile() or info.isdir() or link is not None):
+                continue  # 장치/FIFO 등은 내용이 없음
+            yield Member(info.name + ("/" if info.isdir() else ""), info.size if info.isfile() else 0, None,
+                         lambda info=info: _Borrowed(self.tar.extractfile(info) or io.BytesIO()),
+                         is_dir=info.isdir(), link=link, metered=self.metered)
+
+    def close(self):
+        self.tar.close()
+
+
+class CompressedFile:
+    """gz/bz2/xz로 압축한 파일 하나 (멤버 하나, 크기는 풀어 봐야 알 수 있음)"""
+    format = "compressed"
+
+    def __init__(self, stream, compression, name):
+        self.stream = stream
+        self.compression = compression
+        self.name = name
+        self.stopped = None
+        self.error = None
+
+    def members(self):
+        yield Member(self.name, None, None, lambda: _Borrowed(self.stream), metered=True)
+
+    def close(self):
+        pass
+
+
+class _Borrowed:
+    """아카이브가 관리하는 스트림을 with 문으로 쓸 수 있게 감쌈 (닫지 않음)"""
+
+    def __init__(self, reader):
+        self.reader = reader
+
+    def read(self, size=-1):
+        return self.reader.read(size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def decode_name(filename):
+    """zipfile/zip_directory가 cp437로 읽은 이름을 euc-kr로 다시 읽어 봅니다. (실패하면 그대로)"""
+    try:
+        return filename.encode('cp437').decode('euc-kr')
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return filename
+
+
+def is_tar_header(head):
+    return len(head) >= TAR_BLOCK and head[TAR_MAGIC_OFFSET:TAR_MAGIC_OFFSET + 5] == b"ustar"
+
+
+def inner_name(name):
+    """단일 파일 압축 안의 파일 이름 (report.txt.gz -> report.txt, logs.tgz -> logs.tar)"""
+    stem, ext = os.path.splitext(name)
+    suffix = _INNER_SUFFIXES.get(ext.lower())
+    if suffix is None:
+        return name
+    return stem + suffix if stem else "data"
+
+
+def decompressing_reader(fileobj, compression, charge=None,
+                         bomb_ratio=DEFAULT_BOMB_RATIO, bomb_min_bytes=DEFAULT_BOMB_MIN_BYTES):
+    """
+    압축 스트림을 풀며 읽는 스트림. 푼 바이트는 charge(크기)로 알립니다.
+    bomb_min_bytes 이상 풀렸는데 (푼 크기 / 읽은 압축 크기)가 bomb_ratio를 넘으면 StreamLimit("bomb")
+    """
+    raw = CountingReader(fileobj)
+    decoded = STREAM_CODECS[compression](raw)
+
+    def on_read(size):
+        if output.count >= bomb_min_bytes and output.count > bomb_ratio * max(1, raw.count):
+            raise StreamLimit("bomb", f"{compression} 스트림이 {output.count:,}바이트로 풀림 "
+                                      f"(압축 {raw.count:,}바이트의 {output.count // max(1, raw.count)}배)")
+        if charge is not None:
+            charge(size)
+
+    output = CountingReader(decoded, on_read)
+    return output
+
+
+def open_archive(fileobj, kind, name, charge=None, metered=False,
+                 bomb_ratio=DEFAULT_BOMB_RATIO, bomb_min_bytes=DEFAULT_BOMB_MIN_BYTES):
+    """
+    형식(kind: file_type.sniff_bytes 결과)에 맞는 아카이브 객체를 만듭니다.
+    zip/hwpx는 임의 접근이 되는 fileobj, 나머지는 앞에서부터 읽는 스트림이면 됩니다.
+    charge(크기): 압축을 풀어 읽은 바이트를 알릴 함수 (한도를 넘으면 StreamLimit을 내면 됨)
+    metered: fileobj에서 읽는 바이트를 호출한 쪽에서 이미 세고 있음 (TAR 멤버를 다시 세지 않음)
+    """
+    if kind in RANDOM_ACCESS_TYPES:
+        return ZipArchive(zipfile.ZipFile(fileobj))
+    if kind == "tar":
+        return TarArchive(fileobj, metered=metered)
+    if kind in STREAM_CODECS:
+        stream = decompressing_reader(fileobj, kind, charge, bomb_ratio, bomb_min_bytes)
+        head = stream.read(TAR_BLOCK)
+        stream = PrependReader(head, stream)
+        if is_tar_header(head):
+            return TarArchive(stream, compression=kind, metered=True)
+        return CompressedFile(stream, kind, inner_name(name))
+    raise ValueError(f"압축 파일 형식이 아닙니다: {kind}")
+
+
+class Spool:
+    """
+    임의 접근이 필요한 멤버(안의 ZIP, 분석기에 넘길 내용)를 받아 두는 버퍼.
+    memory_bytes까지는 메모리에 두고, 넘으면 임시 파일로 옮겨 이어서 씁니다.
+    """
+
+    def __init__(self, memory_bytes=DEFAULT_SPOOL_MEMORY_BYTES):
+        self.memory_bytes = memory_bytes
+        self.file = io.BytesIO()
+        self.size = 0
+        self.on_disk = False
+
+    def write(self, data):
+        if not self.on_disk and self.size + len(data) > self.memory_bytes:
+            disk = tempfile.TemporaryFile(prefix="spool_")
+            disk.write(self.file.getbuffer())
+            self.file = disk
+            self.on_disk = True
+        self.file.write(data)
+        self.size += len(data)
+
+    def fileobj(self):
+        """처음부터 읽는 파일 객체 (zipfile.ZipFile 등에 넘김)"""
+        self.file.flush()
+        self.file.seek(0)
+        return self.file
+
+    @contextlib.contextmanager
+    def mapped(self):
+        """내용 전체를 가리키는 버퍼 (메모리면 bytes, 임시 파일이면 mmap)"""
+        if self.size == 0:
+            yield b""
+        elif self.on_disk:
+            self.file.flush()
+            mapped = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield mapped
+            finally:
+                mapped.close()
+        else:
+            # 메모리에 있는 만큼(memory_bytes 이하)은 복사본을 넘김 (분석기가 조각을 붙잡고 있어도 닫을 수 있도록)
+            yield self.file.getvalue()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,227 @@
+"""
+바이트 엔트로피 계산 엔진
+파일을 mmap으로 열고 NumPy로 바이트 히스토그램을 계산합니다.
+- 파일 전체 / 임의 구간(섹션, 오버레이) / 고정 크기 창(window) 단위 엔트로피
+- 창 단위 프로파일에서 높은 엔트로피 구간을 묶어 정상 섹션 안에 숨은 암호화/압축 데이터를 찾습니다.
+NumPy가 없으면 순수 파이썬(Counter)으로 같은 값을 계산합니다. (느리지만 결과 동일)
+"""
+import os
+import mmap
+import math
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_WINDOW_SIZE = 4096
+# 이 값 이상인 창을 높은 엔트로피로 봅니다. (압축/암호화 데이터는 보통 7.5 이상)
+HIGH_ENTROPY_THRESHOLD = 7.2
+# 결과에 담는 축약 프로파일의 최대 점 수 (창이 더 많으면 구간별 최댓값으로 줄임)
+PROFILE_POINTS = 256
+# np.bincount는 입력을 int64로 바꾸므로 큰 구간은 이 크기씩 나눠 셉니다. (임시 배열 크기 제한)
+_CHUNK_SIZE = 64 * 1024
+
+
+@contextmanager
+def open_mapped(filepath):
+    """파일을 읽기 전용 mmap으로 엽니다. 빈 파일은 mmap할 수 없으므로 b''을 돌려줍니다."""
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+def _bounds(buf, start, end):
+    size = len(buf)
+    start = min(max(0, start), size)
+    end = size if end is None else min(max(start, end), size)
+    return start, end
+
+
+def byte_histogram(buf, start=0, end=None):
+    """buf[start:end]의 바이트 값별 개수 (길이 256 리스트)"""
+    start, end = _bounds(buf, start, end)
+    if start == end:
+        return [0] * 256
+    if np is not None:
+        view = np.frombuffer(buf, dtype=np.uint8, count=end - start, offset=start)
+        histogram = np.zeros(256, dtype=np.int64)
+        for first in range(0, len(view), _CHUNK_SIZE):
+            histogram += np.bincount(view[first:first + _CHUNK_SIZE], minlength=256)
+        return histogram.tolist()
+    counts = Counter(buf[start:end])
+    return [counts.get(value, 0) for value in range(256)]
+
+
+def histogram_entropy(histogram):
+    """바이트 히스토그램의 섀넌 엔트로피 (0.0 ~ 8.0)"""
+    total = sum(histogram)
+    if total == 0:
+        return 0.0
+    entropy = 0.0
+    for count in histogram:
+        if count:
+            p = count / total
+            entropy -= p * math.log2(p)
+    return entropy
+
+
+def entropy(buf, start=0, end=None):
+    """buf[start:end]의 섀넌 엔트로피"""
+    return histogram_entropy(byte_histogram(buf, start, end))
+
+
+def _window_histograms(buf, window):
+    """buf의 온전한 창들의 히스토그램 행렬 (창 개수 x 256)"""
+    full = len(buf) // window
+    if np is None:
+        return [byte_histogram(buf, i * window, (i + 1) * window) for i in range(full)]
+    histograms = np.zeros((full, 256), dtype=np.int32)
+    if full:
+        rows = np.frombuffer(buf, dtype=np.uint8, count=full * window).reshape(full, window)
+        for index, row in enumerate(rows):
+            histograms[index] = np.bincount(row, minlength=256)
+    return histograms
+
+
+def _matrix_entropies(histograms, window):
+    if np is None:
+        return [histogram_entropy(histogram) for histogram in histograms]
+    p = histograms / window
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.where(histograms > 0, p * np.log2(p), 0.0)
+    return (-terms.sum(axis=1)).tolist()
+
+
+def _add(left, right):
+    return [a + b for a, b in zip(left, right)]
+
+
+class EntropyProfile:
+    """
+    파일 전체를 창 단위로 한 번만 훑어 만든 엔트로피 프로파일
+    창은 파일 오프셋 0 기준으로 나누며, 임의 구간(섹션/오버레이)의 엔트로피는
+    구간 안에 온전히 들어가는 창의 히스토그램 합 + 양 끝 자투리만 다시 세어 구합니다.
+    """
+
+    def __init__(self, buf, window=DEFAULT_WINDOW_SIZE, threshold=HIGH_ENTROPY_THRESHOLD):
+        self.buf = buf
+        self.size = len(buf)
+        self.window = window
+        self.threshold = threshold
+        self._histograms = _window_histograms(buf, window)
+        self._full = len(self._histograms)
+        self.values = _matrix_entropies(self._histograms, window)
+        if self._full * window < self.size:
+            # 마지막 창은 window보다 짧을 수 있습니다.
+            self.values.append(entropy(buf, self._full * window))
+
+    def _histogram(self, first, last):
+        """창 first ~ last-1 히스토그램의 합"""
+        if first >= last:
+            return [0] * 256
+        if np is None:
+            total = [0] * 256
+            for histogram in self._histograms[first:last]:
+                total = _add(total, histogram)
+            return total
+        return self._histograms[first:last].sum(axis=0, dtype=np.int64).tolist()
+
+    def range_profile(self, start=0, end=None):
+        """
+        buf[start:end] 구간의 엔트로피와 구간 안의 높은 엔트로피 창 묶음
+        반환: {offset, size, entropy, high_entropy_regions}
+        """
+        start, end = _bounds(self.buf, start, end)
+        first = min(-(-start // self.window), self._full)
+        last = max(min(end // self.window, self._full), first)
+        if first < last:
+            histogram = self._histogram(first, last)
+            histogram = _add(histogram, byte_histogram(self.buf, start, first * self.window))
+            histogram = _add(histogram, byte_histogram(self.buf, last * self.window, end))
+        else:
+            histogram = byte_histogram(self.buf, start, end)
+        return {
+            "offset": start,
+            "size": end - start,
+            "entropy": histogram_entropy(histogram),
+            "high_entropy_regions": high_entropy_regions(
+                self.values[first:last], first * self.window, self.window, self.threshold),
+        }
+
+    def summary(self):
+        """파일 전체 요약: {size, entropy, window, windows, high_entropy_windows, high_entropy_regions, profile}"""
+        histogram = self._histogram(0, self._full)
+        histogram = _add(histogram, byte_histogram(self.buf, self._full * self.window))
+        return {
+            "size": self.size,
+            "entropy": round(histogram_entropy(histogram), 4),
+            "window": self.window,
+            "windows": len(self.values),
+            "high_entropy_windows": sum(1 for v in self.values if v >= self.threshold),
+            "high_entropy_regions": high_entropy_regions(self.values, 0, self.window, self.threshold, self.size),
+            "profile": downsample(self.values),
+        }
+
+
+def window_entropies(buf, start=0, end=None, window=DEFAULT_WINDOW_SIZE):
+    """
+    buf[start:end]를 window 바이트씩 나눈 창별 엔트로피 목록
+    마지막 창은 window보다 짧을 수 있습니다.
+    """
+    start, end = _bounds(buf, start, end)
+    if start == end:
+        return []
+    return EntropyProfile(memoryview(buf)[start:end], window).values
+
+
+def high_entropy_regions(values, start=0, window=DEFAULT_WINDOW_SIZE, threshold=HIGH_ENTROPY_THRESHOLD, end=None):
+    """연속된 높은 엔트로피 창을 하나의 구간으로 묶습니다. [{offset, size, entropy(평균), max_entropy}]"""
+    regions = []
+    run = []
+    for index, value in enumerate(values + [None]):
+        if value is not None and value >= threshold:
+            run.append((index, value))
+            continue
+        if run:
+            offset = start + run[0][0] * window
+            stop = start + (run[-1][0] + 1) * window
+            if end is not None:
+                stop = min(stop, end)
+            scores = [v for _, v in run]
+            regions.append({
+                "offset": offset,
+                "size": stop - offset,
+                "entropy": round(sum(scores) / len(scores), 4),
+                "max_entropy": round(max(scores), 4),
+            })
+            run = []
+    return regions
+
+
+def downsample(values, points=PROFILE_POINTS):
+    """창별 엔트로피를 최대 points개로 줄입니다. (구간별 최댓값을 남겨 짧은 고엔트로피 구간도 보이게)"""
+    if len(values) <= points:
+        return [round(v, 3) for v in values]
+    step = len(values) / points
+    return [round(max(values[int(i * step):max(int((i + 1) * step), int(i * step) + 1)]), 3)
+            for i in range(points)]
+
+
+def profile_buffer(buf, window=DEFAULT_WINDOW_SIZE, threshold=HIGH_ENTROPY_THRESHOLD):
+    """mmap(또는 bytes) 전체의 엔트로피 요약 (EntropyProfile.summary)"""
+    return EntropyProfile(buf, window, threshold).summary()
+
+
+def profile_file(filepath, window=DEFAULT_WINDOW_SIZE, threshold=HIGH_ENTROPY_THRESHOLD):
+    """파일 경로를 받아 profile_buffer 결과를 반환합니다."""
+    with open_mapped(filepath) as buf:
+        return profile_buffer(buf, window, threshold)
@@ -1,150 +1,287 @@
 """
 통합 파일 분석 모듈
-원본 Analyze_*.py 스크립트를 실행하고 결과를 반환합니다.
+각 analyze_*.py 모듈의 분석 함수를 같은 프로세스 안에서 직접 호출하고,
+구조화된 결과(details)와 텍스트 보고서(script_output)를 함께 반환합니다.
+(분석기 모듈은 첫 호출 시 한 번만 import 되어 이후 요청에서 재사용됩니다)
 """
 import os
-import sys
-import subprocess
-from typing import Dict, Any
+import time
+import hashlib
+import tempfile
+from typing import Dict, Any, Callable, Optional
+
+from app.backend.analyze.file_type import detect_file_type, mismatch_finding, with_extension, TYPE_EXTENSIONS
+from app.core.metrics import ANALYZER_SECONDS
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# 분석 결과 형식/로직이 바뀌면 올려서 이전 결과와 구분합니다.
+ANALYZER_VERSION = "2.16.0"
 
-def analyze_pdf(filepath: str) -> Dict[str, Any]:
-    """PDF 파일을 Analyze_PDF.py로 분석"""
-    script_path = os.path.join(BASE_DIR, "Analyze_PDF.py")
-    
+# 확장자 불일치를 보고서 맨 앞에 붙일 때의 머리말
+MISMATCH_PREFIX = "[파일 형식 검사] 🚨 "
+
+
+def _run_engine(file_type: str, filepath: str,
+                inspect: Callable[[str], Dict[str, Any]],
+                format_report: Callable[[Dict[str, Any]], str]) -> Dict[str, Any]:
+    """분석 함수를 실행하고 공통 응답 형식으로 감쌉니다."""
     try:
-        result = subprocess.run(
-            [sys.executable, script_path, filepath],
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='ignore'
-        )
-        
+        details = inspect(filepath)
+
         return {
-            "file_type": "pdf",
+            "file_type": file_type,
             "file_name": os.path.basename(filepath),
-            "script_output": result.stdout,
-            "script_error": result.stderr if result.returncode != 0 else None,
-            "returncode": result.returncode
+            "script_output": format_report(details),
+            "details": details
         }
     except Exception as e:
         return {
-            "file_type": "pdf",
+            "file_type": file_type,
             "file_name": os.path.basename(filepath),
             "error": f"분석 중 예외 발생: {str(e)}"
         }
 
 
+def analyze_pdf(filepath: str) -> Dict[str, Any]:
+    """PDF 파일을 analyze_pdf 모듈로 분석"""
+    from app.backend.analyze.analyze_pdf import inspect_pdf, format_pdf_report
+    from app.config import PDF_DECODE_BUDGET, PDF_STRUCTURE_ANALYSIS
+    return _run_engine("pdf", filepath, lambda path: inspect_pdf(path, PDF_DECODE_BUDGET, PDF_STRUCTURE_ANALYSIS),
+                       format_pdf_report)
+
+
 def analyze_pe(filepath: str) -> Dict[str, Any]:
-    """PE(실행파일)를 Analyze_PE.py로 분석"""
-    script_path = os.path.join(BASE_DIR, "Analyze_PE.py")
-    
-    try:
-        result = subprocess.run(
-            [sys.executable, script_path, filepath],
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='ignore'
-        )
-        
-        return {
-            "file_type": "pe",
-            "file_name": os.path.basename(filepath),
-            "script_output": result.stdout,
-            "script_error": result.stderr if result.returncode != 0 else None,
-            "returncode": result.returncode
-        }
-    except Exception as e:
-        return {
-            "file_type": "pe",
-            "file_name": os.path.basename(filepath),
-            "error": f"분석 중 예외 발생: {str(e)}"
-        }
+    """PE(실행파일)를 analyze_pe 모듈로 분석"""
+    from app.backend.analyze.analyze_pe import inspect_pe, format_pe_report
+    from app.config import PE_DATA_DIRECTORIES, PE_IMPORT_RULES
+    return _run_engine("pe", filepath, lambda path: inspect_pe(path, PE_DATA_DIRECTORIES, PE_IMPORT_RULES),
+                       format_pe_report)
+
+
+def _archive_budget():
+    """압축 파일 재귀 검사 한도 (ZIP/TAR/gz/bz2/xz 공통)"""
+    from app.backend.analyze.archive_scan import ScanBudget
+    from app.config import (ARCHIVE_MAX_DEPTH, ARCHIVE_MAX_TOTAL_BYTES, ARCHIVE_MAX_ENTRIES,
+                            ARCHIVE_MAX_SECONDS, ARCHIVE_MAX_MEMBER_BYTES, ARCHIVE_SPOOL_MEMORY_BYTES,
+                            ARCHIVE_BOMB_RATIO, ARCHIVE_BOMB_MIN_BYTES)
+    return ScanBudget(ARCHIVE_MAX_DEPTH, ARCHIVE_MAX_TOTAL_BYTES, ARCHIVE_MAX_ENTRIES,
+                      ARCHIVE_MAX_SECONDS, ARCHIVE_MAX_MEMBER_BYTES, ARCHIVE_SPOOL_MEMORY_BYTES,
+                      ARCHIVE_BOMB_RATIO, ARCHIVE_BOMB_MIN_BYTES)
 
 
 def analyze_zip(filepath: str) -> Dict[str, Any]:
-    """ZIP 파일을 Analyze_ZIP.py로 분석"""
-    script_path = os.path.join(BASE_DIR, "Analyze_ZIP.py")
-    
-    try:
-        result = subprocess.run(
-            [sys.executable, script_path, filepath],
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='ignore'
-        )
-        
-        return {
-            "file_type": "zip",
-            "file_name": os.path.basename(filepath),
-            "script_output": result.stdout,
-            "script_error": result.stderr if result.returncode != 0 else None,
-            "returncode": result.returncode
-        }
-    except Exception as e:
-        return {
-            "file_type": "zip",
-            "file_name": os.path.basename(filepath),
-            "error": f"분석 중 예외 발생: {str(e)}"
-        }
+    """ZIP 파일을 analyze_zip 모듈로 분석 (내부 파일은 스트림으로 읽어 재귀 검사)"""
+    from app.backend.analyze.analyze_zip import inspect_zip, format_zip_report
+    from app.config import ZIP_INFLATE_MAX_BYTES, ZIP_INFLATE_MAX_CPU_SECONDS, ZIP_TOP_ENTRIES, ARCHIVE_BOMB_RATIO
+    budget = _archive_budget()
+    return _run_engine("zip", filepath,
+                       lambda path: inspect_zip(path, budget, True, ZIP_INFLATE_MAX_BYTES, ZIP_INFLATE_MAX_CPU_SECONDS,
+                                                ZIP_TOP_ENTRIES, ARCHIVE_BOMB_RATIO),
+                       format_zip_report)
+
+
+def analyze_archive(filepath: str) -> Dict[str, Any]:
+    """TAR/gz/bz2/xz 파일을 analyze_archive 모듈로 분석 (앞에서부터 스트림으로 읽으며 재귀 검사)"""
+    from app.backend.analyze.analyze_archive import inspect_archive, format_archive_report
+    budget = _archive_budget()
+    return _run_engine("archive", filepath, lambda path: inspect_archive(path, budget), format_archive_report)
+
+
+def list_zip_entries(filepath: str, offset: int, limit: int) -> Dict[str, Any]:
+    """ZIP 엔트리 상세 목록 페이지 (분석 결과에는 집계와 상위 엔트리만 남으므로 전체 목록은 여기서 조회)"""
+    from app.backend.analyze.analyze_zip import list_entries
+    from app.config import ZIP_INFLATE_MAX_BYTES, ZIP_INFLATE_MAX_CPU_SECONDS, ARCHIVE_BOMB_RATIO
+    return list_entries(filepath, offset, limit, ZIP_INFLATE_MAX_BYTES, ZIP_INFLATE_MAX_CPU_SECONDS, ARCHIVE_BOMB_RATIO)
 
 
 def analyze_mshwp(filepath: str) -> Dict[str, Any]:
-    """MS Office/HWP 파일을 MSHWP_Analysis.py로 분석"""
-    script_path = os.path.join(BASE_DIR, "MSHWP_Analysis.py")
-    
+    """MS Office(OLE: doc/xls/ppt)/HWP 파일을 analyze_mshwp 모듈로 분석"""
     try:
-        result = subprocess.run(
-            [sys.executable, script_path, filepath],
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='ignore'
-        )
-        
+        from app.backend.analyze.analyze_mshwp import inspect_mshwp, format_mshwp_report
+    except ImportError as e:
         return {
             "file_type": "office_hwp",
             "file_name": os.path.basename(filepath),
-            "script_output": result.stdout,
-            "script_error": result.stderr if result.returncode != 0 else None,
-            "returncode": result.returncode
+            "error": f"oletools/olefile 라이브러리를 불러올 수 없습니다: {str(e)}"
         }
-    except Exception as e:
+    return _run_engine("office_hwp", filepath, inspect_mshwp, format_mshwp_report)
+
+
+def analyze_ooxml(filepath: str) -> Dict[str, Any]:
+    """
+    OOXML(docx/xlsx/pptx) 파일을 analyze_ooxml 모듈로 분석 (필요한 파트만 해제)
+    [Content_Types].xml이 없는 ZIP은 OOXML이 아니므로 ZIP 분석(폭탄 검사/재귀 검사)으로 넘깁니다.
+    """
+    from app.backend.analyze.entropy import open_mapped
+    from app.backend.analyze.file_type import zip_container_type
+    with open_mapped(filepath) as buf:
+        if zip_container_type(buf) != "ooxml":
+            return analyze_zip(filepath)
+    try:
+        from app.backend.analyze.analyze_ooxml import inspect_ooxml, format_ooxml_report
+    except ImportError as e:
         return {
             "file_type": "office_hwp",
             "file_name": os.path.basename(filepath),
-            "error": f"분석 중 예외 발생: {str(e)}"
+            "error": f"oletools/olefile 라이브러리를 불러올 수 없습니다: {str(e)}"
         }
+    from app.config import (OOXML_MAX_XML_BYTES, OOXML_MAX_BINARY_BYTES,
+                            ZIP_INFLATE_MAX_BYTES, ZIP_INFLATE_MAX_CPU_SECONDS, ARCHIVE_BOMB_RATIO)
+    return _run_engine("office_hwp", filepath,
+                       lambda path: inspect_ooxml(path, None, OOXML_MAX_XML_BYTES, OOXML_MAX_BINARY_BYTES,
+                                                  ZIP_INFLATE_MAX_BYTES, ZIP_INFLATE_MAX_CPU_SECONDS,
+                                                  ARCHIVE_BOMB_RATIO),
+                       format_ooxml_report)
 
 
-def analyze_file(filepath: str) -> Dict[str, Any]:
+# 시그니처로 판별한 형식 -> 분석 함수
+ANALYZERS_BY_TYPE = {
+    "pdf": analyze_pdf,
+    "pe": analyze_pe,
+    "mz": analyze_pe,
+    "zip": analyze_zip,
+    "hwpx": analyze_zip,
+    "tar": analyze_archive,
+    "gzip": analyze_archive,
+    "bz2": analyze_archive,
+    "xz": analyze_archive,
+    "ooxml": analyze_ooxml,
+    "ole": analyze_mshwp,
+}
+
+
+# 유사도 해시를 계산하는 형식 (실행파일/문서)
+SIMILARITY_TYPES = ("pe", "mz", "ole", "ooxml", "hwpx", "pdf")
+
+
+def _similarity_hash(filepath: str) -> Optional[str]:
+    """파일 전체의 유사도 해시 (mmap으로 읽음)"""
+    from app.backend.analyze.entropy import open_mapped
+    from app.backend.analyze.similarity_hash import similarity_digest
+
+    with open_mapped(filepath) as buf:
+        return similarity_digest(buf)
+
+
+def _analyze_carved(filepath: str, result: Dict[str, Any], depth: int):
     """
-    파일 확장자를 확인하고 적절한 분석 스크립트를 실행합니다.
+    분석 결과(details.carved)에 기록된 내장 파일을 잘라 내 디스패처(run_analysis)로 다시 분석합니다.
+    조각은 mmap의 memoryview를 그대로 임시 파일에 써서 원본 전체를 메모리로 복사하지 않습니다.
+    """
+    from app.config import CARVE_MAX_DEPTH, CARVE_MAX_CHILDREN
+    from app.backend.analyze.entropy import open_mapped
+
+    carved = [item for item in (result.get("details") or {}).get("carved", [])
+              if item["kind"] in ANALYZERS_BY_TYPE]
+    if not carved or depth >= CARVE_MAX_DEPTH:
+        return
+
+    stem = os.path.splitext(os.path.basename(filepath))[0]
+    children = []
+    with tempfile.TemporaryDirectory(prefix="carved_") as workdir, open_mapped(filepath) as buf:
+        for item in carved[:CARVE_MAX_CHILDREN]:
+            # 재분석 시 확장자 불일치로 잘못 탐지되지 않도록 형식의 대표 확장자를 붙임
+            child_path = os.path.join(
+                workdir, f"{stem}_{item['source']}_{item['offset']:x}{TYPE_EXTENSIONS.get(item['kind'], '')}")
+            with memoryview(buf) as view:
+                chunk = view[item["offset"]:item["offset"] + item["size"]]
+                with open(child_path, "wb") as f:
+                    f.write(chunk)
+                sha256 = hashlib.sha256(chunk).hexdigest()
+                chunk.release()
+            children.append({**item, "sha256": sha256, "depth": depth + 1,
+                             "analysis": run_analysis(child_path, depth + 1)})
+
+    result["children"] = children
+    if "script_output" in result:
+        lines = [result["script_output"], "", "=" * 60, f"내장 파일 재분석 ({len(children)}개)", "=" * 60]
+        for child in children:
+            analysis = child["analysis"]
+            lines.append(f"\n--- [{child['source']}] {child['kind']} @ {hex(child['offset'])} "
+                         f"({child['size']} bytes, sha256 {child['sha256']}) ---")
+            lines.append(analysis.get("script_output") or f"[오류] {analysis.get('error')}")
+        result["script_output"] = "\n".join(lines)
+
+
+def run_analysis(filepath: str, depth: int = 0) -> Dict[str, Any]:
+    """
+    파일 앞부분의 시그니처로 실제 형식을 판별하고 적절한 분석 함수를 현재 프로세스에서 실행합니다.
+    확장자와 실제 형식이 다르면 findings에 탐지 항목으로 기록합니다.
+    분석기가 내장 파일(details.carved)을 찾으면 CARVE_MAX_DEPTH 깊이까지 같은 방식으로 다시 분석합니다.
     """
     if not os.path.exists(filepath):
         return {"error": "파일을 찾을 수 없습니다", "filepath": filepath}
-    
-    ext = os.path.splitext(filepath)[1].lower()
-    
-    # 파일 타입별 분석
-    if ext == '.pdf':
-        return analyze_pdf(filepath)
-    elif ext in ['.exe', '.dll', '.sys']:
-        return analyze_pe(filepath)
-    elif ext == '.zip':
-        return analyze_zip(filepath)
-    elif ext in ['.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.hwp']:
-        return analyze_mshwp(filepath)
-    else:
+
+    detection = detect_file_type(filepath)
+    analyzer = ANALYZERS_BY_TYPE.get(detection["type"])
+
+    if analyzer is None:
         return {
             "error": "지원하지 않는 파일 형식입니다",
             "file_name": os.path.basename(filepath),
-            "extension": ext,
-            "supported_types": [".pdf", ".exe", ".dll", ".zip", ".doc", ".docx", 
-                              ".xls", ".xlsx", ".ppt", ".pptx", ".hwp"]
-        }
\ No newline at end of file
+            "extension": detection["extension"],
+            "detected_type": detection,
+            "supported_types": ["PE(EXE/DLL/SYS)", "PDF", "ZIP", "HWPX", "TAR", "gzip/bzip2/xz",
+                                "OOXML(docx/xlsx/pptx)", "OLE(doc/xls/ppt/hwp)"]
+        }
+
+    result = analyzer(filepath)
+    result["findings"] = []
+    if detection["type"] in SIMILARITY_TYPES:
+        result["similarity_hash"] = _similarity_hash(filepath)
+    _analyze_carved(filepath, result, depth)
+    return _apply_detection(result, detection)
+
+
+def _apply_detection(result: Dict[str, Any], detection: Dict[str, Any]) -> Dict[str, Any]:
+    """파일 이름(확장자)에 따라 달라지는 부분: detected_type, 확장자 불일치 탐지 항목과 보고서 머리말"""
+    result["detected_type"] = detection
+    finding = mismatch_finding(detection)
+    if finding:
+        result["findings"].append(finding)
+        if "script_output" in result:
+            result["script_output"] = f"{MISMATCH_PREFIX}{finding['description']}\n\n" + result["script_output"]
+    return result
+
+
+def rename_analysis(result: Dict[str, Any], filepath: str) -> Dict[str, Any]:
+    """
+    같은 내용(SHA-256)을 다른 이름으로 분석한 결과를 filepath의 이름 기준으로 고친 사본을 만듭니다.
+    (캐시 적중 시 사용: 내용으로 정해지는 부분은 그대로 두고 확장자 검사만 다시 함)
+    """
+    detected = result.get("detected_type")
+    if detected is None:
+        return dict(result, file_name=os.path.basename(filepath))
+    findings = [finding for finding in result.get("findings", []) if finding["id"] != "extension_mismatch"]
+    result = dict(result, file_name=os.path.basename(filepath), findings=findings)
+    output = result.get("script_output")
+    if detected["extension_mismatch"] and output and output.startswith(MISMATCH_PREFIX):
+        result["script_output"] = output.split("\n\n", 1)[-1]
+    return _apply_detection(result, with_extension(detected, filepath))
+
+
+def observe_analysis(result: Dict[str, Any], seconds: float, outcome: str = None):
+    """분석 시간을 형식/결과별 히스토그램에 기록합니다."""
+    if outcome is None:
+        outcome = "error" if "error" in result else "ok"
+    ANALYZER_SECONDS.observe(seconds, file_type=result.get("file_type", "unknown"), outcome=outcome)
+
+
+def analyze_file(filepath: str) -> Dict[str, Any]:
+    """
+    파일을 분석합니다.
+    워커 풀이 활성화되어 있으면 격리된 워커 프로세스에서, 아니면 현재 프로세스에서 실행합니다.
+    """
+    from app.backend.analyze.worker_pool import pool_enabled, get_pool, PoolQueueFull
+
+    if not pool_enabled():
+        started = time.perf_counter()
+        result = run_analysis(filepath)
+        observe_analysis(result, time.perf_counter() - started)
+        return result
+
+    try:
+        return get_pool().submit(filepath)
+    except PoolQueueFull as e:
+        return {"error": str(e), "file_name": os.path.basename(filepath)}
@@ -0,0 +1,196 @@
+"""
+파일 형식 판별 모듈
+확장자 대신 파일 앞부분(최대 SNIFF_BYTES)의 시그니처(매직 바이트)로 실제 형식을 판별합니다.
+- MZ/PE 실행파일, %PDF, PK(ZIP/OOXML/HWPX), OLE(Compound File) 헤더
+- gzip/bzip2/xz 압축 스트림, TAR(ustar) 헤더
+- 정확한 위치의 시그니처를 모두 먼저 보고, 앞에 데이터가 붙은 PDF(%PDF- 위치 허용)는 마지막에 봅니다.
+- ZIP은 중앙 디렉토리에 [Content_Types].xml이 있을 때만 OOXML로 봅니다. (앞부분의 엔트리 이름만으로는 판별하지 않음)
+- 시그니처로 판별하지 못한 경우 python-magic(설치된 경우)으로 설명만 보충합니다.
+"""
+import os
+import mmap
+import struct
+from typing import Dict, Any, Optional
+
+try:
+    import magic
+except ImportError:
+    magic = None
+
+try:
+    from app.backend.analyze import zip_directory
+except ImportError:  # analyze 디렉토리에서 CLI로 직접 실행한 경우
+    import zip_directory
+
+SNIFF_BYTES = 8192
+
+OLE_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+ZIP_SIGNATURES = (b"PK\x03\x04", b"PK\x05\x06", b"PK\x07\x08")
+GZIP_SIGNATURE = b"\x1f\x8b\x08"
+XZ_SIGNATURE = b"\xfd7zXZ\x00"
+# bzip2: "BZh" + 블록 크기(1-9) + 첫 블록 매직(또는 빈 스트림의 끝 매직)
+BZIP2_BLOCK_MAGICS = (b"\x31\x41\x59\x26\x53\x59", b"\x17\x72\x45\x38\x50\x90")
+TAR_MAGIC_OFFSET = 257
+
+# 판별 형식 -> 설명
+TYPE_DESCRIPTIONS = {
+    "pe": "PE 실행파일 (EXE/DLL)",
+    "mz": "DOS(MZ) 실행파일",
+    "pdf": "PDF 문서",
+    "zip": "ZIP 압축파일",
+    "ooxml": "MS Office Open XML 문서 (docx/xlsx/pptx)",
+    "hwpx": "HWPX 문서",
+    "ole": "OLE Compound File (doc/xls/ppt/hwp)",
+    "tar": "TAR 묶음 파일",
+    "gzip": "gzip 압축파일",
+    "bz2": "bzip2 압축파일",
+    "xz": "xz 압축파일",
+    "unknown": "알 수 없는 형식",
+}
+
+# 판별 형식 -> 대표 확장자 (잘라 낸 내장 파일을 임시 파일로 쓸 때, EXPECTED_TYPES_BY_EXT와 어긋나지 않게)
+TYPE_EXTENSIONS = {
+    "pe": ".exe", "mz": ".exe", "pdf": ".pdf", "zip": ".zip", "ooxml": ".zip", "hwpx": ".hwpx", "ole": ".doc",
+    "tar": ".tar", "gzip": ".gz", "bz2": ".bz2", "xz": ".xz",
+}
+
+# 확장자 -> 해당 확장자에서 기대되는 형식들
+EXPECTED_TYPES_BY_EXT = {
+    ".pdf": {"pdf"},
+    ".exe": {"pe", "mz"}, ".dll": {"pe"}, ".sys": {"pe"}, ".scr": {"pe"},
+    ".ocx": {"pe"}, ".cpl": {"pe"},
+    ".zip": {"zip", "ooxml", "hwpx"},
+    ".docx": {"ooxml"}, ".xlsx": {"ooxml"}, ".pptx": {"ooxml"},
+    ".docm": {"ooxml"}, ".xlsm": {"ooxml"}, ".pptm": {"ooxml"},
+    ".doc": {"ole"}, ".xls": {"ole"}, ".ppt": {"ole"}, ".hwp": {"ole"},
+    ".hwpx": {"hwpx"},
+    ".tar": {"tar"},
+    ".gz": {"gzip"}, ".tgz": {"gzip"},
+    ".bz2": {"bz2"}, ".tbz2": {"bz2"}, ".tbz": {"bz2"},
+    ".xz": {"xz"}, ".txz": {"xz"},
+}
+
+OOXML_CONTENT_TYPES = "[content_types].xml"
+# OOXML 판별 시 중앙 디렉토리에서 [Content_Types].xml을 찾는 최대 엔트리 수 (못 찾으면 ZIP으로 봄)
+_OOXML_SCAN_ENTRIES = 10000
+_HWPX_MIMETYPE = b"application/hwp+zip"
+
+
+def _sniff_pe(head: bytes, fp=None) -> str:
+    """MZ 헤더 뒤 e_lfanew가 가리키는 위치에 PE 시그니처가 있는지 확인합니다."""
+    if len(head) < 0x40:
+        return "mz"
+    e_lfanew = struct.unpack_from("<I", head, 0x3C)[0]
+    signature = head[e_lfanew:e_lfanew + 4] if e_lfanew + 4 <= len(head) else b""
+    if not signature and fp is not None and e_lfanew < 0x10000000:
+        # PE 헤더가 앞부분 밖에 있는 경우 그 위치만 4바이트 읽기
+        fp.seek(e_lfanew)
+        signature = fp.read(4)
+    return "pe" if signature == b"PE\x00\x00" else "mz"
+
+
+def _has_content_types(buf) -> bool:
+    """중앙 디렉토리에 [Content_Types].xml 엔트리가 있는지 (OOXML 패키지의 필수 파트)"""
+    try:
+        directory = zip_directory.read_directory(buf, _OOXML_SCAN_ENTRIES)
+    except (ValueError, struct.error):
+        return False
+    return any(entry.name.lower() == OOXML_CONTENT_TYPES for entry in directory.entries)
+
+
+def zip_container_type(buf) -> str:
+    """
+    ZIP 전체 내용(bytes/mmap)으로 OOXML/HWPX/ZIP을 구분합니다.
+    HWPX는 첫 엔트리(mimetype), OOXML은 중앙 디렉토리의 [Content_Types].xml로 판별합니다.
+    """
+    if buf[:4] == b"PK\x03\x04" and len(buf) >= 30:
+        name_len = struct.unpack_from("<H", buf, 26)[0]
+        first_name = buf[30:30 + name_len]
+        if first_name == b"mimetype" and _HWPX_MIMETYPE in buf[:200]:
+            return "hwpx"
+    if _has_content_types(buf):
+        return "ooxml"
+    return "zip"
+
+
+def _sniff_zip(head: bytes, fp=None) -> str:
+    """ZIP 계열: 파일이 있으면 중앙 디렉토리까지 보고, 앞부분만 있으면 HWPX가 아닌 한 ZIP으로 봅니다."""
+    if fp is None:
+        return "hwpx" if zip_container_type(head) == "hwpx" else "zip"
+    with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        return zip_container_type(buf)
+
+
+def sniff_bytes(head: bytes, fp=None) -> str:
+    """
+    파일 앞부분 바이트로 형식을 판별합니다.
+    fp: 파일 객체 (PE 헤더가 앞부분 밖에 있거나 ZIP 중앙 디렉토리를 봐야 할 때 사용)
+    """
+    if head.startswith(b"MZ"):
+        return _sniff_pe(head, fp)
+    if head.startswith(b"%PDF-"):
+        return "pdf"
+    if head.startswith(ZIP_SIGNATURES):
+        return _sniff_zip(head, fp)
+    if head.startswith(OLE_SIGNATURE):
+        return "ole"
+    if head.startswith(GZIP_SIGNATURE):
+        return "gzip"
+    if head.startswith(XZ_SIGNATURE):
+        return "xz"
+    if head.startswith(b"BZh") and head[3:4] in b"123456789" and head[4:10] in BZIP2_BLOCK_MAGICS:
+        return "bz2"
+    if head[TAR_MAGIC_OFFSET:TAR_MAGIC_OFFSET + 5] == b"ustar":
+        return "tar"
+    # 앞에 다른 데이터가 붙은 PDF (리더는 앞 1024바이트 안의 헤더를 허용)
+    if b"%PDF-" in head[:1024]:
+        return "pdf"
+    return "unknown"
+
+
+def _magic_description(head: bytes) -> Optional[str]:
+    if magic is None:
+        return None
+    try:
+        return magic.from_buffer(head)
+    except Exception:
+        return None
+
+
+def detect_file_type(filepath: str) -> Dict[str, Any]:
+    """
+    파일의 실제 형식을 판별하고 확장자와 일치하는지 확인합니다.
+    반환: {"type", "description", "extension", "extension_mismatch"}
+    """
+    with open(filepath, "rb") as fp:
+        head = fp.read(SNIFF_BYTES)
+        file_type = sniff_bytes(head, fp)
+
+    description = TYPE_DESCRIPTIONS[file_type]
+    if file_type == "unknown":
+        description = _magic_description(head) or description
+
+    return with_extension({"type": file_type, "description": description}, filepath)
+
+
+def with_extension(detection: Dict[str, Any], filepath: str) -> Dict[str, Any]:
+    """판별한 형식에 filepath의 확장자와 불일치 여부를 붙입니다. (같은 내용을 다른 이름으로 받았을 때 다시 계산)"""
+    ext = os.path.splitext(filepath)[1].lower()
+    expected = EXPECTED_TYPES_BY_EXT.get(ext)
+    return dict(detection, extension=ext, extension_mismatch=bool(expected) and detection["type"] not in expected)
+
+
+def mismatch_finding(detection: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """확장자와 실제 형식이 다르면 분석 결과에 넣을 탐지 항목을 만듭니다."""
+    if not detection["extension_mismatch"]:
+        return None
+    # 문서/압축 확장자로 위장한 실행파일은 대표적인 악성 유포 기법
+    severity = "high" if detection["type"] in ("pe", "mz") else "medium"
+    return {
+        "id": "extension_mismatch",
+        "severity": severity,
+        "description": (
+            f"확장자({detection['extension']})와 실제 파일 형식({detection['description']})이 다릅니다. "
+            "확장자를 위장한 파일일 수 있습니다."
+        ),
+    }
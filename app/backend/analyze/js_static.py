@@ -0,0 +1,218 @@
+"""
+JavaScript 정적 분석
+PDF 등에서 꺼낸 스크립트를 실행하지 않고 토큰 단위로 훑어 익스플로잇 킷에서 흔한 패턴을 찾습니다.
+- 동적 실행/디코딩: eval, unescape, String.fromCharCode, Function 생성자, 문자열 setTimeout
+- 긴 16진수 / 퍼센트(%uXXXX, %XX) 인코딩 문자열 (셸코드)
+- 힙 스프레이: 반복문 안에서 문자열을 키우거나 배열을 채우는 패턴, 0x0c0c0c0c 같은 NOP 슬레드 값
+- 알려진 취약 API 호출 (util.printf, Collab.getIcon 등)
+같은 익스플로잇 킷 스크립트가 수많은 파일에 반복해서 들어 있으므로 결과를 스크립트 SHA-256으로 캐시합니다.
+(프로세스마다 LRU, 분석기 워커 프로세스에서는 요청 사이에 유지됨)
+"""
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+
+# 분석할 최대 스크립트 크기 (넘는 부분은 보지 않음)
+MAX_SCRIPT_BYTES = 2 * 1024 * 1024
+# 결과 캐시 크기 (스크립트 수)
+SCRIPT_CACHE_SIZE = 1024
+# 이 길이 이상인 인코딩 문자열을 페이로드로 봅니다.
+LONG_STRING_LENGTH = 1024
+# 반복문 키워드 뒤 몇 토큰 안을 본문으로 볼지
+LOOP_WINDOW_TOKENS = 48
+# 반복 횟수로 보기에 큰 숫자 (힙 스프레이)
+LARGE_LOOP_COUNT = 0x1000
+
+TOKEN_RE = re.compile(
+    r"(?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))"
+    r"|(?P<string>\"(?:[^\"\\\n]|\\.)*\"?|'(?:[^'\\\n]|\\.)*'?)"
+    r"|(?P<name>[A-Za-z_$][\w$]*)"
+    r"|(?P<number>0[xX][0-9A-Fa-f]+|\d+(?:\.\d*)?(?:[eE][+-]?\d+)?)"
+    r"|(?P<op>\+=|[{}()\[\];,.=+])"
+    r"|(?P<other>\S)",
+    re.S,
+)
+HEX_STRING_RE = re.compile(r"(?:[0-9A-Fa-f]{2}){%d,}" % (LONG_STRING_LENGTH // 2))
+PERCENT_ENCODED_RE = re.compile(r"(?:%%u[0-9A-Fa-f]{4}|%%[0-9A-Fa-f]{2}){%d,}" % (LONG_STRING_LENGTH // 6))
+NOP_SLED_RE = re.compile(r"(?i)(?:%u0c0c|%u0a0a|%u9090|\\x0c\\x0c|\\x90\\x90){4,}|0x0c0c0c0c|0x0a0a0a0a|0x90909090")
+
+# 동적 실행/디코딩 함수 -> (규칙, 설명, 가중치)
+DYNAMIC_CALLS = {
+    "eval": ("eval", "eval()로 문자열 코드 실행", 2),
+    "unescape": ("unescape", "unescape()로 인코딩된 데이터 복원 (셸코드 디코딩에 흔함)", 2),
+    "String.fromCharCode": ("from_char_code", "String.fromCharCode()로 문자열 조립 (난독화)", 1),
+    "Function": ("function_constructor", "Function 생성자로 문자열 코드 실행", 2),
+    "app.setTimeOut": ("string_timeout", "app.setTimeOut()으로 문자열 코드 지연 실행", 2),
+    "setTimeout": ("string_timeout", "setTimeout()으로 문자열 코드 지연 실행", 1),
+}
+
+# 알려진 취약 API -> 관련 취약점
+EXPLOIT_APIS = {
+    "util.printf": "CVE-2008-2992 (util.printf 버퍼 오버플로)",
+    "util.printd": "CVE-2009-4324 계열 (util.printd)",
+    "Collab.collectEmailInfo": "CVE-2007-5659 (Collab.collectEmailInfo)",
+    "Collab.getIcon": "CVE-2009-0927 (Collab.getIcon)",
+    "media.newPlayer": "CVE-2009-4324 (media.newPlayer)",
+    "spell.customDictionaryOpen": "CVE-2009-1493 (spell.customDictionaryOpen)",
+    "getAnnots": "CVE-2009-1492 (getAnnots)",
+    "printSeps": "CVE-2010-4091 (Doc.printSeps)",
+    "exportDataObject": "내장 파일 추출/실행 (exportDataObject)",
+    "app.launchURL": "외부 URL 열기 (app.launchURL)",
+    "app.openDoc": "다른 문서 열기 (app.openDoc)",
+    "submitForm": "폼 데이터 외부 전송 (submitForm)",
+}
+EXPLOIT_WEIGHT = 5
+ENCODED_STRING_WEIGHT = 3
+HEAP_SPRAY_WEIGHT = 5
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def tokenize(source):
+    """(종류, 값) 토큰 목록 (주석 제외)"""
+    tokens = []
+    for match in TOKEN_RE.finditer(source):
+        kind = match.lastgroup
+        if kind != "comment":
+            tokens.append((kind, match.group()))
+    return tokens
+
+
+def _dotted_calls(tokens):
+    """함수 호출 이름 목록: a.b.c( 형태는 'a.b.c'로 합칩니다. 반환: [(이름, 토큰 위치)]"""
+    calls = []
+    for index, (kind, value) in enumerate(tokens):
+        if value != "(" or index == 0 or tokens[index - 1][0] != "name":
+            continue
+        parts = [tokens[index - 1][1]]
+        position = index - 2
+        while position >= 1 and tokens[position][1] == "." and tokens[position - 1][0] == "name":
+            parts.append(tokens[position - 1][1])
+            position -= 2
+        calls.append((".".join(reversed(parts)), index))
+    return calls
+
+
+def _call_matches(call, name):
+    """호출 이름이 규칙과 같거나 규칙으로 끝나는지 (this.getAnnots, doc.printSeps 등)"""
+    return call == name or call.endswith("." + name)
+
+
+def _string_argument(tokens, index):
+    return index + 1 < len(tokens) and tokens[index + 1][0] == "string"
+
+
+def _heap_spray(tokens):
+    """반복문 본문에서 문자열 키우기(x += x, s += "...")/배열 채우기 + 큰 반복 횟수를 찾습니다."""
+    reasons = []
+    for index, (kind, value) in enumerate(tokens):
+        if kind != "name" or value not in ("for", "while"):
+            continue
+        window = tokens[index:index + LOOP_WINDOW_TOKENS]
+        large = any(k == "number" and _number(v) >= LARGE_LOOP_COUNT for k, v in window)
+        grows = False
+        fills = False
+        for position in range(1, len(window) - 2):
+            if window[position][1] == "+=" and window[position - 1][0] == "name":
+                target = window[position - 1][1]
+                if window[position + 1][1] == target or window[position + 1][0] == "string":
+                    grows = True
+            if window[position][1] == "]" and window[position + 1][1] == "=":
+                fills = True
+        if large and (grows or fills):
+            reasons.append("큰 반복 횟수의 반복문에서 " + ("문자열을 키움" if grows else "배열을 채움"))
+    return reasons
+
+
+def _number(value):
+    try:
+        return int(value, 16) if value[:2] in ("0x", "0X") else float(value)
+    except ValueError:
+        return 0
+
+
+def _add(findings, rule, description, weight, detail=None):
+    for item in findings:
+        if item["rule"] == rule and item["description"] == description:
+            item["count"] += 1
+            return
+    findings.append({"rule": rule, "description": description, "weight": weight, "count": 1, "detail": detail})
+
+
+def _analyze(source):
+    tokens = tokenize(source)
+    findings = []
+
+    for call, index in _dotted_calls(tokens):
+        for name, (rule, description, weight) in DYNAMIC_CALLS.items():
+            if not _call_matches(call, name):
+                continue
+            # setTimeout/Function은 문자열 인자일 때만 코드 실행
+            if rule in ("string_timeout", "function_constructor") and not _string_argument(tokens, index):
+                continue
+            _add(findings, rule, description, weight)
+        for name, description in EXPLOIT_APIS.items():
+            if _call_matches(call, name):
+                _add(findings, "exploit_api", description, EXPLOIT_WEIGHT, call)
+
+    longest = 0
+    for kind, value in tokens:
+        if kind != "string":
+            continue
+        longest = max(longest, len(value))
+        if len(value) < LONG_STRING_LENGTH:
+            continue
+        if HEX_STRING_RE.search(value):
+            _add(findings, "long_hex_string", "긴 16진수 인코딩 문자열 (셸코드 의심)", ENCODED_STRING_WEIGHT, len(value))
+        elif PERCENT_ENCODED_RE.search(value):
+            _add(findings, "long_percent_string", "긴 %u/% 인코딩 문자열 (셸코드 의심)", ENCODED_STRING_WEIGHT, len(value))
+
+    if NOP_SLED_RE.search(source):
+        _add(findings, "nop_sled", "NOP 슬레드 값(0x0c0c0c0c, %u9090 등)", HEAP_SPRAY_WEIGHT)
+    for reason in _heap_spray(tokens):
+        _add(findings, "heap_spray", reason, HEAP_SPRAY_WEIGHT)
+
+    return {
+        "tokens": len(tokens),
+        "longest_string": longest,
+        "findings": findings,
+        "score": sum(item["weight"] * min(item["count"], 3) for item in findings),
+    }
+
+
+def analyze_script(script):
+    """
+    스크립트(str 또는 bytes) 하나를 분석합니다. 같은 내용은 캐시한 결과를 돌려줍니다.
+    반환: {"sha256", "size", "tokens", "longest_string", "findings", "score", "cached"}
+    """
+    if isinstance(script, str):
+        data = script.encode("utf-8", "surrogatepass")
+    else:
+        data = bytes(script)
+        script = data.decode("latin-1")
+    sha256 = hashlib.sha256(data).hexdigest()
+
+    with _cache_lock:
+        cached = _cache.get(sha256)
+        if cached is not None:
+            _cache.move_to_end(sha256)
+            _cache_stats["hits"] += 1
+            return dict(cached, cached=True)
+        _cache_stats["misses"] += 1
+
+    result = _analyze(script[:MAX_SCRIPT_BYTES])
+    result.update({"sha256": sha256, "size": len(data), "truncated": len(script) > MAX_SCRIPT_BYTES})
+
+    with _cache_lock:
+        _cache[sha256] = result
+        while len(_cache) > SCRIPT_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return dict(result, cached=False)
+
+
+def cache_stats():
+    with _cache_lock:
+        return dict(_cache_stats, entries=len(_cache), max_entries=SCRIPT_CACHE_SIZE)
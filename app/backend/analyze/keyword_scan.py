@@ -0,0 +1,39 @@
+"""
+다중 키워드 스캐너
+여러 바이트 키워드를 정규식 하나(대안 |)로 묶어 mmap/bytes 버퍼를 finditer로 한 번만 훑으며
+키워드별 개수와 위치(바이트 오프셋)를 구합니다. (복사 없음, 메모리는 파일 크기와 무관)
+압축 파일 내부 엔트리도 Spool에 받은 뒤 mmap/bytes로 넘기므로 버퍼 입력만 지원합니다.
+같은 키워드의 일치는 겹치지 않게 세므로, 키워드끼리 겹치지 않는 한 키워드별 개수는 bytes.count()와 같습니다.
+(한 키워드가 다른 키워드의 접두어이면 같은 위치에서는 긴 키워드만 셈)
+"""
+import re
+
+
+class KeywordScanner:
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keywords))
+        if not self.keywords or not all(self.keywords):
+            raise ValueError("빈 키워드는 검색할 수 없습니다")
+        # 긴 키워드를 먼저 두어 같은 위치에서는 긴 쪽이 일치하도록 합니다.
+        # (캡처 그룹을 쓰면 re의 접두 문자 최적화가 꺼져 수십 배 느려지므로 일치한 바이트로 키워드를 구분)
+        ordered = sorted(self.keywords, key=len, reverse=True)
+        self.pattern = re.compile(b"|".join(re.escape(keyword) for keyword in ordered))
+
+    def _empty(self):
+        return {keyword: {"count": 0, "offsets": []} for keyword in self.keywords}
+
+    def _add(self, hits, match, max_offsets):
+        hit = hits[match.group()]
+        hit["count"] += 1
+        if max_offsets is None or len(hit["offsets"]) < max_offsets:
+            hit["offsets"].append(match.start())
+
+    def scan(self, buf, max_offsets=None, start=0, end=None):
+        """
+        mmap/bytes 전체(또는 [start, end) 범위)를 한 번에 훑습니다. (범위를 줘도 복사하지 않음, 오프셋은 buf 기준)
+        반환: {keyword: {"count", "offsets"}} (offsets는 키워드마다 앞에서부터 최대 max_offsets개, None이면 전부)
+        """
+        hits = self._empty()
+        for match in self.pattern.finditer(buf, start, len(buf) if end is None else end):
+            self._add(hits, match, max_offsets)
+        return hits
@@ -0,0 +1,343 @@
+"""
+PDF 객체 탐색기
+PDF 전체를 파싱하지 않고 간접 객체(`N G obj ... endobj`)만 순서대로 찾아 사전(dictionary) 부분을 돌려줍니다.
+- 이름의 #xx 이스케이프(/J#61vaScript -> /JavaScript)를 풀어 둡니다.
+- 압축된 객체 스트림(/ObjStm)은 필요할 때만 풀어서 안에 든 객체도 같은 형식으로 돌려줍니다.
+- 스트림 해제는 파일마다 정한 예산(DecodeBudget) 안에서만 하며, 예산을 넘으면 더 풀지 않습니다. (압축 폭탄 방어)
+지원 필터: FlateDecode(PNG predictor 포함), ASCIIHexDecode (그 밖의 필터나 TIFF predictor가 있는 스트림은 풀지 않음)
+"""
+import re
+import zlib
+
+# 파일 하나에서 스트림을 풀어 만들 수 있는 최대 바이트 수 / 스트림 하나의 최대 크기
+DEFAULT_DECODE_BUDGET = 64 * 1024 * 1024
+MAX_STREAM_OUTPUT = 16 * 1024 * 1024
+# 탐색할 최대 객체 수 (객체 스트림 내부 포함)
+MAX_OBJECTS = 200000
+# 객체 사전으로 돌려주는 최대 길이 (이보다 긴 부분은 잘라냄)
+MAX_DICTIONARY_BYTES = 1024 * 1024
+
+OBJECT_HEADER_RE = re.compile(rb"(\d{1,10})[ \t\r\n\f\x00]+(\d{1,5})[ \t\r\n\f\x00]+obj\b")
+STREAM_RE = re.compile(rb"stream\r?\n?")
+ENDSTREAM_RE = re.compile(rb"[\r\n]*endstream")
+# #xx 이스케이프가 들어 있는 이름 토큰 / 이스케이프 하나
+ESCAPED_NAME_RE = re.compile(rb"/[^\x00\t\n\f\r ()<>\[\]{}/%]*#[0-9A-Fa-f]{2}[^\x00\t\n\f\r ()<>\[\]{}/%]*")
+NAME_ESCAPE_RE = re.compile(rb"#([0-9A-Fa-f]{2})")
+LENGTH_RE = re.compile(rb"/Length[ \t\r\n\f\x00]+(\d+)(?![ \t\r\n\f\x00]+\d+[ \t\r\n\f\x00]+R)")
+FILTER_RE = re.compile(rb"/Filter[ \t\r\n\f\x00]*(\[[^\]]*\]|/[^\x00\t\n\f\r ()<>\[\]{}/%]+)")
+FILTER_NAME_RE = re.compile(rb"/([^\x00\t\n\f\r ()<>\[\]{}/%]+)")
+INTEGER_KEY_RE = {
+    key: re.compile(rb"/" + key + rb"[ \t\r\n\f\x00]+(\d+)")
+    for key in (b"N", b"First", b"Predictor", b"Columns")
+}
+
+FLATE_FILTERS = (b"FlateDecode", b"Fl")
+ASCII_HEX_FILTERS = (b"ASCIIHexDecode", b"AHx")
+
+
+def normalize_names(data):
+    """이름 토큰의 #xx 이스케이프를 풉니다. (/J#61vaScript -> /JavaScript)"""
+    if b"#" not in data:
+        return data
+    return ESCAPED_NAME_RE.sub(
+        lambda name: NAME_ESCAPE_RE.sub(lambda escape: bytes([int(escape.group(1), 16)]), name.group()), data)
+
+
+class DecodeBudget:
+    """파일 하나에서 스트림을 풀 수 있는 남은 바이트 수"""
+
+    def __init__(self, limit=DEFAULT_DECODE_BUDGET):
+        self.limit = limit
+        self.used = 0
+        self.exhausted = False
+        self.errors = 0
+
+    @property
+    def remaining(self):
+        return max(0, self.limit - self.used)
+
+    def take(self, size):
+        self.used += size
+
+
+class PdfObject:
+    """
+    간접 객체 하나
+    number/generation: 객체 번호, offset/end: 파일 안의 위치 (객체 스트림 안의 객체는 담고 있는 스트림 객체의 위치)
+    container: 담고 있는 객체 스트림의 번호 (파일에 직접 있으면 None)
+    dictionary: 스트림 앞부분(사전 등)의 원본 바이트, normalized: 이름 이스케이프를 푼 사전
+    """
+
+    __slots__ = ("number", "generation", "offset", "end", "container", "dictionary", "normalized",
+                 "stream_start", "stream_end")
+
+    def __init__(self, number, generation, offset, end, dictionary, container=None,
+                 stream_start=None, stream_end=None):
+        self.number = number
+        self.generation = generation
+        self.offset = offset
+        self.end = end
+        self.container = container
+        self.dictionary = dictionary
+        self.normalized = normalize_names(dictionary)
+        self.stream_start = stream_start
+        self.stream_end = stream_end
+
+    @property
+    def has_stream(self):
+        return self.stream_start is not None
+
+    def filters(self):
+        """스트림 필터 이름 목록 (이스케이프를 푼 사전 기준)"""
+        match = FILTER_RE.search(self.normalized)
+        if not match:
+            return []
+        return FILTER_NAME_RE.findall(match.group(1))
+
+    def integer(self, key):
+        match = INTEGER_KEY_RE[key].search(self.normalized)
+        return int(match.group(1)) if match else None
+
+    @property
+    def is_object_stream(self):
+        return self.has_stream and b"/ObjStm" in self.normalized
+
+
+def _ascii_hex_decode(data):
+    data = re.sub(rb"[^0-9A-Fa-f>]", b"", bytes(data)).split(b">", 1)[0]
+    if len(data) % 2:
+        data += b"0"
+    return bytes.fromhex(data.decode("ascii"))
+
+
+def _png_unpredict(data, columns):
+    """PNG predictor(/Predictor 10~15)를 되돌립니다. 행마다 앞 1바이트가 predictor 종류 (바이트당 색 성분 1개 기준)"""
+    width = columns + 1
+    previous = bytes(columns)
+    rows = []
+    for start in range(0, len(data) - width + 1, width):
+        kind = data[start]
+        row = data[start + 1:start + width]
+        if kind == 0:
+            pass
+        elif kind == 2:  # Up (교차 참조 스트림에서 대부분 이것)
+            row = bytes((a + b) & 0xFF for a, b in zip(row, previous))
+        elif kind in (1, 3, 4):
+            out = bytearray(columns)
+            for i in range(columns):
+                left = out[i - 1] if i else 0
+                up = previous[i]
+                if kind == 1:
+                    base = left
+                elif kind == 3:
+                    base = (left + up) >> 1
+                else:
+                    corner = previous[i - 1] if i else 0
+                    estimate = left + up - corner
+                    pa, pb, pc = abs(estimate - left), abs(estimate - up), abs(estimate - corner)
+                    base = left if pa <= pb and pa <= pc else up if pb <= pc else corner
+                out[i] = (row[i] + base) & 0xFF
+            row = bytes(out)
+        else:
+            raise ValueError(f"알 수 없는 PNG predictor: {kind}")
+        rows.append(row)
+        previous = row
+    return b"".join(rows)
+
+
+def decode_stream(buf, obj, budget):
+    """
+    객체의 스트림을 필터 순서대로 풀어 돌려줍니다. 풀 수 없거나 예산이 없으면 None
+    (필터가 없으면 원본 바이트)
+    """
+    if not obj.has_stream or obj.container is not None:
+        return None
+    predictor = obj.integer(b"Predictor") or 1
+    if predictor != 1 and predictor < 10:
+        return None
+    filters = obj.filters()
+
+    data = buf[obj.stream_start:obj.stream_end]
+    for name in filters:
+        if budget.remaining <= 0:
+            budget.exhausted = True
+            return None
+        limit = min(budget.remaining, MAX_STREAM_OUTPUT)
+        try:
+            if name in FLATE_FILTERS:
+                inflater = zlib.decompressobj()
+                decoded = inflater.decompress(data, limit)
+                if inflater.unconsumed_tail:
+                    budget.exhausted = True
+                if predictor >= 10:
+                    decoded = _png_unpredict(decoded, obj.integer(b"Columns") or 1)
+            elif name in ASCII_HEX_FILTERS:
+                decoded = _ascii_hex_decode(data)[:limit]
+            else:
+                return None
+        except (zlib.error, ValueError):
+            budget.errors += 1
+            return None
+        budget.take(len(decoded))
+        data = decoded
+    return data
+
+
+def _find_stream_end(buf, obj_dictionary, data_start, limit):
+    """스트림 데이터의 끝: /Length가 맞으면 그 값, 아니면 endstream 위치"""
+    match = LENGTH_RE.search(obj_dictionary)
+    if match:
+        end = data_start + int(match.group(1))
+        if end <= limit and ENDSTREAM_RE.match(buf, end, min(limit, end + 64)):
+            return end
+    end = buf.find(b"endstream", data_start, limit)
+    if end < 0:
+        return limit
+    while end > data_start and buf[end - 1:end] in (b"\r", b"\n"):
+        end -= 1
+    return end
+
+
+def _iter_file_objects(buf, position=0):
+    """파일에 직접 들어 있는 간접 객체 (position부터)"""
+    size = len(buf)
+    while True:
+        header = OBJECT_HEADER_RE.search(buf, position)
+        if header is None:
+            return
+        body_start = header.end()
+        endobj = buf.find(b"endobj", body_start)
+        object_end = size if endobj < 0 else endobj
+        # 사전 뒤의 stream 키워드 (다음 객체의 것이 아닌지 endobj 위치와 비교)
+        stream = STREAM_RE.search(buf, body_start, object_end)
+        stream_start = stream_end = None
+        if stream is not None:
+            dictionary = buf[body_start:stream.start()]
+            stream_start = stream.end()
+            stream_end = _find_stream_end(buf, normalize_names(dictionary), stream_start, size)
+            endobj = buf.find(b"endobj", stream_end)
+            object_end = size if endobj < 0 else endobj
+        else:
+            dictionary = buf[body_start:min(object_end, body_start + MAX_DICTIONARY_BYTES)]
+        end = object_end if endobj < 0 else endobj + 6
+        yield PdfObject(int(header.group(1)), int(header.group(2)), header.start(), end,
+                        bytes(dictionary[:MAX_DICTIONARY_BYTES]), None, stream_start, stream_end)
+        position = max(end, body_start)
+
+
+def _iter_stream_objects(stream_object, decoded):
+    """객체 스트림을 푼 데이터 안의 객체 (헤더: '객체번호 오프셋' 쌍 N개, 본문은 /First부터)"""
+    count = stream_object.integer(b"N")
+    first = stream_object.integer(b"First")
+    if not count or first is None or first > len(decoded):
+        return
+    numbers = re.findall(rb"\d+", decoded[:first])
+    pairs = [(int(numbers[i]), int(numbers[i + 1])) for i in range(0, min(len(numbers) - 1, count * 2), 2)]
+    for index, (number, offset) in enumerate(pairs):
+        start = first + offset
+        end = first + pairs[index + 1][1] if index + 1 < len(pairs) else len(decoded)
+        if start >= len(decoded) or end < start:
+            continue
+        yield PdfObject(number, 0, stream_object.offset, stream_object.end,
+                        decoded[start:min(end, start + MAX_DICTIONARY_BYTES)], stream_object.number)
+
+
+def read_object(buf, offset):
+    """offset에서 시작하는 간접 객체 하나 (walk 중 기록해 둔 위치로 다시 읽을 때)"""
+    return next(_iter_file_objects(buf, offset), None)
+
+
+# ==========================================
+# 문자열 객체
+# ==========================================
+_LITERAL_ESCAPES = {
+    ord("n"): b"\n", ord("r"): b"\r", ord("t"): b"\t", ord("b"): b"\b", ord("f"): b"\f",
+    ord("("): b"(", ord(")"): b")", ord("\\"): b"\\",
+}
+REFERENCE_RE = re.compile(rb"(\d{1,10})[ \t\r\n\f\x00]+(\d{1,5})[ \t\r\n\f\x00]+R\b")
+
+
+def read_literal_string(data, start, limit):
+    """
+    data[start]의 '('부터 짝이 맞는 ')'까지 PDF 리터럴 문자열을 풉니다. (\\ 이스케이프, 8진수, 줄 이어쓰기)
+    반환: (문자열 bytes, 끝 위치). 결과는 최대 limit 바이트
+    """
+    out = bytearray()
+    depth = 0
+    position = start
+    size = len(data)
+    while position < size and len(out) < limit:
+        byte = data[position]
+        if byte == 0x5C:  # 역슬래시
+            position += 1
+            if position >= size:
+                break
+            byte = data[position]
+            if byte in _LITERAL_ESCAPES:
+                out += _LITERAL_ESCAPES[byte]
+            elif 0x30 <= byte <= 0x37:
+                digits = data[position:position + 3]
+                length = 1
+                while length < len(digits) and 0x30 <= digits[length] <= 0x37:
+                    length += 1
+                out.append(int(digits[:length], 8) & 0xFF)
+                position += length - 1
+            elif byte == 0x0D:
+                if data[position + 1:position + 2] == b"\n":
+                    position += 1
+            elif byte != 0x0A:
+                out.append(byte)
+        elif byte == 0x28:  # (
+            depth += 1
+            if depth > 1:
+                out.append(byte)
+        elif byte == 0x29:  # )
+            depth -= 1
+            if depth == 0:
+                return bytes(out), position + 1
+            out.append(byte)
+        else:
+            out.append(byte)
+        position += 1
+    return bytes(out), position
+
+
+def read_hex_string(data, start, limit):
+    """data[start]의 '<'부터 '>'까지 16진수 문자열을 풉니다. 반환: (문자열 bytes, 끝 위치)"""
+    end = data.find(b">", start)
+    end = len(data) if end < 0 else end
+    digits = re.sub(rb"[^0-9A-Fa-f]", b"", data[start + 1:end])[:limit * 2]
+    if len(digits) % 2:
+        digits += b"0"
+    return bytes.fromhex(digits.decode("ascii")), end + 1
+
+
+def text_from_string(value):
+    """PDF 문자열의 텍스트 (UTF-16BE BOM이 있으면 UTF-16, 아니면 Latin-1)"""
+    if value[:2] == b"\xfe\xff":
+        return value[2:].decode("utf-16-be", "replace")
+    return value.decode("latin-1")
+
+
+def walk_objects(buf, budget=None, max_objects=MAX_OBJECTS):
+    """
+    PDF의 간접 객체를 파일 순서대로 돌려줍니다. 객체 스트림은 그 객체 바로 뒤에 안의 객체들을 이어서 돌려줍니다.
+    budget: DecodeBudget (None이면 기본 예산으로 새로 만듦)
+    """
+    budget = budget or DecodeBudget()
+    count = 0
+    for obj in _iter_file_objects(buf):
+        if count >= max_objects:
+            return
+        count += 1
+        yield obj
+        if not obj.is_object_stream:
+            continue
+        decoded = decode_stream(buf, obj, budget)
+        if decoded is None:
+            continue
+        for inner in _iter_stream_objects(obj, decoded):
+            if count >= max_objects:
+                return
+            count += 1
+            yield inner
@@ -0,0 +1,335 @@
+"""
+PDF 리비전(증분 업데이트) 구조 분석
+파일 끝의 startxref에서 시작해 교차 참조(xref 테이블 또는 xref 스트림)와 trailer의 /Prev를 거꾸로 따라가며
+리비전 목록을 만듭니다. 파일 전체를 읽지 않고 mmap에서 필요한 위치만 봅니다.
+- 리비전: 원본 문서와, 그 뒤에 덧붙은 증분 업데이트 (파일 순서로 0, 1, 2 ...)
+- 각 리비전의 바이트 범위: 앞 리비전의 끝부터 자기 xref 뒤의 %%EOF까지
+- 이상 징후: 마지막 %%EOF 뒤의 데이터, xref가 가리키지 않는 객체(orphan), 여러 리비전에서 다시 정의된 객체,
+  xref 오프셋이 객체를 가리키지 않음, /Prev 체인에 연결되지 않은 %%EOF 구간
+선형화(Linearized) 파일은 첫 페이지용 xref 구간이 따로 있으므로 앞의 두 구간을 원본으로 봅니다.
+"""
+import re
+import bisect
+
+try:
+    from app.backend.analyze import pdf_objects
+except ImportError:  # analyze 디렉토리에서 직접 실행한 경우
+    import pdf_objects
+
+# 따라갈 최대 리비전 수 (/Prev 체인)
+MAX_REVISIONS = 100
+# 리비전 하나의 xref에서 읽을 최대 항목 수
+MAX_XREF_ENTRIES = 1000000
+# 결과에 담는 객체 번호 목록의 최대 길이
+MAX_LISTED_OBJECTS = 50
+# 이 크기 이하의 %%EOF 뒤 데이터는 (공백/NUL이 아니어도) 작성기 찌꺼기로 봅니다.
+TRAILING_GARBAGE_BYTES = 32
+# startxref는 파일 끝 근처에 있으므로 먼저 이 크기만큼만 뒤에서 찾습니다.
+TAIL_BYTES = 4096
+
+WHITESPACE = b" \t\r\n\f\x00"
+STARTXREF_RE = re.compile(rb"startxref[ \t\r\n\f\x00]+(\d+)")
+XREF_OBJECT_RE = re.compile(rb"[ \t\r\n\f\x00]*(\d{1,10})[ \t\r\n\f\x00]+(\d{1,5})[ \t\r\n\f\x00]+obj\b")
+TRAILER_INTEGER_RE = {
+    key: re.compile(rb"/" + key + rb"[ \t\r\n\f\x00]+(\d+)")
+    for key in (b"Prev", b"Size", b"XRefStm")
+}
+TRAILER_REFERENCE_RE = {
+    key: re.compile(rb"/" + key + rb"[ \t\r\n\f\x00]+(\d+)[ \t\r\n\f\x00]+(\d+)[ \t\r\n\f\x00]+R")
+    for key in (b"Root", b"Info", b"Encrypt")
+}
+W_RE = re.compile(rb"/W[ \t\r\n\f\x00]*\[([^\]]*)\]")
+INDEX_RE = re.compile(rb"/Index[ \t\r\n\f\x00]*\[([^\]]*)\]")
+
+
+class Revision:
+    """
+    리비전 하나 (xref 구간 하나)
+    entries: {객체 번호: (종류, 값1, 값2)}  종류 'n'(파일 오프셋, 세대), 'c'(객체 스트림 번호, 인덱스), 'f'(해제)
+    start/end: 리비전이 차지하는 파일 범위, eof: xref 뒤 %%EOF의 위치 (없으면 None)
+    """
+
+    __slots__ = ("xref_offset", "xref_type", "trailer", "entries", "start", "end", "eof")
+
+    def __init__(self, xref_offset, xref_type, trailer, entries):
+        self.xref_offset = xref_offset
+        self.xref_type = xref_type
+        self.trailer = trailer
+        self.entries = entries
+        self.start = 0
+        self.end = None
+        self.eof = None
+
+    def in_use(self):
+        return [number for number, entry in self.entries.items() if entry[0] != "f"]
+
+
+def _trailer_fields(data):
+    fields = {}
+    for key, pattern in TRAILER_INTEGER_RE.items():
+        match = pattern.search(data)
+        fields[key.decode().lower()] = int(match.group(1)) if match else None
+    for key, pattern in TRAILER_REFERENCE_RE.items():
+        match = pattern.search(data)
+        fields[key.decode().lower()] = int(match.group(1)) if match else None
+    return fields
+
+
+def _parse_xref_table(buf, offset):
+    """'xref' 테이블: '시작번호 개수' 줄 다음에 '오프셋 세대 n|f' 항목이 이어지고 trailer 사전으로 끝납니다."""
+    trailer_at = buf.find(b"trailer", offset)
+    if trailer_at < 0:
+        raise ValueError("trailer가 없습니다")
+    tokens = bytes(buf[offset + 4:trailer_at]).split()
+    entries = {}
+    position = 0
+    while position + 1 < len(tokens) and len(entries) < MAX_XREF_ENTRIES:
+        first, count = int(tokens[position]), int(tokens[position + 1])
+        position += 2
+        for number in range(first, first + count):
+            if position + 3 > len(tokens):
+                break
+            value, generation, kind = tokens[position:position + 3]
+            position += 3
+            entries[number] = ("f" if kind == b"f" else "n", int(value), int(generation))
+    end = buf.find(b"startxref", trailer_at)
+    trailer = bytes(buf[trailer_at:end if end > 0 else trailer_at + pdf_objects.MAX_DICTIONARY_BYTES])
+    return entries, _trailer_fields(trailer)
+
+
+def _parse_xref_stream(buf, offset, budget):
+    """xref 스트림 객체 (/Type /XRef): /W 폭의 이진 항목, /Index 구간 (trailer 항목은 스트림 사전에 있음)"""
+    obj = pdf_objects.read_object(buf, offset)
+    if obj is None or obj.offset - offset > 64 or b"/XRef" not in obj.normalized:
+        raise ValueError("xref 스트림이 아닙니다")
+    w = W_RE.search(obj.normalized)
+    widths = [int(value) for value in re.findall(rb"\d+", w.group(1))] if w else []
+    if len(widths) != 3 or sum(widths) == 0:
+        raise ValueError("/W가 올바르지 않습니다")
+    data = pdf_objects.decode_stream(buf, obj, budget)
+    if data is None:
+        raise ValueError("xref 스트림을 풀 수 없습니다")
+    trailer = _trailer_fields(obj.normalized)
+    index = INDEX_RE.search(obj.normalized)
+    numbers = [int(value) for value in re.findall(rb"\d+", index.group(1))] if index else [0, trailer["size"] or 0]
+
+    entries = {}
+    row = sum(widths)
+    position = 0
+    for first, count in zip(numbers[0::2], numbers[1::2]):
+        for number in range(first, first + count):
+            if position + row > len(data) or len(entries) >= MAX_XREF_ENTRIES:
+                return entries, trailer
+            fields = []
+            for width in widths:
+                fields.append(int.from_bytes(data[position:position + width], "big"))
+                position += width
+            kind = fields[0] if widths[0] else 1
+            if kind == 0:
+                entries[number] = ("f", fields[1], fields[2])
+            elif kind == 1:
+                entries[number] = ("n", fields[1], fields[2])
+            elif kind == 2:
+                entries[number] = ("c", fields[1], fields[2])
+    return entries, trailer
+
+
+def _read_revision(buf, offset, budget):
+    if buf[offset:offset + 4] == b"xref":
+        entries, trailer = _parse_xref_table(buf, offset)
+        revision = Revision(offset, "table", trailer, entries)
+        # 하이브리드 파일: 테이블 trailer의 /XRefStm이 가리키는 스트림 항목을 보탭니다.
+        if trailer["xrefstm"] is not None and trailer["xrefstm"] < len(buf):
+            extra, _ = _parse_xref_stream(buf, trailer["xrefstm"], budget)
+            for number, entry in extra.items():
+                entries.setdefault(number, entry)
+        return revision
+    entries, trailer = _parse_xref_stream(buf, offset, budget)
+    return Revision(offset, "stream", trailer, entries)
+
+
+def find_startxref(buf):
+    """파일 끝의 마지막 startxref 값 (뒤쪽 TAIL_BYTES를 먼저 보고, 없으면 파일 전체를 뒤에서부터 찾음)"""
+    size = len(buf)
+    at = buf.rfind(b"startxref", max(0, size - TAIL_BYTES))
+    if at < 0:
+        at = buf.rfind(b"startxref")
+    if at < 0:
+        return None
+    match = STARTXREF_RE.match(buf, at)
+    return int(match.group(1)) if match else None
+
+
+def read_revisions(buf, budget=None, max_revisions=MAX_REVISIONS):
+    """
+    startxref부터 /Prev를 거꾸로 따라가 리비전을 읽습니다.
+    반환: (파일 순서로 정렬한 [Revision], [오류 메시지])
+    """
+    budget = budget or pdf_objects.DecodeBudget()
+    size = len(buf)
+    revisions = []
+    errors = []
+    offset = find_startxref(buf)
+    if offset is None:
+        return revisions, ["startxref가 없습니다"]
+    seen = set()
+    while offset is not None and len(revisions) < max_revisions:
+        if offset in seen:
+            errors.append(f"/Prev가 순환합니다 (0x{offset:X})")
+            break
+        seen.add(offset)
+        if offset >= size:
+            errors.append(f"xref 오프셋이 파일 밖입니다 (0x{offset:X})")
+            break
+        try:
+            revision = _read_revision(buf, offset, budget)
+        except (ValueError, IndexError) as e:
+            errors.append(f"0x{offset:X}의 xref를 읽지 못했습니다: {e}")
+            break
+        revisions.append(revision)
+        offset = revision.trailer["prev"]
+
+    revisions.sort(key=lambda revision: revision.xref_offset)
+    start = 0
+    for index, revision in enumerate(revisions):
+        eof = buf.find(b"%%EOF", revision.xref_offset)
+        following = revisions[index + 1].xref_offset if index + 1 < len(revisions) else size
+        if 0 <= eof < following:
+            revision.eof = eof
+            revision.end = eof + 5
+        else:
+            revision.end = following
+        revision.start = start
+        start = revision.end
+    return revisions, errors
+
+
+def is_linearized(buf):
+    """첫 객체가 선형화 사전인지 (파일 앞 1KB만 봄)"""
+    return b"/Linearized" in pdf_objects.normalize_names(bytes(buf[:1024]))
+
+
+def revision_finder(revisions):
+    """
+    파일 오프셋 -> 리비전 번호 함수 (리비전이 없으면 항상 None)
+    리비전 i는 자기 시작부터 다음 리비전 시작 전까지이고, 마지막 리비전 뒤의 데이터는 마지막 리비전에 넣습니다.
+    """
+    starts = [revision.start for revision in revisions]
+
+    def revision_of(offset):
+        if not revisions:
+            return None
+        return max(0, bisect.bisect_right(starts, offset) - 1)
+    return revision_of
+
+
+def _eof_markers(buf):
+    markers = []
+    at = buf.find(b"%%EOF")
+    while at >= 0:
+        markers.append(at)
+        at = buf.find(b"%%EOF", at + 5)
+    return markers
+
+
+def _resolve_entries(buf, revisions):
+    """
+    xref 'n' 항목이 실제로 그 번호의 객체 헤더를 가리키는지 확인합니다.
+    반환: (헤더 시작 위치 집합, 맞지 않는 항목 [(리비전, 객체 번호, 오프셋)])
+    """
+    resolved = set()
+    mismatched = []
+    size = len(buf)
+    for index, revision in enumerate(revisions):
+        for number, (kind, offset, _) in revision.entries.items():
+            if kind != "n" or number == 0:
+                continue
+            match = XREF_OBJECT_RE.match(buf, offset, min(size, offset + 64)) if offset < size else None
+            if match and int(match.group(1)) == number:
+                resolved.add(match.start(1))
+            else:
+                mismatched.append((index, number, offset))
+    return resolved, mismatched
+
+
+def find_anomalies(buf, revisions, errors, file_objects):
+    """
+    구조 이상 징후 목록
+    file_objects: 객체 탐색에서 찾은 파일의 간접 객체 [(번호, 세대, 헤더 오프셋)]
+    반환: [{"type", "description", "count", "objects"/"offset"/"size" ...}]
+    """
+    anomalies = []
+    size = len(buf)
+
+    for message in errors:
+        anomalies.append({"type": "broken_xref", "description": f"교차 참조 체인 손상: {message}", "count": 1})
+
+    # 마지막 %%EOF 뒤의 데이터 (공백/NUL과 작은 찌꺼기 제외)
+    last_eof = buf.rfind(b"%%EOF")
+    if last_eof >= 0:
+        tail_start = last_eof + 5
+        trailing = size - tail_start
+        window = bytes(buf[tail_start:tail_start + 64 * 1024]).strip(WHITESPACE)
+        if trailing > TRAILING_GARBAGE_BYTES and window:
+            anomalies.append({"type": "data_after_eof", "description": "마지막 %%EOF 뒤에 데이터가 있음",
+                              "offset": tail_start, "size": trailing, "count": 1})
+
+    if not revisions:
+        return anomalies
+
+    # /Prev 체인에 들어 있지 않은 %%EOF 구간 (체인을 끊고 덧붙인 업데이트 등)
+    linked = {revision.eof for revision in revisions if revision.eof is not None}
+    unlinked = [marker for marker in _eof_markers(buf) if marker not in linked]
+    if unlinked:
+        anomalies.append({"type": "unlinked_sections", "description": "xref 체인에 연결되지 않은 %%EOF 구간",
+                          "count": len(unlinked), "offsets": unlinked[:MAX_LISTED_OBJECTS]})
+
+    resolved, mismatched = _resolve_entries(buf, revisions)
+    if mismatched:
+        anomalies.append({"type": "xref_mismatch", "description": "xref 오프셋이 해당 객체를 가리키지 않음",
+                          "count": len(mismatched),
+                          "objects": [number for _, number, _ in mismatched[:MAX_LISTED_OBJECTS]]})
+
+    # xref가 가리키지 않는 객체 (어느 리비전에서도 보이지 않는 숨은 객체)
+    orphans = [number for number, _, offset in file_objects if offset not in resolved]
+    if orphans:
+        anomalies.append({"type": "orphan_objects", "description": "어느 xref에도 없는 객체 (뷰어가 읽지 않는 숨은 객체)",
+                          "count": len(orphans), "objects": orphans[:MAX_LISTED_OBJECTS]})
+
+    # 여러 리비전에서 다시 정의된 객체
+    defined = {}
+    for index, revision in enumerate(revisions):
+        for number in revision.in_use():
+            defined.setdefault(number, []).append(index)
+    redefined = sorted(number for number, indexes in defined.items() if len(indexes) > 1)
+    if redefined:
+        anomalies.append({"type": "redefined_objects", "description": "여러 리비전에서 다시 정의된 객체",
+                          "count": len(redefined), "objects": redefined[:MAX_LISTED_OBJECTS]})
+    return anomalies
+
+
+def summarize_revisions(revisions, linearized=False):
+    """리비전 목록을 결과용 dict로 (원본 구간 다음부터가 증분 업데이트)"""
+    original = 2 if linearized and len(revisions) >= 2 else 1
+    summaries = []
+    seen = set()
+    for index, revision in enumerate(revisions):
+        in_use = revision.in_use()
+        redefined = [number for number in in_use if number in seen]
+        seen.update(in_use)
+        summaries.append({
+            "index": index,
+            "incremental_update": index >= original,
+            "xref_offset": revision.xref_offset,
+            "xref_type": revision.xref_type,
+            "start": revision.start,
+            "end": revision.end,
+            "size": revision.end - revision.start,
+            "objects": len(in_use),
+            "freed": sum(1 for entry in revision.entries.values() if entry[0] == "f" and entry[2] != 65535),
+            "redefined": sorted(redefined)[:MAX_LISTED_OBJECTS],
+            "root": revision.trailer["root"],
+            "encrypted": revision.trailer["encrypt"] is not None,
+            "keywords": {},
+        })
+    return summaries
@@ -0,0 +1,279 @@
+"""
+PE 내장 페이로드 추출(carving)
+드로퍼가 실제 악성 파일을 숨겨 두는 오버레이, 리소스(RT_RCDATA 등), 그리고 파일 중간에 박힌
+MZ/PE, ZIP, CAB 헤더를 찾아 위치/크기만 기록합니다.
+- 입력은 mmap이며 구조체는 struct.unpack_from으로 제자리에서 읽고, 시그니처는 mmap.find로 찾습니다.
+  (파일 전체를 bytes로 복사하지 않음 / 형식 판별용 앞부분 몇 KB만 복사)
+- 리소스 트리는 제너레이터로 필요한 만큼만 따라갑니다.
+추출한 조각의 재분석(디스패처 재호출, 깊이 제한)은 file_analyzer가 담당합니다.
+"""
+import struct
+
+try:
+    import pefile
+except ImportError:
+    pefile = None
+
+try:
+    from app.backend.analyze.file_type import sniff_bytes, SNIFF_BYTES
+    from app.backend.analyze import entropy as entropy_engine
+except ImportError:  # analyze 디렉토리에서 CLI로 직접 실행한 경우
+    from file_type import sniff_bytes, SNIFF_BYTES
+    import entropy as entropy_engine
+
+# 파일 하나에서 기록할 최대 조각 수
+MAX_CARVED = 64
+# 리소스 트리에서 읽을 최대 항목 수 / 최대 깊이 (손상·악의적인 트리 방어)
+MAX_RESOURCE_ENTRIES = 4096
+MAX_RESOURCE_DEPTH = 3
+# 이보다 작은 조각은 기록하지 않습니다.
+MIN_CARVE_SIZE = 64
+# 형식을 모르는 리소스라도 이 크기 이상이고 엔트로피가 높으면 암호화된 페이로드 후보로 기록
+ENCRYPTED_MIN_SIZE = 4096
+
+CAB_SIGNATURE = b"MSCF"
+ZIP_LOCAL_HEADER = b"PK\x03\x04"
+ZIP_END_OF_CENTRAL_DIR = b"PK\x05\x06"
+
+RT_RCDATA = 10
+
+
+def _u16(buf, offset):
+    return struct.unpack_from("<H", buf, offset)[0]
+
+
+def _u32(buf, offset):
+    return struct.unpack_from("<I", buf, offset)[0]
+
+
+def _sniff(buf, offset, end):
+    """offset 위치 조각의 형식 (디스패처와 같은 판별 + CAB)"""
+    if buf[offset:offset + 4] == CAB_SIGNATURE:
+        return "cab"
+    return sniff_bytes(buf[offset:min(end, offset + SNIFF_BYTES)])
+
+
+# ==========================================
+# 내장 파일 크기 계산
+# ==========================================
+def pe_image_size(buf, offset, end):
+    """offset에 있는 PE의 디스크상 크기 (헤더와 섹션 원시 데이터의 끝). PE가 아니면 None"""
+    if offset + 0x40 > end or buf[offset:offset + 2] != b"MZ":
+        return None
+    e_lfanew = _u32(buf, offset + 0x3C)
+    pe_offset = offset + e_lfanew
+    if e_lfanew < 0x40 or e_lfanew > 0x1000 or pe_offset + 24 > end:
+        return None
+    if buf[pe_offset:pe_offset + 4] != b"PE\x00\x00":
+        return None
+
+    number_of_sections = _u16(buf, pe_offset + 6)
+    optional_size = _u16(buf, pe_offset + 20)
+    table = pe_offset + 24 + optional_size
+    if number_of_sections > 96 or table + 40 * number_of_sections > end:
+        return None
+
+    size = table + 40 * number_of_sections - offset
+    if optional_size >= 64:
+        size = max(size, _u32(buf, pe_offset + 24 + 60))  # SizeOfHeaders
+    for i in range(number_of_sections):
+        raw_size, raw_ptr = struct.unpack_from("<II", buf, table + 40 * i + 16)
+        if raw_size:
+            size = max(size, raw_ptr + raw_size)
+    return min(size, end - offset)
+
+
+def zip_size(buf, offset, end):
+    """offset에서 시작하는 ZIP의 크기 (뒤따르는 End of Central Directory 끝까지). 찾지 못하면 end까지"""
+    eocd = buf.find(ZIP_END_OF_CENTRAL_DIR, offset, end)
+    if eocd < 0 or eocd + 22 > end:
+        return end - offset
+    comment_length = _u16(buf, eocd + 20)
+    return min(eocd + 22 + comment_length, end) - offset
+
+
+def cab_size(buf, offset, end):
+    """CAB 헤더(CFHEADER)의 cbCabinet. 헤더가 올바르지 않으면 None"""
+    if offset + 36 > end:
+        return None
+    reserved1, cb_cabinet = struct.unpack_from("<II", buf, offset + 4)
+    minor, major = buf[offset + 24], buf[offset + 25]
+    if reserved1 != 0 or (major, minor) != (1, 3) or cb_cabinet < 36:
+        return None
+    return min(cb_cabinet, end - offset)
+
+
+def _zip_header_valid(buf, offset, end):
+    if offset + 30 > end:
+        return False
+    version, flags, method = struct.unpack_from("<HHH", buf, offset + 4)
+    name_length = _u16(buf, offset + 26)
+    return version <= 63 and method in (0, 8, 9, 12, 14, 93, 98, 99) and 0 < name_length <= 1024
+
+
+def embedded_size(buf, kind, offset, end):
+    """형식별 조각 크기. 헤더가 올바르지 않으면 None"""
+    if kind in ("pe", "mz"):
+        return pe_image_size(buf, offset, end)
+    if kind == "cab":
+        return cab_size(buf, offset, end)
+    if kind in ("zip", "ooxml", "hwpx"):
+        return zip_size(buf, offset, end) if _zip_header_valid(buf, offset, end) else None
+    return None
+
+
+def find_embedded(buf, start, end, limit=MAX_CARVED):
+    """
+    buf[start:end]에서 MZ/PE, ZIP, CAB 헤더를 찾습니다.
+    반환: [{kind, offset, size}] (찾은 조각 내부는 다시 검색하지 않음)
+    """
+    found = []
+    candidates = {}
+    for signature in (b"MZ", ZIP_LOCAL_HEADER, CAB_SIGNATURE):
+        position = buf.find(signature, start, end)
+        if position >= 0:
+            candidates[signature] = position
+
+    while candidates and len(found) < limit:
+        signature, offset = min(candidates.items(), key=lambda item: item[1])
+        if signature == b"MZ":
+            kind = "pe"
+        elif signature == CAB_SIGNATURE:
+            kind = "cab"
+        else:
+            kind = _sniff(buf, offset, end)
+        size = embedded_size(buf, kind, offset, end)
+
+        resume = offset + 1
+        if size is not None and size >= MIN_CARVE_SIZE:
+            found.append({"kind": kind, "offset": offset, "size": size})
+            resume = offset + size
+        for sig, position in list(candidates.items()):
+            if position < resume:
+                position = buf.find(sig, resume, end)
+                if position < 0:
+                    del candidates[sig]
+                else:
+                    candidates[sig] = position
+    return found
+
+
+# ==========================================
+# 리소스 트리
+# ==========================================
+def _resource_name(buf, rsrc_offset, value, end):
+    """디렉토리 항목의 이름/ID (상위 비트가 켜져 있으면 UTF-16 문자열 오프셋)"""
+    if not value & 0x80000000:
+        return value
+    offset = rsrc_offset + (value & 0x7FFFFFFF)
+    if offset + 2 > end:
+        return "?"
+    length = min(_u16(buf, offset), 256)
+    return buf[offset + 2:min(end, offset + 2 + length * 2)].decode("utf-16-le", "replace")
+
+
+def iter_resources(pe, buf):
+    """
+    리소스 트리를 깊이 우선으로 따라가며 리프(데이터 항목)를 하나씩 돌려줍니다.
+    반환 항목: {"path": [형식, 이름, 언어], "offset", "size"} (offset은 파일 오프셋)
+    """
+    directory = pe.OPTIONAL_HEADER.DATA_DIRECTORY[pefile.DIRECTORY_ENTRY["IMAGE_DIRECTORY_ENTRY_RESOURCE"]]
+    if not directory.VirtualAddress or not directory.Size:
+        return
+    try:
+        rsrc_offset = pe.get_offset_from_rva(directory.VirtualAddress)
+    except pefile.PEFormatError:
+        return
+
+    end = len(buf)
+    visited = set()
+    budget = [MAX_RESOURCE_ENTRIES]
+
+    def walk(offset, path):
+        if offset in visited or offset + 16 > end or len(path) >= MAX_RESOURCE_DEPTH:
+            return
+        visited.add(offset)
+        count = _u16(buf, offset + 12) + _u16(buf, offset + 14)
+        for i in range(count):
+            entry = offset + 16 + 8 * i
+            if budget[0] <= 0 or entry + 8 > end:
+                return
+            budget[0] -= 1
+            name, target = struct.unpack_from("<II", buf, entry)
+            entry_path = path + [_resource_name(buf, rsrc_offset, name, end)]
+            if target & 0x80000000:
+                yield from walk(rsrc_offset + (target & 0x7FFFFFFF), entry_path)
+                continue
+            data_entry = rsrc_offset + target
+            if data_entry + 16 > end:
+                continue
+            rva, size = struct.unpack_from("<II", buf, data_entry)
+            try:
+                data_offset = pe.get_offset_from_rva(rva)
+            except pefile.PEFormatError:
+                continue
+            if data_offset is None or data_offset >= end:
+                continue
+            yield {"path": entry_path, "offset": data_offset, "size": min(size, end - data_offset)}
+
+    yield from walk(rsrc_offset, [])
+
+
+def _resource_label(path):
+    parts = []
+    for index, part in enumerate(path):
+        if index == 0 and isinstance(part, int):
+            part = pefile.RESOURCE_TYPE.get(part, part)
+        parts.append(str(part))
+    return "/".join(parts)
+
+
+# ==========================================
+# 추출
+# ==========================================
+def carve_pe(pe, buf):
+    """
+    pefile 객체(fast_load 가능)와 같은 파일의 mmap을 받아 숨은 페이로드 후보를 찾습니다.
+    반환: [{source(overlay/resource/embedded), kind, offset, size, resource, entropy}]
+    kind는 file_type.sniff_bytes 판별 결과(pe/zip/pdf/ole...)와 cab, 모르면 data입니다.
+    """
+    end = len(buf)
+    carved = []
+    seen = set()
+
+    def add(source, kind, offset, size, resource=None):
+        if len(carved) >= MAX_CARVED or offset in seen or size < MIN_CARVE_SIZE:
+            return
+        seen.add(offset)
+        carved.append({
+            "source": source,
+            "kind": kind,
+            "offset": offset,
+            "size": size,
+            "resource": resource,
+            "entropy": round(entropy_engine.entropy(buf, offset, offset + size), 4),
+        })
+
+    # 1. 오버레이 (섹션 뒤에 덧붙은 데이터: SFX 설치파일/드로퍼의 페이로드 위치)
+    overlay_start = pe.get_overlay_data_start_offset()
+    if overlay_start is not None:
+        kind = _sniff(buf, overlay_start, end)
+        size = embedded_size(buf, kind, overlay_start, end) or (end - overlay_start)
+        add("overlay", kind if kind != "unknown" else "data", overlay_start, size)
+
+    # 2. 리소스 (형식이 판별되거나, RT_RCDATA 중 크고 엔트로피가 높은 것)
+    for leaf in iter_resources(pe, buf):
+        offset, size = leaf["offset"], leaf["size"]
+        kind = _sniff(buf, offset, offset + size)
+        label = _resource_label(leaf["path"])
+        if kind != "unknown":
+            add("resource", kind, offset, embedded_size(buf, kind, offset, offset + size) or size, label)
+        elif (leaf["path"][0] == RT_RCDATA and size >= ENCRYPTED_MIN_SIZE
+              and entropy_engine.entropy(buf, offset, offset + size) >= entropy_engine.HIGH_ENTROPY_THRESHOLD):
+            add("resource", "data", offset, size, label)
+
+    # 3. 파일 중간에 박힌 MZ/PE, ZIP, CAB 헤더 (자기 자신의 MZ 헤더는 제외)
+    for item in find_embedded(buf, 2, end):
+        add("embedded", item["kind"], item["offset"], item["size"])
+
+    return carved
@@ -0,0 +1,182 @@
+"""
+유사도 해시 (TLSH 방식)
+재패킹된 변종처럼 바이트 일부만 다른 파일을 찾기 위한 지역 민감 해시입니다.
+- 5바이트 슬라이딩 창의 바이트 3개 조합 6가지를 Pearson 해시로 128개 버킷에 세고,
+  버킷 개수를 사분위수로 2비트씩 양자화해 본문(32바이트)을 만듭니다.
+- 헤더에는 길이(로그 스케일)와 사분위수 비율을 담습니다.
+- 거리(digest_distance)가 작을수록 비슷한 파일이며, 보통 100 이하면 같은 계열로 봅니다.
+큰 파일은 전체 대신 고르게 떨어진 블록(SAMPLE_BLOCKS x SAMPLE_BLOCK_SIZE)만 해시합니다.
+(버킷 분포는 위치와 무관하므로 표본으로도 변종끼리의 거리가 유지되고, 50MB 파일도 수백 ms 안에 끝남)
+TLSH 알고리즘 구조를 따르지만 Pearson 표와 체크섬이 다르므로 TLSH 도구와 값이 호환되지는 않습니다.
+(체크섬은 순차 계산이라 벡터화할 수 없어 생략)
+"""
+import math
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BUCKETS = 128
+MIN_DATA_LENGTH = 50
+DIGEST_BYTES = 2 + BUCKETS // 4  # 헤더 2바이트 + 본문 32바이트
+DIGEST_HEX_LENGTH = DIGEST_BYTES * 2
+
+# 창 [a0, a1, a2, a3, a4] (a0이 현재 바이트)에서 쓰는 바이트 조합과 salt
+_TRIPLETS = ((2, 1, 2), (3, 1, 3), (5, 2, 3), (7, 2, 4), (11, 1, 4), (13, 3, 4))
+
+# Pearson 해시 치환표 (고정 시드로 만든 0~255 순열)
+_rng = random.Random(0x51A5C4)
+PEARSON_TABLE = list(range(256))
+_rng.shuffle(PEARSON_TABLE)
+del _rng
+
+# 이보다 큰 입력은 고르게 떨어진 블록 표본만 해시합니다.
+SAMPLE_BLOCKS = 64
+SAMPLE_BLOCK_SIZE = 64 * 1024
+MAX_FULL_BYTES = SAMPLE_BLOCKS * SAMPLE_BLOCK_SIZE
+
+# 한 번에 처리하는 바이트 수 (임시 배열 크기 제한)
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _pearson(salt, i, j, k):
+    table = PEARSON_TABLE
+    return table[table[table[table[salt] ^ i] ^ j] ^ k]
+
+
+def _sample_ranges(start, end):
+    """해시할 구간 목록: 작으면 전체, 크면 고르게 떨어진 SAMPLE_BLOCKS개 블록"""
+    if end - start <= MAX_FULL_BYTES:
+        return [(start, end)]
+    step = (end - start - SAMPLE_BLOCK_SIZE) / (SAMPLE_BLOCKS - 1)
+    return [(start + int(i * step), start + int(i * step) + SAMPLE_BLOCK_SIZE) for i in range(SAMPLE_BLOCKS)]
+
+
+def _bucket_counts_python(buf, ranges):
+    counts = [0] * 256
+    for start, end in ranges:
+        window = [0] * 5
+        for filled, position in enumerate(range(start, end), 1):
+            window = [buf[position]] + window[:4]
+            if filled < 5:
+                continue
+            for salt, x, y in _TRIPLETS:
+                counts[_pearson(salt, window[0], window[x], window[y])] += 1
+    return counts[:BUCKETS]
+
+
+def _bucket_counts_numpy(buf, ranges):
+    table = np.array(PEARSON_TABLE, dtype=np.uint8)
+    # table[table[salt] ^ a0]를 표 하나로 미리 합쳐 둡니다.
+    salted = {salt: table[np.arange(256, dtype=np.uint8) ^ table[salt]] for salt, _, _ in _TRIPLETS}
+    counts = np.zeros(256, dtype=np.int64)
+    for start, end in ranges:
+        data = np.frombuffer(buf, dtype=np.uint8, count=end - start, offset=start)
+        # 청크 경계에서 창이 끊기지 않도록 앞 청크의 마지막 4바이트를 겹쳐 읽습니다.
+        for first in range(0, len(data) - 4, _CHUNK_SIZE):
+            chunk = data[first:first + _CHUNK_SIZE + 4]
+            window = (chunk[4:], chunk[3:-1], chunk[2:-2], chunk[1:-3], chunk[:-4])
+            for salt, x, y in _TRIPLETS:
+                h = salted[salt][window[0]]
+                h = table[h ^ window[x]]
+                h = table[h ^ window[y]]
+                counts += np.bincount(h, minlength=256)
+    return counts[:BUCKETS].tolist()
+
+
+def _length_value(length):
+    """파일 길이를 1바이트 로그 스케일로 (TLSH l_capturing과 같은 구간)"""
+    if length <= 656:
+        value = math.floor(math.log(length) / math.log(1.5))
+    elif length <= 3199:
+        value = math.floor(math.log(length) / math.log(1.3) - 8.72777)
+    else:
+        value = math.floor(math.log(length) / math.log(1.1) - 62.5472)
+    return value & 0xFF
+
+
+def similarity_digest(buf, start=0, end=None):
+    """
+    buf[start:end](bytes/mmap)의 유사도 해시 (16진수 68자)
+    데이터가 너무 짧거나 단조로워(버킷 절반 이상이 비어 있음) 비교 의미가 없으면 None
+    """
+    end = len(buf) if end is None else min(end, len(buf))
+    length = end - start
+    if length < MIN_DATA_LENGTH:
+        return None
+
+    ranges = _sample_ranges(start, end)
+    if np is not None:
+        counts = _bucket_counts_numpy(buf, ranges)
+    else:
+        counts = _bucket_counts_python(buf, ranges)
+
+    if sum(1 for count in counts if count) <= BUCKETS // 2:
+        return None
+
+    ordered = sorted(counts)
+    q1, q2, q3 = ordered[BUCKETS // 4 - 1], ordered[BUCKETS // 2 - 1], ordered[BUCKETS * 3 // 4 - 1]
+    if q3 == 0:
+        return None
+
+    body = bytearray(BUCKETS // 4)
+    for index, count in enumerate(counts):
+        if count <= q1:
+            code = 0
+        elif count <= q2:
+            code = 1
+        elif count <= q3:
+            code = 2
+        else:
+            code = 3
+        body[index // 4] |= code << ((index % 4) * 2)
+
+    q1_ratio = (q1 * 100 // q3) % 16
+    q2_ratio = (q2 * 100 // q3) % 16
+    header = bytes([_length_value(length), (q1_ratio << 4) | q2_ratio])
+    return (header + bytes(body)).hex()
+
+
+def _mod_diff(x, y, modulus):
+    diff = abs(x - y)
+    return min(diff, modulus - diff)
+
+
+# 본문 바이트 쌍(256 x 256)의 2비트 코드 거리 합 (코드 차이 3은 6으로 가중)
+def _build_body_distance():
+    table = []
+    for x in range(256):
+        row = []
+        for y in range(256):
+            total = 0
+            for shift in (0, 2, 4, 6):
+                diff = abs(((x >> shift) & 3) - ((y >> shift) & 3))
+                total += 6 if diff == 3 else diff
+            row.append(total)
+        table.append(bytes(row))
+    return table
+
+
+_BODY_DISTANCE = _build_body_distance()
+
+
+def digest_distance(a, b):
+    """두 유사도 해시(16진수 또는 bytes)의 거리. 0이면 같은 분포, 클수록 다른 파일"""
+    if isinstance(a, str):
+        a = bytes.fromhex(a)
+    if isinstance(b, str):
+        b = bytes.fromhex(b)
+
+    distance = 0
+    length_diff = _mod_diff(a[0], b[0], 256)
+    distance += length_diff if length_diff <= 1 else length_diff * 12
+
+    for shift in (4, 0):
+        q_diff = _mod_diff((a[1] >> shift) & 0xF, (b[1] >> shift) & 0xF, 16)
+        distance += q_diff if q_diff <= 1 else (q_diff - 1) * 12
+
+    for x, y in zip(a[2:], b[2:]):
+        distance += _BODY_DISTANCE[x][y]
+    return distance
@@ -0,0 +1,358 @@
+"""
+분석기 워커 풀
+미리 띄워둔 워커 프로세스에 파이프로 분석 작업을 전달합니다.
+- 워커는 시작 시 분석 라이브러리(pefile/olefile/oletools/numpy)와 모든 분석기 모듈을 한 번만 import 합니다.
+- 작업마다 실행 시간/메모리(RSS) 제한을 적용합니다. (새 워커는 import를 마치고 준비 신호를 보낸 뒤부터 시간을 잼)
+- 죽거나 멈춘 워커, 제한을 넘긴 워커, 일정 횟수 이상 작업한 워커는 자동으로 교체합니다.
+"""
+import os
+import time
+import queue
+import signal
+import threading
+import multiprocessing
+from typing import Dict, Any, Optional
+
+from app.config import (
+    ANALYZER_POOL_SIZE,
+    ANALYZER_QUEUE_DEPTH,
+    ANALYZER_JOB_TIMEOUT,
+    ANALYZER_JOB_MAX_RSS_MB,
+    ANALYZER_WORKER_MAX_JOBS,
+)
+from app.core.metrics import QUEUE_WAIT_SECONDS, REJECTED
+from app.backend.analyze.file_analyzer import observe_analysis
+
+# 작업 결과를 기다리는 동안 워커 상태(생존/메모리)를 확인하는 주기(초)
+_POLL_INTERVAL = 0.05
+# 워커가 미리 import를 마치고 보내는 준비 신호 / 이 시간 안에 오지 않으면 시작 실패로 봄(초)
+_READY = "ready"
+_START_TIMEOUT = 120
+
+# 워커 시작 시 미리 import 할 모듈 (file_analyzer의 분석 함수가 처음 호출될 때 import 하는 모듈 전부)
+WARM_MODULES = (
+    "pefile", "olefile", "oletools.oleid", "oletools.olevba", "numpy",
+    "app.backend.analyze.analyze_pe",
+    "app.backend.analyze.pe_carve",
+    "app.backend.analyze.analyze_pdf",
+    "app.backend.analyze.pdf_objects",
+    "app.backend.analyze.pdf_structure",
+    "app.backend.analyze.js_static",
+    "app.backend.analyze.keyword_scan",
+    "app.backend.analyze.analyze_zip",
+    "app.backend.analyze.analyze_archive",
+    "app.backend.analyze.archive_scan",
+    "app.backend.analyze.analyze_ooxml",
+    "app.backend.analyze.analyze_mshwp",
+    "app.backend.analyze.entropy",
+    "app.backend.analyze.similarity_hash",
+)
+
+
+class PoolQueueFull(Exception):
+    """실행 중 + 대기 중인 작업 수가 풀 한도를 넘었을 때 발생"""
+
+
+def _warm_imports():
+    """무거운 분석 라이브러리를 미리 import 해 둡니다. (설치되지 않은 모듈은 무시)"""
+    for module in WARM_MODULES:
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+
+
+def _worker_main(conn):
+    """워커 프로세스 본체: 파이프로 파일 경로를 받아 분석 결과를 돌려줍니다."""
+    # Ctrl+C 등은 부모(서버)가 처리하고 워커는 종료 메시지로만 끝냅니다.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _warm_imports()
+
+    from app.backend.analyze.file_analyzer import run_analysis
+
+    conn.send(_READY)
+    while True:
+        try:
+            filepath = conn.recv()
+        except (EOFError, OSError):
+            break
+        if filepath is None:
+            break
+
+        try:
+            result = run_analysis(filepath)
+        except Exception as e:
+            result = {"error": f"분석 중 예외 발생: {str(e)}", "file_name": os.path.basename(filepath)}
+        conn.send(result)
+
+    conn.close()
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    """프로세스의 현재 RSS(MB)를 반환합니다. (/proc이 없는 환경에서는 None)"""
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _Worker:
+    def __init__(self, ctx):
+        parent_conn, child_conn = ctx.Pipe()
+        self.conn = parent_conn
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs_done = 0
+        self.ready = False
+
+    def wait_ready(self, timeout: float = _START_TIMEOUT) -> bool:
+        """워커가 import를 마쳤다는 신호를 기다립니다. 죽었거나 시간 안에 오지 않으면 False"""
+        if self.ready:
+            return True
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.conn.poll(_POLL_INTERVAL):
+                try:
+                    self.ready = self.conn.recv() == _READY
+                except (EOFError, OSError):
+                    return False
+                return self.ready
+            if not self.process.is_alive():
+                return False
+        return False
+
+    def stop(self, timeout: float = 2.0):
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.kill()
+        self.conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join(1.0)
+
+
+class AnalyzerPool:
+    """
+    워커 프로세스 풀
+    submit()은 호출한 스레드에서 결과가 나올 때까지 블록됩니다.
+    (비동기 라우터에서는 run_in_threadpool 등으로 호출하세요)
+    """
+
+    def __init__(self, size: int = ANALYZER_POOL_SIZE,
+                 queue_depth: int = ANALYZER_QUEUE_DEPTH,
+                 job_timeout: float = ANALYZER_JOB_TIMEOUT,
+                 max_rss_mb: int = ANALYZER_JOB_MAX_RSS_MB,
+                 max_jobs_per_worker: int = ANALYZER_WORKER_MAX_JOBS):
+        self.size = max(1, size)
+        self.queue_depth = max(0, queue_depth)
+        self.job_timeout = job_timeout
+        self.max_rss_mb = max_rss_mb
+        self.max_jobs_per_worker = max_jobs_per_worker
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers = set()
+        self._slots = threading.BoundedSemaphore(self.size + self.queue_depth)
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._stats = {
+            "jobs_completed": 0,
+            "jobs_failed": 0,
+            "jobs_rejected": 0,
+            "timeouts": 0,
+            "memory_kills": 0,
+            "crashes": 0,
+            "workers_recycled": 0,
+            "busy": 0,
+            "waiting": 0,
+            "queue_wait_seconds_total": 0.0,
+        }
+
+    # --- 워커 관리 ---
+    def start(self):
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._ctx)
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _recycle(self, worker: _Worker, kill: bool = False) -> _Worker:
+        """워커를 종료하고 새 워커로 교체합니다."""
+        with self._lock:
+            self._workers.discard(worker)
+            self._stats["workers_recycled"] += 1
+        if kill:
+            worker.kill()
+            worker.conn.close()
+        else:
+            worker.stop()
+        return self._spawn()
+
+    def shutdown(self):
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.stop()
+
+    # --- 작업 실행 ---
+    def submit(self, filepath: str) -> Dict[str, Any]:
+        if self._closed:
+            raise RuntimeError("분석기 워커 풀이 종료되었습니다")
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats["jobs_rejected"] += 1
+            REJECTED.inc(queue="analyzer_pool")
+            raise PoolQueueFull(f"분석 대기열이 가득 찼습니다 (최대 {self.size + self.queue_depth}건)")
+
+        try:
+            with self._lock:
+                self._stats["waiting"] += 1
+            enqueued = time.monotonic()
+            worker = self._idle.get()
+            waited = time.monotonic() - enqueued
+            QUEUE_WAIT_SECONDS.observe(waited, queue="analyzer_pool")
+            with self._lock:
+                self._stats["waiting"] -= 1
+                self._stats["busy"] += 1
+                self._stats["queue_wait_seconds_total"] += waited
+
+            started = time.perf_counter()
+            try:
+                worker, result, outcome = self._run_on(worker, filepath)
+            finally:
+                self._idle.put(worker)
+                with self._lock:
+                    self._stats["busy"] -= 1
+
+            observe_analysis(result, time.perf_counter() - started, outcome)
+            with self._lock:
+                self._stats["jobs_failed" if "error" in result else "jobs_completed"] += 1
+            return result
+        finally:
+            self._slots.release()
+
+    def _run_on(self, worker: _Worker, filepath: str):
+        """
+        워커 하나에서 작업을 실행하고 (다음에 쓸 워커, 결과, 비정상 종료 사유)를 반환합니다.
+        사유는 정상적으로 결과를 받았으면 None, 아니면 "crash" | "timeout" | "memory_limit"
+        """
+        file_name = os.path.basename(filepath)
+        if not worker.process.is_alive():
+            # 대기 중에 죽은 워커는 작업을 보내기 전에 교체
+            with self._lock:
+                self._stats["crashes"] += 1
+            worker = self._recycle(worker, kill=True)
+        # 방금 교체된 워커의 시작(import) 시간은 작업 제한 시간에 넣지 않음
+        if not worker.wait_ready():
+            with self._lock:
+                self._stats["crashes"] += 1
+            return (self._recycle(worker, kill=True),
+                    {"error": "분석 워커를 시작하지 못했습니다", "file_name": file_name}, "crash")
+        try:
+            worker.conn.send(filepath)
+        except (OSError, BrokenPipeError):
+            with self._lock:
+                self._stats["crashes"] += 1
+            return (self._recycle(worker, kill=True),
+                    {"error": "분석 워커와 통신할 수 없습니다", "file_name": file_name}, "crash")
+
+        deadline = time.monotonic() + self.job_timeout
+        while True:
+            if worker.conn.poll(_POLL_INTERVAL):
+                try:
+                    result = worker.conn.recv()
+                except (EOFError, OSError):
+                    break
+                worker.jobs_done += 1
+                if worker.jobs_done >= self.max_jobs_per_worker:
+                    worker = self._recycle(worker)
+                return worker, result, None
+
+            if not worker.process.is_alive():
+                break
+
+            if time.monotonic() > deadline:
+                with self._lock:
+                    self._stats["timeouts"] += 1
+                return self._recycle(worker, kill=True), {
+                    "error": f"분석 시간이 제한({self.job_timeout:g}초)을 초과했습니다",
+                    "file_name": file_name
+                }, "timeout"
+
+            rss = _rss_mb(worker.process.pid)
+            if rss is not None and rss > self.max_rss_mb:
+                with self._lock:
+                    self._stats["memory_kills"] += 1
+                return self._recycle(worker, kill=True), {
+                    "error": f"분석 메모리 사용량이 제한({self.max_rss_mb}MB)을 초과했습니다",
+                    "file_name": file_name
+                }, "memory_limit"
+
+        # 결과 없이 워커가 종료됨 (비정상 입력으로 인한 크래시 등)
+        with self._lock:
+            self._stats["crashes"] += 1
+        return (self._recycle(worker, kill=True),
+                {"error": "분석 워커가 비정상 종료되었습니다", "file_name": file_name}, "crash")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["alive_workers"] = sum(1 for w in self._workers if w.process.is_alive())
+        stats.update({
+            "pool_size": self.size,
+            "queue_depth": self.queue_depth,
+            "job_timeout": self.job_timeout,
+            "max_rss_mb": self.max_rss_mb,
+            "max_jobs_per_worker": self.max_jobs_per_worker,
+        })
+        return stats
+
+
+_pool: Optional[AnalyzerPool] = None
+_pool_lock = threading.Lock()
+
+
+def pool_enabled() -> bool:
+    return ANALYZER_POOL_SIZE > 0
+
+
+def get_pool() -> AnalyzerPool:
+    """전역 워커 풀을 반환합니다. (없으면 생성 후 시작)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = AnalyzerPool()
+            _pool.start()
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    with _pool_lock:
+        pool = _pool
+    if pool is None:
+        return {"enabled": pool_enabled(), "started": False}
+    stats = pool.stats()
+    stats.update({"enabled": True, "started": True})
+    return stats
@@ -0,0 +1,403 @@
+"""
+ZIP 중앙 디렉토리 파서 / 압축 폭탄 검사
+zipfile에 기대지 않고 EOCD(ZIP64 포함)와 중앙 디렉토리를 직접 읽어, 헤더에 적힌 크기를 믿지 않고 검사합니다.
+- 구조 검사(중앙 디렉토리만 읽음): 같은 로컬 헤더 오프셋을 가리키는 엔트리(중복),
+  앞 엔트리의 데이터 범위 안에서 시작하는 엔트리(겹침) — 겹친 엔트리 압축 폭탄(overlapping bomb)의 특징
+- 해제 검사: 엔트리를 실제로 스트리밍 해제하며 나온 바이트 수만 세고 버립니다.
+  전체 해제 바이트/CPU 시간 예산을 넘는 순간 멈추므로, 아카이브가 무엇을 주장하든 메모리는
+  입력 청크 + 출력 청크 크기로 제한됩니다.
+- 엔트리 읽기(read_entry): 필요한 엔트리 하나만 정한 크기까지 해제해 내용을 꺼냅니다. (OOXML 파트 등)
+mmap/bytes 어느 쪽이든 받습니다.
+"""
+import bz2
+import time
+import zlib
+import struct
+
+EOCD_SIGNATURE = b"PK\x05\x06"
+EOCD64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+EOCD64_SIGNATURE = b"PK\x06\x06"
+CENTRAL_SIGNATURE = b"PK\x01\x02"
+LOCAL_SIGNATURE = b"PK\x03\x04"
+EOCD_SIZE = 22
+CENTRAL_SIZE = 46
+LOCAL_SIZE = 30
+# EOCD 뒤 주석의 최대 길이 (EOCD는 파일 끝에서 이 범위 안에 있음)
+MAX_COMMENT = 0xFFFF
+ZIP64_EXTRA_ID = 0x0001
+
+# 읽을 최대 중앙 디렉토리 엔트리 수 (넘으면 잘라냄, 엔트리 수 주장과 무관하게 메모리 제한)
+MAX_CENTRAL_ENTRIES = 200000
+# 기본 해제 예산
+DEFAULT_MAX_INFLATE_BYTES = 1024 * 1024 * 1024
+DEFAULT_MAX_CPU_SECONDS = 5.0
+# 해제 시 입력/출력 청크 크기
+INPUT_CHUNK = 64 * 1024
+OUTPUT_CHUNK = 1024 * 1024
+# 실제 압축률이 이 이상이면 압축 폭탄 의심
+BOMB_RATIO = 100
+# 결과에 담는 겹침/중복 목록의 최대 길이
+MAX_LISTED = 50
+
+METHOD_NAMES = {0: "stored", 8: "deflate", 9: "deflate64", 12: "bzip2", 14: "lzma", 93: "zstd", 99: "aes"}
+
+
+class CentralEntry:
+    """중앙 디렉토리 엔트리 하나 (크기/오프셋은 모두 아카이브가 주장하는 값)"""
+
+    __slots__ = ("index", "name", "name_length", "flags", "method", "compressed_size", "file_size", "local_offset")
+
+    def __init__(self, index, name, name_length, flags, method, compressed_size, file_size, local_offset):
+        self.index = index
+        self.name = name
+        self.name_length = name_length
+        self.flags = flags
+        self.method = method
+        self.compressed_size = compressed_size
+        self.file_size = file_size
+        self.local_offset = local_offset
+
+    @property
+    def encrypted(self):
+        return bool(self.flags & 0x1)
+
+    @property
+    def is_dir(self):
+        return self.name.endswith("/")
+
+    def span_end(self):
+        """중앙 디렉토리 정보만으로 계산한 로컬 엔트리의 끝 (로컬 헤더 + 이름 + 압축 데이터, 로컬 extra 제외)"""
+        return self.local_offset + LOCAL_SIZE + self.name_length + self.compressed_size
+
+
+class ZipDirectory:
+    """EOCD와 중앙 디렉토리를 읽은 결과"""
+
+    def __init__(self, entries, cd_offset, cd_size, claimed_entries, prefix, zip64, truncated):
+        self.entries = entries
+        self.cd_offset = cd_offset          # 파일에서 중앙 디렉토리가 실제로 시작하는 위치
+        self.cd_size = cd_size
+        self.claimed_entries = claimed_entries
+        self.prefix = prefix                # 앞에 붙은 데이터 길이 (자동 압축 해제 실행파일 등)
+        self.zip64 = zip64
+        self.truncated = truncated          # MAX_CENTRAL_ENTRIES 또는 손상으로 끝까지 읽지 못함
+
+
+def _find_eocd(buf):
+    size = len(buf)
+    start = max(0, size - EOCD_SIZE - MAX_COMMENT)
+    at = buf.rfind(EOCD_SIGNATURE, start)
+    while at >= 0:
+        if at + EOCD_SIZE <= size:
+            comment_length = struct.unpack_from("<H", buf, at + 20)[0]
+            if at + EOCD_SIZE + comment_length <= size:
+                return at
+        at = buf.rfind(EOCD_SIGNATURE, start, at)
+    return None
+
+
+def _zip64_eocd(buf, eocd):
+    """ZIP64 EOCD 로케이터가 있으면 (엔트리 수, 중앙 디렉토리 크기, 오프셋, EOCD64 위치)"""
+    locator = eocd - 20
+    if locator < 0 or buf[locator:locator + 4] != EOCD64_LOCATOR_SIGNATURE:
+        return None
+    record = struct.unpack_from("<Q", buf, locator + 8)[0]
+    # 앞에 데이터가 붙어 있으면 기록된 오프셋이 어긋나므로 로케이터 바로 앞(레코드 56바이트)도 확인
+    for position in (record, locator - 56):
+        if 0 <= position and position + 56 <= len(buf) and buf[position:position + 4] == EOCD64_SIGNATURE:
+            count, cd_size, cd_offset = struct.unpack_from("<QQQ", buf, position + 32)
+            return count, cd_size, cd_offset, position
+    return None
+
+
+def _zip64_values(extra, file_size, compressed_size, local_offset):
+    """ZIP64 extra(0x0001)에서 0xFFFFFFFF로 적힌 값만 순서대로 꺼냅니다."""
+    position = 0
+    while position + 4 <= len(extra):
+        tag, length = struct.unpack_from("<HH", extra, position)
+        if tag == ZIP64_EXTRA_ID:
+            data = extra[position + 4:position + 4 + length]
+            values = [struct.unpack_from("<Q", data, index)[0] for index in range(0, len(data) - 7, 8)]
+            if file_size == 0xFFFFFFFF and values:
+                file_size = values.pop(0)
+            if compressed_size == 0xFFFFFFFF and values:
+                compressed_size = values.pop(0)
+            if local_offset == 0xFFFFFFFF and values:
+                local_offset = values.pop(0)
+            break
+        position += 4 + length
+    return file_size, compressed_size, local_offset
+
+
+def read_directory(buf, max_entries=MAX_CENTRAL_ENTRIES):
+    """
+    EOCD를 찾아 중앙 디렉토리를 읽습니다. ZIP이 아니면 ValueError
+    (중앙 디렉토리를 실제 바이트 끝까지 훑으며 읽으므로 EOCD의 엔트리 수 주장은 참고로만 씀)
+    """
+    eocd = _find_eocd(buf)
+    if eocd is None:
+        raise ValueError("EOCD(중앙 디렉토리 끝 레코드)가 없습니다")
+    claimed, cd_size, cd_offset = struct.unpack_from("<HII", buf, eocd + 10)
+    directory_end = eocd
+    zip64 = _zip64_eocd(buf, eocd)
+    if zip64 is not None:
+        claimed, cd_size, cd_offset, directory_end = zip64
+    # 실제 중앙 디렉토리 위치는 EOCD 바로 앞 (기록된 오프셋과의 차이 = 앞에 붙은 데이터)
+    actual = directory_end - cd_size
+    if actual < 0:
+        raise ValueError("중앙 디렉토리 크기가 파일보다 큽니다")
+    prefix = actual - cd_offset
+
+    entries = []
+    position = actual
+    truncated = False
+    while position + CENTRAL_SIZE <= directory_end:
+        if buf[position:position + 4] != CENTRAL_SIGNATURE:
+            truncated = True
+            break
+        if len(entries) >= max_entries:
+            truncated = True
+            break
+        (flags, method, compressed_size, file_size, name_length, extra_length, comment_length,
+         local_offset) = struct.unpack_from("<8xHH8xIIHHH8xI", buf, position)
+        name_start = position + CENTRAL_SIZE
+        raw_name = bytes(buf[name_start:name_start + name_length])
+        extra = bytes(buf[name_start + name_length:name_start + name_length + extra_length])
+        file_size, compressed_size, local_offset = _zip64_values(extra, file_size, compressed_size, local_offset)
+        name = raw_name.decode("utf-8" if flags & 0x800 else "cp437", "replace")
+        entries.append(CentralEntry(len(entries), name, name_length, flags, method, compressed_size, file_size,
+                                    local_offset + prefix))
+        position = name_start + name_length + extra_length + comment_length
+    return ZipDirectory(entries, actual, cd_size, claimed, prefix, zip64 is not None, truncated)
+
+
+def find_overlaps(directory):
+    """
+    중앙 디렉토리 정보만으로 엔트리 배치를 검사합니다.
+    반환: {"duplicate_offsets": [{"offset", "entries"}], "overlaps": [{"entry", "overlaps", "offset"}],
+           "outside": [중앙 디렉토리/파일 범위를 넘는 엔트리]}
+    """
+    by_offset = {}
+    for entry in directory.entries:
+        by_offset.setdefault(entry.local_offset, []).append(entry)
+    duplicates = [{"offset": offset, "entries": [entry.name for entry in group][:MAX_LISTED], "count": len(group)}
+                  for offset, group in by_offset.items() if len(group) > 1]
+
+    overlaps = []
+    outside = []
+    ordered = sorted(by_offset.items())
+    for index, (offset, group) in enumerate(ordered):
+        end = max(entry.span_end() for entry in group)
+        if end > directory.cd_offset or offset < directory.prefix:
+            outside.extend(entry.name for entry in group)
+        if index + 1 < len(ordered) and ordered[index + 1][0] < end:
+            overlaps.append({"entry": group[0].name, "overlaps": ordered[index + 1][1][0].name,
+                             "offset": ordered[index + 1][0]})
+    return {
+        "duplicate_offsets": duplicates[:MAX_LISTED],
+        "duplicate_count": sum(group["count"] for group in duplicates),
+        "overlaps": overlaps[:MAX_LISTED],
+        "overlap_count": len(overlaps),
+        "outside": outside[:MAX_LISTED],
+    }
+
+
+class InflateBudget:
+    """아카이브 하나를 해제할 때의 전체 예산 (해제 바이트, CPU 시간)"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_INFLATE_BYTES, max_cpu_seconds=DEFAULT_MAX_CPU_SECONDS):
+        self.max_bytes = max_bytes
+        self.max_cpu_seconds = max_cpu_seconds
+        self.used = 0
+        self.started = time.process_time()
+        self.exceeded = None  # "bytes" | "cpu"
+
+    @property
+    def cpu_seconds(self):
+        return time.process_time() - self.started
+
+    def check(self):
+        if self.used > self.max_bytes:
+            self.exceeded = "bytes"
+        elif self.cpu_seconds > self.max_cpu_seconds:
+            self.exceeded = "cpu"
+        return self.exceeded is None
+
+
+def _decompressor(method):
+    if method == 8:
+        return zlib.decompressobj(-15)
+    if method == 12:
+        return bz2.BZ2Decompressor()
+    return None
+
+
+def _data_start(buf, entry):
+    """로컬 헤더를 읽어 압축 데이터의 시작 위치 (로컬 헤더가 아니면 None)"""
+    offset = entry.local_offset
+    if offset < 0 or offset + LOCAL_SIZE > len(buf) or buf[offset:offset + 4] != LOCAL_SIGNATURE:
+        return None
+    name_length, extra_length = struct.unpack_from("<HH", buf, offset + 26)
+    return offset + LOCAL_SIZE + name_length + extra_length
+
+
+def inflate_entry(buf, entry, budget):
+    """
+    엔트리 하나를 스트리밍 해제하며 나온 바이트 수를 셉니다. (출력은 버림)
+    반환: {"inflated", "complete", "error"}  complete=False면 예산 초과로 중간에 멈춤
+    """
+    start = _data_start(buf, entry)
+    if start is None:
+        return {"inflated": 0, "complete": False, "error": "로컬 헤더가 없습니다"}
+    end = min(len(buf), start + entry.compressed_size)
+    if entry.method == 0:
+        budget.used += end - start
+        return {"inflated": end - start, "complete": budget.check(), "error": None}
+    decompressor = _decompressor(entry.method)
+    if decompressor is None:
+        return {"inflated": 0, "complete": False,
+                "error": f"지원하지 않는 압축 방식: {METHOD_NAMES.get(entry.method, entry.method)}"}
+
+    deflate = entry.method == 8
+    inflated = 0
+    position = start
+    try:
+        while position < end:
+            data = buf[position:min(end, position + INPUT_CHUNK)]
+            position += len(data)
+            while True:
+                output = decompressor.decompress(data, OUTPUT_CHUNK)
+                data = decompressor.unconsumed_tail if deflate else b""
+                inflated += len(output)
+                budget.used += len(output)
+                if not budget.check():
+                    return {"inflated": inflated, "complete": False, "error": None}
+                if decompressor.eof:
+                    return {"inflated": inflated, "complete": True, "error": None}
+                # 출력 청크가 가득 찼으면 내부에 남은 출력이 있을 수 있으므로 빈 입력으로 이어서 꺼냄
+                if deflate and not data and len(output) < OUTPUT_CHUNK:
+                    break
+                if not deflate and decompressor.needs_input:
+                    break
+    except (zlib.error, OSError, EOFError, ValueError) as e:
+        return {"inflated": inflated, "complete": False, "error": f"해제 오류: {e}"}
+    return {"inflated": inflated, "complete": True, "error": None}
+
+
+def read_entry(buf, entry, max_bytes):
+    """
+    엔트리 하나를 해제해 앞에서부터 max_bytes까지의 내용을 반환합니다. (필요한 파트만 꺼낼 때)
+    반환: (bytes, complete)  complete=False면 max_bytes에서 잘림
+    로컬 헤더가 없거나, 암호화되었거나, 지원하지 않는 압축 방식이면 ValueError (해제 오류는 zlib.error/OSError/EOFError)
+    """
+    start = _data_start(buf, entry)
+    if start is None:
+        raise ValueError("로컬 헤더가 없습니다")
+    if entry.encrypted:
+        raise ValueError("암호화된 엔트리입니다")
+    end = min(len(buf), start + entry.compressed_size)
+    if entry.method == 0:
+        size = min(end - start, max_bytes)
+        return bytes(buf[start:start + size]), size == end - start
+    decompressor = _decompressor(entry.method)
+    if decompressor is None:
+        raise ValueError(f"지원하지 않는 압축 방식: {METHOD_NAMES.get(entry.method, entry.method)}")
+
+    deflate = entry.method == 8
+    output = bytearray()
+    position = start
+    while position < end:
+        data = buf[position:min(end, position + INPUT_CHUNK)]
+        position += len(data)
+        while True:
+            # max_bytes보다 1바이트 더 요청해서 잘렸는지 구분 (그 이상은 풀지 않음)
+            output += decompressor.decompress(data, max_bytes + 1 - len(output))
+            data = decompressor.unconsumed_tail if deflate else b""
+            if len(output) > max_bytes:
+                return bytes(output[:max_bytes]), False
+            if decompressor.eof:
+                return bytes(output), True
+            if deflate and not data:
+                break
+            if not deflate and decompressor.needs_input:
+                break
+    return bytes(output), True
+
+
+def measure(buf, directory, budget=None, entries=None):
+    """
+    모든 엔트리(entries를 주면 그 엔트리만)를 예산 안에서 실제로 해제해 크기를 잽니다. (같은 오프셋의 엔트리는 한 번만 해제)
+    반환: {"entries": {엔트리 번호: 해제 결과}, "inflated", "decompressed", "budget_exceeded", "cpu_seconds", "measured"}
+    """
+    budget = budget or InflateBudget()
+    results = {}
+    seen = {}
+    for entry in directory.entries if entries is None else entries:
+        if entry.is_dir or entry.encrypted:
+            continue
+        if entry.local_offset in seen:
+            # 중복 오프셋: 같은 데이터를 다시 풀지 않고 결과를 공유 (실제 압축 해제 프로그램은 매번 풀게 됨)
+            results[entry.index] = dict(results[seen[entry.local_offset]], shared=True)
+            continue
+        if not budget.check():
+            break
+        results[entry.index] = inflate_entry(buf, entry, budget)
+        seen[entry.local_offset] = entry.index
+    # 중복 엔트리는 압축 해제 프로그램이 매번 다시 풀므로 합계에 포함
+    total = sum(result["inflated"] for result in results.values())
+    return {
+        "entries": results,
+        "inflated": total,
+        "decompressed": budget.used,  # 실제로 해제한 바이트 (중복 엔트리는 한 번만)
+        "budget_exceeded": budget.exceeded,
+        "cpu_seconds": round(budget.cpu_seconds, 3),
+        "measured": len(results),
+    }
+
+
+def inspect_bomb(buf, max_bytes=DEFAULT_MAX_INFLATE_BYTES, max_cpu_seconds=DEFAULT_MAX_CPU_SECONDS,
+                 bomb_ratio=BOMB_RATIO, directory=None):
+    """
+    압축 폭탄 검사: 중앙 디렉토리 구조 검사 + 예산 안의 실제 해제
+    directory: 이미 읽은 ZipDirectory (None이면 여기서 읽음)
+    반환: {"directory", "layout", "inflate", "ratio", "reasons", "is_bomb", "error"}
+    """
+    result = {"directory": None, "layout": None, "inflate": None, "ratio": None,
+              "reasons": [], "is_bomb": False, "error": None}
+    if directory is None:
+        try:
+            directory = read_directory(buf)
+        except (ValueError, struct.error) as e:
+            result["error"] = str(e)
+            return result
+
+    result["directory"] = {"entries": len(directory.entries), "claimed_entries": directory.claimed_entries,
+                           "cd_offset": directory.cd_offset, "cd_size": directory.cd_size,
+                           "prefix": directory.prefix, "zip64": directory.zip64, "truncated": directory.truncated}
+    layout = find_overlaps(directory)
+    result["layout"] = layout
+    reasons = result["reasons"]
+    if layout["duplicate_offsets"]:
+        reasons.append(f"같은 로컬 헤더를 가리키는 엔트리 {layout['duplicate_count']}개")
+    if layout["overlap_count"]:
+        reasons.append(f"데이터 범위가 겹치는 엔트리 {layout['overlap_count']}곳")
+
+    inflate = measure(buf, directory, InflateBudget(max_bytes, max_cpu_seconds))
+    result["inflate"] = inflate
+    archive_size = max(1, len(buf))
+    result["ratio"] = round(inflate["inflated"] / archive_size, 1)
+    if inflate["budget_exceeded"] == "bytes":
+        reasons.append(f"해제 바이트 예산({max_bytes:,}) 초과")
+    elif inflate["budget_exceeded"] == "cpu":
+        reasons.append(f"해제 CPU 시간 예산({max_cpu_seconds}초) 초과")
+    if result["ratio"] > bomb_ratio:
+        reasons.append(f"실제 해제 크기가 파일의 {result['ratio']:.0f}배")
+    result["is_bomb"] = bool(reasons)
+    return result
+
+
+def entry_ratio(entry, measured):
+    """실제 해제한 크기 기준 압축률 (해제하지 못했으면 None)"""
+    if measured is None or entry.compressed_size <= 0:
+        return None
+    return measured["inflated"] / entry.compressed_size
@@ -0,0 +1,152 @@
+"""
+ZIP 엔트리 집계
+중앙 디렉토리(zip_directory)의 엔트리를 한 번 훑으면서 엔트리마다 줄을 남기지 않고 작은 집계만 만듭니다.
+- 확장자 분류별 개수, 압축률 구간별 개수(히스토그램), 암호화/위험 표시 엔트리 수
+- 의심 점수가 높은 상위 N개 엔트리 (크기 N인 힙으로 유지하므로 엔트리가 수십만 개여도 메모리는 N에 비례)
+엔트리 전체 목록은 entries_page()로 구간을 나눠 조회합니다.
+"""
+import os
+import heapq
+
+try:
+    from app.backend.analyze import archive_scan
+    from app.backend.analyze import zip_directory
+except ImportError:  # analyze 디렉토리에서 CLI로 직접 실행한 경우
+    import archive_scan
+    import zip_directory
+
+# 보고서에 남기는 의심 엔트리 수 (app.config의 ZIP_TOP_ENTRIES로 덮어씀)
+DEFAULT_TOP_ENTRIES = 50
+
+EXTENSION_CLASSES = {
+    "executable": ('.exe', '.dll', '.scr', '.com', '.pif', '.cpl', '.sys', '.msi', '.lnk'),
+    "script": ('.bat', '.cmd', '.vbs', '.vbe', '.js', '.jse', '.wsf', '.ps1', '.hta', '.jar'),
+    "document": ('.doc', '.docx', '.docm', '.xls', '.xlsx', '.xlsm', '.ppt', '.pptx', '.pptm',
+                 '.pdf', '.rtf', '.hwp', '.hwpx', '.txt', '.csv', '.xml', '.html', '.htm'),
+    "archive": ('.zip', '.rar', '.7z', '.gz', '.tgz', '.bz2', '.xz', '.tar', '.cab', '.iso', '.img'),
+    "image": ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.ico', '.svg', '.webp'),
+}
+CLASS_BY_EXT = {ext: name for name, exts in EXTENSION_CLASSES.items() for ext in exts}
+CLASS_LABELS = {"executable": "실행파일", "script": "스크립트", "document": "문서", "archive": "압축파일",
+                "image": "이미지", "other": "기타", "directory": "디렉토리"}
+
+# 압축률 구간 경계 (마지막 경계는 압축 폭탄 기준 압축률, 마지막 구간은 그 초과)
+RATIO_BOUNDS = (1, 2, 5, 10)
+
+# 의심 점수 (상위 N개를 고르는 기준)
+SCORE_BOMB_RATIO = 5
+SCORE_SIZE_LIE = 5
+SCORE_LAYOUT = 4
+SCORE_DANGEROUS = 4
+SCORE_ENCRYPTED = 1
+
+
+def ratio_labels(bomb_ratio=zip_directory.BOMB_RATIO):
+    return ("<1x", "1-2x", "2-5x", "5-10x", f"10-{bomb_ratio}x", f">{bomb_ratio}x")
+
+
+def ratio_bucket(ratio, bomb_ratio=zip_directory.BOMB_RATIO):
+    bounds = RATIO_BOUNDS + (bomb_ratio,)
+    labels = ratio_labels(bomb_ratio)
+    for index, bound in enumerate(bounds):
+        if ratio < bound or (index == len(bounds) - 1 and ratio <= bound):
+            return labels[index]
+    return labels[-1]
+
+
+def _assess(entry, measured, layout_flags, ext, bomb_ratio):
+    """엔트리 하나의 (압축률, 실제 해제 크기, 표시 목록, 의심 점수)"""
+    inflated = measured["inflated"] if measured else None
+    ratio = 0
+    if entry.compressed_size > 0:
+        ratio = (inflated if inflated is not None else entry.file_size) / entry.compressed_size
+
+    flags = []
+    score = 0
+    # Zip Bomb 체크: 압축률이 bomb_ratio(기본 100배)를 넘으면 매우 의심
+    if ratio > bomb_ratio:
+        flags.append("💣ZipBomb의심")
+        score += SCORE_BOMB_RATIO
+    # 헤더에 적은 크기보다 실제로 더 많이 풀림 (크기 위장)
+    if inflated is not None and inflated > entry.file_size:
+        flags.append("💣크기 위장")
+        score += SCORE_SIZE_LIE
+    if entry.name in layout_flags:
+        flags.append(layout_flags[entry.name])
+        score += SCORE_LAYOUT
+    if ext in archive_scan.DANGEROUS_EXTS:
+        flags.append(f"🚨실행파일({ext})")
+        score += SCORE_DANGEROUS
+    if entry.encrypted:
+        flags.append("🔒암호화됨")
+        score += SCORE_ENCRYPTED
+    return ratio, inflated, flags, score
+
+
+def _record(entry, ratio, inflated, flags, score):
+    return {
+        "index": entry.index,
+        "filename": archive_scan.decode_name(entry.name),
+        "ratio": ratio,
+        "ratio_source": "header" if inflated is None else "inflated",
+        "declared_size": entry.file_size,
+        "compressed_size": entry.compressed_size,
+        "inflated": inflated,
+        "flags": flags,
+        "score": score,
+    }
+
+
+def entry_record(entry, measured, layout_flags, bomb_ratio=zip_directory.BOMB_RATIO):
+    """
+    엔트리 하나의 상세 정보 (기존 보고서의 한 줄과 같은 내용 + 의심 점수)
+    measured: zip_directory.measure()의 엔트리별 결과 (None이면 헤더 크기로 압축률 계산)
+    """
+    ext = os.path.splitext(entry.name)[1].lower()
+    return _record(entry, *_assess(entry, measured, layout_flags, ext, bomb_ratio))
+
+
+def summarize_entries(directory, measured, layout_flags, top_n=DEFAULT_TOP_ENTRIES,
+                      bomb_ratio=zip_directory.BOMB_RATIO):
+    """
+    엔트리를 한 번 훑어 집계를 만듭니다. (상세 정보 dict는 상위 top_n개에 들어가는 엔트리만 만듦)
+    bomb_ratio: 압축 폭탄으로 표시할 압축률 (inspect_bomb에 넘긴 값과 같게)
+    반환: ({"entries", "directories", "encrypted", "flagged", "max_ratio", "declared_size", "compressed_size",
+            "by_class", "ratio_histogram", "truncated", "top_n"}, 의심 점수 순 상위 top_n개 엔트리)
+    """
+    by_class = dict.fromkeys(CLASS_LABELS, 0)
+    histogram = dict.fromkeys(ratio_labels(bomb_ratio), 0)
+    summary = {"entries": len(directory.entries), "directories": 0, "encrypted": 0, "flagged": 0,
+               "max_ratio": 0, "declared_size": 0, "compressed_size": 0,
+               "by_class": by_class, "ratio_histogram": histogram,
+               "truncated": directory.truncated, "top_n": top_n}
+    heap = []
+    for entry in directory.entries:
+        if entry.is_dir:
+            by_class["directory"] += 1
+            summary["directories"] += 1
+            continue
+        ext = os.path.splitext(entry.name)[1].lower()
+        by_class[CLASS_BY_EXT.get(ext, "other")] += 1
+        ratio, inflated, flags, score = _assess(entry, measured.get(entry.index), layout_flags, ext, bomb_ratio)
+        histogram[ratio_bucket(ratio, bomb_ratio)] += 1
+        summary["encrypted"] += entry.encrypted
+        summary["flagged"] += bool(flags)
+        summary["max_ratio"] = max(summary["max_ratio"], ratio)
+        summary["declared_size"] += entry.file_size
+        summary["compressed_size"] += entry.compressed_size
+        # 점수 -> 압축률 -> 앞쪽 엔트리 순으로 우선 (-index로 같은 점수면 먼저 나온 엔트리를 남김)
+        key = (score, ratio, -entry.index)
+        if len(heap) < top_n:
+            heapq.heappush(heap, key + (_record(entry, ratio, inflated, flags, score),))
+        elif heap and key > heap[0][:3]:
+            heapq.heapreplace(heap, key + (_record(entry, ratio, inflated, flags, score),))
+
+    top = [key[3] for key in sorted(heap, key=lambda key: key[:3], reverse=True)]
+    return summary, top
+
+
+def entries_page(directory, measured, layout_flags, offset=0, limit=100, bomb_ratio=zip_directory.BOMB_RATIO):
+    """중앙 디렉토리 순서로 offset부터 limit개 엔트리의 상세 정보"""
+    page = directory.entries[offset:offset + limit]
+    return [entry_record(entry, measured.get(entry.index), layout_flags, bomb_ratio) for entry in page]
@@ -1,14 +1,23 @@
 from fastapi import FastAPI, Request, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.backend.router import scan_router, user_router, oauth_router
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.backend.model.user import User
+from app.backend.model.scan_cache import ScanCache
+from app.backend.model.hash_verdict import HashVerdict
 import os
 from app.core.database import Base, engine
 from itsdangerous import URLSafeSerializer, BadSignature
-from app.config import SECRET_KEY
+from app.config import SECRET_KEY, UPLOAD_MAX_BYTES, BATCH_MAX_BYTES
+from app.core.upload_limit import UploadSizeLimitMiddleware
+from app.backend.analyze.worker_pool import pool_enabled, get_pool, shutdown_pool, get_pool_stats
+from app.backend.service.scan_cache_service import scan_cache
+from app.backend.service.scan_job_service import scan_jobs
+from app.backend.service.similarity_index import similarity_index
+from app.backend.service.hash_verdict_service import hash_verdicts
+from app.core import metrics
 
 app = FastAPI(
     title="SafeScan API",
@@ -34,6 +43,11 @@ if os.getenv("CORS_ORIGINS"):
     additional_origins = os.getenv("CORS_ORIGINS").split(",")
     origins.extend([origin.strip() for origin in additional_origins])
 
+# 스캔 업로드 크기 제한 (본문 파싱 전에 검사, 413 응답에도 CORS 헤더가 붙도록 CORS보다 먼저 등록)
+# 일괄 스캔은 여러 파일을 한 본문으로 받으므로 전체 한도를 따로 두고, 파일별 한도는 저장할 때 검사
+app.add_middleware(UploadSizeLimitMiddleware, max_bytes=UPLOAD_MAX_BYTES,
+                   path_limits={"/api/scan/batch": BATCH_MAX_BYTES})
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -65,6 +79,48 @@ def api_health_check():
         "version": "1.0.0"
     }
 
+@app.get("/api/health/analyzer")
+def analyzer_health_check():
+    """분석기 워커 풀 상태 (풀 크기, 대기열, 워커 교체 횟수 등)"""
+    return get_pool_stats()
+
+@app.get("/api/health/cache")
+def cache_health_check():
+    """스캔 결과 캐시 상태 (적중/미스/제거 횟수 등)"""
+    return scan_cache.stats()
+
+@app.get("/api/health/jobs")
+def jobs_health_check():
+    """비동기 스캔 작업 큐 상태"""
+    return scan_jobs.stats()
+
+@app.get("/api/health/similarity")
+def similarity_health_check():
+    """유사 샘플 색인 상태 (레코드/샘플 수)"""
+    return similarity_index.stats()
+
+@app.get("/api/health/hashes")
+def hashes_health_check():
+    """알려진 해시 판정 저장소 상태 (Bloom 필터 음성/적중/오탐 횟수, 필터 채움 비율)"""
+    return hash_verdicts.stats()
+
+# 수집 시점에 풀/작업 큐/캐시 상태를 읽는 게이지
+metrics.gauge(
+    "safescan_analyzer_pool_workers", "Analyzer pool workers by state", ("state",),
+    lambda: {(state,): get_pool_stats().get(key, 0)
+             for state, key in (("busy", "busy"), ("waiting", "waiting"), ("alive", "alive_workers"))})
+metrics.gauge(
+    "safescan_scan_jobs", "Async scan jobs by status", ("status",),
+    lambda: {(status,): count for status, count in scan_jobs.stats()["jobs_by_status"].items()})
+metrics.gauge(
+    "safescan_scan_cache_entries", "Entries in the in-memory scan cache", (),
+    lambda: {(): scan_cache.stats()["memory_entries"]})
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    """Prometheus 텍스트 형식 메트릭 (업로드/분석기/LLM/대기열/캐시 DB 단계별 지연 시간)"""
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/api/health/deep")
 def deep_health_check(db: Session = Depends(get_db)):
     """데이터베이스 연결 확인"""
@@ -131,11 +187,14 @@ def root():
         "frontend": "https://d2atpnajyyx47s.cloudfront.net",
         "endpoints": {
             "health": "/api/health",
+            "metrics": "/metrics",
             "api_me": "/api/me",
             "scan_pdf": "/api/scan/pdf",
             "scan_exe": "/api/scan/executable",
             "scan_zip": "/api/scan/zip",
             "scan_ms": "/api/scan/ms",
+            "scan_jobs": "/api/scan/jobs",
+            "scan_batch": "/api/scan/batch",
             "auth_google": "/api/auth/google",
             "auth_github": "/api/auth/github",
             "login": "/api/login",
@@ -153,6 +212,16 @@ app.include_router(oauth_router.router)
 async def startup_event():
     # 데이터베이스 테이블 생성
     Base.metadata.create_all(bind=engine)
+
+    # 분석기 워커 미리 띄우기 (첫 요청에서 import 비용이 들지 않도록)
+    if pool_enabled():
+        get_pool()
+
+    # 알려진 해시 Bloom 필터를 백그라운드에서 열기 (없으면 DB에서 만듦)
+    hash_verdicts.start()
+
+    # 비동기 스캔 작업 큐 시작
+    await scan_jobs.start()
     
     print("=" * 70)
     print("SafeScan API Server Started")
@@ -162,4 +231,6 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    await scan_jobs.stop()
+    shutdown_pool()
     print("SafeScan API Server Shutdown")
\ No newline at end of file
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class ScanCache(Base):
+    __tablename__ = "scan_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(100), nullable=False, unique=True, index=True)
+    sha256 = Column(String(64), nullable=False, index=True)
+    kind = Column(String(30), nullable=False)
+    analyzer_version = Column(String(20), nullable=False)
+    payload = Column(Text(length=4294967295), nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
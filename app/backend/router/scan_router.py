@@ -1,22 +1,24 @@
 import os
 import json
-from typing import Optional
+import time
+import asyncio
+import zipfile
+from typing import List, Optional
 
-from fastapi import APIRouter, UploadFile, File, Form
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query
 from fastapi.templating import Jinja2Templates
 from fastapi.requests import Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 
-# 통합 파일 분석 모듈 import
-from app.backend.analyze.file_analyzer import analyze_file
-
-# Gemini 분석 함수들 import
-from app.backend.LLM.gemini import (
-    generate_pdf_summary,
-    generate_pe_summary,
-    generate_zip_summary,
-    generate_office_summary
-)
+# 캐시 조회 -> 분석 -> Gemini 요약 파이프라인
+from app.backend.service.scan_service import run_scan, SCAN_KINDS
+from app.backend.service.scan_job_service import scan_jobs, ScanQueueFull, FINISHED_STATES
+from app.backend.service.upload_service import save_upload, expand_zip_upload, find_upload
+from app.backend.analyze.file_type import detect_file_type
+from app.backend.analyze.file_analyzer import list_zip_entries
+from app.config import BATCH_MAX_FILES, BATCH_CONCURRENCY, ZIP_ENTRIES_PAGE_SIZE, ZIP_ENTRIES_PAGE_MAX
+from app.core.metrics import UPLOAD_BYTES, UPLOAD_SECONDS, QUEUE_WAIT_SECONDS, REJECTED
 
 router = APIRouter(
     prefix="/api/scan"
@@ -55,135 +57,111 @@ def zip_page(request: Request):
     return templates.TemplateResponse("zip_scan.html", {"request": request})
 
 
+async def _save_upload(file: UploadFile, endpoint: str):
+    """업로드를 저장하고 크기/저장 시간을 메트릭으로 기록합니다."""
+    started = time.perf_counter()
+    saved = await save_upload(file, UPLOAD_DIR)
+    UPLOAD_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint)
+    UPLOAD_BYTES.observe(saved.size, endpoint=endpoint)
+    return saved
+
+
+async def _scan_upload(file: UploadFile, kind: str, endpoint: str) -> dict:
+    """업로드 파일을 스트리밍으로 저장하고 스캔 파이프라인(캐시/분석/요약)을 실행합니다."""
+    # 청크 단위 저장 + SHA-256 계산 (최대 크기 초과 시 413)
+    saved = await _save_upload(file, endpoint)
+    
+    # 파일 분석 + Gemini 요약 (같은 파일은 SHA-256 캐시에서 재사용)
+    return await run_in_threadpool(run_scan, saved.path, kind, saved.sha256)
+
+
 @router.post("/ms")
 async def scan_ms(request: Request, file: UploadFile = File(...)):
     """MS Office/HWP 파일 스캔 API"""
-    save_path = os.path.join(UPLOAD_DIR, file.filename)
-    content = await file.read()
-    
-    with open(save_path, "wb") as f:
-        f.write(content)
-    
-    # 파일 분석
-    analysis_result = analyze_file(save_path)
-    
-    # Gemini를 통한 요약 생성
-    llm_summary = None
-    if "error" not in analysis_result:
-        try:
-            llm_summary = generate_office_summary(analysis_result)
-        except Exception as e:
-            llm_summary = json.dumps({
-                "summary": f"LLM 분석 실패: {str(e)}",
-                "risk_score": 0,
-                "risk_level": "low",
-                "reasons": [],
-                "recommended_actions": []
-            }, ensure_ascii=False)
+    scan = await _scan_upload(file, "office", "ms")
     
     return {
         "file": file.filename,
-        "analysis": analysis_result,
-        "llm_summary": llm_summary
+        "sha256": scan["sha256"],
+        "cached": scan["cached"],
+        "analysis": scan["analysis"],
+        "llm_summary": scan["llm_summary"],
+        "similar_samples": scan["similar_samples"]
     }
 
 
 @router.post("/pdf")
 async def scan_pdf(request: Request, file: UploadFile = File(...)):
     """PDF 파일 스캔 API"""
-    save_path = os.path.join(UPLOAD_DIR, file.filename)
-    content = await file.read()
-    
-    with open(save_path, "wb") as f:
-        f.write(content)
-    
-    # 파일 분석
-    analysis_result = analyze_file(save_path)
-    
-    # Gemini를 통한 요약 생성
-    llm_summary = None
-    if "error" not in analysis_result:
-        try:
-            llm_summary = generate_pdf_summary(analysis_result)
-        except Exception as e:
-            llm_summary = json.dumps({
-                "summary": f"LLM 분석 실패: {str(e)}",
-                "risk_score": 0,
-                "risk_level": "low",
-                "reasons": [],
-                "recommended_actions": []
-            }, ensure_ascii=False)
+    scan = await _scan_upload(file, "pdf", "pdf")
     
     return {
         "file": file.filename,
-        "analysis": analysis_result,
-        "llm_summary": llm_summary
+        "sha256": scan["sha256"],
+        "cached": scan["cached"],
+        "analysis": scan["analysis"],
+        "llm_summary": scan["llm_summary"],
+        "similar_samples": scan["similar_samples"]
     }
 
 
 @router.post("/executable")
 async def scan_executable(request: Request, file: UploadFile = File(...)):
     """실행파일(EXE/DLL) 스캔 API"""
-    save_path = os.path.join(UPLOAD_DIR, file.filename)
-    content = await file.read()
-    
-    with open(save_path, "wb") as f:
-        f.write(content)
-    
-    # 파일 분석
-    analysis_result = analyze_file(save_path)
-    
-    # Gemini를 통한 요약 생성
-    llm_summary = None
-    if "error" not in analysis_result:
-        try:
-            llm_summary = generate_pe_summary(analysis_result)
-        except Exception as e:
-            llm_summary = json.dumps({
-                "summary": f"LLM 분석 실패: {str(e)}",
-                "risk_score": 0,
-                "risk_level": "low",
-                "reasons": [],
-                "recommended_actions": []
-            }, ensure_ascii=False)
+    scan = await _scan_upload(file, "pe", "executable")
     
     return {
         "file": file.filename,
-        "analysis": analysis_result,
-        "llm_summary": llm_summary
+        "sha256": scan["sha256"],
+        "cached": scan["cached"],
+        "analysis": scan["analysis"],
+        "llm_summary": scan["llm_summary"],
+        "similar_samples": scan["similar_samples"]
     }
 
 
 @router.post("/zip")
 async def scan_zip(request: Request, file: UploadFile = File(...)):
     """ZIP 파일 스캔 API"""
-    save_path = os.path.join(UPLOAD_DIR, file.filename)
-    content = await file.read()
-    
-    with open(save_path, "wb") as f:
-        f.write(content)
-    
-    # 파일 분석
-    analysis_result = analyze_file(save_path)
-    
-    # Gemini를 통한 요약 생성
-    llm_summary = None
-    if "error" not in analysis_result:
-        try:
-            llm_summary = generate_zip_summary(analysis_result)
-        except Exception as e:
-            llm_summary = json.dumps({
-                "summary": f"LLM 분석 실패: {str(e)}",
-                "risk_score": 0,
-                "risk_level": "low",
-                "reasons": [],
-                "recommended_actions": []
-            }, ensure_ascii=False)
+    scan = await _scan_upload(file, "zip", "zip")
     
     return {
         "file": file.filename,
-        "analysis": analysis_result,
-        "llm_summary": llm_summary
+        "sha256": scan["sha256"],
+        "cached": scan["cached"],
+        "analysis": scan["analysis"],
+        "llm_summary": scan["llm_summary"],
+        "similar_samples": scan["similar_samples"]
+    }
+
+
+@router.get("/zip/{sha256}/entries")
+async def zip_entries(sha256: str,
+                      offset: int = Query(0, ge=0),
+                      limit: int = Query(ZIP_ENTRIES_PAGE_SIZE, ge=1, le=ZIP_ENTRIES_PAGE_MAX)):
+    """
+    ZIP 엔트리 상세 목록 조회 API (페이지 단위)
+    스캔 결과에는 엔트리 집계와 의심 상위 엔트리만 담기므로, 전체 목록은 업로드된 파일의 중앙 디렉토리에서 읽어 옵니다.
+    """
+    path = find_upload(UPLOAD_DIR, sha256.lower())
+    if path is None:
+        raise HTTPException(status_code=404, detail="업로드된 파일을 찾을 수 없습니다")
+    if detect_file_type(path)["type"] not in ("zip", "hwpx"):
+        raise HTTPException(status_code=400, detail="ZIP 형식 파일이 아닙니다")
+
+    page = await run_in_threadpool(list_zip_entries, path, offset, limit)
+    if page["error"]:
+        raise HTTPException(status_code=422, detail=page["error"])
+
+    return {
+        "sha256": sha256.lower(),
+        "file": page["file_name"],
+        "total_entries": page["total_entries"],
+        "truncated": page["truncated"],
+        "offset": offset,
+        "limit": limit,
+        "next_offset": offset + limit if offset + limit < page["total_entries"] else None,
+        "entries": page["entries"]
     }
 
 
@@ -193,45 +171,177 @@ async def scan_any_file(request: Request, file: UploadFile = File(...)):
     범용 파일 스캔 API
     확장자를 자동으로 감지하여 적절한 분석 수행
     """
-    save_path = os.path.join(UPLOAD_DIR, file.filename)
-    content = await file.read()
-    
-    with open(save_path, "wb") as f:
-        f.write(content)
-    
-    # 파일 분석
-    analysis_result = analyze_file(save_path)
-    
     # 파일 타입에 따라 적절한 Gemini 분석 수행
-    llm_summary = None
-    if "error" not in analysis_result:
-        try:
-            file_type = analysis_result.get("file_type")
-            
-            if file_type == "pdf":
-                llm_summary = generate_pdf_summary(analysis_result)
-            elif file_type == "pe":
-                llm_summary = generate_pe_summary(analysis_result)
-            elif file_type == "zip":
-                llm_summary = generate_zip_summary(analysis_result)
-            elif file_type == "office_hwp":
-                llm_summary = generate_office_summary(analysis_result)
-                
-        except Exception as e:
-            llm_summary = json.dumps({
-                "summary": f"LLM 분석 실패: {str(e)}",
-                "risk_score": 0,
-                "risk_level": "low",
-                "reasons": [],
-                "recommended_actions": []
-            }, ensure_ascii=False)
+    scan = await _scan_upload(file, "auto", "analyze")
     
     response = {
         "file": file.filename,
-        "analysis": analysis_result
+        "sha256": scan["sha256"],
+        "cached": scan["cached"],
+        "analysis": scan["analysis"]
     }
     
-    if llm_summary:
-        response["llm_summary"] = llm_summary
+    if scan["llm_summary"]:
+        response["llm_summary"] = scan["llm_summary"]
+    if scan["similar_samples"]:
+        response["similar_samples"] = scan["similar_samples"]
     
-    return response
\ No newline at end of file
+    return response
+
+
+# ==========================================
+# 비동기 스캔 작업 API
+# ==========================================
+
+# SSE 연결 유지용 주석 전송 주기(초)
+SSE_HEARTBEAT_SECONDS = 15
+
+
+def _queue_full_response(retry_after: int) -> JSONResponse:
+    REJECTED.inc(queue="scan_jobs")
+    return JSONResponse(
+        status_code=429,
+        headers={"Retry-After": str(retry_after)},
+        content={"detail": f"스캔 작업 대기열이 가득 찼습니다. {retry_after}초 후 다시 시도하세요."}
+    )
+
+
+@router.post("/jobs", status_code=202)
+async def create_scan_job(request: Request, file: UploadFile = File(...), kind: str = Form("auto")):
+    """
+    비동기 스캔 작업 등록 API
+    업로드 저장 후 바로 작업 ID를 반환합니다. (분석/요약은 백그라운드에서 수행)
+    kind: auto | pdf | pe | zip | office
+    """
+    if kind not in SCAN_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind는 {', '.join(SCAN_KINDS)} 중 하나여야 합니다")
+
+    # 업로드를 저장하기 전에 먼저 대기열 확인
+    if scan_jobs.full():
+        return _queue_full_response(scan_jobs.retry_after())
+
+    saved = await _save_upload(file, "jobs")
+    try:
+        job = scan_jobs.submit(saved.path, saved.file_name, saved.sha256, kind)
+    except ScanQueueFull as e:
+        return _queue_full_response(e.retry_after)
+
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "file": job.file_name,
+        "sha256": job.sha256,
+        "status_url": f"{router.prefix}/jobs/{job.id}",
+        "events_url": f"{router.prefix}/jobs/{job.id}/events"
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_scan_job(job_id: str):
+    """스캔 작업 상태/결과 조회 API (폴링용)"""
+    job = scan_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="스캔 작업을 찾을 수 없습니다")
+    return job.to_dict()
+
+
+@router.get("/jobs/{job_id}/events")
+async def scan_job_events(request: Request, job_id: str):
+    """스캔 작업 상태 변경을 Server-Sent Events로 전달합니다. (완료/실패 시 스트림 종료)"""
+    job = scan_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="스캔 작업을 찾을 수 없습니다")
+
+    async def event_stream():
+        version = -1
+        while True:
+            if await request.is_disconnected():
+                break
+            if job.version != version:
+                version = job.version
+                data = json.dumps(job.to_dict(), ensure_ascii=False)
+                yield f"event: {job.status}\ndata: {data}\n\n"
+                if job.status in FINISHED_STATES:
+                    break
+            elif not await job.wait_for_change(version, SSE_HEARTBEAT_SECONDS):
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# ==========================================
+# 일괄(batch) 스캔 API
+# ==========================================
+
+@router.post("/batch")
+async def scan_batch(request: Request, files: List[UploadFile] = File(...), summarize: bool = Form(False)):
+    """
+    일괄 스캔 API
+    여러 파일(또는 ZIP 1개의 내부 파일들)을 워커 풀에서 동시에 분석하고,
+    끝나는 순서대로 파일별 결과를 NDJSON(한 줄에 JSON 하나)으로 스트리밍합니다.
+    summarize=true이면 파일별 Gemini 요약도 함께 생성합니다.
+    """
+    if len(files) > BATCH_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {BATCH_MAX_FILES}개 파일까지 스캔할 수 있습니다")
+
+    saved_files = [await _save_upload(file, "batch") for file in files]
+
+    # ZIP 파일 1개만 올린 경우 내부 파일들을 일괄 스캔
+    archive = None
+    skipped = []
+    if len(saved_files) == 1 and detect_file_type(saved_files[0].path)["type"] == "zip":
+        try:
+            saved_files, skipped = await run_in_threadpool(expand_zip_upload, saved_files[0], UPLOAD_DIR)
+            archive = files[0].filename
+        except zipfile.BadZipFile:
+            # 손상된 ZIP은 압축파일 자체를 한 건으로 스캔
+            pass
+
+    kind = "auto" if summarize else None
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def scan_one(index, saved):
+        enqueued = time.perf_counter()
+        async with semaphore:
+            QUEUE_WAIT_SECONDS.observe(time.perf_counter() - enqueued, queue="batch")
+            try:
+                scan = await run_in_threadpool(run_scan, saved.path, kind, saved.sha256)
+            except Exception as e:
+                return {"index": index, "file": saved.file_name, "sha256": saved.sha256,
+                        "error": f"스캔 실패: {str(e)}"}
+        line = {
+            "index": index,
+            "file": saved.file_name,
+            "sha256": saved.sha256,
+            "cached": scan["cached"],
+            "analysis": scan["analysis"]
+        }
+        if scan["llm_summary"]:
+            line["llm_summary"] = scan["llm_summary"]
+        if scan["similar_samples"]:
+            line["similar_samples"] = scan["similar_samples"]
+        return line
+
+    async def result_stream():
+        tasks = [asyncio.create_task(scan_one(i, saved)) for i, saved in enumerate(saved_files)]
+        errors = len(skipped)
+        try:
+            for item in skipped:
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+            for next_done in asyncio.as_completed(tasks):
+                line = await next_done
+                if "error" in line or "error" in line.get("analysis", {}):
+                    errors += 1
+                yield json.dumps(line, ensure_ascii=False) + "\n"
+            yield json.dumps({"done": True, "archive": archive, "total": len(tasks) + len(skipped), "errors": errors},
+                             ensure_ascii=False) + "\n"
+        finally:
+            # 클라이언트가 연결을 끊으면 남은 작업 취소
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(result_stream(), media_type="application/x-ndjson")
@@ -0,0 +1,534 @@
+"""
+알려진 해시 판정 저장소
+SHA-256을 키로 벤더 허용 목록/악성 해시 목록과 지난 스캔의 판정을 DB(hash_verdict 테이블)에 저장하고,
+앞단의 Bloom 필터로 목록에 없는 해시(대부분의 업로드)는 DB를 조회하지 않고 바로 걸러냅니다.
+- Bloom 필터는 파일(HASH_BLOOM_PATH)을 공유 mmap으로 열어 같은 서버의 워커 프로세스가 비트 배열 하나를 함께 씁니다.
+  키가 이미 SHA-256이므로 별도 해시 함수 없이 다이제스트 앞 16바이트로 이중 해싱(h1 + i*h2)합니다.
+- 필터는 서버 시작 시 백그라운드에서 열고, 파일이 없거나 크기 설정이 바뀌었으면 DB에서 다시 만듭니다. (rebuild 명령으로 직접 가능)
+  준비되기 전의 조회는 필터 없이 None을 반환하므로 해당 파일은 평소처럼 스캔됩니다.
+- 필터는 추가만 하므로 DB에서 지운 해시는 오탐(DB 조회 1회)이 될 뿐 판정이 틀리지는 않습니다.
+  프로세스 사이의 비트 갱신은 원자적이지 않아 드물게 비트가 빠질 수 있으나, 그 해시는 평소처럼 스캔됩니다.
+
+해시 목록 가져오기 (저장소 루트에서):
+    python -m app.backend.service.hash_verdict_service import allowlist.txt --verdict clean --source vendor-x
+    python -m app.backend.service.hash_verdict_service import feed.csv --verdict malicious --source feed
+    python -m app.backend.service.hash_verdict_service lookup <sha256>
+    python -m app.backend.service.hash_verdict_service rebuild
+목록 파일은 한 줄에 해시 하나(sha256sum 출력처럼 뒤에 파일명이 붙어도 됨) 또는 "sha256,verdict[,note]" CSV입니다.
+"""
+import os
+import sys
+import json
+import math
+import mmap
+import time
+import struct
+import argparse
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from app.config import (
+    HASH_VERDICT_ENABLED,
+    HASH_VERDICT_RECORD_SCANS,
+    HASH_BLOOM_PATH,
+    HASH_BLOOM_CAPACITY,
+    HASH_BLOOM_ERROR_RATE,
+)
+from app.core.database import SessionLocal
+from app.backend.model.hash_verdict import HashVerdict
+from app.backend.analyze.entropy import byte_histogram
+from app.core.metrics import HASH_LOOKUPS
+
+MALICIOUS = "malicious"
+CLEAN = "clean"
+VERDICTS = (MALICIOUS, CLEAN)
+
+# 완료된 스캔은 LLM 위험도가 high일 때만 malicious로 저장합니다.
+# (LLM 한 번의 low 판정을 영구적인 clean으로 두면 이후 분석기 개선이 그 해시에 적용되지 않음)
+SCAN_RISK_LEVEL = "high"
+SCAN_SOURCE = "scan"
+
+MAGIC = b"SSBLOOM1"
+HEADER = struct.Struct("<8sQII")  # magic, 비트 수, 해시 함수 수, 예약
+_MASK64 = (1 << 64) - 1
+
+# 가져오기/재구성 시 한 번에 처리할 해시 수
+IMPORT_BATCH_SIZE = 5000
+# DB에 연결하지 못해 필터를 만들지 못했을 때 다시 시도하기까지의 시간(초)
+REBUILD_RETRY_SECONDS = 60
+
+
+def bloom_parameters(capacity: int, error_rate: float):
+    """예상 원소 수와 목표 오탐률로 (비트 수, 해시 함수 수)를 구합니다."""
+    capacity = max(1, capacity)
+    bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    bits = max(8 * 1024, -(-bits // 8) * 8)
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+def parse_sha256(value: str) -> Optional[bytes]:
+    value = value.strip().lower()
+    if len(value) != 64:
+        return None
+    try:
+        return bytes.fromhex(value)
+    except ValueError:
+        return None
+
+
+class BloomFilter:
+    def __init__(self, path: str, capacity: int = HASH_BLOOM_CAPACITY, error_rate: float = HASH_BLOOM_ERROR_RATE):
+        self.path = path
+        self.bits, self.hashes = bloom_parameters(capacity, error_rate)
+        self.size = HEADER.size + self.bits // 8
+        self._map: Optional[mmap.mmap] = None
+        self._inode = None
+
+    def _positions(self, digest: bytes) -> List[int]:
+        # numpy(uint64) 일괄 추가와 같은 값이 나오도록 64비트에서 넘치는 부분은 버립니다.
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        return [((h1 + i * h2) & _MASK64) % self.bits for i in range(self.hashes)]
+
+    def _map_file(self, path: str):
+        with open(path, "r+b") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE)
+            inode = os.fstat(f.fileno()).st_ino
+        if self._map is not None:
+            self._map.close()
+        self._map, self._inode = mapped, inode
+
+    def open(self) -> bool:
+        """필터 파일을 엽니다. 파일이 없거나 크기 설정이 다르면 False (rebuild 필요)"""
+        try:
+            with open(self.path, "rb") as f:
+                header = f.read(HEADER.size)
+                size = os.fstat(f.fileno()).st_size
+        except FileNotFoundError:
+            return False
+        if len(header) < HEADER.size or size != self.size:
+            return False
+        if HEADER.unpack(header)[:3] != (MAGIC, self.bits, self.hashes):
+            return False
+        self._map_file(self.path)
+        return True
+
+    def reopen_if_replaced(self):
+        """다른 프로세스가 rebuild로 파일을 바꿨으면 새 파일을 다시 엽니다."""
+        try:
+            inode = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            return
+        if inode != self._inode:
+            self.open()
+
+    def create(self, digests: Iterable[bytes]):
+        """빈 필터 파일을 임시 경로에 만들어 digests를 넣은 뒤 원래 경로로 바꿔치기합니다."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.bits, self.hashes, 0))
+            f.truncate(self.size)
+        try:
+            self._map_file(temp_path)
+            batch = []
+            for digest in digests:
+                batch.append(digest)
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    self.add_many(batch)
+                    batch = []
+            self.add_many(batch)
+            self._map.flush()
+            os.replace(temp_path, self.path)
+        except BaseException:
+            # 중간에 실패하면(DB 오류 등) 필터 크기만 한 임시 파일이 남지 않도록 지웁니다.
+            if self._map is not None:
+                self._map.close()
+            self._map, self._inode = None, None
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def might_contain(self, digest: bytes) -> bool:
+        mapped = self._map
+        for position in self._positions(digest):
+            if not mapped[HEADER.size + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def add(self, digest: bytes):
+        mapped = self._map
+        for position in self._positions(digest):
+            offset = HEADER.size + (position >> 3)
+            mapped[offset] = mapped[offset] | (1 << (position & 7))
+
+    def add_many(self, digests: List[bytes]):
+        if not digests:
+            return
+        if np is None:
+            for digest in digests:
+                self.add(digest)
+            return
+        keys = np.frombuffer(b"".join(digest[:16] for digest in digests), dtype="<u8").reshape(-1, 2)
+        h1 = keys[:, 0:1]
+        h2 = keys[:, 1:2] | np.uint64(1)
+        steps = np.arange(self.hashes, dtype=np.uint64)
+        positions = ((h1 + steps * h2) % np.uint64(self.bits)).ravel()
+        bitmap = np.frombuffer(self._map, dtype=np.uint8, offset=HEADER.size)
+        np.bitwise_or.at(bitmap, (positions >> np.uint64(3)).astype(np.intp),
+                         (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)))
+        del bitmap
+
+    def fill_ratio(self) -> float:
+        """켜진 비트 비율 (0.5를 넘으면 오탐률이 목표보다 커짐)"""
+        if self._map is None:
+            return 0.0
+        histogram = byte_histogram(self._map, HEADER.size)
+        ones = sum(count * bin(value).count("1") for value, count in enumerate(histogram))
+        return ones / self.bits
+
+
+def verdict_summary(known: Dict[str, Any]) -> str:
+    """저장된 판정을 LLM 요약과 같은 JSON 형식으로 만듭니다. (프론트엔드가 그대로 표시)"""
+    source = known["source"]
+    if known["verdict"] == MALICIOUS:
+        return json.dumps({
+            "summary": f"알려진 악성 파일 해시와 일치합니다. (출처: {source})",
+            "risk_score": 100,
+            "risk_level": "high",
+            "reasons": [f"SHA-256이 악성 해시 목록({source})에 등록되어 있음"] + ([known["note"]] if known["note"] else []),
+            "recommended_actions": ["파일을 실행하거나 열지 말고 즉시 삭제하세요.", "이미 실행했다면 시스템을 격리하고 정밀 검사하세요."]
+        }, ensure_ascii=False)
+    return json.dumps({
+        "summary": f"신뢰할 수 있는 파일 목록에 등록된 해시입니다. (출처: {source})",
+        "risk_score": 0,
+        "risk_level": "low",
+        "reasons": [f"SHA-256이 허용 목록({source})에 등록되어 있음"] + ([known["note"]] if known["note"] else []),
+        "recommended_actions": ["출처가 확인된 파일이므로 정상적으로 사용해도 됩니다.", "배포처가 다르다면 해시를 다시 확인하세요."]
+    }, ensure_ascii=False)
+
+
+class HashVerdictStore:
+    def __init__(self, enabled: bool = HASH_VERDICT_ENABLED, bloom_path: str = HASH_BLOOM_PATH,
+                 capacity: int = HASH_BLOOM_CAPACITY, error_rate: float = HASH_BLOOM_ERROR_RATE,
+                 record_scans: bool = HASH_VERDICT_RECORD_SCANS):
+        self.enabled = enabled
+        self.record_scans = record_scans
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bloom = BloomFilter(bloom_path, capacity, error_rate)
+        self._lock = threading.Lock()
+        self._ready = False
+        self._building = False
+        self._retry_at = 0.0
+        self._stats = {
+            "lookups": 0,
+            "bloom_negatives": 0,
+            "hits": 0,
+            "false_positives": 0,
+            "added": 0,
+            "rebuilds": 0,
+            "db_errors": 0,
+        }
+
+    # ==========================================
+    # Bloom 필터
+    # ==========================================
+    def _iter_db_digests(self):
+        db = SessionLocal()
+        try:
+            for (sha256,) in db.query(HashVerdict.sha256).yield_per(IMPORT_BATCH_SIZE):
+                digest = parse_sha256(sha256)
+                if digest is not None:
+                    yield digest
+        finally:
+            db.close()
+
+    def _swap(self, bloom: BloomFilter, rebuilt: bool):
+        """새로 연 필터로 바꿉니다. (잠금을 잡고 호출)"""
+        if self.bloom is not bloom and self.bloom._map is not None:
+            self.bloom._map.close()
+        self.bloom = bloom
+        self._ready = True
+        if rebuilt:
+            self._stats["rebuilds"] += 1
+
+    def load(self) -> bool:
+        """
+        필터를 열고, 없으면 DB에서 만듭니다. 만드는 동안에는 잠금을 잡지 않으므로 조회는 필터 없이 계속됩니다.
+        반환: 사용할 수 있으면 True
+        """
+        with self._lock:
+            if self._ready:
+                return True
+            if self._building or time.time() < self._retry_at:
+                return False
+            self._building = True
+        bloom = BloomFilter(self.bloom.path, self.capacity, self.error_rate)
+        try:
+            rebuilt = not bloom.open()
+            if rebuilt:
+                bloom.create(self._iter_db_digests())
+        except Exception:
+            with self._lock:
+                self._stats["db_errors"] += 1
+                self._retry_at = time.time() + REBUILD_RETRY_SECONDS
+                self._building = False
+            return False
+        with self._lock:
+            self._swap(bloom, rebuilt)
+            self._building = False
+        return True
+
+    def start(self):
+        """서버 시작 시 필터 준비를 백그라운드 스레드로 시작합니다."""
+        if self.enabled:
+            threading.Thread(target=self.load, name="hash-bloom-load", daemon=True).start()
+
+    def _ensure_ready(self) -> bool:
+        """필터를 쓸 수 있으면 True (잠금을 잡고 호출). 아직 준비 전이면 백그라운드 준비를 다시 시도하고 False"""
+        if self._ready:
+            self.bloom.reopen_if_replaced()
+            return True
+        if not self._building and time.time() >= self._retry_at:
+            self.start()
+        return False
+
+    def rebuild(self) -> int:
+        """DB의 모든 해시로 필터 파일을 새로 만듭니다. 반환: 넣은 해시 수"""
+        count = [0]
+
+        def counted():
+            for digest in self._iter_db_digests():
+                count[0] += 1
+                yield digest
+
+        bloom = BloomFilter(self.bloom.path, self.capacity, self.error_rate)
+        bloom.create(counted())
+        with self._lock:
+            self._swap(bloom, True)
+        return count[0]
+
+    # ==========================================
+    # 조회
+    # ==========================================
+    def lookup(self, sha256: str) -> Optional[Dict[str, Any]]:
+        """
+        알려진 해시의 판정. 반환: {"sha256", "verdict", "source", "note"} 또는 None
+        Bloom 필터에 없으면 DB를 조회하지 않습니다.
+        """
+        if not self.enabled:
+            return None
+        digest = parse_sha256(sha256)
+        if digest is None:
+            return None
+
+        with self._lock:
+            if not self._ensure_ready():
+                return None
+            self._stats["lookups"] += 1
+            maybe = self.bloom.might_contain(digest)
+            if not maybe:
+                self._stats["bloom_negatives"] += 1
+        if not maybe:
+            HASH_LOOKUPS.inc(outcome="bloom_negative")
+            return None
+
+        db = SessionLocal()
+        try:
+            row = db.query(HashVerdict).filter(HashVerdict.sha256 == sha256.lower()).first()
+            if row is not None and row.source == SCAN_SOURCE and row.verdict == CLEAN:
+                # 이전 버전이 LLM low 판정으로 저장한 clean은 믿지 않고 다시 스캔합니다.
+                row = None
+            known = None if row is None else {
+                "sha256": row.sha256,
+                "verdict": row.verdict,
+                "source": row.source,
+                "note": row.note,
+            }
+        except Exception:
+            with self._lock:
+                self._stats["db_errors"] += 1
+            return None
+        finally:
+            db.close()
+
+        outcome = "hit" if known is not None else "false_positive"
+        with self._lock:
+            self._stats["hits" if known is not None else "false_positives"] += 1
+        HASH_LOOKUPS.inc(outcome=outcome)
+        return known
+
+    # ==========================================
+    # 추가
+    # ==========================================
+    def add(self, sha256: str, verdict: str, source: str, note: Optional[str] = None,
+            overwrite: bool = True) -> bool:
+        """판정 하나를 저장합니다. overwrite=False이면 이미 있는 해시는 그대로 둡니다."""
+        if verdict not in VERDICTS:
+            raise ValueError(f"알 수 없는 판정: {verdict} (가능: {', '.join(VERDICTS)})")
+        digest = parse_sha256(sha256)
+        if digest is None:
+            raise ValueError(f"올바른 SHA-256이 아닙니다: {sha256}")
+        sha256 = digest.hex()
+
+        db = SessionLocal()
+        try:
+            row = db.query(HashVerdict).filter(HashVerdict.sha256 == sha256).first()
+            if row is None:
+                db.add(HashVerdict(sha256=sha256, verdict=verdict, source=source[:50], note=note))
+            elif overwrite:
+                row.verdict, row.source, row.note = verdict, source[:50], note
+            else:
+                return False
+            db.commit()
+        except Exception:
+            db.rollback()
+            with self._lock:
+                self._stats["db_errors"] += 1
+            return False
+        finally:
+            db.close()
+
+        with self._lock:
+            if self._ensure_ready():
+                self.bloom.add(digest)
+            self._stats["added"] += 1
+        return True
+
+    def record_scan(self, sha256: str, llm_summary: Optional[str]) -> bool:
+        """완료된 스캔의 LLM 판정이 high이면 malicious로 저장합니다. 가져온 목록의 판정은 덮어쓰지 않습니다."""
+        if not (self.enabled and self.record_scans and llm_summary):
+            return False
+        try:
+            risk_level = json.loads(llm_summary).get("risk_level")
+        except (TypeError, ValueError, AttributeError):
+            return False
+        if risk_level != SCAN_RISK_LEVEL:
+            return False
+        return self.add(sha256, MALICIOUS, SCAN_SOURCE, overwrite=False)
+
+    def import_lines(self, lines: Iterable[str], verdict: str, source: str,
+                     batch_size: int = IMPORT_BATCH_SIZE) -> Dict[str, int]:
+        """
+        해시 목록을 일괄 저장합니다. (배치마다 기존 행 조회 -> 갱신/일괄 삽입 -> 커밋 -> 필터 추가)
+        반환: {"read", "inserted", "updated", "invalid"}
+        """
+        if verdict not in VERDICTS:
+            raise ValueError(f"알 수 없는 판정: {verdict} (가능: {', '.join(VERDICTS)})")
+        counts = {"read": 0, "inserted": 0, "updated": 0, "invalid": 0}
+        batch: Dict[str, Dict[str, Any]] = {}
+
+        self.load()
+
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            counts["read"] += 1
+            fields = [field.strip() for field in line.split(",")] if "," in line else line.split(None, 1)
+            digest = parse_sha256(fields[0])
+            if digest is None:
+                counts["invalid"] += 1
+                continue
+            row_verdict = fields[1].lower() if "," in line and len(fields) > 1 and fields[1].lower() in VERDICTS else verdict
+            note = fields[2][:255] if "," in line and len(fields) > 2 and fields[2] else None
+            batch[digest.hex()] = {"sha256": digest.hex(), "verdict": row_verdict, "source": source[:50], "note": note}
+            if len(batch) >= batch_size:
+                self._import_batch(batch, counts)
+                batch = {}
+        if batch:
+            self._import_batch(batch, counts)
+        return counts
+
+    def _import_batch(self, batch: Dict[str, Dict[str, Any]], counts: Dict[str, int]):
+        db = SessionLocal()
+        try:
+            updated = []
+            for row in db.query(HashVerdict).filter(HashVerdict.sha256.in_(list(batch))):
+                item = batch.pop(row.sha256)
+                row.verdict, row.source, row.note = item["verdict"], item["source"], item["note"]
+                updated.append(row.sha256)
+            db.bulk_insert_mappings(HashVerdict, list(batch.values()))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        counts["updated"] += len(updated)
+        counts["inserted"] += len(batch)
+        digests = [bytes.fromhex(sha) for sha in updated + list(batch)]
+        with self._lock:
+            if self._ready:
+                self.bloom.add_many(digests)
+            self._stats["added"] += len(digests)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                "enabled": self.enabled,
+                "ready": self._ready,
+                "capacity": self.capacity,
+                "bloom_bits": self.bloom.bits,
+                "bloom_hashes": self.bloom.hashes,
+                "bloom_fill_ratio": round(self.bloom.fill_ratio(), 6) if self._ready else None,
+            })
+        return stats
+
+
+hash_verdicts = HashVerdictStore()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="알려진 해시 판정 저장소 관리")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="해시 목록 파일을 가져옵니다")
+    import_parser.add_argument("path", help="해시 목록 파일 ('-'이면 표준 입력)")
+    import_parser.add_argument("--verdict", required=True, choices=VERDICTS, help="CSV에 판정 열이 없을 때 쓸 판정")
+    import_parser.add_argument("--source", required=True, help="목록 출처 (예: vendor-x, feed)")
+    import_parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+
+    lookup_parser = commands.add_parser("lookup", help="해시 하나의 판정을 조회합니다")
+    lookup_parser.add_argument("sha256")
+
+    commands.add_parser("rebuild", help="DB에서 Bloom 필터 파일을 다시 만듭니다")
+    commands.add_parser("stats", help="저장소/필터 상태를 출력합니다")
+
+    args = parser.parse_args(argv)
+    store = HashVerdictStore(enabled=True)
+
+    if args.command == "import":
+        started = time.perf_counter()
+        if args.path == "-":
+            result = store.import_lines(sys.stdin, args.verdict, args.source, args.batch_size)
+        else:
+            with open(args.path, "r", encoding="utf-8", errors="replace") as f:
+                result = store.import_lines(f, args.verdict, args.source, args.batch_size)
+        result["seconds"] = round(time.perf_counter() - started, 3)
+    elif args.command == "lookup":
+        store.load()
+        result = store.lookup(args.sha256) or {"sha256": args.sha256, "verdict": None}
+    elif args.command == "rebuild":
+        result = {"hashes": store.rebuild()}
+    else:
+        store.load()
+        result = store.stats()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
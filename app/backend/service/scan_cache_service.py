@@ -0,0 +1,137 @@
+"""
+스캔 결과 캐시
+파일의 SHA-256을 키로 분석 결과와 LLM 요약을 저장합니다.
+- 1차: 프로세스 메모리의 LRU 캐시 (최대 SCAN_CACHE_MAX_ENTRIES개)
+- 2차: DB(scan_cache 테이블) 영구 캐시
+항목마다 ANALYZER_VERSION을 함께 저장하여, 분석기가 바뀌면 이전 항목은 무시됩니다.
+"""
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from app.config import SCAN_CACHE_MAX_ENTRIES, SCAN_CACHE_DB_ENABLED
+from app.core.database import SessionLocal
+from app.backend.model.scan_cache import ScanCache
+from app.backend.analyze.file_analyzer import ANALYZER_VERSION
+from app.core.metrics import CACHE_DB_SECONDS
+
+
+class ScanResultCache:
+    def __init__(self, max_entries: int = SCAN_CACHE_MAX_ENTRIES, use_db: bool = SCAN_CACHE_DB_ENABLED):
+        self.max_entries = max_entries
+        self.use_db = use_db
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "stale": 0,
+            "db_errors": 0,
+        }
+
+    @staticmethod
+    def _key(sha256: str, kind: str) -> str:
+        return f"{sha256}:{kind}"
+
+    def get(self, sha256: str, kind: str) -> Optional[Any]:
+        key = self._key(sha256, kind)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return self._entries[key]
+
+        value = self._db_get(key)
+        with self._lock:
+            if value is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["db_hits"] += 1
+        self._remember(key, value)
+        return value
+
+    def put(self, sha256: str, kind: str, value: Any):
+        key = self._key(sha256, kind)
+        self._remember(key, value)
+        with self._lock:
+            self._stats["stores"] += 1
+        self._db_put(key, sha256, kind, value)
+
+    def _remember(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    # --- DB 영구 캐시 ---
+    def _db_get(self, key: str) -> Optional[Any]:
+        if not self.use_db:
+            return None
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            row = db.query(ScanCache).filter(ScanCache.cache_key == key).first()
+            if row is None:
+                return None
+            if row.analyzer_version != ANALYZER_VERSION:
+                with self._lock:
+                    self._stats["stale"] += 1
+                return None
+            return json.loads(row.payload)
+        except Exception:
+            with self._lock:
+                self._stats["db_errors"] += 1
+            return None
+        finally:
+            db.close()
+            CACHE_DB_SECONDS.observe(time.perf_counter() - started, op="get")
+
+    def _db_put(self, key: str, sha256: str, kind: str, value: Any):
+        if not self.use_db:
+            return
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            payload = json.dumps(value, ensure_ascii=False)
+            row = db.query(ScanCache).filter(ScanCache.cache_key == key).first()
+            if row is None:
+                db.add(ScanCache(cache_key=key, sha256=sha256, kind=kind,
+                                 analyzer_version=ANALYZER_VERSION, payload=payload))
+            else:
+                row.analyzer_version = ANALYZER_VERSION
+                row.payload = payload
+            db.commit()
+        except IntegrityError:
+            # 다른 요청이 같은 키를 먼저 저장한 경우
+            db.rollback()
+        except Exception:
+            db.rollback()
+            with self._lock:
+                self._stats["db_errors"] += 1
+        finally:
+            db.close()
+            CACHE_DB_SECONDS.observe(time.perf_counter() - started, op="put")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._entries)
+        stats.update({
+            "max_entries": self.max_entries,
+            "db_enabled": self.use_db,
+            "analyzer_version": ANALYZER_VERSION,
+        })
+        return stats
+
+
+scan_cache = ScanResultCache()
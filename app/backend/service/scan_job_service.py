@@ -0,0 +1,198 @@
+"""
+비동기 스캔 작업(Job) 서비스
+업로드를 받자마자 작업 ID를 돌려주고, 제한된 크기의 프로세스 내 큐를 통해
+정적 분석 -> Gemini 요약 단계를 백그라운드에서 처리합니다.
+클라이언트는 GET /api/scan/jobs/{id} 폴링 또는 SSE 스트림으로 결과를 받습니다.
+"""
+import time
+import math
+import uuid
+import asyncio
+from typing import Any, Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import SCAN_JOB_WORKERS, SCAN_JOB_QUEUE_SIZE, SCAN_JOB_TTL
+from app.backend.service.scan_service import known_hash_scan, scan_analysis, scan_similar, scan_summary
+from app.core.metrics import QUEUE_WAIT_SECONDS
+
+# 작업 상태
+QUEUED = "queued"
+ANALYZING = "analyzing"
+SUMMARIZING = "summarizing"
+DONE = "done"
+FAILED = "failed"
+FINISHED_STATES = (DONE, FAILED)
+
+
+class ScanQueueFull(Exception):
+    """작업 큐가 가득 찼을 때 발생 (retry_after: 재시도 권장 시간(초))"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"스캔 작업 대기열이 가득 찼습니다. {retry_after}초 후 다시 시도하세요.")
+        self.retry_after = retry_after
+
+
+class ScanJob:
+    def __init__(self, file_path: str, file_name: str, sha256: str, kind: str):
+        self.id = uuid.uuid4().hex
+        self.file_path = file_path
+        self.file_name = file_name
+        self.sha256 = sha256
+        self.kind = kind
+        self.status = QUEUED
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.version = 0
+        self._changed = asyncio.Event()
+
+    def update(self, status: str, **fields):
+        self.status = status
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.version += 1
+        # 대기 중인 SSE 구독자를 깨우고 다음 변경용 이벤트로 교체
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_for_change(self, version: int, timeout: float) -> bool:
+        """version 이후 상태가 바뀔 때까지 기다립니다. (시간 초과 시 False)"""
+        if self.version != version:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            "file": self.file_name,
+            "sha256": self.sha256,
+            "kind": self.kind,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.result is not None:
+            data["result"] = self.result
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+class ScanJobManager:
+    def __init__(self, workers: int = SCAN_JOB_WORKERS,
+                 queue_size: int = SCAN_JOB_QUEUE_SIZE,
+                 ttl: int = SCAN_JOB_TTL):
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.ttl = ttl
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        self._jobs: Dict[str, ScanJob] = {}
+        # 최근 작업 처리 시간 평균 (Retry-After 추정용)
+        self._avg_job_seconds = 5.0
+
+    async def start(self):
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def full(self) -> bool:
+        return self._queue is not None and self._queue.full()
+
+    def retry_after(self) -> int:
+        pending = self._queue.qsize() if self._queue is not None else 0
+        estimate = math.ceil(pending * self._avg_job_seconds / self.workers)
+        return min(60, max(1, estimate))
+
+    def submit(self, file_path: str, file_name: str, sha256: str, kind: str) -> ScanJob:
+        if self._queue is None:
+            raise RuntimeError("스캔 작업 큐가 시작되지 않았습니다")
+        self._prune()
+
+        job = ScanJob(file_path, file_name, sha256, kind)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise ScanQueueFull(self.retry_after())
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[ScanJob]:
+        return self._jobs.get(job_id)
+
+    def _prune(self):
+        """보관 시간이 지난 완료 작업을 정리합니다."""
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.status in FINISHED_STATES and now - job.finished_at > self.ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: ScanJob):
+        job.update(ANALYZING, started_at=time.time())
+        QUEUE_WAIT_SECONDS.observe(job.started_at - job.created_at, queue="scan_jobs")
+        try:
+            known = await run_in_threadpool(known_hash_scan, job.file_path, job.sha256)
+            if known is not None:
+                job.update(DONE, finished_at=time.time(), result=dict(known, similar_samples=[]))
+            else:
+                await self._scan(job)
+        except Exception as e:
+            job.update(FAILED, finished_at=time.time(), error=f"스캔 작업 실패: {str(e)}")
+
+        elapsed = job.finished_at - job.started_at
+        self._avg_job_seconds = 0.8 * self._avg_job_seconds + 0.2 * elapsed
+
+    async def _scan(self, job: ScanJob):
+        analysis_step = await run_in_threadpool(scan_analysis, job.file_path, job.sha256)
+        analysis = analysis_step["analysis"]
+        similar_samples = await run_in_threadpool(scan_similar, job.sha256, analysis)
+
+        job.update(SUMMARIZING)
+        summary_step = await run_in_threadpool(scan_summary, job.sha256, analysis, job.kind)
+
+        job.update(DONE, finished_at=time.time(), result={
+            "analysis": analysis,
+            "llm_summary": summary_step["llm_summary"],
+            "similar_samples": similar_samples,
+            "cached": analysis_step["cached"] and summary_step["cached"],
+        })
+
+    def stats(self) -> Dict[str, Any]:
+        counts = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "jobs_by_status": counts,
+            "avg_job_seconds": round(self._avg_job_seconds, 3),
+        }
+
+
+scan_jobs = ScanJobManager()
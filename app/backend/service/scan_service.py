@@ -0,0 +1,173 @@
+"""
+스캔 파이프라인
+업로드된 파일에 대해 알려진 해시 조회 -> 캐시 조회 -> 정적 분석 -> Gemini 요약 -> 캐시 저장을 수행합니다.
+라우터에서는 run_in_threadpool 등으로 호출하세요. (분석/LLM 호출이 블로킹)
+"""
+import os
+import json
+import hashlib
+from typing import Any, Dict, Optional
+
+from app.backend.analyze.file_analyzer import analyze_file, rename_analysis
+from app.backend.service.scan_cache_service import scan_cache
+from app.backend.service.similarity_index import similarity_index
+from app.backend.service.hash_verdict_service import hash_verdicts, verdict_summary
+from app.backend.LLM.gemini import (
+    generate_pdf_summary,
+    generate_pe_summary,
+    generate_zip_summary,
+    generate_office_summary,
+    is_fallback_summary
+)
+
+# 요약 종류 -> Gemini 요약 함수
+SUMMARIZERS = {
+    "pdf": generate_pdf_summary,
+    "pe": generate_pe_summary,
+    "zip": generate_zip_summary,
+    "office": generate_office_summary,
+}
+
+# 요청 가능한 요약 종류
+SCAN_KINDS = ("auto",) + tuple(SUMMARIZERS)
+
+# 범용 스캔(/analyze)에서 분석 결과의 file_type으로 요약 종류 선택
+SUMMARY_KIND_BY_FILE_TYPE = {
+    "pdf": "pdf",
+    "pe": "pe",
+    "zip": "zip",
+    "archive": "zip",
+    "office_hwp": "office",
+}
+
+
+def sha256_file(filepath: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _llm_failure_summary(e: Exception) -> str:
+    return json.dumps({
+        "summary": f"LLM 분석 실패: {str(e)}",
+        "risk_score": 0,
+        "risk_level": "low",
+        "reasons": [],
+        "recommended_actions": []
+    }, ensure_ascii=False)
+
+
+def known_hash_scan(filepath: str, sha256: str) -> Optional[Dict[str, Any]]:
+    """
+    알려진 해시(허용/악성 목록, 지난 판정)이면 분석과 요약 없이 저장된 판정으로 결과를 만듭니다.
+    반환: {"analysis", "llm_summary", "cached"} 또는 None (모르는 해시)
+    """
+    known = hash_verdicts.lookup(sha256)
+    if known is None:
+        return None
+    analysis = {
+        "file_type": "known_hash",
+        "file_name": os.path.basename(filepath),
+        "script_output": f"알려진 해시: {known['verdict']} (출처: {known['source']})",
+        "known_verdict": known,
+    }
+    return {"analysis": analysis, "llm_summary": verdict_summary(known), "cached": True}
+
+
+def scan_analysis(filepath: str, sha256: str) -> Dict[str, Any]:
+    """정적 분석 단계 (캐시 우선). 반환: {"analysis", "cached"}"""
+
+    analysis = scan_cache.get(sha256, "analysis")
+    if analysis is not None:
+        # 확장자 불일치 검사는 이번 업로드의 이름으로 다시 함
+        return {"analysis": rename_analysis(analysis, filepath), "cached": True}
+
+    analysis = analyze_file(filepath)
+    if "error" not in analysis:
+        scan_cache.put(sha256, "analysis", analysis)
+    return {"analysis": analysis, "cached": False}
+
+
+def scan_similar(sha256: str, analysis: Dict[str, Any]) -> list:
+    """유사도 해시가 가까운 이전 샘플과 그 판정 (유사 샘플 색인 조회, 실패해도 스캔은 계속)"""
+    try:
+        return similarity_index.nearest(analysis.get("similarity_hash"), exclude_sha256=sha256)
+    except Exception:
+        return []
+
+
+def record_verdict(sha256: str, analysis: Dict[str, Any], llm_summary: Optional[str]):
+    """LLM 판정을 유사 샘플 색인과 해시 판정 저장소에 기록합니다. (폴백 요약은 판정이 아니므로 제외)"""
+    if not llm_summary or is_fallback_summary(llm_summary):
+        return
+    try:
+        similarity_index.add_verdict(sha256, analysis, llm_summary)
+    except Exception:
+        pass
+    hash_verdicts.record_scan(sha256, llm_summary)
+
+
+def summary_kind_for(kind: Optional[str], analysis: Dict[str, Any]) -> Optional[str]:
+    """요청한 요약 종류를 결정합니다. ("auto"이면 분석 결과의 file_type 기준, None이면 요약 생략)"""
+    if kind is None or "error" in analysis:
+        return None
+    summary_kind = kind if kind != "auto" else SUMMARY_KIND_BY_FILE_TYPE.get(analysis.get("file_type"))
+    return summary_kind if summary_kind in SUMMARIZERS else None
+
+
+def scan_summary(sha256: str, analysis: Dict[str, Any], kind: Optional[str]) -> Dict[str, Any]:
+    """Gemini 요약 단계 (캐시 우선). 반환: {"llm_summary", "cached"}"""
+    summary_kind = summary_kind_for(kind, analysis)
+    if summary_kind is None:
+        return {"llm_summary": None, "cached": True}
+
+    # 요약은 확장자 불일치 탐지 항목에 따라 달라지므로 불일치 여부도 캐시 키에 넣음
+    mismatch = (analysis.get("detected_type") or {}).get("extension_mismatch")
+    cache_kind = f"summary:{summary_kind}" + (":mismatch" if mismatch else "")
+    llm_summary = scan_cache.get(sha256, cache_kind)
+    if llm_summary is not None:
+        record_verdict(sha256, analysis, llm_summary)
+        return {"llm_summary": llm_summary, "cached": True}
+
+    try:
+        llm_summary = SUMMARIZERS[summary_kind](analysis)
+    except Exception as e:
+        llm_summary = _llm_failure_summary(e)
+    if not is_fallback_summary(llm_summary):
+        scan_cache.put(sha256, cache_kind, llm_summary)
+        record_verdict(sha256, analysis, llm_summary)
+    return {"llm_summary": llm_summary, "cached": False}
+
+
+def run_scan(filepath: str, kind: Optional[str] = "auto", sha256: Optional[str] = None) -> Dict[str, Any]:
+    """
+    파일을 분석하고 LLM 요약을 생성합니다.
+    kind: "pdf" | "pe" | "zip" | "office" (요약 프롬프트 고정), "auto" (file_type으로 선택), None (요약 생략)
+    반환: {"sha256", "analysis", "llm_summary", "similar_samples", "cached"}
+    """
+    sha256 = sha256 or sha256_file(filepath)
+
+    # 0. 알려진 해시이면 분석/요약 생략
+    known = known_hash_scan(filepath, sha256)
+    if known is not None:
+        return dict(known, sha256=sha256, similar_samples=[])
+
+    # 1. 정적 분석 (캐시 우선)
+    analysis_step = scan_analysis(filepath, sha256)
+    analysis = analysis_step["analysis"]
+
+    # 2. 유사 샘플 조회 (이번 판정을 기록하기 전에 이전 판정만 조회)
+    similar_samples = scan_similar(sha256, analysis)
+
+    # 3. Gemini 요약 (캐시 우선)
+    summary_step = scan_summary(sha256, analysis, kind)
+
+    return {
+        "sha256": sha256,
+        "analysis": analysis,
+        "llm_summary": summary_step["llm_summary"],
+        "similar_samples": similar_samples,
+        "cached": analysis_step["cached"] and summary_step["cached"]
+    }
@@ -0,0 +1,215 @@
+"""
+유사 샘플 색인 (유사도 해시 LSH 색인)
+판정이 끝난 샘플의 유사도 해시를 파일에 쌓아 두고, 새 파일과 가장 가까운 이전 샘플과 그 판정을 찾습니다.
+- 저장: 고정 길이 레코드를 이어 붙이기만 하는(append-only) 파일. 레코드 하나를 write 한 번으로 덧붙이므로
+  여러 워커/프로세스가 같은 파일에 동시에 추가해도 레코드가 섞이지 않습니다.
+- 조회: 파일을 mmap으로 열어 공유하고, 본문(32바이트)을 2바이트씩 16개 밴드로 나눈 LSH 버킷 표를
+  프로세스마다 메모리에 둡니다. 밴드가 하나라도 같은 샘플만 후보로 거리를 계산하므로 조회는 전체 개수에 비례하지 않습니다.
+  (다른 프로세스가 추가한 레코드는 조회할 때 파일 크기를 보고 새 부분만 읽어 반영)
+"""
+import os
+import mmap
+import json
+import time
+import struct
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.config import (
+    SIMILARITY_INDEX_ENABLED,
+    SIMILARITY_INDEX_PATH,
+    SIMILARITY_MAX_DISTANCE,
+    SIMILARITY_TOP_K,
+)
+from app.backend.analyze.similarity_hash import DIGEST_BYTES, digest_distance
+
+MAGIC = b"SSIMIDX1"
+HEADER = struct.Struct("<8sII")  # magic, 레코드 크기, 예약
+# digest, sha256, file_type, risk_level, risk_score, scanned_at
+RECORD = struct.Struct(f"<{DIGEST_BYTES}s32s12s10sHI2x")
+
+BAND_BYTES = 2
+BANDS = (DIGEST_BYTES - 2) // BAND_BYTES
+# 조회 한 번에 거리를 계산할 최대 후보 수 (밴드가 많이 겹치는 순)
+MAX_CANDIDATES = 512
+
+
+def _text(value: bytes) -> str:
+    return value.rstrip(b"\x00").decode("ascii", "ignore")
+
+
+def _field(value: Optional[str], size: int) -> bytes:
+    """레코드의 고정 길이 문자열 필드 (ASCII만, size바이트에서 자름)"""
+    return (value or "").encode("ascii", "ignore")[:size]
+
+
+def _score(value: Any) -> int:
+    """레코드의 위험 점수 필드 (숫자가 아니면 0, 0~0xFFFF로 자름)"""
+    try:
+        score = int(float(value or 0))
+    except (TypeError, ValueError, OverflowError):
+        score = 0
+    return max(0, min(score, 0xFFFF))
+
+
+class SimilarityIndex:
+    def __init__(self, path: str = SIMILARITY_INDEX_PATH, enabled: bool = SIMILARITY_INDEX_ENABLED):
+        self.path = path
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._map: Optional[mmap.mmap] = None
+        self._count = 0
+        self._bands: Dict[bytes, List[int]] = {}
+        self._latest: Dict[bytes, int] = {}  # sha256 -> 마지막 레코드 번호
+
+    # ==========================================
+    # 파일
+    # ==========================================
+    def _ensure_file(self):
+        if os.path.exists(self.path):
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            return
+        try:
+            os.write(fd, HEADER.pack(MAGIC, RECORD.size, 0))
+        finally:
+            os.close(fd)
+
+    def _refresh(self):
+        """파일에 새로 추가된 레코드를 읽어 LSH 버킷 표에 반영합니다. (잠금을 잡고 호출)"""
+        if not os.path.exists(self.path):
+            return
+        size = os.path.getsize(self.path)
+        count = max(0, (size - HEADER.size) // RECORD.size)
+        if count <= self._count:
+            return
+
+        if self._map is not None:
+            self._map.close()
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, record_size, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or record_size != RECORD.size:
+            raise ValueError(f"유사 샘플 색인 파일 형식이 올바르지 않습니다: {self.path}")
+
+        for index in range(self._count, count):
+            offset = HEADER.size + index * RECORD.size
+            digest = self._map[offset:offset + DIGEST_BYTES]
+            sha256 = self._map[offset + DIGEST_BYTES:offset + DIGEST_BYTES + 32]
+            for band in range(BANDS):
+                start = 2 + band * BAND_BYTES
+                key = bytes([band]) + digest[start:start + BAND_BYTES]
+                self._bands.setdefault(key, []).append(index)
+            self._latest[sha256] = index
+        self._count = count
+
+    def _record(self, index: int) -> Dict[str, Any]:
+        digest, sha256, file_type, risk_level, risk_score, scanned_at = RECORD.unpack_from(
+            self._map, HEADER.size + index * RECORD.size)
+        return {
+            "digest": digest,
+            "sha256": sha256.hex(),
+            "file_type": _text(file_type),
+            "risk_level": _text(risk_level),
+            "risk_score": risk_score,
+            "scanned_at": scanned_at,
+        }
+
+    # ==========================================
+    # 추가 / 조회
+    # ==========================================
+    def add(self, sha256: str, digest: str, file_type: str, risk_level: str, risk_score: int) -> bool:
+        """판정을 레코드로 덧붙입니다. 같은 sha256의 마지막 판정과 같으면 건너뜁니다."""
+        if not self.enabled or not digest:
+            return False
+        raw_sha = bytes.fromhex(sha256)
+        # 마지막 판정과 비교할 때도 레코드에 저장되는 값(정규화한 값)으로 비교
+        level = _field(risk_level, 10)
+        score = _score(risk_score)
+        record = RECORD.pack(bytes.fromhex(digest), raw_sha, _field(file_type, 12), level, score, int(time.time()))
+
+        with self._lock:
+            self._ensure_file()
+            self._refresh()
+            latest = self._latest.get(raw_sha)
+            if latest is not None:
+                previous = self._record(latest)
+                if (previous["risk_level"], previous["risk_score"]) == (_text(level), score):
+                    return False
+
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+            try:
+                os.write(fd, record)
+            finally:
+                os.close(fd)
+            self._refresh()
+        return True
+
+    def nearest(self, digest: Optional[str], exclude_sha256: Optional[str] = None,
+                k: int = SIMILARITY_TOP_K, max_distance: int = SIMILARITY_MAX_DISTANCE) -> List[Dict[str, Any]]:
+        """
+        가장 가까운 이전 샘플 k개 (거리 오름차순)
+        sha256별로 마지막 판정만 사용하고, exclude_sha256(자기 자신)은 제외합니다.
+        """
+        if not self.enabled or not digest:
+            return []
+        raw = bytes.fromhex(digest)
+        excluded = bytes.fromhex(exclude_sha256) if exclude_sha256 else None
+
+        with self._lock:
+            self._refresh()
+            if self._count == 0:
+                return []
+
+            hits: Dict[int, int] = {}
+            for band in range(BANDS):
+                start = 2 + band * BAND_BYTES
+                for index in self._bands.get(bytes([band]) + raw[start:start + BAND_BYTES], ()):
+                    hits[index] = hits.get(index, 0) + 1
+            candidates = sorted(hits, key=hits.get, reverse=True)[:MAX_CANDIDATES]
+
+            results = {}
+            for index in candidates:
+                record = self._record(index)
+                sha = bytes.fromhex(record["sha256"])
+                if sha == excluded or self._latest.get(sha) != index:
+                    continue
+                distance = digest_distance(raw, record.pop("digest"))
+                if distance <= max_distance:
+                    results[record["sha256"]] = dict(record, distance=distance)
+
+        return sorted(results.values(), key=lambda item: item["distance"])[:k]
+
+    def add_verdict(self, sha256: str, analysis: Dict[str, Any], llm_summary: Optional[str]) -> bool:
+        """분석 결과의 유사도 해시와 LLM 요약의 위험도(risk_level/risk_score)를 기록합니다."""
+        digest = analysis.get("similarity_hash")
+        if not digest or not llm_summary:
+            return False
+        try:
+            summary = json.loads(llm_summary)
+        except (TypeError, ValueError):
+            return False
+        return self.add(sha256, digest, analysis.get("file_type", ""),
+                        str(summary.get("risk_level", "")), summary.get("risk_score", 0))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            try:
+                self._refresh()
+            except (OSError, ValueError):
+                pass
+            return {
+                "enabled": self.enabled,
+                "records": self._count,
+                "samples": len(self._latest),
+                "bands": len(self._bands),
+            }
+
+
+similarity_index = SimilarityIndex()
@@ -0,0 +1,161 @@
+"""
+업로드 저장 서비스
+업로드 파일을 청크 단위로 디스크에 복사하면서 SHA-256을 함께 계산합니다.
+파일 크기와 관계없이 메모리 사용량은 청크 크기로 일정하며, 최대 크기를 넘으면 즉시 중단합니다.
+저장 위치: UPLOAD_DIR/<sha256>/<원본 파일명>  (같은 내용의 파일은 한 번만 저장)
+"""
+import os
+import hashlib
+import zipfile
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from fastapi import UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import UPLOAD_MAX_BYTES, UPLOAD_CHUNK_SIZE, BATCH_MAX_FILES, BATCH_MAX_BYTES
+
+
+@dataclass
+class SavedUpload:
+    path: str
+    file_name: str
+    size: int
+    sha256: str
+
+
+def safe_filename(filename: str) -> str:
+    """경로 구분자를 제거하고 파일명만 남깁니다."""
+    name = os.path.basename((filename or "").replace("\\", "/")).strip()
+    if name in ("", ".", ".."):
+        return "upload.bin"
+    return name
+
+
+def find_upload(upload_dir: str, sha256: str):
+    """SHA-256으로 저장된 업로드 파일 경로를 찾습니다. (없으면 None)"""
+    if len(sha256) != 64 or not all(c in "0123456789abcdef" for c in sha256):
+        return None
+    directory = os.path.join(upload_dir, sha256)
+    if not os.path.isdir(directory):
+        return None
+    for name in sorted(os.listdir(directory)):
+        return os.path.join(directory, name)
+    return None
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"업로드 파일이 너무 큽니다 (최대 {max_bytes // (1024 * 1024)}MB)"
+    )
+
+
+def _store(tmp_path: str, upload_dir: str, sha256: str, file_name: str) -> str:
+    """임시 파일을 UPLOAD_DIR/<sha256>/<파일명> 위치로 옮깁니다. (이미 있으면 임시 파일 삭제)"""
+    target_dir = os.path.join(upload_dir, sha256)
+    os.makedirs(target_dir, exist_ok=True)
+    target_path = os.path.join(target_dir, file_name)
+    if os.path.exists(target_path):
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, target_path)
+    return target_path
+
+
+async def save_upload(file: UploadFile, upload_dir: str,
+                      max_bytes: int = UPLOAD_MAX_BYTES,
+                      chunk_size: int = UPLOAD_CHUNK_SIZE) -> SavedUpload:
+    file_name = safe_filename(file.filename)
+    digest = hashlib.sha256()
+    size = 0
+
+    fd, tmp_path = tempfile.mkstemp(prefix=".upload-", dir=upload_dir)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                digest.update(chunk)
+                await run_in_threadpool(out.write, chunk)
+
+        sha256 = digest.hexdigest()
+        target_path = _store(tmp_path, upload_dir, sha256, file_name)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        await file.close()
+
+    return SavedUpload(path=target_path, file_name=file_name, size=size, sha256=sha256)
+
+
+def save_fileobj(fp, file_name: str, upload_dir: str,
+                 max_bytes: int = UPLOAD_MAX_BYTES,
+                 chunk_size: int = UPLOAD_CHUNK_SIZE) -> SavedUpload:
+    """
+    파일 객체(압축파일 내부 항목 등)를 save_upload와 같은 방식으로 저장합니다. (동기)
+    max_bytes를 더 크게 넘겨도 파일 하나는 UPLOAD_MAX_BYTES를 넘을 수 없습니다.
+    """
+    file_name = safe_filename(file_name)
+    max_bytes = min(max_bytes, UPLOAD_MAX_BYTES)
+    digest = hashlib.sha256()
+    size = 0
+
+    fd, tmp_path = tempfile.mkstemp(prefix=".upload-", dir=upload_dir)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: fp.read(chunk_size), b""):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                digest.update(chunk)
+                out.write(chunk)
+
+        sha256 = digest.hexdigest()
+        target_path = _store(tmp_path, upload_dir, sha256, file_name)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return SavedUpload(path=target_path, file_name=file_name, size=size, sha256=sha256)
+
+
+def expand_zip_upload(saved: SavedUpload, upload_dir: str,
+                      max_files: int = BATCH_MAX_FILES,
+                      max_bytes: int = BATCH_MAX_BYTES) -> Tuple[List[SavedUpload], List[Dict[str, str]]]:
+    """
+    ZIP 업로드의 내부 파일들을 각각 업로드 파일처럼 저장합니다. (일괄 스캔용)
+    압축 해제 총량은 max_bytes, 항목 하나는 UPLOAD_MAX_BYTES로 제한하며, 제한을 넘거나 암호화된 항목은 건너뜁니다.
+    항목 수가 max_files를 넘으면 400 오류를 냅니다.
+    반환: (저장된 파일 목록, 건너뛴 항목 목록 [{"file", "error"}])
+    """
+    members, skipped = [], []
+    remaining = max_bytes
+    with zipfile.ZipFile(saved.path) as zf:
+        infos = [info for info in zf.infolist() if not info.is_dir()]
+        if len(infos) > max_files:
+            raise HTTPException(status_code=400, detail=f"압축파일 내부 파일이 너무 많습니다 (최대 {max_files}개)")
+        for info in infos:
+            if info.flag_bits & 0x1:
+                skipped.append({"file": info.filename, "error": "암호화된 항목이라 스캔할 수 없습니다"})
+                continue
+            try:
+                with zf.open(info) as member:
+                    member_saved = save_fileobj(member, info.filename, upload_dir, remaining)
+            except HTTPException:
+                skipped.append({"file": info.filename, "error": "압축 해제 크기 제한을 초과했습니다"})
+                continue
+            except (zipfile.BadZipFile, OSError, EOFError) as e:
+                skipped.append({"file": info.filename, "error": f"압축 해제 실패: {str(e)}"})
+                continue
+            remaining -= member_saved.size
+            members.append(member_saved)
+    return members, skipped
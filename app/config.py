@@ -11,4 +11,112 @@ GITHUB_CLIENT_ID = os.getenv("GITHUB_CLIENT_ID")
 GITHUB_CLIENT_SECRET = os.getenv("GITHUB_CLIENT_SECRET")
 GITHUB_REDIRECT_URI = os.getenv("GITHUB_REDIRECT_URI")
 
-SECRET_KEY = os.getenv("SECRET_KEY", "supersecret")
\ No newline at end of file
+SECRET_KEY = os.getenv("SECRET_KEY", "supersecret")
+
+# ==========================================
+# 분석기 워커 풀 설정
+# ==========================================
+ANALYZER_POOL_SIZE = int(os.getenv("ANALYZER_POOL_SIZE", "2"))              # 0이면 풀 없이 프로세스 내에서 직접 분석
+ANALYZER_QUEUE_DEPTH = int(os.getenv("ANALYZER_QUEUE_DEPTH", "32"))         # 실행 중인 작업 외 대기 가능한 작업 수
+ANALYZER_JOB_TIMEOUT = float(os.getenv("ANALYZER_JOB_TIMEOUT", "60"))       # 작업당 최대 실행 시간(초)
+ANALYZER_JOB_MAX_RSS_MB = int(os.getenv("ANALYZER_JOB_MAX_RSS_MB", "1024")) # 워커 최대 메모리(RSS, MB)
+ANALYZER_WORKER_MAX_JOBS = int(os.getenv("ANALYZER_WORKER_MAX_JOBS", "500")) # 이 횟수만큼 처리한 워커는 교체
+
+
+# ==========================================
+# 스캔 결과 캐시 설정 (SHA-256 기준)
+# ==========================================
+SCAN_CACHE_MAX_ENTRIES = int(os.getenv("SCAN_CACHE_MAX_ENTRIES", "2048"))    # 메모리(LRU) 캐시 최대 항목 수
+SCAN_CACHE_DB_ENABLED = os.getenv("SCAN_CACHE_DB_ENABLED", "true").lower() == "true"  # DB 영구 캐시 사용 여부
+
+
+# ==========================================
+# 업로드 설정
+# ==========================================
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(100 * 1024 * 1024)))  # 업로드 파일 최대 크기(바이트)
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))      # 디스크로 복사할 때 청크 크기
+
+
+# ==========================================
+# 비동기 스캔 작업(Job) 설정
+# ==========================================
+SCAN_JOB_WORKERS = int(os.getenv("SCAN_JOB_WORKERS", "4"))          # 작업 큐를 처리하는 동시 작업 수
+SCAN_JOB_QUEUE_SIZE = int(os.getenv("SCAN_JOB_QUEUE_SIZE", "100"))  # 대기 가능한 작업 수 (초과 시 429)
+SCAN_JOB_TTL = int(os.getenv("SCAN_JOB_TTL", "3600"))               # 완료된 작업 결과 보관 시간(초)
+
+
+# ==========================================
+# 일괄(batch) 스캔 설정
+# ==========================================
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "100"))  # 요청 1건(또는 압축파일 1개)당 최대 파일 수
+BATCH_MAX_BYTES = int(os.getenv("BATCH_MAX_BYTES", str(1024 * 1024 * 1024)))  # 요청 1건(또는 압축 해제) 전체 최대 크기 (파일별은 UPLOAD_MAX_BYTES)
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", str(max(1, ANALYZER_POOL_SIZE))))  # 동시에 분석할 파일 수
+
+
+# ==========================================
+# PE 분석 설정
+# ==========================================
+PE_DATA_DIRECTORIES = os.getenv("PE_DATA_DIRECTORIES", "IMPORT")  # 파싱할 데이터 디렉토리 (콤마 구분, ALL이면 전체 로드)
+PE_IMPORT_RULES = os.getenv("PE_IMPORT_RULES") or None             # 의심 API 규칙 파일 경로 (비우면 내장 rules/pe_imports.json)
+
+
+# ==========================================
+# PDF 분석 설정
+# ==========================================
+PDF_DECODE_BUDGET = int(os.getenv("PDF_DECODE_BUDGET_MB", "64")) * 1024 * 1024  # 파일 하나에서 스트림을 풀어 만들 수 있는 최대 바이트
+PDF_STRUCTURE_ANALYSIS = os.getenv("PDF_STRUCTURE_ANALYSIS", "true").lower() == "true"  # xref/trailer로 리비전(증분 업데이트) 구조 분석
+
+
+# ==========================================
+# 압축 파일 재귀 검사 설정 (파일 하나를 검사하는 동안 전체에 걸친 한도)
+# ==========================================
+ARCHIVE_MAX_DEPTH = int(os.getenv("ARCHIVE_MAX_DEPTH", "3"))                         # 압축 파일 안의 압축 파일로 들어가는 최대 깊이
+ARCHIVE_MAX_TOTAL_BYTES = int(os.getenv("ARCHIVE_MAX_TOTAL_MB", "256")) * 1024 * 1024  # 메모리로 해제해 읽는 총 바이트
+ARCHIVE_MAX_ENTRIES = int(os.getenv("ARCHIVE_MAX_ENTRIES", "10000"))                 # 검사할 최대 엔트리 수 (중첩 포함)
+ARCHIVE_MAX_SECONDS = float(os.getenv("ARCHIVE_MAX_SECONDS", "30"))                  # 재귀 검사 최대 시간(초)
+ARCHIVE_MAX_MEMBER_BYTES = int(os.getenv("ARCHIVE_MAX_MEMBER_MB", "64")) * 1024 * 1024  # 엔트리 하나를 읽는 최대 크기
+ARCHIVE_SPOOL_MEMORY_BYTES = int(os.getenv("ARCHIVE_SPOOL_MEMORY_MB", "8")) * 1024 * 1024  # 엔트리를 메모리에 두는 최대 크기 (넘으면 임시 파일)
+ARCHIVE_BOMB_RATIO = int(os.getenv("ARCHIVE_BOMB_RATIO", "100"))                     # 압축 폭탄으로 볼 압축률 (ZIP 해제/gz·bz2·xz 스트림 공통)
+ARCHIVE_BOMB_MIN_BYTES = int(os.getenv("ARCHIVE_BOMB_MIN_MB", "16")) * 1024 * 1024   # gz/bz2/xz 스트림은 이만큼 풀린 뒤부터 압축률 검사
+ZIP_INFLATE_MAX_BYTES = int(os.getenv("ZIP_INFLATE_MAX_MB", "1024")) * 1024 * 1024  # 압축 폭탄 검사에서 실제로 해제해 보는 최대 바이트
+ZIP_INFLATE_MAX_CPU_SECONDS = float(os.getenv("ZIP_INFLATE_MAX_CPU_SECONDS", "5"))   # 압축 폭탄 검사 해제 CPU 시간 예산(초)
+ZIP_TOP_ENTRIES = int(os.getenv("ZIP_TOP_ENTRIES", "50"))                         # 보고서에 남기는 의심 점수 상위 엔트리 수 (나머지는 집계만)
+ZIP_ENTRIES_PAGE_SIZE = int(os.getenv("ZIP_ENTRIES_PAGE_SIZE", "100"))             # 엔트리 목록 조회 API 기본 페이지 크기
+ZIP_ENTRIES_PAGE_MAX = int(os.getenv("ZIP_ENTRIES_PAGE_MAX", "1000"))              # 엔트리 목록 조회 API 최대 페이지 크기
+
+
+# ==========================================
+# OOXML(docx/xlsx/pptx) 분석 설정
+# ==========================================
+OOXML_MAX_XML_BYTES = int(os.getenv("OOXML_MAX_XML_MB", "2")) * 1024 * 1024        # .rels/[Content_Types].xml/ActiveX XML 파트를 해제해 읽는 최대 크기
+OOXML_MAX_BINARY_BYTES = int(os.getenv("OOXML_MAX_BINARY_MB", "32")) * 1024 * 1024  # vbaProject.bin/임베디드 OLE 객체를 해제해 읽는 최대 크기
+
+
+# ==========================================
+# 내장 파일 추출(carving) 설정
+# ==========================================
+CARVE_MAX_DEPTH = int(os.getenv("CARVE_MAX_DEPTH", "2"))         # 추출한 파일을 다시 분석하는 최대 깊이 (0이면 위치만 기록)
+CARVE_MAX_CHILDREN = int(os.getenv("CARVE_MAX_CHILDREN", "8"))   # 파일 하나에서 다시 분석할 최대 조각 수
+
+
+# ==========================================
+# 유사 샘플 검색(유사도 해시 색인) 설정
+# ==========================================
+SIMILARITY_INDEX_ENABLED = os.getenv("SIMILARITY_INDEX_ENABLED", "true").lower() == "true"  # 유사 샘플 색인 사용 여부
+SIMILARITY_INDEX_PATH = os.getenv(
+    "SIMILARITY_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "similarity.idx"))  # 색인 파일 (append-only)
+SIMILARITY_MAX_DISTANCE = int(os.getenv("SIMILARITY_MAX_DISTANCE", "100"))  # 이 거리 이하만 유사 샘플로 보고
+SIMILARITY_TOP_K = int(os.getenv("SIMILARITY_TOP_K", "5"))                  # 응답에 넣을 유사 샘플 수
+
+
+# ==========================================
+# 알려진 해시 판정 저장소(Bloom 필터) 설정
+# ==========================================
+HASH_VERDICT_ENABLED = os.getenv("HASH_VERDICT_ENABLED", "true").lower() == "true"            # 알려진 해시면 분석/요약 생략
+HASH_VERDICT_RECORD_SCANS = os.getenv("HASH_VERDICT_RECORD_SCANS", "true").lower() == "true"  # 완료된 스캔의 악성(high) 판정도 저장
+HASH_BLOOM_PATH = os.getenv(
+    "HASH_BLOOM_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "hash_verdict.bloom"))  # Bloom 필터 파일 (mmap)
+HASH_BLOOM_CAPACITY = int(os.getenv("HASH_BLOOM_CAPACITY", "10000000"))      # 예상 최대 해시 수 (기본 약 18MB)
+HASH_BLOOM_ERROR_RATE = float(os.getenv("HASH_BLOOM_ERROR_RATE", "0.001"))   # 목표 오탐률 (오탐이면 DB 조회 1회)
@@ -0,0 +1,200 @@
+"""
+Prometheus 텍스트 형식 메트릭
+외부 라이브러리 없이 카운터/히스토그램/게이지를 제공하고 GET /metrics에서 노출합니다.
+- 기록(inc/observe)은 잠금 한 번 + 버킷 이진 탐색뿐이라 요청 경로에서 항상 켜 두어도 부담이 없습니다.
+- 값은 이 프로세스 기준입니다. (워커 풀 프로세스 안에서 기록한 값은 포함되지 않으므로 부모에서 측정)
+"""
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 기본 버킷 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# 업로드 크기 버킷 (바이트): 1KB ~ 100MB
+SIZE_BUCKETS = tuple(1024 * 4 ** i for i in range(10))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+    # HELP/TYPE와 샘플에 쓰는 이름 접미사 (카운터는 샘플 이름이 <name>_total이므로 헤더도 같게)
+    suffix = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 레이블이 맞지 않습니다 ({', '.join(self.labelnames)})")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        name = self.name + self.suffix
+        return [f"# HELP {name} {self.documentation}", f"# TYPE {name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+    suffix = "_total"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = self._children.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._children.items())
+        lines = self.header()
+        for key, value in items:
+            lines.append(f"{self.name}{self.suffix}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                # [버킷별 개수..., +Inf 개수, 합계]
+                child = self._children[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            child[index] += 1
+            child[-1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(child)) for key, child in self._children.items())
+        lines = self.header()
+        for key, child in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child[:-1]):
+                cumulative += count
+                le = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge(_Metric):
+    """
+    수집 시점에 callback으로 값을 읽는 게이지
+    callback은 {레이블 값 튜플: 값}을 반환합니다. (레이블이 없으면 키는 빈 튜플)
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 callback: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        if self.callback is None:
+            return lines
+        try:
+            values = self.callback()
+        except Exception:
+            return lines
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"이미 등록된 메트릭입니다: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+    return registry.register(Counter(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Iterable[str] = (),
+              buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+    return registry.register(Histogram(name, documentation, labelnames, buckets))
+
+
+def gauge(name: str, documentation: str, labelnames: Iterable[str] = (),
+          callback: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None) -> Gauge:
+    return registry.register(Gauge(name, documentation, labelnames, callback))
+
+
+# ==========================================
+# 스캔 파이프라인 메트릭
+# ==========================================
+UPLOAD_BYTES = histogram(
+    "safescan_upload_bytes", "Size of uploaded scan files in bytes",
+    ("endpoint",), SIZE_BUCKETS)
+UPLOAD_SECONDS = histogram(
+    "safescan_upload_seconds", "Time spent streaming an upload to disk",
+    ("endpoint",))
+ANALYZER_SECONDS = histogram(
+    "safescan_analyzer_seconds", "Static analyzer run time by detected file type",
+    ("file_type", "outcome"))
+LLM_SECONDS = histogram(
+    "safescan_llm_seconds", "Gemini summary request time by outcome (ok/429/error/fallback)",
+    ("kind", "outcome"))
+QUEUE_WAIT_SECONDS = histogram(
+    "safescan_queue_wait_seconds", "Time a scan waited in a queue before running",
+    ("queue",))
+CACHE_DB_SECONDS = histogram(
+    "safescan_cache_db_seconds", "Scan cache database query time",
+    ("op",))
+REJECTED = counter(
+    "safescan_rejected", "Scans rejected because a queue was full",
+    ("queue",))
+HASH_LOOKUPS = counter(
+    "safescan_hash_lookups", "Known-hash lookups by outcome (bloom_negative/hit/false_positive)",
+    ("outcome",))
@@ -0,0 +1,56 @@
+"""
+업로드 크기 제한 미들웨어
+요청 본문을 파싱하기 전에 크기를 검사하여, 제한을 넘는 업로드는 버퍼링하지 않고 413으로 거절합니다.
+- Content-Length가 제한을 넘으면 본문을 한 바이트도 읽지 않고 바로 거절
+- Content-Length가 없거나(청크 전송) 거짓인 경우 수신한 바이트 수를 세다가 제한을 넘는 순간 중단
+- 여러 파일을 받는 경로(일괄 스캔)는 path_limits로 본문 전체 한도를 따로 지정 (파일별 한도는 저장할 때 검사)
+"""
+from typing import Dict, Optional
+
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+
+# multipart 경계/헤더 등 파일 외 본문 크기 여유분
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+def _too_large_detail(max_bytes: int) -> str:
+    return f"업로드 파일이 너무 큽니다 (최대 {max_bytes // (1024 * 1024)}MB)"
+
+
+class UploadSizeLimitMiddleware:
+    def __init__(self, app, max_bytes: int, path_prefix: str = "/api/scan",
+                 path_limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_prefix = path_prefix
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or scope["method"] != "POST"
+                or not scope["path"].startswith(self.path_prefix)):
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes = self.path_limits.get(scope["path"].rstrip("/"), self.max_bytes)
+        max_body = max_bytes + MULTIPART_OVERHEAD
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > max_body:
+            response = JSONResponse(status_code=413, content={"detail": _too_large_detail(max_bytes)})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body:
+                    # FastAPI는 본문 파싱 중 발생한 HTTPException을 그대로 응답으로 변환
+                    raise HTTPException(status_code=413, detail=_too_large_detail(max_bytes))
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,116 @@
+"""
+분석 엔진 호출 방식 벤치마크
+기존 방식(파일마다 `python analyze_*.py` 서브프로세스 실행)과
+프로세스 내 직접 호출 방식의 스캔 1건당 지연 시간을 비교합니다.
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.bench_engine --repeat 20
+    python -m benchmarks.bench_engine Info_Maker/malware_test.pdf --repeat 50
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from app.backend.analyze import file_analyzer
+
+ANALYZE_DIR = os.path.join(ROOT_DIR, "app", "backend", "analyze")
+
+DEFAULT_SAMPLES = [
+    os.path.join(ROOT_DIR, "Info_Maker", "malware_test.pdf"),
+    os.path.join(ROOT_DIR, "Info_Maker", "malware_test.exe"),
+    os.path.join(ROOT_DIR, "Info_Maker", "malware_test.zip"),
+]
+
+# 확장자 -> (CLI 스크립트, 프로세스 내 분석 함수)
+ENGINES = {
+    ".pdf": ("analyze_pdf.py", file_analyzer.analyze_pdf),
+    ".exe": ("analyze_pe.py", file_analyzer.analyze_pe),
+    ".dll": ("analyze_pe.py", file_analyzer.analyze_pe),
+    ".zip": ("analyze_zip.py", file_analyzer.analyze_zip),
+    ".doc": ("analyze_mshwp.py", file_analyzer.analyze_mshwp),
+    ".xls": ("analyze_mshwp.py", file_analyzer.analyze_mshwp),
+    ".ppt": ("analyze_mshwp.py", file_analyzer.analyze_mshwp),
+    ".hwp": ("analyze_mshwp.py", file_analyzer.analyze_mshwp),
+}
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _summarize(timings):
+    return {
+        "runs": len(timings),
+        "mean_ms": round(statistics.mean(timings) * 1000, 3),
+        "p50_ms": round(_percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(_percentile(timings, 95) * 1000, 3),
+        "max_ms": round(max(timings) * 1000, 3),
+    }
+
+
+def bench_subprocess(script, filepath, repeat):
+    script_path = os.path.join(ANALYZE_DIR, script)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, script_path, filepath],
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            errors='ignore'
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def bench_inprocess(func, filepath, repeat):
+    # 첫 호출의 import 비용은 워밍업으로 제외 (서버에서는 한 번만 발생)
+    func(filepath)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(filepath)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="서브프로세스 vs 프로세스 내 분석 엔진 지연 시간 비교")
+    parser.add_argument("samples", nargs="*", help="분석할 샘플 파일 경로 (기본: Info_Maker/malware_test.*)")
+    parser.add_argument("--repeat", type=int, default=10, help="샘플당 반복 횟수")
+    args = parser.parse_args()
+
+    results = []
+    for filepath in args.samples or DEFAULT_SAMPLES:
+        ext = os.path.splitext(filepath)[1].lower()
+        if ext not in ENGINES or not os.path.exists(filepath):
+            print(f"[건너뜀] {filepath}", file=sys.stderr)
+            continue
+
+        script, func = ENGINES[ext]
+        sub = _summarize(bench_subprocess(script, filepath, args.repeat))
+        inproc = _summarize(bench_inprocess(func, filepath, args.repeat))
+        results.append({
+            "file": os.path.basename(filepath),
+            "size_bytes": os.path.getsize(filepath),
+            "subprocess": sub,
+            "inprocess": inproc,
+            "speedup_p50": round(sub["p50_ms"] / inproc["p50_ms"], 1) if inproc["p50_ms"] else None,
+        })
+
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
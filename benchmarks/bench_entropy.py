@@ -0,0 +1,110 @@
+"""
+엔트로피 계산 벤치마크
+기존 방식(pefile section.get_entropy(): 섹션마다 바이트를 복사해 Counter로 히스토그램 계산)과
+entropy 엔진(mmap + NumPy, 파일/섹션/오버레이/4KB 창 프로파일)의 처리 시간을 비교합니다.
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.bench_entropy --size-mb 50 --repeat 3
+    python -m benchmarks.bench_entropy Info_Maker/malware_test.exe
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import pefile
+
+from app.backend.analyze import entropy as entropy_engine
+from benchmarks.corpus import make_pe
+from benchmarks.bench_engine import _summarize
+
+
+def legacy_entropy(filepath):
+    """섹션별 get_entropy() (순수 파이썬 경로, 섹션 외 영역은 보지 않음)"""
+    pe = pefile.PE(filepath, fast_load=True)
+    try:
+        return [section.get_entropy() for section in pe.sections]
+    finally:
+        pe.close()
+
+
+def engine_entropy(filepath):
+    """파일 전체 프로파일 + 섹션별/오버레이 프로파일"""
+    pe = pefile.PE(filepath, fast_load=True)
+    try:
+        with entropy_engine.open_mapped(filepath) as buf:
+            profile = entropy_engine.EntropyProfile(buf)
+            summary = profile.summary()
+            sections = [profile.range_profile(s.get_PointerToRawData_adj(), s.PointerToRawData + s.SizeOfRawData)
+                        for s in pe.sections]
+            overlay_start = pe.get_overlay_data_start_offset()
+            overlay = profile.range_profile(overlay_start) if overlay_start is not None else None
+        return summary, sections, overlay
+    finally:
+        pe.close()
+
+
+def _time(func, filepath, repeat):
+    func(filepath)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(filepath)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def bench_file(filepath, repeat):
+    legacy = _summarize(_time(legacy_entropy, filepath, repeat))
+    engine = _summarize(_time(engine_entropy, filepath, repeat))
+    _, sections, _ = engine_entropy(filepath)
+    max_diff = max((abs(a - b["entropy"]) for a, b in zip(legacy_entropy(filepath), sections)), default=0.0)
+    return {
+        "file": os.path.basename(filepath),
+        "size_bytes": os.path.getsize(filepath),
+        "numpy": entropy_engine.np is not None,
+        "section_get_entropy": legacy,
+        "entropy_engine": engine,
+        "max_section_entropy_diff": max_diff,
+        "speedup_p50": round(legacy["p50_ms"] / engine["p50_ms"], 1) if engine["p50_ms"] else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="section.get_entropy() vs mmap/NumPy 엔트로피 엔진 비교")
+    parser.add_argument("samples", nargs="*", help="추가로 측정할 PE 파일 경로")
+    parser.add_argument("--size-mb", type=int, default=50, help="합성 PE 크기(MB, 대략)")
+    parser.add_argument("--repeat", type=int, default=3, help="파일당 반복 횟수")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_entropy_")
+    try:
+        # 섹션 8개 + 오버레이 (섹션 크기는 --size-mb를 8등분)
+        section_size = max(0x1000, args.size_mb * 1024 * 1024 // 9)
+        path = os.path.join(workdir, f"synthetic_{args.size_mb}mb.exe")
+        with open(path, "wb") as f:
+            f.write(make_pe(n_sections=8, n_imports=50, section_size=section_size, overlay_size=section_size))
+
+        paths = [path]
+        for filepath in args.samples:
+            if not os.path.exists(filepath):
+                print(f"[건너뜀] {filepath}", file=sys.stderr)
+                continue
+            paths.append(filepath)
+
+        results = [bench_file(filepath, args.repeat) for filepath in paths]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
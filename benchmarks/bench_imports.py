@@ -0,0 +1,81 @@
+"""
+의심 API 임포트 매칭 벤치마크
+기존 방식(임포트마다 `any(api in func_name for api in 목록)` 부분 문자열 검사 + pefile.get_imphash())과
+컴파일된 규칙 테이블로 일치/imphash를 한 번에 계산하는 match_imports의 시간을 비교합니다.
+(pefile은 임포트 썽크를 ILT/IAT 합쳐 8192개까지만 읽으므로 기본 4000개로 측정)
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.bench_imports --imports 4000 --repeat 50
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import pefile
+
+from app.backend.analyze.analyze_pe import load_import_rules, match_imports, _compile_import_rules
+from benchmarks.corpus import make_pe
+from benchmarks.bench_engine import _summarize
+
+
+def legacy_match(pe, apis):
+    found = []
+    for entry in pe.DIRECTORY_ENTRY_IMPORT:
+        dll_name = entry.dll.decode('utf-8', 'ignore')
+        for imp in entry.imports:
+            if imp.name:
+                func_name = imp.name.decode('utf-8', 'ignore')
+                if any(api in func_name for api in apis):
+                    found.append({"function": func_name, "dll": dll_name})
+    return found, pe.get_imphash()
+
+
+def _time(func, repeat):
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="부분 문자열 검사 vs 컴파일된 규칙 테이블 임포트 매칭 비교")
+    parser.add_argument("--imports", type=int, default=4000, help="합성 PE의 임포트 함수 개수")
+    parser.add_argument("--repeat", type=int, default=50, help="반복 횟수")
+    args = parser.parse_args()
+
+    pe = pefile.PE(data=make_pe(n_sections=2, n_imports=args.imports))
+    rules = load_import_rules()
+    apis = sorted({rule for matches in rules.values() for _, _, rule in matches})
+
+    start = time.perf_counter()
+    _compile_import_rules.cache_clear()
+    load_import_rules()
+    compile_ms = round((time.perf_counter() - start) * 1000, 3)
+
+    legacy = _summarize(_time(lambda: legacy_match(pe, apis), args.repeat))
+    compiled = _summarize(_time(lambda: match_imports(pe.DIRECTORY_ENTRY_IMPORT, rules), args.repeat))
+    matches, imphash, count = match_imports(pe.DIRECTORY_ENTRY_IMPORT, rules)
+
+    print(json.dumps({
+        "imports": count,
+        "rules": len(apis),
+        "rule_compile_ms": compile_ms,
+        "substring_any": legacy,
+        "compiled_table": compiled,
+        "matches": len(matches),
+        "imphash_matches_pefile": imphash == pe.get_imphash(),
+        "speedup_p50": round(legacy["p50_ms"] / compiled["p50_ms"], 1) if compiled["p50_ms"] else None,
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
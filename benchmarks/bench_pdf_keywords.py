@@ -0,0 +1,103 @@
+"""
+PDF 키워드 스캔 벤치마크
+기존 방식(f.read()로 파일 전체를 읽고 키워드마다 content.count(): 키워드 9개 = 9번 전체 탐색)과
+KeywordScanner(정규식 하나로 mmap 전체를 한 번만 탐색)의 시간과 파이썬 메모리 최대치를 비교합니다.
+두 방식의 키워드별 개수가 같은지도 확인합니다.
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.bench_pdf_keywords --size-mb 100 --repeat 3
+    python -m benchmarks.bench_pdf_keywords Info_Maker/malware_test.pdf
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from app.backend.analyze.analyze_pdf import SUSPICIOUS_KEYWORDS, KEYWORD_SCANNER
+from app.backend.analyze.entropy import open_mapped
+from benchmarks.corpus import make_pdf
+from benchmarks.bench_engine import _summarize
+
+# make_pdf 객체 하나의 대략적인 크기 (stream_size=256 기준)
+_BYTES_PER_OBJECT = 350
+
+
+def legacy_counts(filepath):
+    with open(filepath, "rb") as f:
+        content = f.read()
+    return {keyword: content.count(keyword) for keyword in SUSPICIOUS_KEYWORDS}
+
+
+def mmap_counts(filepath):
+    with open_mapped(filepath) as buf:
+        hits = KEYWORD_SCANNER.scan(buf, max_offsets=100)
+    return {keyword: hit["count"] for keyword, hit in hits.items()}
+
+
+def _measure(func, filepath, repeat):
+    func(filepath)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(filepath)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(filepath)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    summary = _summarize(timings)
+    summary["peak_python_mb"] = round(peak / (1024 * 1024), 2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="content.count() 반복 vs 단일 패스 키워드 스캔 비교")
+    parser.add_argument("files", nargs="*", help="측정할 PDF (없으면 --size-mb 크기의 합성 PDF 생성)")
+    parser.add_argument("--size-mb", type=int, default=100, help="합성 PDF 크기(MB)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수")
+    args = parser.parse_args()
+
+    temp_dir = None
+    files = args.files
+    if not files:
+        temp_dir = tempfile.mkdtemp(prefix="bench-pdf-")
+        path = os.path.join(temp_dir, "synthetic.pdf")
+        n_objects = args.size_mb * 1024 * 1024 // _BYTES_PER_OBJECT
+        with open(path, "wb") as f:
+            f.write(make_pdf(n_objects=n_objects, n_keywords=n_objects // 100))
+        files = [path]
+
+    results = []
+    try:
+        for path in files:
+            expected = legacy_counts(path)
+            legacy = _measure(legacy_counts, path, args.repeat)
+            mapped = _measure(mmap_counts, path, args.repeat)
+            results.append({
+                "file": os.path.basename(path),
+                "size_mb": round(os.path.getsize(path) / (1024 * 1024), 2),
+                "hits": sum(expected.values()),
+                "read_and_count": legacy,
+                "single_pass_mmap": mapped,
+                "counts_match": mmap_counts(path) == expected,
+                "speedup_p50": round(legacy["p50_ms"] / mapped["p50_ms"], 1) if mapped["p50_ms"] else None,
+            })
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print(json.dumps({"keywords": len(SUSPICIOUS_KEYWORDS), "results": results}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+PE 로드 방식 벤치마크
+pefile 전체 로드(기존 방식)와 fast_load + 필요한 데이터 디렉토리만 파싱하는 방식의
+inspect_pe 지연 시간과 최대 메모리(tracemalloc)를 비교합니다.
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.bench_pe_load --repeat 10
+    python -m benchmarks.bench_pe_load Info_Maker/malware_test.exe --directories IMPORT,RESOURCE
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from app.backend.analyze.analyze_pe import inspect_pe, DEFAULT_DATA_DIRECTORIES
+from benchmarks.corpus import make_pe
+from benchmarks.bench_engine import _summarize
+
+# 리소스/재배치가 많은 합성 PE (설치 프로그램 같은 큰 실행파일 흉내)
+SYNTHETIC = {
+    "synthetic_small.exe": dict(n_sections=4, n_imports=40, n_resources=50, n_relocs=2000),
+    "synthetic_large.exe": dict(n_sections=8, n_imports=200, section_size=0x40000,
+                                n_resources=3000, resource_size=1024, n_relocs=60000),
+}
+
+
+def _time(filepath, directories, repeat):
+    inspect_pe(filepath, directories)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        inspect_pe(filepath, directories)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _peak_mb(filepath, directories):
+    tracemalloc.start()
+    try:
+        inspect_pe(filepath, directories)
+        return round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+    finally:
+        tracemalloc.stop()
+
+
+def bench_file(filepath, directories, repeat):
+    full = _summarize(_time(filepath, "ALL", repeat))
+    fast = _summarize(_time(filepath, directories, repeat))
+    full["peak_mb"] = _peak_mb(filepath, "ALL")
+    fast["peak_mb"] = _peak_mb(filepath, directories)
+
+    # 두 방식의 임포트 검사 결과가 같은지 확인 (fast_load에서 임포트를 파싱하는 경우)
+    full_result = inspect_pe(filepath, "ALL")
+    fast_result = inspect_pe(filepath, directories)
+    return {
+        "file": os.path.basename(filepath),
+        "size_bytes": os.path.getsize(filepath),
+        "full_load": full,
+        "fast_load": fast,
+        "directories": fast_result["parsed_directories"],
+        "same_imports": full_result["suspicious_imports"] == fast_result["suspicious_imports"],
+        "speedup_p50": round(full["p50_ms"] / fast["p50_ms"], 1) if fast["p50_ms"] else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pefile 전체 로드 vs fast_load 비교")
+    parser.add_argument("samples", nargs="*", help="추가로 측정할 PE 파일 경로 (기본: 합성 PE만)")
+    parser.add_argument("--directories", default=",".join(DEFAULT_DATA_DIRECTORIES),
+                        help="fast_load에서 파싱할 데이터 디렉토리 (콤마 구분)")
+    parser.add_argument("--repeat", type=int, default=5, help="파일당 반복 횟수")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_pe_")
+    try:
+        paths = []
+        for name, params in SYNTHETIC.items():
+            path = os.path.join(workdir, name)
+            with open(path, "wb") as f:
+                f.write(make_pe(**params))
+            paths.append(path)
+
+        for filepath in args.samples:
+            if not os.path.exists(filepath):
+                print(f"[건너뜀] {filepath}", file=sys.stderr)
+                continue
+            paths.append(filepath)
+
+        results = [bench_file(path, args.directories, args.repeat) for path in paths]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
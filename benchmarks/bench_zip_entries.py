@@ -0,0 +1,102 @@
+"""
+ZIP 엔트리 수 확장성 벤치마크
+엔트리 수를 늘려 가며 합성 ZIP을 만들고 inspect_zip(재귀 검사 포함/제외)과
+엔트리 목록 페이지 조회(list_entries)의 시간, 파이썬 메모리 최대치, 보고서/결과(JSON) 크기를 측정합니다.
+엔트리 수가 늘어도 보고서와 결과 크기는 거의 일정해야 합니다. (엔트리별 정보는 집계 + 상위 N개만)
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.bench_zip_entries --entries 1000,20000,200000 --repeat 1
+    python -m benchmarks.bench_zip_entries archive.zip
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from app.backend.analyze.analyze_zip import inspect_zip, format_zip_report, list_entries
+from benchmarks.corpus import make_zip
+from benchmarks.bench_engine import _summarize
+
+# 합성 엔트리 하나의 내용 크기 (작게 해서 중앙 디렉토리 처리 비용이 드러나도록)
+_ENTRY_SIZE = 64
+
+
+def _measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    summary = _summarize(timings)
+    summary["peak_python_mb"] = round(peak / (1024 * 1024), 2)
+    return summary
+
+
+def _output_sizes(path):
+    result = inspect_zip(path)
+    return {
+        "report_bytes": len(format_zip_report(result).encode("utf-8")),
+        "details_json_bytes": len(json.dumps(result, ensure_ascii=False).encode("utf-8")),
+        # 재귀 검사 트리는 탐지된 노드만, 단계마다 MAX_NODES_PER_LEVEL개까지만 남김
+        "tree_json_bytes": len(json.dumps(result["tree"], ensure_ascii=False).encode("utf-8")),
+        "top_entries": len(result["entries"]),
+    }
+
+
+def bench_file(path, repeat):
+    total = list_entries(path, 0, 1)["total_entries"]
+    result = {
+        "file": os.path.basename(path),
+        "size_mb": round(os.path.getsize(path) / (1024 * 1024), 2),
+        "entries": total,
+        "summary_only": _measure(lambda: inspect_zip(path, recursive=False), repeat),
+        "with_recursive_scan": _measure(lambda: inspect_zip(path), repeat),
+        "page_last_100": _measure(lambda: list_entries(path, max(0, total - 100), 100), repeat),
+    }
+    result.update(_output_sizes(path))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엔트리 수에 따른 ZIP 분석 시간/메모리/출력 크기")
+    parser.add_argument("files", nargs="*", help="측정할 ZIP (없으면 --entries 개수별 합성 ZIP 생성)")
+    parser.add_argument("--entries", default="1000,20000,200000", help="합성 ZIP 엔트리 수 (쉼표로 구분)")
+    parser.add_argument("--repeat", type=int, default=1, help="반복 횟수")
+    args = parser.parse_args()
+
+    temp_dir = None
+    files = args.files
+    if not files:
+        temp_dir = tempfile.mkdtemp(prefix="bench-zip-")
+        files = []
+        for count in (int(value) for value in args.entries.split(",")):
+            path = os.path.join(temp_dir, f"entries_{count}.zip")
+            with open(path, "wb") as f:
+                f.write(make_zip(n_entries=count, entry_size=_ENTRY_SIZE))
+            files.append(path)
+
+    try:
+        results = [bench_file(path, args.repeat) for path in files]
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print(json.dumps({"results": results}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
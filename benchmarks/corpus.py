@@ -0,0 +1,511 @@
+"""
+벤치마크용 합성 샘플 생성기
+같은 인자(seed 포함)로 호출하면 항상 같은 바이트열을 만듭니다.
+- make_pe:  섹션 N개, 임포트 N개를 가진 PE32 실행파일
+- make_pdf: 객체 N개, 의심 키워드 N개를 가진 PDF (xref 테이블 포함)
+- make_zip: 항목 N개, 중첩 깊이 D의 ZIP
+- make_ole: VBA 매크로 스트림 N개를 가진 OLE(Compound File) 문서
+"""
+import io
+import random
+import struct
+import zipfile
+
+# ==========================================
+# PE
+# ==========================================
+_FILE_ALIGNMENT = 0x200
+_SECTION_ALIGNMENT = 0x1000
+
+_IMPORT_POOL = {
+    "KERNEL32.dll": ["VirtualAlloc", "WriteProcessMemory", "CreateRemoteThread", "CreateProcessA",
+                     "WinExec", "GetProcAddress", "LoadLibraryA", "CreateFileW", "ReadFile",
+                     "WriteFile", "CloseHandle", "Sleep", "GetTickCount", "ExitProcess"],
+    "ADVAPI32.dll": ["RegOpenKeyExA", "RegSetValueExA", "RegCloseKey", "OpenProcessToken"],
+    "WININET.dll": ["InternetOpenA", "InternetOpenUrlA", "InternetReadFile"],
+    "urlmon.dll": ["URLDownloadToFileA"],
+    "SHELL32.dll": ["ShellExecuteA", "SHGetFolderPathA"],
+    "USER32.dll": ["MessageBoxA", "GetMessageA", "DispatchMessageA", "FindWindowA"],
+}
+
+
+def _align(value, alignment):
+    return (value + alignment - 1) // alignment * alignment
+
+
+def _import_names(n_imports, rng):
+    """DLL별 임포트 함수 목록 (실제 API 이름 우선, 부족하면 합성 이름)"""
+    pool = [(dll, func) for dll, funcs in _IMPORT_POOL.items() for func in funcs]
+    rng.shuffle(pool)
+    chosen = pool[:n_imports]
+    for i in range(len(chosen), n_imports):
+        chosen.append(("SYNTH%d.dll" % (i % 8), "SyntheticFunc%05d" % i))
+    by_dll = {}
+    for dll, func in chosen:
+        by_dll.setdefault(dll, []).append(func)
+    return by_dll
+
+
+def _build_idata(by_dll, rva):
+    """임포트 디렉토리(.idata) 섹션 내용을 만듭니다. 반환: (bytes, 디렉토리 크기)"""
+    dlls = list(by_dll)
+    desc_size = 20 * (len(dlls) + 1)
+
+    # 각 DLL의 ILT/IAT 크기 계산
+    thunk_offsets = []
+    offset = desc_size
+    for dll in dlls:
+        thunk_offsets.append(offset)
+        offset += 4 * (len(by_dll[dll]) + 1)
+    iat_offsets = []
+    for dll in dlls:
+        iat_offsets.append(offset)
+        offset += 4 * (len(by_dll[dll]) + 1)
+
+    # 이름 테이블
+    names = bytearray()
+    names_base = offset
+    hint_rvas, dll_name_rvas = [], []
+    for dll in dlls:
+        rvas = []
+        for func in by_dll[dll]:
+            rvas.append(rva + names_base + len(names))
+            entry = struct.pack("<H", 0) + func.encode() + b"\x00"
+            if len(entry) % 2:
+                entry += b"\x00"
+            names += entry
+        hint_rvas.append(rvas)
+    for dll in dlls:
+        dll_name_rvas.append(rva + names_base + len(names))
+        names += dll.encode() + b"\x00"
+
+    data = bytearray(names_base)
+    for i, dll in enumerate(dlls):
+        struct.pack_into("<IIIII", data, 20 * i,
+                         rva + thunk_offsets[i], 0, 0, dll_name_rvas[i], rva + iat_offsets[i])
+        for j, hint_rva in enumerate(hint_rvas[i]):
+            struct.pack_into("<I", data, thunk_offsets[i] + 4 * j, hint_rva)
+            struct.pack_into("<I", data, iat_offsets[i] + 4 * j, hint_rva)
+    data += names
+    return bytes(data), desc_size
+
+
+def _section_payload(index, size, rng):
+    """섹션 내용: 낮은 엔트로피(반복 코드)와 높은 엔트로피(난수, 패킹 흉내) 섹션을 섞습니다."""
+    if index % 3 == 2:
+        return rng.randbytes(size)
+    pattern = b"\x55\x8b\xec\x83\xec\x10\x53\x56\x57\x8b\x45\x08\x5f\x5e\x5b\xc9\xc3\x90"
+    return (pattern * (size // len(pattern) + 1))[:size]
+
+
+def _build_rsrc(n_resources, resource_size, rva, rng):
+    """RT_RCDATA 리소스 n개를 가진 리소스 디렉토리(.rsrc) 섹션 내용"""
+    entry_dirs = 16 + 8 + 16 + 8 * n_resources          # 루트 + 형식(RT_RCDATA) 디렉토리
+    lang_dirs = entry_dirs
+    data_entries = lang_dirs + (16 + 8) * n_resources   # 리소스별 언어 디렉토리
+    payloads = data_entries + 16 * n_resources
+    slot = _align(resource_size, 4)
+
+    data = bytearray(payloads + slot * n_resources)
+    struct.pack_into("<IIHHHH", data, 0, 0, 0, 0, 0, 0, 1)
+    struct.pack_into("<II", data, 16, 10, 0x80000000 | 24)  # RT_RCDATA
+    struct.pack_into("<IIHHHH", data, 24, 0, 0, 0, 0, 0, n_resources)
+    for i in range(n_resources):
+        lang_dir = lang_dirs + 24 * i
+        data_entry = data_entries + 16 * i
+        payload = payloads + slot * i
+        struct.pack_into("<II", data, 40 + 8 * i, i + 1, 0x80000000 | lang_dir)
+        struct.pack_into("<IIHHHHII", data, lang_dir, 0, 0, 0, 0, 0, 1, 0x409, data_entry)
+        struct.pack_into("<IIII", data, data_entry, rva + payload, resource_size, 0, 0)
+        data[payload:payload + resource_size] = rng.randbytes(resource_size)
+    return bytes(data)
+
+
+def _build_reloc(n_relocs, target_rva, target_size):
+    """target 영역을 가리키는 HIGHLOW 재배치 항목 n개 (.reloc 섹션 내용)"""
+    data = bytearray()
+    pages = max(1, target_size // 0x1000)
+    per_block = 256
+    for block in range(0, n_relocs, per_block):
+        count = min(per_block, n_relocs - block)
+        page = target_rva + ((block // per_block) % pages) * 0x1000
+        entries = b"".join(struct.pack("<H", (3 << 12) | (i * 4 % 0x1000)) for i in range(count))
+        if count % 2:
+            entries += b"\x00\x00"
+        data += struct.pack("<II", page, 8 + len(entries)) + entries
+    return bytes(data)
+
+
+def make_pe(n_sections=4, n_imports=20, section_size=0x1000, overlay_size=0,
+            n_resources=0, resource_size=256, n_relocs=0, seed=0):
+    """
+    섹션 N개, 임포트 N개를 가진 PE32 파일
+    n_resources/n_relocs를 주면 리소스/재배치 디렉토리도 만듭니다. (전체 로드 비용 측정용)
+    """
+    rng = random.Random(seed)
+    n_sections = max(1, n_sections)
+    total_sections = n_sections + 1 + (1 if n_resources else 0) + (1 if n_relocs else 0)
+    headers_size = _align(0x40 + 4 + 20 + 224 + 40 * total_sections, _FILE_ALIGNMENT)
+
+    sections = []
+    directories = {}
+    raw_ptr = headers_size
+    rva = _align(headers_size, _SECTION_ALIGNMENT)
+
+    def add_section(name, payload, characteristics):
+        nonlocal raw_ptr, rva
+        sections.append([name, rva, payload, raw_ptr, characteristics])
+        raw_ptr += _align(len(payload), _FILE_ALIGNMENT)
+        rva += _align(max(len(payload), 1), _SECTION_ALIGNMENT)
+
+    for i in range(n_sections):
+        name = b".text" if i == 0 else (".s%d" % i).encode()
+        add_section(name, _section_payload(i, section_size, rng), 0x60000020 if i == 0 else 0xC0000040)
+
+    idata, import_dir_size = _build_idata(_import_names(n_imports, rng), rva)
+    directories[1] = (rva, import_dir_size)
+    add_section(b".idata", idata, 0xC0000040)
+
+    if n_resources:
+        rsrc = _build_rsrc(n_resources, resource_size, rva, rng)
+        directories[2] = (rva, len(rsrc))
+        add_section(b".rsrc", rsrc, 0x40000040)
+
+    if n_relocs:
+        reloc = _build_reloc(n_relocs, sections[0][1], section_size)
+        directories[5] = (rva, len(reloc))
+        add_section(b".reloc", reloc, 0x42000040)
+    size_of_image = rva
+
+    out = bytearray(headers_size)
+    out[0:2] = b"MZ"
+    struct.pack_into("<I", out, 0x3C, 0x40)
+    out[0x40:0x44] = b"PE\x00\x00"
+    struct.pack_into("<HHIIIHH", out, 0x44, 0x14C, total_sections, 0x5F000000 + seed, 0, 0, 224, 0x0102)
+
+    code_size = _align(section_size, _FILE_ALIGNMENT)
+    struct.pack_into(
+        "<HBBIIIIIIIIIHHHHHHIIIIHHIIIIII", out, 0x58,
+        0x10B, 14, 0, code_size, 0, 0, sections[0][1], sections[0][1], sections[0][1],
+        0x400000, _SECTION_ALIGNMENT, _FILE_ALIGNMENT, 6, 0, 0, 0, 6, 0, 0,
+        size_of_image, headers_size, 0, 2, 0x8140, 0x100000, 0x1000, 0x100000, 0x1000, 0, 16
+    )
+    # 데이터 디렉토리: [1] Import, [2] Resource, [5] Base Relocation
+    for index, (dir_rva, dir_size) in directories.items():
+        struct.pack_into("<II", out, 0x58 + 96 + 8 * index, dir_rva, dir_size)
+
+    table = 0x58 + 224
+    for i, (name, sec_rva, payload, ptr, characteristics) in enumerate(sections):
+        struct.pack_into("<8sIIIIIIHHI", out, table + 40 * i, name, len(payload), sec_rva,
+                         _align(len(payload), _FILE_ALIGNMENT), ptr, 0, 0, 0, 0, characteristics)
+
+    for name, sec_rva, payload, ptr, characteristics in sections:
+        out += payload
+        out += b"\x00" * (_align(len(payload), _FILE_ALIGNMENT) - len(payload))
+
+    if overlay_size:
+        out += rng.randbytes(overlay_size)
+    return bytes(out)
+
+
+# ==========================================
+# PDF
+# ==========================================
+_PDF_KEYWORD_OBJECTS = [
+    b"<< /Type /Action /S /JavaScript /JS (app.alert\\('bench'\\);) >>",
+    b"<< /Type /Action /S /Launch /F (cmd.exe) >>",
+    b"<< /Type /Action /S /URI /URI (http://example.invalid/) >>",
+    b"<< /Type /Action /S /SubmitForm /F (http://example.invalid/post) >>",
+    b"<< /Type /Annot /Subtype /RichMedia /AA << /O 3 0 R >> >>",
+]
+
+
+def make_pdf(n_objects=50, n_keywords=5, stream_size=256, seed=0):
+    rng = random.Random(seed)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R /OpenAction 4 0 R >>" if n_keywords else b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>",
+    ]
+    for i in range(max(0, n_objects - len(objects))):
+        if i < n_keywords:
+            objects.append(_PDF_KEYWORD_OBJECTS[i % len(_PDF_KEYWORD_OBJECTS)])
+        else:
+            words = b" ".join(b"w%d" % rng.randrange(1000) for _ in range(stream_size // 5))
+            body = b"BT /F1 12 Tf 72 712 Td (" + words[:stream_size] + b") Tj ET"
+            objects.append(b"<< /Length %d >>\nstream\n" % len(body) + body + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n" % (len(objects) + 1)
+    out += b"0000000000 65535 f \n"
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(out)
+
+
+# ==========================================
+# ZIP
+# ==========================================
+_ZIP_DATE = (2024, 1, 1, 0, 0, 0)
+_ZIP_NAMES = ["readme.txt", "report.docx", "photo.jpg", "setup.exe", "run.bat", "script.js", "data.bin"]
+
+
+def make_zip(n_entries=10, depth=0, entry_size=4096, seed=0):
+    """n_entries개 항목을 가진 ZIP. depth > 0이면 같은 구조의 ZIP을 한 겹씩 안에 넣습니다."""
+    rng = random.Random(seed)
+    inner = make_zip(n_entries, depth - 1, entry_size, seed + 1) if depth > 0 else None
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(n_entries):
+            name = "dir%d/%d_%s" % (i % 4, i, _ZIP_NAMES[i % len(_ZIP_NAMES)])
+            if i % 2:
+                data = rng.randbytes(entry_size)
+            else:
+                data = (b"lorem ipsum %d " % i) * (entry_size // 14 + 1)
+            zf.writestr(zipfile.ZipInfo(name, _ZIP_DATE), data[:entry_size])
+        if inner is not None:
+            zf.writestr(zipfile.ZipInfo("nested_depth%d.zip" % depth, _ZIP_DATE), inner)
+    return buffer.getvalue()
+
+
+# ==========================================
+# OLE (Compound File Binary) + VBA
+# ==========================================
+_SECTOR = 512
+_MINI_SECTOR = 64
+_MINI_CUTOFF = 4096
+_ENDOFCHAIN = 0xFFFFFFFE
+_FREESECT = 0xFFFFFFFF
+_FATSECT = 0xFFFFFFFD
+_NOSTREAM = 0xFFFFFFFF
+
+
+def _ovba_compress(data):
+    """
+    MS-OVBA 압축 컨테이너를 만듭니다. (압축은 하지 않는 형식만 사용)
+    4096바이트 청크는 비압축 청크로, 마지막 짧은 청크는 리터럴 토큰만으로 구성합니다.
+    """
+    out = bytearray(b"\x01")
+    for start in range(0, len(data), 4096):
+        chunk = data[start:start + 4096]
+        if len(chunk) == 4096:
+            out += struct.pack("<H", (4096 + 2 - 3) | 0x3000) + chunk
+            continue
+        body = bytearray()
+        for i in range(0, len(chunk), 8):
+            body += b"\x00" + chunk[i:i + 8]
+        out += struct.pack("<H", (len(body) + 2 - 3) | 0x3000 | 0x8000) + body
+    return bytes(out)
+
+
+def _vba_dir_stream(module_names):
+    def record(record_id, payload):
+        return struct.pack("<HI", record_id, len(payload)) + payload
+
+    d = bytearray()
+    d += record(0x0001, struct.pack("<I", 1))            # PROJECTSYSKIND (Win32)
+    d += record(0x0002, struct.pack("<I", 0x409))        # PROJECTLCID
+    d += record(0x0014, struct.pack("<I", 0x409))        # PROJECTLCIDINVOKE
+    d += record(0x0003, struct.pack("<H", 1252))         # PROJECTCODEPAGE
+    d += record(0x0004, b"BenchProject")                 # PROJECTNAME
+    d += record(0x0005, b"") + record(0x0040, b"")       # PROJECTDOCSTRING
+    d += record(0x0006, b"") + record(0x003D, b"")       # PROJECTHELPFILEPATH
+    d += record(0x0007, struct.pack("<I", 0))            # PROJECTHELPCONTEXT
+    d += record(0x0008, struct.pack("<I", 0))            # PROJECTLIBFLAGS
+    d += struct.pack("<HIIH", 0x0009, 4, 1, 0)           # PROJECTVERSION
+    d += record(0x000C, b"") + record(0x003C, b"")       # PROJECTCONSTANTS
+    d += struct.pack("<HIH", 0x000F, 2, len(module_names))  # PROJECTMODULES
+    d += struct.pack("<HIH", 0x0013, 2, 0xFFFF)          # PROJECTCOOKIE
+    for name in module_names:
+        encoded = name.encode()
+        d += record(0x0019, encoded)                     # MODULENAME
+        d += record(0x0047, name.encode("utf-16-le"))    # MODULENAMEUNICODE
+        d += record(0x001A, encoded) + record(0x0032, name.encode("utf-16-le"))  # MODULESTREAMNAME
+        d += record(0x001C, b"") + record(0x0048, b"")   # MODULEDOCSTRING
+        d += record(0x0031, struct.pack("<I", 0))        # MODULEOFFSET
+        d += record(0x001E, struct.pack("<I", 0))        # MODULEHELPCONTEXT
+        d += struct.pack("<HIH", 0x002C, 2, 0xFFFF)      # MODULECOOKIE
+        d += struct.pack("<HI", 0x0021, 0)               # MODULETYPE (procedural)
+        d += struct.pack("<HI", 0x002B, 0)               # MODULE terminator
+    d += struct.pack("<HI", 0x0010, 0)                   # dir terminator
+    return bytes(d)
+
+
+def _vba_module_source(index, lines, rng):
+    body = [
+        'Attribute VB_Name = "Module%d"' % index,
+        "Sub AutoOpen()",
+        '    Dim s As String',
+        '    s = "pow" & "ershell -nop -w hidden -c IEX"',
+        '    Shell s, vbHide',
+        "End Sub",
+    ]
+    for i in range(lines):
+        body.append("' filler %d %08x" % (i, rng.getrandbits(32)))
+    return ("\r\n".join(body) + "\r\n").encode()
+
+
+class _CfbEntry:
+    def __init__(self, name, data=None):
+        self.name = name
+        self.data = data          # None이면 storage
+        self.children = []
+        self.sid = None
+        self.left = self.right = self.child = _NOSTREAM
+        self.start = _ENDOFCHAIN
+        self.size = 0
+
+    def sort_key(self):
+        return (len(self.name), self.name.upper())
+
+
+def _balanced(entries):
+    """형제 항목으로 (정렬된) 이진 트리를 만들고 루트를 반환합니다."""
+    if not entries:
+        return None
+    mid = len(entries) // 2
+    root = entries[mid]
+    left, right = _balanced(entries[:mid]), _balanced(entries[mid + 1:])
+    root.left = left.sid if left else _NOSTREAM
+    root.right = right.sid if right else _NOSTREAM
+    return root
+
+
+def _build_cfb(tree):
+    """
+    {"이름": bytes | dict} 형태의 트리로 OLE Compound File(버전 3)을 만듭니다.
+    4096바이트 미만 스트림은 미니 스트림에 저장합니다.
+    """
+    root = _CfbEntry("Root Entry")
+    entries = [root]
+
+    def add(parent, items):
+        for name, value in items.items():
+            entry = _CfbEntry(name, value if isinstance(value, bytes) else None)
+            entry.sid = len(entries)
+            entries.append(entry)
+            parent.children.append(entry)
+            if entry.data is None:
+                add(entry, value)
+
+    root.sid = 0
+    add(root, tree)
+    for entry in entries:
+        children = sorted(entry.children, key=_CfbEntry.sort_key)
+        top = _balanced(children)
+        entry.child = top.sid if top else _NOSTREAM
+
+    # 미니 스트림 배치
+    mini = bytearray()
+    minifat = []
+    big_streams = []
+    for entry in entries[1:]:
+        if entry.data is None:
+            continue
+        entry.size = len(entry.data)
+        if entry.size >= _MINI_CUTOFF:
+            big_streams.append(entry)
+            continue
+        if entry.size == 0:
+            continue
+        first = len(mini) // _MINI_SECTOR
+        count = (entry.size + _MINI_SECTOR - 1) // _MINI_SECTOR
+        entry.start = first
+        minifat += [first + i + 1 for i in range(count - 1)] + [_ENDOFCHAIN]
+        mini += entry.data + b"\x00" * (count * _MINI_SECTOR - entry.size)
+
+    # 일반 섹터 배치: [미니 스트림][큰 스트림들][디렉토리][미니 FAT][FAT]
+    sectors = []
+    fat = []
+
+    def place(data):
+        count = max(1, (len(data) + _SECTOR - 1) // _SECTOR)
+        first = len(sectors)
+        for i in range(count):
+            sectors.append(data[i * _SECTOR:(i + 1) * _SECTOR].ljust(_SECTOR, b"\x00"))
+            fat.append(first + i + 1 if i < count - 1 else _ENDOFCHAIN)
+        return first
+
+    if mini:
+        root.start = place(bytes(mini))
+        root.size = len(mini)
+    for entry in big_streams:
+        entry.start = place(entry.data)
+
+    directory = bytearray()
+    for entry in entries:
+        name = entry.name.encode("utf-16-le")
+        entry_type = 5 if entry is root else (1 if entry.data is None else 2)
+        directory += struct.pack(
+            "<64sHBBIII16sIQQIQ",
+            name + b"\x00\x00", len(name) + 2, entry_type, 1,
+            entry.left, entry.right, entry.child, b"\x00" * 16, 0, 0, 0,
+            entry.start if entry_type != 1 else 0, entry.size
+        )
+    while len(directory) % _SECTOR:
+        directory += struct.pack("<64sHBBIII16sIQQIQ", b"", 0, 0, 0, _NOSTREAM, _NOSTREAM, _NOSTREAM,
+                                 b"\x00" * 16, 0, 0, 0, 0, 0)
+    first_dir = place(bytes(directory))
+
+    first_minifat, minifat_count = _ENDOFCHAIN, 0
+    if minifat:
+        minifat_data = b"".join(struct.pack("<I", v) for v in minifat)
+        first_minifat = place(minifat_data)
+        minifat_count = (len(minifat_data) + _SECTOR - 1) // _SECTOR
+
+    # FAT 섹터 수는 FAT 자신을 포함해야 하므로 반복 계산
+    fat_count = 1
+    while (len(sectors) + fat_count) > fat_count * (_SECTOR // 4):
+        fat_count += 1
+    if fat_count > 109:
+        raise ValueError("합성 OLE 파일이 너무 큽니다 (DIFAT 미지원)")
+    first_fat = len(sectors)
+    fat += [_FATSECT] * fat_count
+    fat += [_FREESECT] * (fat_count * (_SECTOR // 4) - len(fat))
+    fat_data = b"".join(struct.pack("<I", v) for v in fat)
+    for i in range(fat_count):
+        sectors.append(fat_data[i * _SECTOR:(i + 1) * _SECTOR])
+
+    header = bytearray(_SECTOR)
+    header[0:8] = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+    struct.pack_into("<HHHHH6sIIIIIIIII", header, 0x18,
+                     0x3E, 3, 0xFFFE, 9, 6, b"", 0, fat_count, first_dir, 0,
+                     _MINI_CUTOFF, first_minifat, minifat_count, _ENDOFCHAIN, 0)
+    difat = [first_fat + i for i in range(fat_count)] + [_FREESECT] * (109 - fat_count)
+    struct.pack_into("<109I", header, 0x4C, *difat)
+    return bytes(header) + b"".join(sectors)
+
+
+def make_ole(n_macros=2, macro_lines=20, filler_streams=2, filler_size=8192, seed=0):
+    """Word 97-2003 문서 구조(Macros/VBA)를 흉내 낸 OLE 파일"""
+    rng = random.Random(seed)
+    module_names = ["Module%d" % i for i in range(1, n_macros + 1)]
+
+    tree = {
+        "WordDocument": b"\xec\xa5" + rng.randbytes(max(0, filler_size - 2)),
+        "\x05SummaryInformation": b"\xfe\xff\x00\x00" + b"\x00" * 44,
+    }
+    for i in range(filler_streams):
+        tree["Data%d" % i] = rng.randbytes(filler_size)
+
+    if module_names:
+        vba = {
+            "_VBA_PROJECT": b"\xcc\x61\xff\xff\x00\x00\x00",
+            "dir": _ovba_compress(_vba_dir_stream(module_names)),
+        }
+        for i, name in enumerate(module_names, start=1):
+            vba[name] = _ovba_compress(_vba_module_source(i, macro_lines, rng))
+        project = "ID=\"{00000000-0000-0000-0000-000000000000}\"\r\n"
+        project += "".join("Module=%s\r\n" % name for name in module_names)
+        project += "Name=\"BenchProject\"\r\n"
+        tree["Macros"] = {"PROJECT": project.encode(), "VBA": vba}
+
+    return _build_cfb(tree)
@@ -0,0 +1,353 @@
+"""
+분석기 처리량 벤치마크
+benchmarks/corpus.py로 크기별 합성 샘플을 만들고, 분석기별(프로세스 내 호출)과
+전체 API 경로(POST /api/scan/analyze: 업로드 저장 -> 분석 -> 요약)의
+지연 시간 백분위수(p50/p95/p99), 초당 처리 파일 수, 최대 메모리를 JSON으로 출력합니다.
+
+- API 경로는 스캔 캐시를 끄고 매 요청마다 실제로 분석합니다.
+- Gemini 요약은 기본적으로 고정 응답으로 대체합니다. (--with-llm 으로 실제 호출)
+- DB는 기본적으로 메모리 내 SQLite로 바꿔 실행합니다. (--database-url 로 지정 가능)
+- 메모리: tracemalloc(파이썬 할당 최대치)은 별도 패스에서 측정하며, ru_maxrss는 프로세스 전체 값입니다.
+
+사용법 (저장소 루트에서):
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --types pdf,zip --sizes small,medium --repeat 5
+    python -m benchmarks.run --compare bench.json --threshold 20
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import resource
+import tempfile
+import contextlib
+import statistics
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.corpus import make_pe, make_pdf, make_zip, make_ole
+
+# 형식 -> (파일 확장자, 생성 함수, 분석 함수 이름)
+GENERATORS = {
+    "pe": (".exe", make_pe, "analyze_pe"),
+    "pdf": (".pdf", make_pdf, "analyze_pdf"),
+    "zip": (".zip", make_zip, "analyze_zip"),
+    "ole": (".doc", make_ole, "analyze_mshwp"),
+}
+
+# 크기별 생성 인자
+SIZES = {
+    "small": {
+        "pe": {"n_sections": 4, "n_imports": 20, "section_size": 0x1000},
+        "pdf": {"n_objects": 50, "n_keywords": 5},
+        "zip": {"n_entries": 10, "depth": 0},
+        "ole": {"n_macros": 1, "macro_lines": 20, "filler_streams": 2, "filler_size": 8192},
+    },
+    "medium": {
+        "pe": {"n_sections": 8, "n_imports": 100, "section_size": 0x10000},
+        "pdf": {"n_objects": 500, "n_keywords": 50},
+        "zip": {"n_entries": 200, "depth": 2},
+        "ole": {"n_macros": 5, "macro_lines": 200, "filler_streams": 8, "filler_size": 32768},
+    },
+    "large": {
+        "pe": {"n_sections": 16, "n_imports": 400, "section_size": 0x80000, "overlay_size": 1024 * 1024},
+        "pdf": {"n_objects": 5000, "n_keywords": 200},
+        "zip": {"n_entries": 2000, "depth": 3, "entry_size": 1024},
+        "ole": {"n_macros": 20, "macro_lines": 1000, "filler_streams": 32, "filler_size": 65536},
+    },
+}
+
+# Gemini 대신 사용하는 고정 요약
+STUB_SUMMARY = json.dumps({
+    "summary": "benchmark stub",
+    "risk_score": 0,
+    "risk_level": "low",
+    "reasons": [],
+    "recommended_actions": []
+})
+
+
+# ==========================================
+# 통계
+# ==========================================
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _summarize(timings, wall_seconds):
+    return {
+        "runs": len(timings),
+        "mean_ms": round(statistics.mean(timings) * 1000, 3),
+        "p50_ms": round(_percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(_percentile(timings, 95) * 1000, 3),
+        "p99_ms": round(_percentile(timings, 99) * 1000, 3),
+        "max_ms": round(max(timings) * 1000, 3),
+        "files_per_sec": round(len(timings) / wall_seconds, 2) if wall_seconds else None,
+    }
+
+
+def _max_rss_mb():
+    """현재 프로세스와 (종료된) 자식 프로세스의 최대 RSS (MB)"""
+    scale = 1024 * 1024 if platform.system() == "Darwin" else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    }
+
+
+def _peak_traced_mb(func, paths):
+    """파일별로 func를 한 번씩 실행하며 파이썬 할당 최대치(MB)를 측정합니다."""
+    peak = 0
+    for path in paths:
+        tracemalloc.start()
+        try:
+            func(path)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    return round(peak / (1024 * 1024), 2)
+
+
+# ==========================================
+# 코퍼스
+# ==========================================
+def build_corpus(directory, types, sizes, files):
+    """(형식, 크기)별로 seed만 다른 파일 files개를 만듭니다. 반환: {(형식, 크기): [경로...]}"""
+    corpus = {}
+    for file_type in types:
+        ext, generator, _ = GENERATORS[file_type]
+        for size in sizes:
+            paths = []
+            for seed in range(files):
+                data = generator(seed=seed, **SIZES[size][file_type])
+                path = os.path.join(directory, f"{file_type}_{size}_{seed}{ext}")
+                with open(path, "wb") as f:
+                    f.write(data)
+                paths.append(path)
+            corpus[(file_type, size)] = paths
+    return corpus
+
+
+def _case_info(file_type, size, paths):
+    return {
+        "type": file_type,
+        "size": size,
+        "files": len(paths),
+        "bytes_per_file": round(statistics.mean(os.path.getsize(p) for p in paths)),
+        "params": SIZES[size][file_type],
+    }
+
+
+# ==========================================
+# 분석기 벤치마크 (프로세스 내 호출)
+# ==========================================
+def bench_analyzers(corpus, repeat):
+    from app.backend.analyze import file_analyzer
+
+    results = []
+    for (file_type, size), paths in corpus.items():
+        func = getattr(file_analyzer, GENERATORS[file_type][2])
+        # 첫 호출의 import 비용은 워밍업으로 제외
+        warmup = func(paths[0])
+        if "error" in warmup:
+            print(f"[경고] {file_type}/{size}: {warmup['error']}", file=sys.stderr)
+
+        timings = []
+        wall_start = time.perf_counter()
+        for _ in range(repeat):
+            for path in paths:
+                start = time.perf_counter()
+                func(path)
+                timings.append(time.perf_counter() - start)
+        wall = time.perf_counter() - wall_start
+
+        case = _case_info(file_type, size, paths)
+        case["latency"] = _summarize(timings, wall)
+        case["peak_traced_mb"] = _peak_traced_mb(func, paths)
+        results.append(case)
+    return results
+
+
+# ==========================================
+# 전체 API 경로 벤치마크
+# ==========================================
+def _stub_summarizers():
+    from app.backend.service import scan_service
+    for kind in scan_service.SUMMARIZERS:
+        scan_service.SUMMARIZERS[kind] = lambda analysis: STUB_SUMMARY
+
+
+def _use_database(url):
+    """앱의 DB 엔진을 url로 교체합니다. (운영 DB에 테이블 생성/기록을 하지 않도록)"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import StaticPool
+    from app.core import database
+    from app.backend import main
+
+    options = {}
+    if url.startswith("sqlite"):
+        options = {"connect_args": {"check_same_thread": False}, "poolclass": StaticPool}
+    engine = create_engine(url, **options)
+    database.engine = engine
+    database.SessionLocal.configure(bind=engine)
+    main.engine = engine
+
+
+def bench_api(corpus, repeat, with_llm, database_url):
+    from fastapi.testclient import TestClient
+    from app.backend.main import app
+    from app.backend.router import scan_router
+    from app.backend.service.scan_cache_service import scan_cache
+    from app.backend.service.hash_verdict_service import hash_verdicts
+    from app.backend.service.similarity_index import similarity_index
+
+    _use_database(database_url)
+    if not with_llm:
+        _stub_summarizers()
+    # 매 요청이 실제 분석을 거치도록 캐시와 알려진 해시 조회를 끄고, 업로드는 임시 디렉토리에 저장
+    scan_cache.use_db = False
+    hash_verdicts.enabled = False
+    similarity_index.enabled = False
+    upload_dir = tempfile.mkdtemp(prefix="bench-upload-")
+    scan_router.UPLOAD_DIR = upload_dir
+
+    def scan(client, path):
+        scan_cache._entries.clear()
+        with open(path, "rb") as f:
+            response = client.post("/api/scan/analyze",
+                                   files={"file": (os.path.basename(path), f, "application/octet-stream")})
+        response.raise_for_status()
+        return response.json()
+
+    results = []
+    try:
+        with TestClient(app) as client:
+            for (file_type, size), paths in corpus.items():
+                warmup = scan(client, paths[0])
+                if "error" in warmup.get("analysis", {}):
+                    print(f"[경고] api {file_type}/{size}: {warmup['analysis']['error']}", file=sys.stderr)
+
+                timings = []
+                wall_start = time.perf_counter()
+                for _ in range(repeat):
+                    for path in paths:
+                        start = time.perf_counter()
+                        scan(client, path)
+                        timings.append(time.perf_counter() - start)
+                wall = time.perf_counter() - wall_start
+
+                case = _case_info(file_type, size, paths)
+                case["latency"] = _summarize(timings, wall)
+                case["peak_traced_mb"] = _peak_traced_mb(lambda p: scan(client, p), paths)
+                results.append(case)
+    finally:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+    return results
+
+
+# ==========================================
+# 이전 결과와 비교
+# ==========================================
+def compare(baseline, current, threshold):
+    """
+    p50/p95 지연 시간을 이전 결과와 비교합니다.
+    반환: (비교 결과 목록, threshold(%) 이상 느려진 항목이 있는지)
+    """
+    def index(report):
+        cases = {}
+        for section in ("analyzers", "api"):
+            for case in report.get(section, []):
+                cases[(section, case["type"], case["size"])] = case["latency"]
+        return cases
+
+    before, after = index(baseline), index(current)
+    rows, regressed = [], False
+    for key in sorted(set(before) & set(after)):
+        row = {"section": key[0], "type": key[1], "size": key[2]}
+        for metric in ("p50_ms", "p95_ms"):
+            old, new = before[key][metric], after[key][metric]
+            change = round((new - old) / old * 100, 1) if old else None
+            row[metric] = {"before": old, "after": new, "change_pct": change}
+            if change is not None and change >= threshold:
+                regressed = True
+        rows.append(row)
+    return rows, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 코퍼스 기반 분석기/API 처리량 벤치마크")
+    parser.add_argument("--types", default=",".join(GENERATORS), help="대상 형식 (쉼표 구분: pe,pdf,zip,ole)")
+    parser.add_argument("--sizes", default="small,medium", help="코퍼스 크기 (쉼표 구분: small,medium,large)")
+    parser.add_argument("--files", type=int, default=5, help="(형식, 크기)별 생성할 파일 수")
+    parser.add_argument("--repeat", type=int, default=3, help="코퍼스 반복 횟수")
+    parser.add_argument("--skip-api", action="store_true", help="/api/scan/analyze 경로 측정 생략")
+    parser.add_argument("--with-llm", action="store_true", help="API 경로에서 실제 Gemini 요약 호출")
+    parser.add_argument("--database-url", default="sqlite://", help="API 경로에서 사용할 DB (기본: 메모리 내 SQLite)")
+    parser.add_argument("--keep-corpus", metavar="DIR", help="생성한 코퍼스를 이 디렉토리에 남김")
+    parser.add_argument("--output", metavar="FILE", help="결과 JSON 저장 경로 (기본: 표준 출력)")
+    parser.add_argument("--compare", metavar="FILE", help="이전 결과 JSON과 p50/p95 비교")
+    parser.add_argument("--threshold", type=float, default=20.0, help="회귀로 판단할 지연 증가율(%%)")
+    args = parser.parse_args()
+
+    types = [t for t in args.types.split(",") if t]
+    sizes = [s for s in args.sizes.split(",") if s]
+    unknown = [t for t in types if t not in GENERATORS] + [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"알 수 없는 형식/크기: {', '.join(unknown)}")
+
+    corpus_dir = args.keep_corpus or tempfile.mkdtemp(prefix="bench-corpus-")
+    os.makedirs(corpus_dir, exist_ok=True)
+    try:
+        corpus = build_corpus(corpus_dir, types, sizes, max(1, args.files))
+        from app.backend.analyze.file_analyzer import ANALYZER_VERSION
+        from app.config import ANALYZER_POOL_SIZE
+
+        report = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "analyzer_version": ANALYZER_VERSION,
+                "analyzer_pool_size": ANALYZER_POOL_SIZE,
+                "files": args.files,
+                "repeat": args.repeat,
+                "with_llm": args.with_llm,
+            },
+            "analyzers": bench_analyzers(corpus, max(1, args.repeat)),
+        }
+        if not args.skip_api:
+            # 서버 시작/종료 로그가 JSON 출력에 섞이지 않도록 stderr로 보냄
+            with contextlib.redirect_stdout(sys.stderr):
+                report["api"] = bench_api(corpus, max(1, args.repeat), args.with_llm, args.database_url)
+        report["max_rss_mb"] = _max_rss_mb()
+    finally:
+        if not args.keep_corpus:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    regressed = False
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["comparison"], regressed = compare(json.load(f), report, args.threshold)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    # 회귀가 있으면 CI에서 감지할 수 있도록 종료 코드 1
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
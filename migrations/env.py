@@ -7,6 +7,8 @@ from alembic import context
 
 from app.core.database import Base
 from app.backend.model.user import User
+from app.backend.model.scan_cache import ScanCache
+from app.backend.model.hash_verdict import HashVerdict
 
 
 
@@ -0,0 +1,43 @@
+"""add scan_cache table
+
+Revision ID: 5c1e9a7d2b40
+Revises: 33b42c062fc2
+Create Date: 2026-10-17 18:02:11.514208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e9a7d2b40'
+down_revision: Union[str, Sequence[str], None] = '33b42c062fc2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('scan_cache',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('cache_key', sa.String(length=100), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('kind', sa.String(length=30), nullable=False),
+    sa.Column('analyzer_version', sa.String(length=20), nullable=False),
+    sa.Column('payload', sa.Text(length=4294967295), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_scan_cache_id'), 'scan_cache', ['id'], unique=False)
+    op.create_index(op.f('ix_scan_cache_cache_key'), 'scan_cache', ['cache_key'], unique=True)
+    op.create_index(op.f('ix_scan_cache_sha256'), 'scan_cache', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_scan_cache_sha256'), table_name='scan_cache')
+    op.drop_index(op.f('ix_scan_cache_cache_key'), table_name='scan_cache')
+    op.drop_index(op.f('ix_scan_cache_id'), table_name='scan_cache')
+    op.drop_table('scan_cache')
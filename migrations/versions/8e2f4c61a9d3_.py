@@ -0,0 +1,41 @@
+"""add hash_verdict table
+
+Revision ID: 8e2f4c61a9d3
+Revises: 5c1e9a7d2b40
+Create Date: 2026-10-17 21:40:05.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2f4c61a9d3'
+down_revision: Union[str, Sequence[str], None] = '5c1e9a7d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('hash_verdict',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('verdict', sa.String(length=20), nullable=False),
+    sa.Column('source', sa.String(length=50), nullable=False),
+    sa.Column('note', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_hash_verdict_id'), 'hash_verdict', ['id'], unique=False)
+    op.create_index(op.f('ix_hash_verdict_sha256'), 'hash_verdict', ['sha256'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_hash_verdict_sha256'), table_name='hash_verdict')
+    op.drop_index(op.f('ix_hash_verdict_id'), table_name='hash_verdict')
+    op.drop_table('hash_verdict')